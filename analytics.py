@@ -0,0 +1,214 @@
+from datetime import date as Date  # Importing the date type for naming months
+
+from changes import Observer  # Importing the observer base class
+from event_management import SUPPLIER_COMPANY_FIELDS  # Importing the event fields naming a supplier company
+from indexes import normalize  # Importing the text normalization used by the indexes
+from records import amount_cents, parse_amount  # Importing the readers of amounts typed as text
+from schedule import EPOCH_ORDINAL, parse_date  # Importing the date parser and the day number of 1970-01-01
+
+REVENUE_GROUPINGS = ("client", "venue", "month", "supplier")  # Groupings of the invoiced revenue
+EVENT_FIELDS_READ = ("invoice", "client_id", "venue_address", "day", "date") + SUPPLIER_COMPANY_FIELDS  # Event attributes the aggregates read
+
+
+def month_of(day):  # Function for naming the month of a day number
+    return Date.fromordinal(day + EPOCH_ORDINAL).strftime("%Y-%m")  # Returning the month as "2026-12"
+
+
+class Totals:  # Definition of the Totals class
+    # Running count and sum of a group of amounts, updated in O(1) when one is added or removed.
+    # The sum is kept in whole cents, so adding and removing amounts over a long session
+    # never drifts the way a running float sum does.
+    __slots__ = ("count", "cents")  # Fixed attributes, as the totals of many groups are kept
+
+    def __init__(self, count=0, cents=0):  # Constructor method for initializing the totals
+        self.count = count  # Number of records in the group
+        self.cents = cents  # Sum of their readable amounts, in cents
+
+    def add(self, amount):  # Method for counting one record in
+        self.count += 1  # Counting the record
+        self.cents += amount_cents(amount)  # Adding its amount, unreadable ones adding nothing
+
+    def remove(self, amount):  # Method for counting one record out
+        self.count -= 1  # Uncounting the record
+        self.cents -= amount_cents(amount)  # Subtracting its amount
+
+    @property
+    def total(self):  # Property giving the sum of the amounts
+        return self.cents / 100  # Returning it in whole units
+
+    @property
+    def mean(self):  # Property giving the average amount
+        return self.total / self.count if self.count else None  # Returning None for an empty group
+
+    def __repr__(self):  # Method for showing the totals while debugging
+        return f"Totals(count={self.count}, total={self.total})"
+
+
+class GroupedTotals:  # Definition of the GroupedTotals class
+    # Totals per group, such as per client or per month. Groups are dropped once empty.
+    def __init__(self):  # Constructor method for initializing the groups
+        self.groups = {}  # Totals by group
+
+    def add(self, group, amount):  # Method for counting one record into a group
+        self.groups.setdefault(group, Totals()).add(amount)  # Creating the group if needed
+
+    def remove(self, group, amount):  # Method for counting one record out of a group
+        totals = self.groups.get(group)  # Getting the group's totals
+        if totals is None:  # Checking if the group exists
+            return
+        totals.remove(amount)  # Uncounting the record
+        if not totals.count:  # Checking if the group is empty
+            del self.groups[group]  # Dropping it
+
+    def get(self, group):  # Method for reading one group's totals
+        return self.groups.get(group) or Totals()  # Returning empty totals for an unknown group
+
+
+class Analytics(Observer):  # Definition of the Analytics class
+    # Keeps running totals of invoiced revenue, client budgets and payroll, updated from the
+    # managers' change notifications, so reading a total never scans the records:
+    #   revenue overall and per client, venue, month and supplier company,
+    #   budgets overall and per client, payroll overall and per department.
+    # The totals are built with one pass over each store on first use.
+    def __init__(self, event_management, client_management, employee_management):  # Constructor method for attaching the aggregates
+        self.event_management = event_management  # Manager of the invoiced events
+        self.client_management = client_management  # Manager of the clients and their budgets
+        self.employee_management = employee_management  # Manager of the salaried employees
+        self._revenue = None  # Revenue totals by grouping, built on first use
+        self._budgets = None  # Budget totals, built on first use
+        self._payroll = None  # Payroll totals by department, built on first use
+        for management in (event_management, client_management, employee_management):  # Iterating over the managers
+            management.add_observer(self)  # Watching its changes
+
+    def revenue_entries(self, values):  # Method for listing where one event's invoice is counted
+        """
+        Args:
+            values: The event's attributes named in EVENT_FIELDS_READ, in order.
+        Returns:
+            tuple: (amount, [(grouping, group), ...]) for the event.
+        """
+        event = dict(zip(EVENT_FIELDS_READ, values))  # Naming the attributes
+        day = event["day"] if event["day"] is not None else parse_date(event["date"])  # Stored day number, or the parsed date of an event saved before it was stored
+        groups = [("client", normalize(event["client_id"]) or ""), ("venue", normalize(event["venue_address"]) or "")]  # Client and venue groups
+        if day is not None:  # Checking if the event's month is known
+            groups.append(("month", month_of(day)))  # Counting it in its month
+        companies = {normalize(event[field]) for field in SUPPLIER_COMPANY_FIELDS} - {None, ""}  # Companies the event uses, each counted once
+        groups.extend(("supplier", company) for company in sorted(companies))  # Counting the event for each of them
+        return parse_amount(event["invoice"]), groups  # Returning the amount and its groups
+
+    def count_event(self, values, sign):  # Method for adding or removing one event's invoice
+        amount, groups = self.revenue_entries(values)  # Working out where it is counted
+        update = "add" if sign > 0 else "remove"  # Choosing the update
+        getattr(self._revenue[None], update)(amount)  # Updating the overall total
+        for grouping, group in groups:  # Iterating over its groups
+            getattr(self._revenue[grouping], update)(group, amount)  # Updating each
+
+    @property
+    def revenue_totals(self):  # Property building the revenue totals on first use
+        if self._revenue is None:  # Checking if the totals are not built yet
+            self._revenue = {grouping: GroupedTotals() for grouping in REVENUE_GROUPINGS}  # Creating the groupings
+            self._revenue[None] = Totals()  # Overall total, under None
+            for values in self.event_management.iter_event_rows(EVENT_FIELDS_READ):  # Iterating over the events, read from the columns of a columnar store
+                self.count_event(values, 1)  # Counting each
+        return self._revenue  # Returning the totals
+
+    @property
+    def budget_totals(self):  # Property building the budget totals on first use
+        if self._budgets is None:  # Checking if the totals are not built yet
+            self._budgets = {None: Totals(), "client": {}}  # Overall total and each client's budget
+            for client_id, budget in self.client_management.iter_client_rows(("client_id", "budget")):  # Iterating over the clients
+                self.count_client(client_id, budget, 1)  # Counting each budget
+        return self._budgets  # Returning the totals
+
+    def count_client(self, client_id, budget, sign):  # Method for adding or removing one client's budget
+        amount = parse_amount(budget)  # Reading the budget
+        if sign > 0:  # Checking for an addition
+            self._budgets[None].add(amount)  # Adding it to the overall total
+            self._budgets["client"][normalize(client_id)] = amount  # Remembering the client's budget
+        else:
+            self._budgets[None].remove(amount)  # Removing it from the overall total
+            self._budgets["client"].pop(normalize(client_id), None)  # Forgetting the client's budget
+
+    @property
+    def payroll_totals(self):  # Property building the payroll totals on first use
+        if self._payroll is None:  # Checking if the totals are not built yet
+            self._payroll = {None: Totals(), "department": GroupedTotals()}  # Overall total and departments
+            for department, salary in self.employee_management.iter_employee_rows(("department", "basic_salary")):  # Iterating over the employees
+                self.count_employee(department, salary, 1)  # Counting each salary
+        return self._payroll  # Returning the totals
+
+    def count_employee(self, department, salary, sign):  # Method for adding or removing one employee's salary
+        amount = parse_amount(salary)  # Reading the salary
+        update = "add" if sign > 0 else "remove"  # Choosing the update
+        getattr(self._payroll[None], update)(amount)  # Updating the overall total
+        getattr(self._payroll["department"], update)(normalize(department) or "", amount)  # Updating the department
+
+    def after_change(self, label, changes):  # Method for keeping the totals in line with stored changes
+        for key, old, new in changes:  # Iterating over the changes
+            if label == "events" and self._revenue is not None:  # Checking for an event change with built totals
+                for record, sign in ((old, -1), (new, 1)):  # Removing the old invoice and adding the new one
+                    if record is not None:  # Checking if that side of the change exists
+                        self.count_event(tuple(getattr(record, field, None) for field in EVENT_FIELDS_READ), sign)
+            elif label == "clients" and self._budgets is not None:  # Checking for a client change with built totals
+                for record, sign in ((old, -1), (new, 1)):  # Removing the old budget and adding the new one
+                    if record is not None:  # Checking if that side of the change exists
+                        self.count_client(key, record.budget, sign)
+            elif label == "employees" and self._payroll is not None:  # Checking for an employee change with built totals
+                for record, sign in ((old, -1), (new, 1)):  # Removing the old salary and adding the new one
+                    if record is not None:  # Checking if that side of the change exists
+                        self.count_employee(record.department, record.basic_salary, sign)
+
+    def revenue(self, by=None, group=None):  # Method for reading invoiced revenue
+        """
+        Args:
+            by: None for every event, or one of "client", "venue", "month" and "supplier".
+            group: The client ID, venue address, "YYYY-MM" month or company name; text is
+                compared ignoring case and surrounding spaces.
+        Returns:
+            Totals: Number of events and sum of their invoices.
+        """
+        totals = self.revenue_totals  # Making sure the totals are built
+        if by is None:  # Checking for the overall total
+            return totals[None]
+        if by not in REVENUE_GROUPINGS:  # Checking the grouping is known
+            raise ValueError(f"Revenue can't be grouped by {by}.")
+        return totals[by].get(normalize(group) if by != "month" else group)  # Returning the group's totals
+
+    def revenue_by(self, by):  # Method for reading the revenue of every group of a grouping
+        """
+        Returns:
+            dict: Totals by group, e.g. by month for by="month".
+        """
+        if by not in REVENUE_GROUPINGS:  # Checking the grouping is known
+            raise ValueError(f"Revenue can't be grouped by {by}.")
+        return dict(self.revenue_totals[by].groups)  # Returning a copy of the groups
+
+    def budgets(self):  # Method for reading the total of the client budgets
+        return self.budget_totals[None]  # Returning the number of clients and their summed budgets
+
+    def budget_utilization(self, client_id):  # Method for comparing a client's invoices with its budget
+        """
+        Returns:
+            float: The client's invoiced revenue divided by its budget, or None if the
+            client has no readable, non-zero budget.
+        """
+        budget = self.budget_totals["client"].get(normalize(client_id))  # Looking up the client's budget
+        if not budget:  # Checking if the ratio can be computed
+            return None
+        return self.revenue("client", client_id).total / budget  # Returning the share of the budget invoiced
+
+    def payroll(self, department=None):  # Method for reading the payroll
+        """
+        Args:
+            department: None for every employee, or a department name.
+        Returns:
+            Totals: Number of employees and sum of their basic salaries.
+        """
+        totals = self.payroll_totals  # Making sure the totals are built
+        if department is None:  # Checking for the overall total
+            return totals[None]
+        return totals["department"].get(normalize(department) or "")  # Returning the department's totals
+
+    def payroll_by_department(self):  # Method for reading the payroll of every department
+        return dict(self.payroll_totals["department"].groups)  # Returning a copy of the departments
+
@@ -0,0 +1,71 @@
+import argparse  # Importing the argparse module for command-line options
+import os  # Importing the os module for the null device
+import time  # Importing the time module for timing the report paths
+import tracemalloc  # Importing the tracemalloc module for measuring peak memory
+from collections import deque  # Importing deque for draining an iterator without keeping its items
+
+from event_management import EventManagement  # Importing the event manager
+from storage import PickleStorage  # Importing the pickle storage, pointed at an unused file
+from synthetic_data import make_records  # Importing the synthetic record generator
+
+
+def legacy_display_all_events(events):  # Function reproducing the old report built with repeated +=
+    all_events_info = ""  # Initializing string to store all events' information
+    for event_id, event in events.items():  # Iterating over events dictionary
+        all_events_info += f"Event ID: {event_id}\n"
+        all_events_info += f"Type: {event.event_type}\n"
+        all_events_info += f"Theme: {event.theme}\n"
+        all_events_info += f"Date: {event.date}\n"
+        all_events_info += f"Time: {event.time}\n"
+        all_events_info += f"Duration: {event.duration}\n"
+        all_events_info += f"Venue Address: {event.venue_address}\n"
+        all_events_info += f"Client ID: {event.client_id}\n"
+        all_events_info += f"Guest List: {event.guest_list}\n"
+        all_events_info += f"Catering Company: {event.catering_company}\n"
+        all_events_info += f"Cleaning Company: {event.cleaning_company}\n"
+        all_events_info += f"Decorations Company: {event.decorations_company}\n"
+        all_events_info += f"Entertainment Company: {event.entertainment_company}\n"
+        all_events_info += f"Furniture Supply Company: {event.furniture_supply_company}\n"
+        all_events_info += f"Invoice: {event.invoice}\n\n"
+    return all_events_info  # Returning the string containing all events' information
+
+
+def stream_to(sink, blocks):  # Function writing streamed report blocks one at a time
+    for block in blocks:  # Iterating over the blocks
+        sink.write(block)  # Writing each block without keeping it
+
+
+def measure(action):  # Function timing an action and recording its peak memory
+    started = time.perf_counter()  # Recording the start time
+    action()  # Running the report path untraced, so tracing doesn't skew the time
+    elapsed = time.perf_counter() - started  # Measuring the elapsed time
+    tracemalloc.start()  # Starting memory tracing
+    action()  # Running the report path again under tracing
+    peak = tracemalloc.get_traced_memory()[1]  # Reading the peak traced memory
+    tracemalloc.stop()  # Stopping memory tracing
+    return elapsed, peak  # Returning the time and peak memory
+
+
+def main():  # Function for running the report benchmark
+    parser = argparse.ArgumentParser(description="Compare the old string report with the streaming report API.")  # Creating the argument parser
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="numbers of events to report on")  # Store sizes to test
+    args = parser.parse_args()  # Parsing the arguments
+
+    for size in args.sizes:  # Iterating over the store sizes
+        manager = EventManagement(backend=PickleStorage(os.devnull, "events"))  # Creating a manager that never touches the real file
+        manager.events = make_records("events", size)  # Filling it with synthetic events
+        with open(os.devnull, "w") as sink:  # Opening a sink that discards the report
+            paths = [  # Report paths to compare
+                ("legacy += string", lambda: legacy_display_all_events(manager.events)),
+                ("display_all_events (join)", manager.display_all_events),
+                ("iter_events streamed", lambda: stream_to(sink, manager.iter_events())),
+                ("iter_event_rows drained", lambda: deque(manager.iter_event_rows(), maxlen=0)),
+            ]
+            print(f"{size} events")  # Reporting the store size
+            for name, action in paths:  # Iterating over the report paths
+                elapsed, peak = measure(action)  # Timing the path
+                print(f"  {name:28s} {elapsed * 1000:9.1f} ms  peak {peak / 1024 / 1024:8.2f} MiB")  # Reporting time and peak memory
+
+
+if __name__ == "__main__":
+    main()  # Running the benchmark
@@ -0,0 +1,47 @@
+import argparse  # Importing the argparse module for command-line options
+import tracemalloc  # Importing the tracemalloc module for measuring record memory
+
+from synthetic_data import GENERATORS, make_records  # Importing the synthetic record generators
+
+
+class LegacyRecord:  # Definition of the LegacyRecord class
+    # Plain class with a per-instance __dict__, like the record classes before __slots__.
+    pass
+
+
+def legacy_copy(record):  # Function for copying a record into the old dict-based layout
+    legacy = LegacyRecord()  # Creating the plain record
+    legacy.__dict__.update(record.__getstate__())  # Copying every attribute
+    return legacy  # Returning the plain record
+
+
+def slotted_copy(record):  # Function for copying a record into the slot-based layout
+    copy = record.__class__.__new__(record.__class__)  # Creating the record without running the constructor
+    copy.__setstate__(record.__getstate__())  # Copying every attribute
+    return copy  # Returning the copy
+
+
+def bytes_per_record(build, records):  # Function for measuring the memory one record layout adds
+    tracemalloc.start()  # Starting memory tracing
+    built = [build(record) for record in records]  # Building every record; the field values are shared, so only the layout is counted
+    size = tracemalloc.get_traced_memory()[0]  # Reading the memory held by the new records
+    tracemalloc.stop()  # Stopping memory tracing
+    del built  # Releasing the records
+    return size / len(records)  # Returning the memory per record
+
+
+def main():  # Function for running the memory benchmark
+    parser = argparse.ArgumentParser(description="Compare bytes per record of dict-based and slot-based records.")  # Creating the argument parser
+    parser.add_argument("--count", type=int, default=100000, help="records built per kind")  # Number of records
+    args = parser.parse_args()  # Parsing the arguments
+
+    print(f"{'records':10s} {'__dict__':>10s} {'__slots__':>10s} {'saved':>7s}")  # Printing the header
+    for label in GENERATORS:  # Iterating over the record kinds
+        records = list(make_records(label, args.count).values())  # Creating the synthetic records once
+        before = bytes_per_record(legacy_copy, records)  # Measuring the old layout
+        after = bytes_per_record(slotted_copy, records)  # Measuring the slot-based layout
+        print(f"{label:10s} {before:10.0f} {after:10.0f} {1 - after / before:7.0%}")  # Reporting bytes per record
+
+
+if __name__ == "__main__":
+    main()  # Running the benchmark
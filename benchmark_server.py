@@ -0,0 +1,154 @@
+import argparse  # Importing the argparse module for command-line options
+import asyncio  # Importing the asyncio module for many concurrent clients on one thread
+import json  # Importing the json module for request bodies
+import os  # Importing the os module for operating system related functionalities
+import random  # Importing the random module for picking requests
+import tempfile  # Importing the tempfile module for a scratch data directory
+import time  # Importing the time module for timing requests
+
+from server import APIServer, DEFAULT_HOST, DEFAULT_PORT  # Importing the server under test and its default address
+from synthetic_data import write_stores  # Importing the synthetic store writer
+
+COUNTS = {"events": 10000, "guests": 10000, "clients": 1000, "employees": 100, "suppliers": 100, "venues": 50}  # Store sizes the requests pick records from
+
+
+class Client:  # Definition of the Client class
+    # One keep-alive connection sending requests one after another.
+    def __init__(self, host, port):  # Constructor method for the server address
+        self.host = host  # Server address
+        self.port = port  # Server port
+        self.reader = None  # Stream reading responses, opened on first use
+        self.writer = None  # Stream writing requests, opened on first use
+
+    async def request(self, method, path, body=None):  # Method for sending one request and reading its response
+        """
+        Returns:
+            int: The response status.
+        """
+        if self.writer is None:  # Checking if the connection is open
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)  # Opening it
+        data = json.dumps(body).encode() if body is not None else b""  # Encoding the body
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)  # Sending the request
+        status = int((await self.reader.readline()).split()[1])  # Reading the status line
+        length, chunked = 0, False  # Body length and whether it is chunked
+        while True:
+            line = await self.reader.readline()  # Reading the next header
+            if line in (b"\r\n", b""):  # Checking for the end of the headers
+                break
+            name, _, value = line.decode("latin-1").partition(":")  # Splitting the header
+            if name.lower() == "content-length":  # Checking for the body length
+                length = int(value)
+            elif name.lower() == "transfer-encoding":  # Checking for a chunked body
+                chunked = value.strip().lower() == "chunked"
+        if chunked:  # Checking for a streamed body
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)  # Reading the chunk size
+                await self.reader.readexactly(size + 2)  # Skipping the chunk and its line end
+                if size == 0:  # Checking for the last chunk
+                    break
+        elif length:  # Checking for a body
+            await self.reader.readexactly(length)  # Skipping the body
+        return status  # Returning the status
+
+    def close(self):  # Method for closing the connection
+        if self.writer is not None:  # Checking if the connection is open
+            self.writer.close()  # Closing it
+
+
+def pick_request(rng, counts, write_ratio, sequence):  # Function for choosing the next request of the mix
+    """
+    Returns:
+        tuple: (name, method, path, body) of a read or, with probability write_ratio, a write.
+    """
+    if rng.random() < write_ratio:  # Checking if this request writes
+        if rng.random() < 0.5:  # Choosing between adding and changing a guest
+            guest_id = f"LOAD{sequence}"  # New guest ID no other request uses
+            return "add guest", "POST", "/guests", {"guest_id": guest_id, "name": f"load guest {sequence}", "address": "load street", "contact_details": "0500000000"}
+        return "modify guest", "PATCH", f"/guests/G{rng.randrange(counts['guests'])}", {"contact_details": f"055{sequence:07d}"}
+    choice = rng.random()  # Choosing the kind of read
+    if choice < 0.5:  # Reading one record
+        return "get event", "GET", f"/events/E{rng.randrange(counts['events'])}", None
+    if choice < 0.8:  # Looking events up through an index
+        return "events by client", "GET", f"/events?client_id=C{rng.randrange(min(counts['clients'], 2000))}", None
+    if choice < 0.95:  # Reading a page
+        return "page of guests", "GET", f"/guests?offset={rng.randrange(counts['guests'])}&limit=50", None
+    return "search", "GET", f"/search?q=guest+{rng.randrange(counts['guests'])}&stores=guests", None
+
+
+async def run_client(host, port, deadline, write_ratio, seed, counter, latencies, errors):  # Function for sending requests from one client until the deadline
+    rng = random.Random(seed)  # Random requests, repeatable per client
+    client = Client(host, port)  # Opening a connection
+    try:
+        while time.perf_counter() < deadline:  # Sending requests until the time is up
+            counter[0] += 1  # Numbering the request
+            name, method, path, body = pick_request(rng, COUNTS, write_ratio, counter[0])  # Choosing it
+            started = time.perf_counter()  # Timing it
+            status = await client.request(method, path, body)  # Sending it
+            latencies.setdefault(name, []).append(time.perf_counter() - started)  # Recording the latency
+            if status >= 400:  # Checking for a failure
+                errors[status] = errors.get(status, 0) + 1  # Counting it
+    finally:
+        client.close()  # Closing the connection
+
+
+def percentile(values, fraction):  # Function for reading a percentile of sorted values
+    return values[min(len(values) - 1, int(len(values) * fraction))]  # Returning the value at that rank
+
+
+def report(latencies, errors, elapsed):  # Function for printing throughput and latency
+    total = sum(len(values) for values in latencies.values())  # Number of requests sent
+    print(f"{total} requests in {elapsed:.1f} s: {total / elapsed:,.0f} requests/s, errors {errors or 'none'}")  # Reporting the throughput
+    print(f"{'request':20s} {'count':>8s} {'p50 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")  # Table heading
+    everything = sorted(value for values in latencies.values() for value in values)  # Every latency
+    for name, values in sorted(latencies.items()) + [("all", everything)]:  # Iterating over the kinds of request and the total
+        values = sorted(values)  # Sorting for the percentiles
+        print(f"{name:20s} {len(values):8d} {percentile(values, 0.5) * 1000:8.2f} {percentile(values, 0.99) * 1000:8.2f} {values[-1] * 1000:8.2f}")
+
+
+async def load_test(host, port, clients, seconds, write_ratio):  # Function for running the clients together
+    deadline = time.perf_counter() + seconds  # Time the clients stop
+    counter, latencies, errors = [0], {}, {}  # Shared request number, latencies by request and errors by status
+    started = time.perf_counter()  # Timing the run
+    await asyncio.gather(*(run_client(host, port, deadline, write_ratio, seed, counter, latencies, errors) for seed in range(clients)))  # Running every client
+    report(latencies, errors, time.perf_counter() - started)  # Reporting the results
+
+
+async def local_test(clients, seconds, write_ratio):  # Function for load testing a server started in this process
+    from context import DataContext  # Importing the shared data context
+    with DataContext(write_behind=True, on_delete="restrict") as context:  # Opening the synthetic stores
+        server = APIServer(context, refresh_interval=None)  # Creating the server
+        await server.start(DEFAULT_HOST, 0)  # Listening on a free port
+        port = server.server.sockets[0].getsockname()[1]  # Reading the port chosen
+        context.search_index.build()  # Indexing before the clock starts, as a long-running server would have
+        try:
+            await load_test(DEFAULT_HOST, port, clients, seconds, write_ratio)  # Running the clients
+        finally:
+            await server.close()  # Stopping the server
+
+
+def main():  # Function for running the load test
+    parser = argparse.ArgumentParser(description="Measure the throughput and latency of the HTTP/JSON server.")  # Creating the argument parser
+    parser.add_argument("--clients", type=int, default=50, help="concurrent connections")  # Number of clients
+    parser.add_argument("--seconds", type=float, default=10, help="length of the run")  # Length of the run
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="share of requests that change records")  # Share of writes
+    parser.add_argument("--records", type=int, default=COUNTS["events"], help="events and guests in the synthetic stores")  # Size of the large stores
+    parser.add_argument("--host", default=None, help="test a running server instead, whose stores were written by synthetic_data")  # Running server
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port of the running server")  # Running server port
+    args = parser.parse_args()  # Parsing the arguments
+
+    COUNTS.update(events=args.records, guests=args.records, clients=max(1, args.records // 10))  # Sizing the stores the requests pick from
+    if args.host is not None:  # Checking for a running server
+        asyncio.run(load_test(args.host, args.port, args.clients, args.seconds, args.write_ratio))  # Testing it
+        return
+    with tempfile.TemporaryDirectory() as directory:  # Creating a scratch directory for the stores
+        previous = os.getcwd()  # Remembering the working directory
+        os.chdir(directory)  # The managers use paths relative to the working directory
+        try:
+            write_stores(COUNTS)  # Writing the synthetic stores
+            asyncio.run(local_test(args.clients, args.seconds, args.write_ratio))  # Serving them and running the clients
+        finally:
+            os.chdir(previous)  # Restoring the working directory
+
+
+if __name__ == "__main__":
+    main()  # Running the load test
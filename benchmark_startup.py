@@ -0,0 +1,69 @@
+import argparse  # Importing the argparse module for command-line options
+import os  # Importing the os module for operating system related functionalities
+import tempfile  # Importing the tempfile module for a scratch data directory
+import time  # Importing the time module for timing startups
+
+from event_management import EventManagement  # Importing the event manager
+from guest_management import GuestManagement  # Importing the guest manager
+from supplier_management import SupplierManagement  # Importing the supplier manager
+from venue_management import VenueManagement  # Importing the venue manager
+from client_management import ClientManagement  # Importing the client manager
+from employee_management import EmployeeManagement  # Importing the employee manager
+from synthetic_data import write_stores  # Importing the synthetic store writer
+
+MANAGERS = {  # Mapping of store labels to their manager class
+    "clients": ClientManagement,
+    "employees": EmployeeManagement,
+    "events": EventManagement,
+    "guests": GuestManagement,
+    "suppliers": SupplierManagement,
+    "venues": VenueManagement,
+}
+
+
+def start(touched):  # Function for constructing all six managers and touching some of their stores
+    started = time.perf_counter()  # Recording the start time
+    managers = {label: manager_class() for label, manager_class in MANAGERS.items()}  # Constructing every manager, as ManagementApp does
+    for label in touched:  # Iterating over the stores the operator uses
+        len(getattr(managers[label], label))  # Accessing the store, which loads it
+    return time.perf_counter() - started  # Returning the elapsed time
+
+
+def best_of(repeat, touched):  # Function for taking the fastest of several startups
+    return min(start(touched) for _ in range(repeat))  # Returning the best time
+
+
+def main():  # Function for running the startup benchmark
+    parser = argparse.ArgumentParser(description="Compare eager and lazy manager startup on synthetic stores.")  # Creating the argument parser
+    parser.add_argument("--records", type=int, default=100000, help="records per large store (events, guests)")  # Size of the large stores
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per scenario")  # Runs per scenario
+    args = parser.parse_args()  # Parsing the arguments
+
+    counts = {  # Store sizes: guests and events large, the rest smaller as in real use
+        "events": args.records,
+        "guests": args.records,
+        "clients": args.records // 10,
+        "employees": args.records // 100,
+        "suppliers": args.records // 100,
+        "venues": args.records // 1000,
+    }
+    with tempfile.TemporaryDirectory() as directory:  # Creating a scratch directory for the stores
+        previous = os.getcwd()  # Remembering the working directory
+        os.chdir(directory)  # The managers use paths relative to the working directory
+        try:
+            write_stores(counts)  # Writing the synthetic stores
+            scenarios = [  # Scenarios to time: name and the stores touched
+                ("eager (every store loaded)", list(MANAGERS)),
+                ("lazy, Events tab only", ["events"]),
+                ("lazy, Venues tab only", ["venues"]),
+                ("lazy, nothing opened", []),
+            ]
+            print(f"Store sizes: {counts}")  # Reporting the store sizes
+            for name, touched in scenarios:  # Iterating over the scenarios
+                print(f"{name:30s} {best_of(args.repeat, touched) * 1000:10.1f} ms")  # Reporting the best startup time
+        finally:
+            os.chdir(previous)  # Restoring the working directory
+
+
+if __name__ == "__main__":
+    main()  # Running the benchmark
@@ -0,0 +1,200 @@
+import argparse  # Importing the argparse module for command-line options
+import gc  # Importing the gc module for collecting garbage between measurements
+import json  # Importing the json module for machine-readable results
+import os  # Importing the os module for operating system related functionalities
+import platform  # Importing the platform module for describing the machine
+import random  # Importing the random module for picking records
+import subprocess  # Importing the subprocess module for reading the current commit
+import sys  # Importing the sys module for the exit status
+import tempfile  # Importing the tempfile module for scratch data directories
+import time  # Importing the time module for timing operations
+from collections import deque  # Importing deque for draining an iterator without keeping its items
+
+from client_management import ClientManagement  # Importing the client manager
+from employee_management import EmployeeManagement  # Importing the employee manager
+from event_management import EventManagement  # Importing the event manager
+from guest_management import GuestManagement  # Importing the guest manager
+from supplier_management import SupplierManagement  # Importing the supplier manager
+from venue_management import VenueManagement  # Importing the venue manager
+from synthetic_data import GENERATORS, make_records  # Importing the synthetic record generators
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)  # Records per store benchmarked unless told otherwise
+SAMPLES = 200  # Single-record operations timed per measurement
+ENTITIES = {  # Per store: manager class, constructor options and an attribute modify changes
+    "events": (EventManagement, {"conflict_policy": "report"}, "invoice"),  # Synthetic events share venues, so double bookings are only reported
+    "guests": (GuestManagement, {}, "contact_details"),
+    "suppliers": (SupplierManagement, {}, "contact_details"),
+    "venues": (VenueManagement, {}, "contact"),
+    "clients": (ClientManagement, {}, "contact_details"),
+    "employees": (EmployeeManagement, {}, "job_title"),
+}
+OPERATIONS = ("load", "save", "get", "add", "modify", "delete", "bulk_add", "bulk_upsert", "report", "rows")  # Operations timed for every store
+NOISE_FLOOR = 0.001  # Seconds below which a slower measurement isn't reported as a regression
+
+
+def open_manager(label, backend):  # Function for creating a store's manager
+    manager_class, options, _ = ENTITIES[label]  # Looking up the manager
+    return manager_class(backend=backend, **options)  # Creating it
+
+
+def timed(action, count=1):  # Function for timing an action
+    """
+    Returns:
+        dict: Total seconds, the number of operations and seconds per operation.
+    """
+    gc.collect()  # Collecting earlier garbage so it isn't charged to this action
+    started = time.perf_counter()  # Recording the start time
+    action()  # Running the action
+    seconds = time.perf_counter() - started  # Measuring the elapsed time
+    return {"seconds": seconds, "count": count, "per_op": seconds / count}  # Returning the measurement
+
+
+def benchmark_store(label, backend, size, rng, samples=SAMPLES):  # Function for timing every operation on one store size
+    """
+    Write a synthetic store in the working directory and time each operation on it.
+    Returns:
+        dict: Measurement by operation name.
+    """
+    _, _, field = ENTITIES[label]  # Attribute changed by modify
+    _, key_field, generator = GENERATORS[label]  # Key attribute and record generator
+    singular = label[:-1]  # Record name used in the manager's method names
+    writer = open_manager(label, backend)  # Manager writing the synthetic store
+    writer.storage.save(make_records(label, size))  # Writing it
+    writer.storage.close()  # Releasing the storage
+    del writer  # Dropping the generated records
+
+    results = {}  # Measurements by operation
+    manager = open_manager(label, backend)  # Fresh manager, as a starting program has
+    results["load"] = timed(lambda: len(getattr(manager, label)))  # Loading the store, with the indexes it builds
+    records = getattr(manager, label)  # The loaded records
+    keys = rng.sample(list(records), min(samples, size))  # Existing records picked at random
+    results["save"] = timed(getattr(manager, f"save_{label}"))  # Writing every record
+    get = getattr(manager, f"get_{singular}")  # Single-record read
+    results["get"] = timed(lambda: [get(key) for key in keys], len(keys))
+    added = [generator(size + i) for i in range(samples)]  # New records no key of the store uses
+    add = getattr(manager, f"add_{singular}")  # Single-record insert
+    results["add"] = timed(lambda: [add(record) for record in added], len(added))
+    modify = getattr(manager, f"modify_{singular}")  # Single-record update
+    results["modify"] = timed(lambda: [modify(key, **{field: f"changed {n}"}) for n, key in enumerate(keys)], len(keys))
+    delete = getattr(manager, f"delete_{singular}")  # Single-record delete
+    results["delete"] = timed(lambda: [delete(getattr(record, key_field)) for record in added], len(added))
+    batch = [generator(size + samples + i) for i in range(max(samples, size // 10))]  # New records added together, a tenth of the store
+    results["bulk_add"] = timed(lambda: getattr(manager, f"bulk_add_{label}")(batch), len(batch))
+    results["bulk_upsert"] = timed(lambda: getattr(manager, f"bulk_upsert_{label}")(batch), len(batch))
+    results["report"] = timed(getattr(manager, f"display_all_{label}"), len(records))  # Building the whole text report
+    results["rows"] = timed(lambda: deque(getattr(manager, f"iter_{singular}_rows")(), maxlen=0), len(records))  # Streaming every row, as the tables do
+    manager.storage.close()  # Writing anything queued and releasing the storage
+    return results  # Returning the measurements
+
+
+def run_suite(labels, backends, sizes, repeat, seed, samples=SAMPLES, progress=None):  # Function for benchmarking every store, backend and size
+    """
+    Each combination is measured repeat times on a fresh store, keeping the fastest run.
+    Returns:
+        list: One result dictionary per store, backend, size and operation.
+    """
+    results = []  # Collected results
+    for backend in backends:  # Iterating over the backends
+        for label in labels:  # Iterating over the stores
+            for size in sizes:  # Iterating over the store sizes
+                best = {}  # Fastest measurement by operation
+                for run in range(repeat):  # Repeating the measurement
+                    with tempfile.TemporaryDirectory() as directory:  # Creating a scratch directory for the store
+                        previous = os.getcwd()  # Remembering the working directory
+                        os.chdir(directory)  # The managers use paths relative to the working directory
+                        try:
+                            measured = benchmark_store(label, backend, size, random.Random(seed + run), samples)  # Timing the operations
+                        finally:
+                            os.chdir(previous)  # Restoring the working directory
+                    for operation, measurement in measured.items():  # Iterating over the measurements
+                        if operation not in best or measurement["seconds"] < best[operation]["seconds"]:  # Checking if this run was faster
+                            best[operation] = measurement  # Keeping it
+                for operation in OPERATIONS:  # Iterating over the operations in a fixed order
+                    result = {"entity": label, "backend": backend, "size": size, "operation": operation, **best[operation]}  # Describing the result
+                    results.append(result)  # Recording it
+                    if progress is not None:  # Checking if someone follows the progress
+                        progress(result)  # Passing the result on
+    return results  # Returning the results
+
+
+def environment():  # Function for describing where the suite ran
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None  # Reading the current commit
+    except OSError:  # Handling a machine without git
+        commit = None
+    return {  # Returning the description
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def result_key(result):  # Function for identifying a result across runs
+    return result["entity"], result["backend"], result["size"], result["operation"]  # Returning the store, backend, size and operation
+
+
+def regressions(baseline, results, threshold):  # Function for finding operations that got slower than a baseline run
+    """
+    Returns:
+        list: (result, baseline seconds per operation, slowdown) for every operation more
+        than threshold slower, ignoring differences under the noise floor.
+    """
+    before = {result_key(result): result for result in baseline["results"]}  # Baseline results by key
+    slower = []  # Regressions found
+    for result in results:  # Iterating over the new results
+        old = before.get(result_key(result))  # Finding the same measurement in the baseline
+        if old is None or old["per_op"] <= 0:  # Checking if it was measured before
+            continue
+        slowdown = result["per_op"] / old["per_op"] - 1  # Relative slowdown
+        if slowdown > threshold and result["seconds"] - old["per_op"] * result["count"] > NOISE_FLOOR:  # Checking if it is slower beyond noise
+            slower.append((result, old["per_op"], slowdown))  # Recording the regression
+    return slower  # Returning the regressions
+
+
+def print_result(result):  # Function for printing one result as a table row
+    print(f"{result['backend']:8s} {result['entity']:10s} {result['size']:>9d} {result['operation']:12s} "
+          f"{result['seconds'] * 1000:12.2f} ms {result['per_op'] * 1e6:12.2f} us/op", flush=True)
+
+
+def main():  # Function for running the benchmark suite
+    parser = argparse.ArgumentParser(description="Time load, save, CRUD, bulk and report operations of every store on synthetic data.")  # Creating the argument parser
+    parser.add_argument("--entities", default=",".join(ENTITIES), help="comma-separated stores to benchmark")  # Stores
+    parser.add_argument("--backends", default="pickle", help="comma-separated storage backends (pickle, journal, sqlite, columnar)")  # Backends
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated records per store")  # Store sizes
+    parser.add_argument("--repeat", type=int, default=1, help="runs per measurement, keeping the fastest")  # Repetitions
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="single-record operations timed per measurement")  # Single-operation samples
+    parser.add_argument("--seed", type=int, default=0, help="seed picking the records operated on")  # Random seed
+    parser.add_argument("--output", help="write the results as JSON to this file (- for standard output)")  # JSON output
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")  # Baseline results
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown reported as a regression, 0.25 meaning 25%%")  # Regression threshold
+    args = parser.parse_args()  # Parsing the arguments
+
+    labels = args.entities.split(",")  # Stores to benchmark
+    for label in labels:  # Iterating over the stores
+        if label not in ENTITIES:  # Checking if the store exists
+            parser.error(f"unknown entity: {label}")  # Refusing unknown stores
+    sizes = [int(size) for size in args.sizes.split(",")]  # Store sizes
+    quiet = args.output == "-"  # Keeping standard output for the JSON
+    report = {"environment": environment(), "samples": args.samples, "repeat": args.repeat, "seed": args.seed}  # Describing the run
+    report["results"] = run_suite(labels, args.backends.split(","), sizes, args.repeat, args.seed, args.samples, None if quiet else print_result)  # Running the suite
+    if args.output == "-":  # Checking if the JSON goes to standard output
+        json.dump(report, sys.stdout, indent=1)  # Writing it
+        print()
+    elif args.output:  # Checking if the JSON goes to a file
+        with open(args.output, "w", encoding="utf-8") as file:  # Opening the file
+            json.dump(report, file, indent=1)  # Writing the results
+    if args.baseline:  # Checking if the results should be compared with an earlier run
+        with open(args.baseline, encoding="utf-8") as file:  # Opening the baseline
+            slower = regressions(json.load(file), report["results"], args.threshold)  # Finding the regressions
+        for result, before, slowdown in slower:  # Iterating over the regressions
+            print(f"Regression: {result['backend']} {result['entity']} {result['size']} {result['operation']}: "
+                  f"{before * 1e6:.2f} -> {result['per_op'] * 1e6:.2f} us/op (+{slowdown:.0%})", file=sys.stderr)
+        if slower:  # Checking if anything got slower
+            sys.exit(1)  # Failing the run, so scripts and CI notice
+
+
+if __name__ == "__main__":
+    main()  # Running the benchmark suite
@@ -0,0 +1,124 @@
+import copy  # Importing the copy module for describing records before and after a change
+
+from records import VERSION_FIELD, record_version  # Importing the record version stamp
+
+
+class ConflictError(ValueError):  # Definition of the ConflictError class
+    # Raised when a record was changed by another process since this one last read it.
+    def __init__(self, message, keys=()):  # Constructor method for naming the conflicting records
+        super().__init__(message)  # Storing the message
+        self.keys = list(keys)  # Keys of the records changed elsewhere
+
+
+class SavedChanges(dict):  # Definition of the SavedChanges class
+    # Changes another process already wrote into the loaded records, as stores reading every
+    # lookup from a shared database hold them: new record, or None once deleted, by key, with
+    # the record each one replaced, or None for an added one, by key in old.
+    def __init__(self, changes=(), old=()):  # Constructor method for pairing the new records with the replaced ones
+        super().__init__(changes)  # Storing the new records
+        self.old = dict(old)  # Storing the replaced records
+
+
+class Observer:  # Definition of the Observer class
+    # Base for objects watching a manager's records. Each change is a (key, old, new)
+    # tuple: old is None for an added record and new is None for a deleted one.
+    def before_change(self, label, changes):  # Method called before changes are stored; raising refuses them
+        pass
+
+    def after_change(self, label, changes):  # Method called once changes are stored
+        pass
+
+
+class Observable:  # Definition of the Observable class
+    # Mixin for the manager classes, which set self.observers to a list in __init__
+    # and call notify_before/notify_after around every add, modify and delete.
+    label = None  # Name of the records, such as "events", passed to observers
+
+    def add_observer(self, observer):  # Method for registering an observer
+        self.observers.append(observer)  # Adding the observer
+
+    def remove_observer(self, observer):  # Method for unregistering an observer
+        self.observers.remove(observer)  # Removing the observer
+
+    def notify_before(self, changes):  # Method for stamping changes and letting observers check them before they are stored
+        for key, old, new in changes:  # Iterating over the changes
+            if new is not None:  # Checking for a stored record
+                setattr(new, VERSION_FIELD, record_version(old) + 1)  # Stamping it one version past the record it replaces
+        for observer in list(self.observers):  # Iterating over a snapshot of the observers
+            observer.before_change(self.label, changes)  # Passing the changes, which the observer may refuse
+
+    def notify_after(self, changes):  # Method for telling observers about stored changes
+        for observer in list(self.observers):  # Iterating over a snapshot of the observers
+            observer.after_change(self.label, changes)  # Passing the stored changes
+
+    def persist_changes(self, records, changes, undo=None):  # Method for persisting stored changes and telling observers about the saved ones
+        """
+        Save the changed records through self.storage, then call notify_after. Records the
+        storage refuses because another process changed them first are put back as they
+        were, so memory and observers keep the last saved value until a refresh reads theirs.
+        Args:
+            records: The loaded records, already holding the changes.
+            changes: The stored changes as (key, old, new) tuples.
+            undo: Function given the refused changes reversed, for the manager's own indexes.
+        Raises:
+            ConflictError: Once the refused records are restored and the rest announced.
+        """
+        try:
+            self.storage.save_changes(records, [key for key, _, _ in changes])  # Persisting the changed keys
+        except ConflictError as error:  # Handling records another process changed first
+            refused = set(error.keys)  # Keys that were not saved
+            reverted = [(key, new, old) for key, old, new in changes if key in refused]  # Changes taking the refused records back
+            for key, _, old in reverted:  # Iterating over the refused records
+                if old is not None:  # Checking if a record was replaced or deleted
+                    records[key] = old  # Restoring it
+                elif key in records:  # Checking if a record was added
+                    del records[key]  # Removing it
+            if undo is not None and reverted:  # Checking if the manager indexes its records
+                undo(reverted)  # Restoring its indexes
+            saved = [change for change in changes if change[0] not in refused]  # Changes that were saved
+            if saved:  # Checking if part of a batch was saved
+                self.notify_after(saved)  # Telling observers about it
+            raise
+        self.notify_after(changes)  # Telling observers about the changes
+
+
+def modified_copy(record, updates):  # Function for previewing a record with some attributes changed
+    changed = copy.copy(record)  # Copying the record
+    for key, value in updates.items():  # Iterating over the updates
+        setattr(changed, key, value)  # Applying each update to the copy
+    return changed  # Returning the preview
+
+
+def check_version(label, key, record, expected_version):  # Function for refusing a change based on an outdated copy of a record
+    """
+    Raise ConflictError if the caller expects a version of the record other than the
+    stored one, meaning someone else changed it since the caller read it.
+    """
+    if expected_version is not None and record_version(record) != expected_version:  # Checking if the caller's copy is outdated
+        raise ConflictError(  # Raising an error naming both versions
+            f"{label[:-1].capitalize()} {key} was changed by someone else "
+            f"(version {record_version(record)}, expected {expected_version}).", [key])
+
+
+def apply_external(records, external):  # Function for applying changes saved by another process to loaded records
+    """
+    Args:
+        records: The loaded records, updated in place.
+        external: New record, or None once deleted, by key; SavedChanges are already in
+            the records and only described.
+    Returns:
+        list: The applied changes as (key, old, new) tuples, for notify_after.
+    """
+    if isinstance(external, SavedChanges):  # Checking if the records already hold the changes
+        return [(key, external.old.get(key), new) for key, new in external.items() if new is not None or external.old.get(key) is not None]  # Describing them, leaving out records added and deleted since the last read
+    changes = []  # Applied changes
+    for key, new in external.items():  # Iterating over the external changes
+        old = records.get(key)  # Getting the loaded record
+        if new is None:  # Checking for a deletion
+            if old is None:  # Checking if the record is already gone
+                continue
+            del records[key]  # Removing the record
+        else:
+            records[key] = new  # Storing the newer record
+        changes.append((key, old, new))  # Recording the change
+    return changes  # Returning the applied changes
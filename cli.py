@@ -0,0 +1,245 @@
+import argparse  # Importing the argparse module for the subcommands
+import itertools  # Importing the itertools module for cutting pages out of listings
+import json  # Importing the json module for JSON output of single records
+import sys  # Importing the sys module for the output streams and exit status
+
+from exporter import STORES, WRITERS, cell_text, export_file, export_rows, iter_chunks, open_management, parse_filters, store_fields  # Importing the streaming exporter and the store table
+from storage import BACKEND_HELP, parse_backend  # Importing the --backend option helpers, which every manager imports anyway
+
+# The command-line counterpart of "main system.py", for scripts, cron jobs and machines
+# without a display. tkinter is never imported, and read commands import only the manager
+# of the store they read; commands that change records go through a DataContext, with the
+# same reference checks as the GUI.
+
+FORMATS = ("text", "csv", "jsonl")  # Output formats of the listing commands
+ON_DELETE = "restrict"  # Reference policy of changes, as in the GUI
+REVENUE_GROUPINGS = ("client", "venue", "month", "supplier")  # Groupings of the revenue report, as in analytics, which parsing doesn't import
+REPORT_OPTIONS = {"group": "revenue", "by_department": "payroll", "manager": "org"}  # Report each report option applies to
+
+
+def open_context(backend):  # Function for opening every store, for commands that change records or read across stores
+    from context import DataContext  # Importing the data context only for those commands
+    return DataContext(backend=backend, on_delete=ON_DELETE)  # Opening the stores with the GUI's reference checks
+
+
+def write_rows(rows, fields, output_format, stream):  # Function for writing tuples of attribute values
+    """
+    Write the rows a chunk at a time, so a large store never has to fit in memory.
+    "text" writes tab-separated lines; "csv" and "jsonl" use the exporter's writers.
+    """
+    if output_format == "text":  # Checking for plain text
+        stream.write("\t".join(fields) + "\n")  # Writing the header
+        stream.writelines("\t".join(cell_text(value) for value in row) + "\n" for row in rows)  # Writing each row
+        return
+    writer = WRITERS[output_format](stream, tuple(fields))  # Starting the output
+    for chunk in iter_chunks(rows):  # Iterating over chunks of rows
+        writer.write(chunk)  # Writing each
+    writer.finish()  # Ending the output
+
+
+def parse_assignments(pairs):  # Function for reading field=value arguments
+    """
+    Returns:
+        dict: Values by attribute name.
+    """
+    values = {}  # Values by attribute
+    for pair in pairs:  # Iterating over the arguments
+        field, separator, value = pair.partition("=")  # Splitting the attribute from its value
+        if not separator or not field:  # Checking the argument has both parts
+            raise ValueError(f"Expected field=value, got: {pair}")
+        values[field.strip()] = value  # Storing the value as typed
+    return values  # Returning the values
+
+
+def command_list(args):  # Function for listing a store's records
+    management = open_management(args.store, args.backend)  # Opening only the store listed
+    fields = tuple(args.fields.split(",")) if args.fields else store_fields(args.store)  # Attributes to list
+    rows = export_rows(management, args.store, fields, parse_filters(args.where))  # Streaming the matching rows, straight from the columns of a columnar store
+    if args.offset or args.limit is not None:  # Checking for a page
+        rows = itertools.islice(rows, args.offset, None if args.limit is None else args.offset + args.limit)  # Cutting it out
+    write_rows(rows, fields, args.format, sys.stdout)  # Writing the rows
+
+
+def command_get(args):  # Function for showing one record
+    management = open_management(args.store, args.backend)  # Opening only the store read
+    record = getattr(management, f"get_{args.store[:-1]}")(args.key)  # Reading the record, which raises ValueError if it is missing
+    state = record.__getstate__()  # Reading every attribute, version included
+    if args.format == "jsonl":  # Checking for JSON
+        print(json.dumps(state, default=str))  # Writing the record as one JSON object
+    else:
+        for field, value in state.items():  # Iterating over the attributes
+            print(f"{field}: {cell_text(value)}")  # Writing one attribute per line
+
+
+def command_add(args):  # Function for adding one record
+    from importer import build_record  # Importing the record builder shared with the file importer
+    with open_context(args.backend) as context:  # Opening the stores
+        record = build_record(args.store, parse_assignments(args.values))  # Building the record, converting typed attributes
+        getattr(context.management(args.store), f"add_{args.store[:-1]}")(record)  # Adding it
+    print(f"Added {args.store[:-1]} {getattr(record, args.store[:-1] + '_id')}.")  # Reporting the addition
+
+
+def command_modify(args):  # Function for changing attributes of one record
+    from importer import ENTITIES  # Importing the converters of typed attributes
+    converters = ENTITIES[args.store][4]  # Converters of the store's typed attributes
+    updates = {field: converters[field](value) if field in converters else value for field, value in parse_assignments(args.values).items()}  # Converting the new values
+    with open_context(args.backend) as context:  # Opening the stores
+        management = context.management(args.store)  # Finding the manager
+        if args.store == "employees":  # Checking for employees, whose modify method can't clear a manager
+            management.update_employee(args.key, updates, args.if_version)  # Storing the values as given
+        else:
+            getattr(management, f"modify_{args.store[:-1]}")(args.key, expected_version=args.if_version, **updates)  # Storing the values
+    print(f"Modified {args.store[:-1]} {args.key}.")  # Reporting the change
+
+
+def command_delete(args):  # Function for deleting one record
+    with open_context(args.backend) as context:  # Opening the stores
+        getattr(context.management(args.store), f"delete_{args.store[:-1]}")(args.key, expected_version=args.if_version)  # Deleting it
+    print(f"Deleted {args.store[:-1]} {args.key}.")  # Reporting the deletion
+
+
+def command_import(args):  # Function for importing a CSV or JSON file
+    from importer import import_file  # Importing the chunked importer
+    with open_context(args.backend) as context:  # Opening the stores
+        total = import_file(args.store, args.path, context.management(args.store), args.upsert)  # Importing the file
+    print(f"Imported {total} {args.store}.")  # Reporting the result
+
+
+def command_export(args):  # Function for writing a store to a CSV, JSON Lines or column file
+    management = open_management(args.store, args.backend)  # Opening only the store exported
+    fields = tuple(args.fields.split(",")) if args.fields else store_fields(args.store)  # Attributes to export
+    filters = parse_filters(args.where)  # Conditions the exported records meet
+    if args.path == "-":  # Checking for standard output
+        if args.format == "columns":  # Checking for the binary format
+            raise ValueError("Column files can't be written to standard output.")
+        write_rows(export_rows(management, args.store, fields, filters), fields, args.format or "csv", sys.stdout)  # Streaming the rows out
+        return
+    count = export_file(args.store, args.path, management, fields, filters, args.format)  # Writing the file, which replaces any earlier one once complete
+    print(f"Exported {count} {args.store}.", file=sys.stderr)  # Reporting the result without mixing it into the data
+
+
+def command_search(args):  # Function for searching every store
+    from search import describe  # Importing the one-line summary of search hits
+    with open_context(args.backend) as context:  # Opening the stores
+        labels = args.stores.split(",") if args.stores else None  # Stores to search
+        for label, key, score in context.search_index.search(args.query, args.limit, labels):  # Iterating over the ranked hits
+            print(f"{score:.2f}\t{describe(label, context.search_index.record(label, key))}")  # Writing each hit
+
+
+def command_report(args):  # Function for printing a report
+    for option, report in REPORT_OPTIONS.items():  # Iterating over the options of one report each
+        if getattr(args, option) not in (None, False) and args.report != report:  # Checking for an option the chosen report doesn't use
+            raise ValueError(f"--{option.replace('_', '-')} only applies to the {report} report.")
+    if args.report == "org":  # Checking for a manager's reports, which only need the employees
+        if args.manager is None:  # Checking the manager is named
+            raise ValueError("Name the manager with --manager.")
+        management = open_management("employees", args.backend)  # Opening only the employees
+        print(f"{management.headcount_under(args.manager)} employees, basic salaries {management.salary_under(args.manager):.2f}", file=sys.stderr)  # Reporting the subtree totals
+        rows = ((employee.employee_id, employee.name, employee.manager_id, employee.basic_salary) for employee in management.reports_under(args.manager))
+        write_rows(rows, ("employee_id", "name", "manager_id", "basic_salary"), args.format, sys.stdout)
+        return
+    if args.report == "conflicts":  # Checking for double bookings, which only need the events
+        rows = open_management("events", args.backend).all_venue_conflicts()  # Sweeping each venue's bookings
+        write_rows(rows, ("venue", "event_id", "other_event_id"), args.format, sys.stdout)
+        return
+    with open_context(args.backend) as context:  # Opening the stores
+        if args.report == "revenue":  # Checking for invoiced revenue
+            analytics = context.analytics  # Running totals
+            groups = analytics.revenue_by(args.group) if args.group else {"all events": analytics.revenue()}  # Totals to show
+            rows = ((group, totals.count, f"{totals.total:.2f}") for group, totals in sorted(groups.items(), key=lambda item: str(item[0])))
+            write_rows(rows, (args.group or "revenue", "events", "total"), args.format, sys.stdout)
+        elif args.report == "payroll":  # Checking for payroll
+            analytics = context.analytics  # Running totals
+            groups = analytics.payroll_by_department() if args.by_department else {"all employees": analytics.payroll()}  # Totals to show
+            rows = ((group, totals.count, f"{totals.total:.2f}") for group, totals in sorted(groups.items(), key=lambda item: str(item[0])))
+            write_rows(rows, ("department" if args.by_department else "payroll", "employees", "total"), args.format, sys.stdout)
+        elif args.report == "budgets":  # Checking for budget utilization
+            analytics = context.analytics  # Running totals
+            rows = ((client_id, budget, f"{analytics.revenue('client', client_id).total:.2f}", cell_text(analytics.budget_utilization(client_id)))
+                    for client_id, budget in context.client_management.iter_client_rows(("client_id", "budget")))
+            write_rows(rows, ("client_id", "budget", "invoiced", "utilization"), args.format, sys.stdout)
+        elif args.report == "references":  # Checking for dangling references
+            write_rows(context.integrity.audit(), ("store", "key", "field", "unknown_reference"), args.format, sys.stdout)
+
+
+def build_parser():  # Function for describing the command line
+    parser = argparse.ArgumentParser(description="Manage the events company records without the GUI.")  # Creating the argument parser
+    parser.add_argument("--backend", type=parse_backend, default=None, help=BACKEND_HELP)  # Storage backend, optionally per store
+    commands = parser.add_subparsers(dest="command", required=True)  # Creating the subcommands
+    store = {"choices": sorted(STORES), "help": "kind of records"}  # Store argument shared by the subcommands
+
+    command = commands.add_parser("list", help="list a store's records")
+    command.add_argument("store", **store)
+    command.add_argument("--fields", help="comma-separated attributes to list, all if omitted")
+    command.add_argument("--where", action="append", default=[], help="condition a record must meet, such as department=Ops, name~smith or budget>=5000; repeatable")
+    command.add_argument("--offset", type=int, default=0, help="records to skip")
+    command.add_argument("--limit", type=int, default=None, help="most records to list")
+    command.add_argument("--format", choices=FORMATS, default="text", help="output format")
+    command.set_defaults(run=command_list)
+
+    command = commands.add_parser("get", help="show one record")
+    command.add_argument("store", **store)
+    command.add_argument("key", help="record ID")
+    command.add_argument("--format", choices=("text", "jsonl"), default="text", help="output format")
+    command.set_defaults(run=command_get)
+
+    command = commands.add_parser("add", help="add a record from field=value arguments")
+    command.add_argument("store", **store)
+    command.add_argument("values", nargs="+", help="field=value for each attribute")
+    command.set_defaults(run=command_add)
+
+    command = commands.add_parser("modify", help="change attributes of a record")
+    command.add_argument("store", **store)
+    command.add_argument("key", help="record ID")
+    command.add_argument("values", nargs="+", help="field=value for each changed attribute")
+    command.add_argument("--if-version", type=int, default=None, help="only change the record if it is still at this version")
+    command.set_defaults(run=command_modify)
+
+    command = commands.add_parser("delete", help="delete a record")
+    command.add_argument("store", **store)
+    command.add_argument("key", help="record ID")
+    command.add_argument("--if-version", type=int, default=None, help="only delete the record if it is still at this version")
+    command.set_defaults(run=command_delete)
+
+    command = commands.add_parser("import", help="import a CSV, JSON or column file")
+    command.add_argument("store", **store)
+    command.add_argument("path", help="CSV (.csv), JSON Lines (.jsonl), JSON (.json) or column (.cols) file")
+    command.add_argument("--upsert", action="store_true", help="replace records whose ID already exists")
+    command.set_defaults(run=command_import)
+
+    command = commands.add_parser("export", help="write a store to a CSV, JSON Lines or column file")
+    command.add_argument("store", **store)
+    command.add_argument("path", help="CSV (.csv), JSON Lines (.jsonl) or column (.cols) file to write, or - for standard output")
+    command.add_argument("--fields", help="comma-separated attributes to export, all if omitted")
+    command.add_argument("--where", action="append", default=[], help="condition a record must meet; repeatable")
+    command.add_argument("--format", choices=sorted(WRITERS), default=None, help="file format, chosen from the extension if omitted")
+    command.set_defaults(run=command_export)
+
+    command = commands.add_parser("search", help="search every store")
+    command.add_argument("query", help="words to find")
+    command.add_argument("--stores", help="comma-separated stores to search, all if omitted")
+    command.add_argument("--limit", type=int, default=20, help="most hits to show")
+    command.set_defaults(run=command_search)
+
+    command = commands.add_parser("report", help="print totals, double bookings, dangling references or an org chart")
+    command.add_argument("report", choices=("revenue", "payroll", "budgets", "conflicts", "references", "org"), help="report to print")
+    command.add_argument("--group", choices=REVENUE_GROUPINGS, default=None, help="revenue report: total the revenue per client, venue, month or supplier")
+    command.add_argument("--by-department", action="store_true", help="payroll report: total the payroll per department")
+    command.add_argument("--manager", default=None, help="org report: ID of the manager whose reports are listed")
+    command.add_argument("--format", choices=FORMATS, default="text", help="output format")
+    command.set_defaults(run=command_report)
+    return parser  # Returning the parser
+
+
+def main(argv=None):  # Function for running one command
+    args = build_parser().parse_args(argv)  # Parsing the arguments
+    try:
+        args.run(args)  # Running the command
+    except (ValueError, KeyError) as e:  # Handling refused changes and unknown records
+        print(f"Error: {e}", file=sys.stderr)  # Reporting the error
+        return 1  # Failing the command
+    return 0  # Succeeding
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # Running the command and passing its status on
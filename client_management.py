@@ -1,9 +1,12 @@
-import os  # Importing the os module for operating system related functionalities
-import pickle  # Importing the pickle module for object serialization
+from changes import Observable, apply_external, check_version, modified_copy  # Importing the change notification mixin and version checks
+from records import Record, record_rows  # Importing the slot-based record base class and row streaming
+from storage import open_storage  # Importing the storage factory used to persist records
 
 CLIENT_FILE_PATH = "clients.txt"  # File path constant for storing client data
+CLIENT_FIELDS = ("client_id", "name", "address", "contact_details", "budget")  # Client attributes in constructor order, used for row output
 
-class Client:  # Definition of the Client class
+class Client(Record):  # Definition of the Client class
+    __slots__ = CLIENT_FIELDS  # Fixed attributes, so instances carry no __dict__
     def __init__(self, client_id, name, address, contact_details, budget):  # Constructor method for initializing client attributes
         self.client_id = client_id  # Assigning client ID
         self.name = name  # Assigning client name
@@ -11,46 +14,111 @@ class Client:  # Definition of the Client class
         self.contact_details = contact_details  # Assigning client contact details
         self.budget = budget  # Assigning client budget
 
-class ClientManagement:  # Definition of the ClientManagement class
-    def __init__(self):  # Constructor method for initializing client management instance
-        self.clients = self.load_clients()  # Loading clients data when an instance is created
+class ClientManagement(Observable):  # Definition of the ClientManagement class
+    label = "clients"  # Name passed to observers
+
+    def __init__(self, backend=None):  # Constructor method for initializing client management instance
+        self.storage = open_storage(backend, CLIENT_FILE_PATH, "clients", Client, "client_id")  # Choosing how clients data is persisted
+        self._clients = None  # Clients data, loaded on first access
+        self.observers = []  # Objects notified before and after each change
+
+    @property
+    def clients(self):  # Property loading clients data the first time it is used
+        if self._clients is None:  # Checking if the clients are not loaded yet
+            self._clients = self.load_clients()  # Loading clients data from the storage
+        return self._clients  # Returning the loaded clients
+
+    @clients.setter
+    def clients(self, value):  # Setter replacing the loaded clients data
+        self._clients = value  # Storing the new clients dictionary
 
     def load_clients(self):  # Method for loading clients data from file
-        if os.path.exists(CLIENT_FILE_PATH):  # Checking if the file exists
-            with open(CLIENT_FILE_PATH, "rb") as file:  # Opening the file in binary read mode
-                try:
-                    return pickle.load(file)  # Loading data from the file using pickle
-                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
-                    print(f"Error loading clients data: {e}")  # Printing error message
-                    return {}  # Returning an empty dictionary if error occurs
-        return {}  # Returning an empty dictionary if file doesn't exist
+        return self.storage.load()  # Loading data through the configured storage
 
     def save_clients(self):  # Method for saving clients data to file
-        with open(CLIENT_FILE_PATH, "wb") as file:  # Opening the file in binary write mode
-            pickle.dump(self.clients, file)  # Saving data to the file using pickle
+        self.storage.save(self.clients)  # Saving all clients data through the configured storage
+
+    def refresh_clients(self, external=None):  # Method for picking up clients saved by other processes sharing the files
+        """
+        Apply the clients other processes added, changed or deleted since the storage
+        last read or wrote them, and tell observers about each.
+        Args:
+            external: Changed clients, or None once deleted, by key, if already read from the
+                storage; they are read now if omitted.
+        Returns:
+            list: The applied changes as (key, old, new) tuples.
+        """
+        if self._clients is None:  # Checking if the clients are not loaded yet
+            return []  # They are read in full on first access
+        if external is None:  # Checking if the changes still have to be read
+            external = self.storage.read_changes(self._clients)  # Reading the saved changes
+        changes = apply_external(self._clients, external)  # Applying the saved changes
+        if changes:  # Checking if anything changed
+            self.notify_after(changes)  # Telling observers about the changes
+        return changes  # Returning the applied changes
 
     def add_client(self, client):  # Method for adding a new client
         if client.client_id in self.clients:  # Checking if client ID already exists
             raise ValueError("Client ID already exists.")  # Raising an error if client ID is not unique
+        changes = [(client.client_id, None, client)]  # Describing the addition
+        self.notify_before(changes)  # Letting observers check the new client
         self.clients[client.client_id] = client  # Adding the new client to the clients dictionary
-        self.save_clients()  # Saving the updated clients data to file
+        self.persist_changes(self.clients, changes)  # Persisting only the new client, then telling observers about the new client
 
-    def delete_client(self, client_id):  # Method for deleting a client
+    def delete_client(self, client_id, expected_version=None):  # Method for deleting a client, optionally only if it is still at the version the caller read
         if client_id not in self.clients:  # Checking if client ID exists
             raise ValueError("Client not found.")  # Raising an error if client ID doesn't exist
+        check_version(self.label, client_id, self.clients[client_id], expected_version)  # Refusing the deletion if someone else changed the client since
+        changes = [(client_id, self.clients[client_id], None)]  # Describing the deletion
+        self.notify_before(changes)  # Letting observers check the deletion
         del self.clients[client_id]  # Deleting the client from the clients dictionary
-        self.save_clients()  # Saving the updated clients data to file
+        self.persist_changes(self.clients, changes)  # Persisting the client change, then telling observers about the deletion
 
-    def modify_client(self, client_id, **kwargs):  # Method for modifying client attributes
+    def modify_client(self, client_id, expected_version=None, **kwargs):  # Method for modifying client attributes, optionally only if the client is still at the version the caller read
         if client_id not in self.clients:  # Checking if client ID exists
             raise ValueError("Client not found.")  # Raising an error if client ID doesn't exist
         client = self.clients[client_id]  # Getting the client object
+        check_version(self.label, client_id, client, expected_version)  # Refusing the change if someone else changed the client since
         allowed_attributes = set(['name', 'address', 'contact_details', 'budget'])  # Allowed attributes for modification
-        for key, value in kwargs.items():  # Iterating over keyword arguments
+        for key in kwargs:  # Iterating over keyword arguments
             if key not in allowed_attributes:  # Checking if attribute is allowed for modification
                 raise ValueError(f"{key} is not a valid attribute of Client.")  # Raising an error for invalid attribute
-            setattr(client, key, value)  # Setting the new value for the attribute
-        self.save_clients()  # Saving the updated clients data to file
+        updated = modified_copy(client, kwargs)  # Copying the client with the new values
+        changes = [(client_id, client, updated)]  # Describing the modification
+        self.notify_before(changes)  # Letting observers check the new values
+        self.clients[client_id] = updated  # Storing the modified client in place of the old one
+        self.persist_changes(self.clients, changes)  # Persisting the client change, then telling observers about the modification
+
+    def bulk_add_clients(self, clients):  # Method for adding many clients with a single save
+        """
+        Add a batch of clients, saving once at the end. Nothing is added if any
+        client ID already exists or appears twice in the batch.
+        Returns:
+            int: The number of clients added.
+        """
+        batch = {}  # New clients by ID
+        for client in clients:  # Iterating over the new clients
+            if client.client_id in batch or client.client_id in self.clients:  # Checking if client ID already exists
+                raise ValueError(f"Client ID already exists: {client.client_id}")  # Raising an error naming the duplicate ID
+            batch[client.client_id] = client  # Adding the client to the batch
+        changes = [(client_id, None, client) for client_id, client in batch.items()]  # Describing the additions
+        self.notify_before(changes)  # Letting observers check the new clients
+        self.clients.update(batch)  # Adding the whole batch to the clients dictionary
+        self.persist_changes(self.clients, changes)  # Persisting the batch once, then telling observers about the new clients
+        return len(batch)  # Returning the number of clients added
+
+    def bulk_upsert_clients(self, clients):  # Method for adding or replacing many clients with a single save
+        """
+        Add a batch of clients, replacing any existing client with the same ID, and save once.
+        Returns:
+            int: The number of clients written.
+        """
+        batch = {client.client_id: client for client in clients}  # New clients by ID, later entries winning
+        changes = [(client_id, self.clients.get(client_id), client) for client_id, client in batch.items()]  # Describing the additions and replacements
+        self.notify_before(changes)  # Letting observers check the batch
+        self.clients.update(batch)  # Storing the whole batch in the clients dictionary
+        self.persist_changes(self.clients, changes)  # Persisting the batch once, then telling observers about the batch
+        return len(batch)  # Returning the number of clients written
 
     def get_client(self, client_id):  # Method for retrieving a client
         if client_id not in self.clients:  # Checking if client ID exists
@@ -65,15 +133,30 @@ class ClientManagement:  # Definition of the ClientManagement class
         print(f"Contact Details: {client.contact_details}")  # Displaying client contact details
         print(f"Budget: {client.budget}")  # Displaying client budget
 
+    def iter_clients(self):  # Method for streaming the details of all clients one client at a time
+        """
+        Yield the details of each client as a block of text, in the layout used by display_all_clients.
+        """
+        for client_id, client in self.clients.items():  # Iterating over clients dictionary
+            yield (  # Yielding the formatted client details
+                f"Client ID: {client_id}\n"  # Adding client ID to the string
+                f"Name: {client.name}\n"  # Adding client name to the string
+                f"Address: {client.address}\n"  # Adding client address to the string
+                f"Contact Details: {client.contact_details}\n"  # Adding client contact details to the string
+                f"Budget: {client.budget}\n\n"  # Adding client budget to the string
+            )
+
+    def iter_client_rows(self, fields=CLIENT_FIELDS, snapshot=False):  # Method for streaming clients as tuples of attribute values
+        """
+        Yield one tuple per client holding the requested attributes (None where an older record lacks one).
+        Args:
+            fields: Attribute names to include, in order.
+            snapshot: Copy the client references first so the clients may change while the rows are consumed.
+        """
+        return record_rows(self.clients, fields, snapshot)  # Streaming the rows, straight from the columns of a columnar store
+
     def display_all_clients(self):  # Method for displaying details of all clients
         if not self.clients:  # Checking if clients dictionary is empty
             return "No clients to display."  # Returning message if no clients exist
         else:
-            all_clients_info = ""  # Initializing string to store all clients' information
-            for client_id, client in self.clients.items():  # Iterating over clients dictionary
-                all_clients_info += f"Client ID: {client_id}\n"  # Adding client ID to the string
-                all_clients_info += f"Name: {client.name}\n"  # Adding client name to the string
-                all_clients_info += f"Address: {client.address}\n"  # Adding client address to the string
-                all_clients_info += f"Contact Details: {client.contact_details}\n"  # Adding client contact details to the string
-                all_clients_info += f"Budget: {client.budget}\n\n"  # Adding client budget to the string
-            return all_clients_info  # Returning the string containing all clients' information
+            return "".join(self.iter_clients())  # Joining the streamed details once instead of growing one string
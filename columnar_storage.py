@@ -0,0 +1,418 @@
+import mmap  # Importing the mmap module for reading column files without copying them
+import os  # Importing the os module for operating system related functionalities
+import pickle  # Importing the pickle module for column values of mixed types
+import struct  # Importing the struct module for packing the file header
+import sys  # Importing the sys module for the command-line arguments
+from array import array  # Importing array for packing numeric columns
+from collections.abc import MutableMapping  # Importing the dictionary interface the records view implements
+from bisect import bisect_left  # Importing bisect_left for finding the value a heap offset belongs to
+from itertools import accumulate  # Importing accumulate for computing string offsets
+
+from sqlite_storage import record_fields  # Importing the list of attributes a record class stores
+from storage import CORRUPT_SUFFIX, TEMP_SUFFIX, JournalStorage, SnapshotError, file_signature, sync_directory  # Importing the journal storage the column file sits under
+
+COLUMNAR_SUFFIX = ".col"  # Extension of the column file that replaces a manager's pickle file
+COLUMNAR_MAGIC = b"EVCOLS1\n"  # Marker identifying a column file
+FILE_HEADER = struct.Struct("<QI")  # Number of rows and number of columns
+COLUMN_HEADER = struct.Struct("<cQQQ")  # Column kind, and offsets of its null flags, values and string heap
+NAME_LENGTH = struct.Struct("<H")  # Length of a column name
+ALIGNMENT = 8  # Byte boundary every column section starts on
+INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)  # Integers a numeric column holds
+KINDS = {  # Column kinds: fixed-width numbers, and offset-indexed heaps of text or pickled values
+    b"q": "64-bit integers",
+    b"d": "64-bit floats",
+    b"s": "UTF-8 text",
+    b"o": "pickled values",
+}
+AGGREGATES = ("count", "sum", "min", "max", "mean")  # Functions aggregate() computes
+CHUNK_ROWS = 65536  # Rows decoded together by scans, bounding the memory a scan holds
+SEARCHED_LOOKUPS = 16  # Key lookups answered by searching the key column before the key map is built
+
+
+def column_kind(values):  # Function for choosing how a column is stored
+    kinds = {type(value) for value in values if value is not None}  # Types of the values present
+    if kinds == {int} and all(INT64_RANGE[0] <= value <= INT64_RANGE[1] for value in values if value is not None):  # Checking for integers that fit
+        return b"q"
+    if kinds == {float}:  # Checking for floats
+        return b"d"
+    if kinds <= {str}:  # Checking for text, or a column with no values
+        return b"s"
+    return b"o"  # Pickling anything else, such as guest ID tuples or numbers mixed with text
+
+
+def padding(offset):  # Function for counting the bytes that align an offset
+    return -offset % ALIGNMENT  # Returning the bytes up to the next boundary
+
+
+def encode_columns(fields, rows):  # Function for laying records out as one column table
+    """
+    Args:
+        fields: Column names, in the order of each row's values.
+        rows: Tuples of values, one per record.
+    Returns:
+        list: Byte strings which, written one after another, form the table; every one
+        is padded so the next starts on an aligned offset.
+    """
+    columns = [list(values) for values in zip(*rows)] or [[] for _ in fields]  # Turning the rows into columns
+    count = len(columns[0]) if columns else 0  # Number of rows
+    sections = []  # Encoded (kind, nulls, values, heap) per column
+    for values in columns:  # Iterating over the columns
+        kind = column_kind(values)  # Choosing the column's layout
+        nulls = bytes(value is None for value in values)  # One flag byte per row
+        if kind in (b"q", b"d"):  # Checking for a numeric column
+            heap = b""  # Numbers need no heap
+            data = array(kind.decode(), (0 if value is None else value for value in values)).tobytes()  # Packing the numbers
+        else:
+            encoded = [b"" if value is None else value.encode() if kind == b"s" else pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in values]  # Encoding each value
+            heap = b"".join(encoded)  # Concatenating the values
+            data = array("Q", accumulate((len(value) for value in encoded), initial=0)).tobytes()  # Offsets of each value in the heap
+        sections.append((kind, nulls, data, heap))  # Keeping the encoded column
+    header = COLUMNAR_MAGIC + FILE_HEADER.pack(count, len(fields))  # Starting the header
+    header_size = len(header) + sum(NAME_LENGTH.size + len(name.encode()) + COLUMN_HEADER.size for name in fields)  # Size of the finished header
+    offset = header_size + padding(header_size)  # Start of the first section
+    body = []  # Sections written after the header
+    for name, (kind, nulls, data, heap) in zip(fields, sections):  # Iterating over the columns
+        placed = []  # Offsets of the column's null flags, values and heap
+        for section in (nulls, data, heap):  # Iterating over the column's sections
+            placed.append(offset)  # Recording where the section starts
+            body.append(section + bytes(padding(len(section))))  # Padding it to the next boundary
+            offset += len(section) + padding(len(section))  # Moving past it
+        header += NAME_LENGTH.pack(len(name.encode())) + name.encode() + COLUMN_HEADER.pack(kind, *placed)  # Describing the column
+    return [header + bytes(padding(len(header)))] + body  # Returning the padded header and the sections
+
+
+def write_columns(file_path, fields, rows):  # Function for writing records as a column file
+    """
+    Write the rows to a temporary file, flush it to disk and rename it over the column file.
+    Args:
+        fields: Column names, in the order of each row's values.
+        rows: Tuples of values, one per record.
+    """
+    temp_path = file_path + TEMP_SUFFIX  # Path of the file being written
+    with open(temp_path, "wb") as file:  # Opening the temporary file in binary write mode
+        for part in encode_columns(fields, rows):  # Iterating over the header and sections
+            file.write(part)  # Writing each
+        file.flush()  # Handing the bytes to the operating system
+        os.fsync(file.fileno())  # Waiting until they are on disk
+    os.replace(temp_path, file_path)  # Putting the new file in place in one step
+    sync_directory(file_path)  # Making the rename survive a crash
+
+
+class ColumnTable:  # Definition of the ColumnTable class
+    # Read-only view over a memory-mapped column file. Values are decoded one at a time
+    # from the mapped pages, so opening a file reads only its header.
+    def __init__(self, file_path, start=0, length=None):  # Constructor method for mapping a column file
+        """
+        Args:
+            start, length: Place of the table in the file, for tables stored inside a larger
+                file such as the row groups of an export; the whole file if omitted.
+        """
+        self.columns = {}  # (kind, nulls, values, heap) views by column name
+        self.heap_starts = {}  # File offset of each text or pickled column's heap
+        with open(file_path, "rb") as file:  # Opening the file in binary read mode
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # Mapping the whole file, which stays mapped after the file is closed
+        self.buffer = memoryview(self.map)[start:None if length is None else start + length]  # Zero-copy view of the table's mapped bytes
+        if bytes(self.buffer[:len(COLUMNAR_MAGIC)]) != COLUMNAR_MAGIC:  # Checking the file is a column file
+            self.close()  # Releasing the mapping
+            raise SnapshotError(f"{file_path} is not a column file.")
+        self.count, column_count = FILE_HEADER.unpack_from(self.buffer, len(COLUMNAR_MAGIC))  # Reading the numbers of rows and columns
+        position = len(COLUMNAR_MAGIC) + FILE_HEADER.size  # Start of the column descriptions
+        for _ in range(column_count):  # Iterating over the column descriptions
+            (length,) = NAME_LENGTH.unpack_from(self.buffer, position)  # Reading the name length
+            name = bytes(self.buffer[position + NAME_LENGTH.size:position + NAME_LENGTH.size + length]).decode()  # Reading the name
+            position += NAME_LENGTH.size + length  # Moving past the name
+            kind, nulls, values, heap = COLUMN_HEADER.unpack_from(self.buffer, position)  # Reading the section offsets
+            position += COLUMN_HEADER.size  # Moving past the description
+            if kind not in KINDS:  # Checking the column kind is known
+                self.close()  # Releasing the mapping
+                raise SnapshotError(f"{file_path} has a column of unknown kind {kind!r}.")
+            width = self.count if kind in (b"q", b"d") else self.count + 1  # Numbers per row, or heap offsets around each value
+            self.heap_starts[name] = start + heap  # Remembering where the heap starts in the file, for searching the mapped bytes
+            self.columns[name] = (  # Viewing the sections without copying them
+                kind,
+                self.buffer[nulls:nulls + self.count],
+                self.buffer[values:values + 8 * width].cast("Q" if kind in (b"s", b"o") else kind.decode()),
+                self.buffer[heap:] if kind in (b"s", b"o") else None,
+            )
+
+    def value(self, name, row):  # Method for decoding one value
+        kind, nulls, values, heap = self.columns[name]  # Looking up the column
+        if nulls[row]:  # Checking for a missing value
+            return None
+        if heap is None:  # Checking for a numeric column
+            return values[row]  # Reading the number in place
+        data = heap[values[row]:values[row + 1]]  # Slicing the value out of the heap
+        return str(data, "utf-8") if kind == b"s" else pickle.loads(data)  # Decoding it
+
+    def find(self, name, text):  # Method for finding the row holding a text value without decoding the column
+        """
+        Search the text column's mapped heap for the encoded value and check each hit lines
+        up with one whole value, so a single lookup reads a few pages instead of every value.
+        Returns:
+            int: The first row holding the text, or None if no row does.
+        """
+        _, nulls, values, _ = self.columns[name]  # Looking up the column
+        encoded = text.encode("utf-8")  # Bytes the value is stored as
+        base = self.heap_starts[name]  # File offset of the heap
+        position, end = base + values[0], base + values[self.count]  # Searched span of the file
+        while position <= end:  # Iterating over the occurrences
+            position = self.map.find(encoded, position, end)  # Finding the next one
+            if position < 0:  # Checking if the heap holds no more
+                return None
+            offset = position - base  # Heap offset of the occurrence
+            row = bisect_left(values, offset)  # First row starting at or after it
+            while row < self.count and values[row] == offset:  # Iterating over the rows starting there, several if some are empty
+                if values[row + 1] - offset == len(encoded) and not nulls[row]:  # Checking the row holds exactly the text
+                    return row
+                row += 1
+            position += 1  # Searching past the occurrence
+        return None
+
+    def column(self, name, start=0, stop=None):  # Method for decoding the values of a column in row order
+        kind, nulls, values, heap = self.columns[name]  # Looking up the column
+        stop = self.count if stop is None else min(stop, self.count)  # Last row, exclusive
+        flags = nulls[start:stop].tobytes()  # Null flags as one bytes object
+        if heap is None:  # Checking for a numeric column
+            numbers = values[start:stop].tolist()  # Reading the numbers in one step
+            if flags.count(1):  # Checking for missing values
+                numbers = [None if null else number for null, number in zip(flags, numbers)]  # Blanking them
+            return numbers
+        offsets = values[start:stop + 1].tolist()  # Reading the heap offsets in one step
+        data = heap[offsets[0]:offsets[-1]].tobytes()  # Copying the chunk's part of the heap once
+        base = offsets[0]  # Heap offset of the copied bytes
+        if kind == b"s":  # Checking for a text column
+            text = data.decode("utf-8")  # Decoding the whole chunk at once
+            if len(text) == len(data):  # Checking for plain ASCII, whose byte offsets are character offsets
+                return [None if null else text[begin - base:end - base] for null, begin, end in zip(flags, offsets, offsets[1:])]  # Slicing each value out
+            return [None if null else data[begin - base:end - base].decode("utf-8") for null, begin, end in zip(flags, offsets, offsets[1:])]  # Decoding each value
+        return [None if null else pickle.loads(data[begin - base:end - base]) for null, begin, end in zip(flags, offsets, offsets[1:])]  # Unpickling each value
+
+    def close(self):  # Method for unmapping the file
+        for _, nulls, values, heap in self.columns.values():  # Iterating over the column views
+            for view in (nulls, values, heap):  # Iterating over the section views
+                if view is not None:  # Checking if the section exists
+                    view.release()  # Releasing it
+        self.buffer.release()  # Releasing the file view
+        try:
+            self.map.close()  # Unmapping the file
+        except BufferError:  # Handling views still held by a running scan
+            pass  # The mapping is closed once they are gone
+
+
+class ColumnarRecords(MutableMapping):  # Definition of the ColumnarRecords class
+    # Dictionary-like view over a column file plus the changes made since it was written.
+    # Records are built only when looked up; scans, filters and aggregates read the
+    # columns directly. Changed and deleted records shadow their row in the file.
+    def __init__(self, table, record_class, key_field, fields):  # Constructor method for initializing the records view
+        self.table = table  # Column file, or None while nothing was written
+        self.record_class = record_class  # Class used to build records from rows
+        self.key_field = key_field  # Column holding each record's key
+        self.fields = fields  # Stored columns, key included
+        self.overlay = {}  # Records changed since the file was written, None once deleted
+        self.shadowed = set()  # Rows of the file replaced or deleted by the overlay
+        self._rows = None  # Row of each key in the file, built on first scan or after a few lookups
+        self.searches = 0  # Key lookups answered by searching the key column so far
+
+    @property
+    def rows_by_key(self):  # Property mapping keys to rows on first use
+        if self._rows is None:  # Checking if the map is not built yet
+            keys = self.table.column(self.key_field) if self.table is not None else []  # Decoding the key column once
+            self._rows = {key: row for row, key in enumerate(keys)}  # Mapping each key to its row
+        return self._rows  # Returning the map
+
+    def row_of(self, key):  # Method for finding the file's row of a key
+        if self._rows is not None:  # Checking if the key map is built
+            return self._rows.get(key)  # Looking the row up
+        self.searches += 1  # Counting the lookup
+        if self.table is None or self.searches > SEARCHED_LOOKUPS or not isinstance(key, str) or self.table.columns[self.key_field][0] != b"s":  # Checking if searching the file no longer pays, or can't be done
+            return self.rows_by_key.get(key)  # Building the map
+        return self.table.find(self.key_field, key)  # Searching the mapped key column, which keeps a command's few lookups cheap
+
+    def build(self, row):  # Method for building the record stored in a row
+        record = self.record_class.__new__(self.record_class)  # Creating the record without running the constructor
+        for field in record.stored_fields():  # Iterating over the record's attributes
+            setattr(record, field, self.table.value(field, row) if field in self.table.columns else None)  # Restoring each attribute
+        return record  # Returning the built record
+
+    def __getitem__(self, key):  # Method for building one record by its key
+        if key in self.overlay:  # Checking if the record changed since the file was written
+            record = self.overlay[key]  # Getting the changed record
+            if record is None:  # Checking if it was deleted
+                raise KeyError(key)
+            return record  # Returning the changed record
+        row = self.row_of(key)  # Looking the row up
+        if row is None:  # Checking if the record exists
+            raise KeyError(key)  # Raising an error like a dictionary would
+        return self.build(row)  # Building the record from its row
+
+    def __setitem__(self, key, record):  # Method for adding or replacing one record
+        self.overlay[key] = record  # Keeping the record with the changes
+        row = self.row_of(key)  # Looking up its row in the file
+        if row is not None:  # Checking if the file holds an older copy
+            self.shadowed.add(row)  # Hiding the older copy
+
+    def __delitem__(self, key):  # Method for deleting one record
+        if key not in self:  # Checking if the record exists
+            raise KeyError(key)  # Raising an error like a dictionary would
+        self[key] = None  # Recording the deletion, which hides the file's copy
+
+    def __contains__(self, key):  # Method for checking if a key exists
+        if key in self.overlay:  # Checking if the record changed since the file was written
+            return self.overlay[key] is not None  # Returning whether it still exists
+        return self.row_of(key) is not None  # Checking the file
+
+    def __iter__(self):  # Method for iterating over the keys
+        for row, key in enumerate(self.rows_by_key):  # Iterating over the file's keys in row order
+            if row not in self.shadowed:  # Skipping rows the overlay replaced
+                yield key
+        for key, record in list(self.overlay.items()):  # Iterating over the changed records
+            if record is not None:  # Skipping deletions
+                yield key
+
+    def __len__(self):  # Method for counting the records
+        stored = self.table.count if self.table is not None else 0  # Rows in the file
+        return stored - len(self.shadowed) + sum(record is not None for record in self.overlay.values())  # Adding the changes
+
+    def items(self):  # Method for streaming key and record pairs
+        """
+        Records of the file are built a chunk of rows at a time from decoded columns, which
+        is much faster than looking each one up.
+        """
+        overlay, shadowed = dict(self.overlay), set(self.shadowed)  # Freezing the changes made so far
+        fields = self.record_class.__new__(self.record_class).stored_fields()  # Attributes every record gets
+        position = fields.index(self.key_field)  # Place of the key among them
+        for row, values in self.scan(fields):  # Iterating over the file's rows
+            if row not in shadowed:  # Skipping rows the overlay replaced
+                record = self.record_class.__new__(self.record_class)  # Creating the record without running the constructor
+                for field, value in zip(fields, values):  # Iterating over its attributes
+                    setattr(record, field, value)  # Restoring each
+                yield values[position], record
+        for key, record in overlay.items():  # Iterating over the changed records
+            if record is not None:  # Skipping deletions
+                yield key, record
+
+    def values(self):  # Method for streaming records
+        for _, record in self.items():  # Reusing the pair iterator
+            yield record
+
+    def scan(self, fields):  # Method for streaming the file's rows with their row numbers
+        if self.table is None:  # Checking if there is a file to scan
+            return
+        for start in range(0, self.table.count, CHUNK_ROWS):  # Iterating over the chunks of rows
+            stop = start + CHUNK_ROWS  # End of the chunk
+            columns = [self.table.column(field, start, stop) if field in self.table.columns else [None] * (min(stop, self.table.count) - start) for field in fields]  # Decoding the chunk of each column
+            yield from enumerate(zip(*columns), start)  # Yielding the rows with their numbers
+
+    def rows(self, fields):  # Method for streaming tuples of attribute values without building records
+        """
+        Yield one tuple per record holding the requested attributes, read from the columns
+        for rows of the file and from the records for changes. Changes made while the rows
+        are consumed don't affect them.
+        """
+        overlay, shadowed = dict(self.overlay), set(self.shadowed)  # Freezing the changes made so far
+        for row, values in self.scan(fields):  # Iterating over the file's rows
+            if row not in shadowed:  # Skipping rows the overlay replaced
+                yield values
+        for record in overlay.values():  # Iterating over the changed records
+            if record is not None:  # Skipping deletions
+                yield tuple(getattr(record, field, None) for field in fields)  # Reading the attributes
+
+    def find(self, field, value):  # Method for listing the keys whose field equals a value
+        return [key for key, found in self.rows((self.key_field, field)) if found == value]  # Scanning the two columns
+
+    def between(self, field, low=None, high=None):  # Method for listing the keys whose numeric field lies in a range
+        """
+        Args:
+            low, high: Inclusive bounds; None leaves that side open.
+        Returns:
+            list: Keys of the records whose field is a number within the bounds.
+        """
+        matches = []  # Keys found
+        for key, value in self.rows((self.key_field, field)):  # Scanning the two columns
+            if isinstance(value, (int, float)) and (low is None or value >= low) and (high is None or value <= high):  # Checking the bounds
+                matches.append(key)  # Keeping the key
+        return matches  # Returning the keys
+
+    def aggregate(self, field, function):  # Method for summarizing a numeric field over every record
+        """
+        Args:
+            function: One of "count", "sum", "min", "max" and "mean". Values that are not
+                numbers, such as blanks, are left out.
+        Returns:
+            The result, or None for min, max and mean of no numbers.
+        """
+        if function not in AGGREGATES:  # Checking the function is known
+            raise ValueError(f"Unknown aggregate: {function}")
+        numbers = [value for (value,) in self.rows((field,)) if isinstance(value, (int, float))]  # Reading the numbers of the column
+        if function == "count":  # Checking for a count
+            return len(numbers)
+        if function == "sum":  # Checking for a sum
+            return sum(numbers)
+        if not numbers:  # Checking for an empty column
+            return None
+        if function == "mean":  # Checking for an average
+            return sum(numbers) / len(numbers)
+        return min(numbers) if function == "min" else max(numbers)  # Returning the smallest or largest
+
+    def attach(self, table):  # Method for switching to a newly written file holding every change
+        self.table = table  # Using the new file
+        self.overlay = {}  # Every change is in the file now
+        self.shadowed = set()  # No row is hidden
+        self._rows = None  # Rows moved, so the key map is rebuilt on first use
+
+
+class ColumnarStorage(JournalStorage):  # Definition of the ColumnarStorage class
+    # Stores records as a memory-mapped column file for read-mostly stores such as venues,
+    # suppliers and past events. Loading maps the file instead of unpickling every record.
+    # Changes are appended to a journal next to it, as the journal backend does, and
+    # folded into a new column file once the journal grows.
+    def __init__(self, file_path, label, record_class=None, key_field=None):  # Constructor method for initializing columnar storage
+        if record_class is None or key_field is None:  # Checking if the columns can be derived
+            raise ValueError("Columnar storage needs the record class and its key field.")  # Raising an error for a missing layout
+        super().__init__(os.path.splitext(file_path)[0] + COLUMNAR_SUFFIX, label, record_class, key_field)  # Journaling next to the column file
+        self.fields = record_fields(record_class)  # Stored columns
+
+    def read(self):  # Method for mapping the column file
+        """
+        Returns:
+            ColumnarRecords: A dictionary-like view building records on demand.
+        """
+        table = None  # Column file, if one was written
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path):  # Checking if the file exists
+            try:
+                table = ColumnTable(self.file_path)  # Mapping it
+            except (SnapshotError, ValueError, struct.error) as e:  # Handling a damaged file
+                print(f"Error loading {self.label} data from {self.file_path}: {e}")  # Printing error message
+                os.replace(self.file_path, self.file_path + CORRUPT_SUFFIX)  # Setting the file aside for inspection
+        return ColumnarRecords(table, self.record_class, self.key_field, self.fields)  # Returning the records view
+
+    def save(self, records):  # Method for writing every record as a new column file and emptying the journal
+        with self.lock:  # Keeping other processes out until the journal is emptied too
+            if hasattr(records, "rows"):  # Checking for a columnar view, whose rows are read without building records
+                rows = records.rows(self.fields)  # Streaming the columns
+            else:
+                rows = (tuple(getattr(record, field, None) for field in self.fields) for record in records.values())  # Reading the attributes of each record
+            write_columns(self.file_path, self.fields, rows)  # Writing the column file
+            with open(self.journal_path, "wb"):  # Truncating the journal now that the file contains it
+                pass
+            self.journal_records = 0  # Resetting the journal record count
+            self.journal_offset = 0  # Nothing is left to read
+            self.signature = file_signature(self.file_path)  # Remembering the file as written
+        if isinstance(records, ColumnarRecords):  # Checking if the records view should follow the new file
+            records.attach(ColumnTable(self.file_path))  # Mapping it
+
+
+def migrate_to_columnar(labels):  # Function for copying stores into column files once
+    from context import DataContext  # Importing the shared data context, after this module is fully loaded
+    with DataContext() as context:  # Opening the stores with their current backend
+        for label in labels:  # Iterating over the stores to convert
+            management = context.management(label)  # Finding the store's manager
+            records = getattr(management, label)  # Loading the records
+            storage = management.storage  # Storage the records come from, which knows their class and key
+            target = ColumnarStorage(storage.file_path, label, storage.record_class, storage.key_field)  # Opening the column file
+            target.save(records)  # Writing every record as columns
+            print(f"Migrated {len(records)} {label} to {target.file_path}")  # Reporting the migration
+
+
+if __name__ == "__main__":
+    migrate_to_columnar(sys.argv[1:] or ["venues", "suppliers", "events"])  # Converting the read-mostly stores unless others are named
@@ -0,0 +1,152 @@
+import queue  # Importing queue for handing refreshed records to the caller's thread
+
+from analytics import Analytics  # Importing the running revenue, budget and payroll totals
+from changes import Observable, Observer  # Importing the change notification classes
+from client_management import ClientManagement  # Importing the client manager
+from employee_management import EmployeeManagement  # Importing the employee manager
+from event_management import EventManagement  # Importing the event manager
+from guest_management import GuestManagement  # Importing the guest manager
+from integrity import ReferentialIntegrity  # Importing the cross-store reference checks
+from matching import Matcher  # Importing the venue and supplier matcher
+from search import SearchIndex  # Importing the full-text search index
+from storage import BACKEND_HELP, BackgroundStorage, parse_backend, store_backend  # Importing the write-behind storage wrapper and the --backend option helpers
+from supplier_management import SupplierManagement  # Importing the supplier manager
+from venue_management import VenueManagement  # Importing the venue manager
+
+
+class DataContext(Observable, Observer):  # Definition of the DataContext class
+    # Owns the one manager of each store for a process, so the GUI tabs and the command-line
+    # tools share the same loaded records instead of each reading the files again.
+    # Observers added to the context hear about changes to every store, with the store's
+    # label, so one registration covers all six managers.
+    def __init__(self, backend=None, write_behind=False, report_error=None, on_delete=None):  # Constructor method for creating the managers
+        """
+        Args:
+            backend: Storage backend name passed to every manager, or names by store label
+                with the default under None, as parse_backend returns.
+            write_behind: Save on a background thread, as the GUI does, so callers never wait on the disk.
+            report_error: Callable receiving background save errors; they are printed if omitted.
+            on_delete: Referential integrity policy ("restrict", "cascade" or "nullify"), or None
+                to leave references between the stores unchecked.
+        """
+        self.write_behind = write_behind  # Whether saves happen on a background thread
+        self.report_error = report_error  # Receiver of background save errors
+        self.client_management = self.open(ClientManagement(backend=store_backend(backend, "clients")))  # The client manager
+        self.employee_management = self.open(EmployeeManagement(backend=store_backend(backend, "employees")))  # The employee manager
+        self.event_management = self.open(EventManagement(backend=store_backend(backend, "events")))  # The event manager
+        self.guest_management = self.open(GuestManagement(backend=store_backend(backend, "guests")))  # The guest manager
+        self.supplier_management = self.open(SupplierManagement(backend=store_backend(backend, "suppliers")))  # The supplier manager
+        self.venue_management = self.open(VenueManagement(backend=store_backend(backend, "venues")))  # The venue manager
+        self.observers = []  # Objects notified about changes to any store
+        self.integrity = None  # Reference checks between the stores, if enabled
+        if on_delete is not None:  # Checking if references should be checked
+            self.integrity = ReferentialIntegrity(  # Checking references on every change
+                self.event_management, self.guest_management, self.supplier_management,
+                self.venue_management, self.client_management, self.employee_management,
+                on_delete=on_delete,
+            )
+        self._matcher = None  # Venue and supplier matcher, created on first use
+        self._search_index = None  # Full-text search index, created on first use
+        self._analytics = None  # Revenue, budget and payroll totals, created on first use
+        self.refreshed = queue.Queue()  # Saved changes read by the background writers, waiting for apply_refreshed
+        for management in self.managers():  # Iterating over the managers
+            management.add_observer(self)  # Passing their changes on to the context's observers
+
+    def open(self, management):  # Method for preparing a new manager's storage
+        if self.write_behind:  # Checking if saves should happen in the background
+            management.storage = BackgroundStorage(management.storage, self.report_error)  # Wrapping its storage before anything is loaded
+        return management  # Returning the manager
+
+    def managers(self):  # Method for listing the managers
+        return [self.client_management, self.employee_management, self.event_management,
+                self.guest_management, self.supplier_management, self.venue_management]
+
+    def management(self, label):  # Method for finding the manager of a store
+        """
+        Args:
+            label: Name of the records, such as "events".
+        Returns:
+            The manager of those records.
+        """
+        for management in self.managers():  # Iterating over the managers
+            if management.label == label:  # Checking if it holds the records
+                return management  # Returning it
+        raise ValueError(f"Unknown records: {label}")  # Raising an error for an unknown store
+
+    @property
+    def matcher(self):  # Property creating the venue and supplier matcher on first use
+        if self._matcher is None:  # Checking if the matcher is not created yet
+            self._matcher = Matcher(self.event_management, self.venue_management, self.supplier_management)  # Creating it
+        return self._matcher  # Returning the matcher
+
+    @property
+    def search_index(self):  # Property creating the full-text search index on first use
+        if self._search_index is None:  # Checking if the index is not created yet
+            self._search_index = SearchIndex(self.managers())  # Creating it
+        return self._search_index  # Returning the index
+
+    @property
+    def analytics(self):  # Property creating the running totals on first use
+        if self._analytics is None:  # Checking if the totals are not created yet
+            self._analytics = Analytics(self.event_management, self.client_management, self.employee_management)  # Creating them
+        return self._analytics  # Returning the totals
+
+    def before_change(self, label, changes):  # Method passing a store's pending changes on to the context's observers
+        for observer in list(self.observers):  # Iterating over a snapshot of the observers
+            observer.before_change(label, changes)  # Passing the changes, which the observer may refuse
+
+    def after_change(self, label, changes):  # Method passing a store's stored changes on to the context's observers
+        for observer in list(self.observers):  # Iterating over a snapshot of the observers
+            observer.after_change(label, changes)  # Passing the stored changes
+
+    def refresh(self):  # Method for picking up the records other processes sharing the files saved
+        """
+        Apply every store's records added, changed or deleted by other processes since this
+        one last read or wrote them. Observers hear about them as about local changes.
+        Returns:
+            int: The number of records that changed.
+        """
+        count = 0  # Number of changed records
+        for management in self.managers():  # Iterating over the managers
+            count += len(getattr(management, f"refresh_{management.label}")())  # Applying the store's saved changes
+        return count  # Returning the number of changed records
+
+    def request_refresh(self):  # Method for reading the records other processes saved without waiting on the disk
+        """
+        Have each background writer read its store's saved changes once its queued writes
+        are done, for apply_refreshed to apply on the calling thread later. Stores saved on
+        the calling thread are refreshed right away.
+        """
+        for management in self.managers():  # Iterating over the managers
+            storage = management.storage  # The manager's storage
+            if isinstance(storage, BackgroundStorage) and storage.records is not None:  # Checking if its writer holds the records
+                storage.request_changes(lambda external, compared, management=management: self.refreshed.put((management, external, compared)))  # Reading on the writer thread
+            else:
+                getattr(management, f"refresh_{management.label}")()  # Applying the store's saved changes now
+
+    def apply_refreshed(self):  # Method for applying the records the background writers read
+        """
+        Apply the saved changes read since request_refresh. A record changed here after the
+        read is kept, since its own save follows the read and wins.
+        Returns:
+            int: The number of records that changed.
+        """
+        count = 0  # Number of changed records
+        while True:
+            try:
+                management, external, compared = self.refreshed.get_nowait()  # Taking the next read
+            except queue.Empty:  # Handling no more reads
+                return count  # Returning the number of changed records
+            records = getattr(management, management.label)  # The manager's loaded records
+            external = {key: record for key, record in external.items() if records.get(key) is compared.get(key)}  # Leaving out records changed since the read
+            count += len(getattr(management, f"refresh_{management.label}")(external))  # Applying the rest
+
+    def close(self):  # Method for writing any queued changes and releasing the storages
+        for management in self.managers():  # Iterating over the managers
+            management.storage.close()  # Closing each storage
+
+    def __enter__(self):  # Method for using the context in a with statement
+        return self  # Returning the context
+
+    def __exit__(self, exc_type, exc_value, traceback):  # Method for closing the context at the end of a with statement
+        self.close()  # Closing the storages
@@ -1,9 +1,13 @@
-import os  # Importing the os module for operating system related functionalities
-import pickle  # Importing the pickle module for object serialization
+from changes import Observable, apply_external, check_version, modified_copy  # Importing the change notification mixin and version checks
+from indexes import HierarchyIndex  # Importing the tree index used for the org chart
+from records import Record, amount_cents, record_rows  # Importing the slot-based record base class, the amount reader and row streaming
+from storage import open_storage  # Importing the storage factory used to persist records
 
 EMPLOYEE_FILE_PATH = "employees.bin"  # File path constant for storing employee data
+EMPLOYEE_FIELDS = ("employee_id", "name", "department", "job_title", "basic_salary", "age", "date_of_birth", "passport_details", "manager_id")  # Employee attributes in constructor order, used for row output
 
-class Employee:  # Definition of the Employee class
+class Employee(Record):  # Definition of the Employee class
+    __slots__ = EMPLOYEE_FIELDS  # Fixed attributes, so instances carry no __dict__
     # Initializes an Employee object with personal and job-related attributes.
     def __init__(
             self,
@@ -27,9 +31,56 @@ class Employee:  # Definition of the Employee class
         self.passport_details = passport_details  # Passport details of the employee
         self.manager_id = manager_id  # Stores the ID of the manager, if applicable
 
-class EmployeeManagement:  # Definition of the EmployeeManagement class
-    def __init__(self):  # Constructor method for initializing employee management instance
-        self.employees = self.load_employees()  # Loading employees data when an instance is created
+class EmployeeManagement(Observable):  # Definition of the EmployeeManagement class
+    label = "employees"  # Name passed to observers
+
+    def __init__(self, backend=None):  # Constructor method for initializing employee management instance
+        self.storage = open_storage(backend, EMPLOYEE_FILE_PATH, "employees", Employee, "employee_id")  # Choosing how employees data is persisted
+        self._employees = None  # Employees data, loaded on first access
+        self._org_chart = None  # Manager hierarchy with headcount and salary in cents per subtree, built on first use
+        self.observers = []  # Objects notified before and after each change
+
+    @property
+    def employees(self):  # Property loading employees data the first time it is used
+        if self._employees is None:  # Checking if the employees are not loaded yet
+            self._employees = self.load_employees()  # Loading employees data from the storage
+        return self._employees  # Returning the loaded employees
+
+    @employees.setter
+    def employees(self, value):  # Setter replacing the loaded employees data
+        self._employees = value  # Storing the new employees dictionary
+        self._org_chart = None  # Rebuilding the hierarchy on next use
+
+    @property
+    def org_chart(self):  # Property building the manager hierarchy on first use
+        if self._org_chart is None:  # Checking if the hierarchy is not built yet
+            self._org_chart = HierarchyIndex()  # Creating the index
+            rows = self.iter_employee_rows(("employee_id", "manager_id", "basic_salary"))  # Reading only the attributes the hierarchy needs
+            self._org_chart.rebuild((employee_id, manager_id or None, amount_cents(salary)) for employee_id, manager_id, salary in rows)  # Indexing every employee, weighted by salary in cents so the subtree sums stay exact
+        return self._org_chart  # Returning the index
+
+    def update_org_chart(self, changes):  # Method for moving stored changes into a built hierarchy
+        if self._org_chart is None:  # Checking if the hierarchy is built
+            return
+        for employee_id, old, new in changes:  # Iterating over the changes
+            if new is None:  # Checking for a deletion
+                self._org_chart.remove(employee_id)  # Removing the employee, whose reports stay listed under the ID
+            else:
+                self._org_chart.update(employee_id, new.manager_id or None, amount_cents(new.basic_salary))  # Placing the employee under its manager
+
+    def check_managers(self, batch):  # Method for refusing manager changes that would make someone their own manager
+        """
+        Args:
+            batch: The new or changed employees by ID, checked together with the stored ones.
+        """
+        chart = self.org_chart  # Hierarchy of the stored employees
+        def manager_of(employee_id):  # Function reading a manager as it will be after the batch
+            if employee_id in batch:  # Checking if the batch changes the employee
+                return batch[employee_id].manager_id or None
+            return chart.parents.get(employee_id)  # Reading the stored manager
+        for employee_id, employee in batch.items():  # Iterating over the batch
+            if chart.creates_cycle(employee_id, employee.manager_id or None, manager_of):  # Checking if the employee would end up above itself
+                raise ValueError(f"Employee {employee_id} can't report to {employee.manager_id}: that would make them their own manager.")  # Raising an error naming both
 
     def load_employees(self):  # Method for loading employees data from file
         """
@@ -37,30 +88,50 @@ class EmployeeManagement:  # Definition of the EmployeeManagement class
         Returns:
             dict: A dictionary containing loaded employee data.
         """
-        if os.path.exists(EMPLOYEE_FILE_PATH):  # Checking if the file exists
-            with open(EMPLOYEE_FILE_PATH, "rb") as file:  # Opening the file in binary read mode
-                try:
-                    return pickle.load(file)  # Loading data from the file using pickle
-                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
-                    print(f"Error loading employees data: {e}")  # Printing error message
-                    return {}  # Returning an empty dictionary if error occurs
-        return {}  # Returning an empty dictionary if file doesn't exist
+        return self.storage.load()  # Loading data through the configured storage
 
     def save_employees(self):  # Method for saving employees data to file
-        with open(EMPLOYEE_FILE_PATH, "wb") as file:  # Opening the file in binary write mode
-            pickle.dump(self.employees, file)  # Saving data to the file using pickle
+        self.storage.save(self.employees)  # Saving all employees data through the configured storage
+
+    def refresh_employees(self, external=None):  # Method for picking up employees saved by other processes sharing the files
+        """
+        Apply the employees other processes added, changed or deleted since the storage
+        last read or wrote them, and tell observers about each.
+        Args:
+            external: Changed employees, or None once deleted, by key, if already read from the
+                storage; they are read now if omitted.
+        Returns:
+            list: The applied changes as (key, old, new) tuples.
+        """
+        if self._employees is None:  # Checking if the employees are not loaded yet
+            return []  # They are read in full on first access
+        if external is None:  # Checking if the changes still have to be read
+            external = self.storage.read_changes(self._employees)  # Reading the saved changes
+        changes = apply_external(self._employees, external)  # Applying the saved changes
+        self.update_org_chart(changes)  # Moving them in the hierarchy
+        if changes:  # Checking if anything changed
+            self.notify_after(changes)  # Telling observers about the changes
+        return changes  # Returning the applied changes
 
     def add_employee(self, employee):  # Method for adding a new employee
         if employee.employee_id in self.employees:  # Checking if employee ID already exists
             raise ValueError("Employee ID already exists.")  # Raising an error if employee ID is not unique
+        self.check_managers({employee.employee_id: employee})  # Refusing a manager who already reports to the new employee
+        changes = [(employee.employee_id, None, employee)]  # Describing the addition
+        self.notify_before(changes)  # Letting observers check the new employee
         self.employees[employee.employee_id] = employee  # Adding the new employee to the employees dictionary
-        self.save_employees()  # Saving the updated employees data to file
+        self.update_org_chart(changes)  # Placing the employee in the hierarchy
+        self.persist_changes(self.employees, changes, undo=self.update_org_chart)  # Persisting only the new employee, then telling observers about the new employee
 
-    def delete_employee(self, employee_id):  # Method for deleting an employee
+    def delete_employee(self, employee_id, expected_version=None):  # Method for deleting an employee, optionally only if it is still at the version the caller read
         if employee_id not in self.employees:  # Checking if employee ID exists
             raise ValueError("Employee not found.")  # Raising an error if employee ID doesn't exist
+        check_version(self.label, employee_id, self.employees[employee_id], expected_version)  # Refusing the deletion if someone else changed the employee since
+        changes = [(employee_id, self.employees[employee_id], None)]  # Describing the deletion
+        self.notify_before(changes)  # Letting observers check the deletion
         del self.employees[employee_id]  # Deleting the employee from the employees dictionary
-        self.save_employees()  # Saving the updated employees data to file
+        self.update_org_chart(changes)  # Removing the employee from the hierarchy
+        self.persist_changes(self.employees, changes, undo=self.update_org_chart)  # Persisting the employee change, then telling observers about the deletion
 
     def modify_employee(
             self,
@@ -73,33 +144,110 @@ class EmployeeManagement:  # Definition of the EmployeeManagement class
             date_of_birth=None,
             passport_details=None,
             manager_id=None,
-    ):  # Method for modifying employee attributes
+            expected_version=None,
+    ):  # Method for modifying employee attributes, optionally only if the employee is still at the version the caller read
+        updates = {  # Collecting the provided attributes
+            key: value for key, value in (
+                ("name", name), ("department", department), ("job_title", job_title), ("basic_salary", basic_salary),
+                ("age", age), ("date_of_birth", date_of_birth), ("passport_details", passport_details), ("manager_id", manager_id),
+            )
+            if value is not None  # Skipping attributes left unchanged
+        }
+        self.update_employee(employee_id, updates, expected_version)  # Storing the new values
+
+    def clear_manager(self, employee_id):  # Method for recording that an employee no longer has a manager
+        self.update_employee(employee_id, {"manager_id": None})  # Storing the missing manager, which modify_employee can't express
+
+    def update_employee(self, employee_id, updates, expected_version=None):  # Method for storing new attribute values of an employee
         if employee_id not in self.employees:  # Checking if employee ID exists
             raise ValueError("Employee not found.")  # Raising an error if employee ID doesn't exist
         employee = self.employees[employee_id]  # Getting the employee object
-        if name is not None:  # Checking if name attribute is provided
-            employee.name = name  # Setting the new value for the name attribute
-        if department is not None:  # Checking if department attribute is provided
-            employee.department = department  # Setting the new value for the department attribute
-        if job_title is not None:  # Checking if job_title attribute is provided
-            employee.job_title = job_title  # Setting the new value for the job_title attribute
-        if basic_salary is not None:  # Checking if basic_salary attribute is provided
-            employee.basic_salary = basic_salary  # Setting the new value for the basic_salary attribute
-        if age is not None:  # Checking if age attribute is provided
-            employee.age = age  # Setting the new value for the age attribute
-        if date_of_birth is not None:  # Checking if date_of_birth attribute is provided
-            employee.date_of_birth = date_of_birth  # Setting the new value for the date_of_birth attribute
-        if passport_details is not None:  # Checking if passport_details attribute is provided
-            employee.passport_details = passport_details  # Setting the new value for the passport_details attribute
-        if manager_id is not None:  # Checking if manager_id attribute is provided
-            employee.manager_id = manager_id  # Setting the new value for the manager_id attribute
-        self.save_employees()  # Saving the updated employees data to file
+        check_version(self.label, employee_id, employee, expected_version)  # Refusing the change if someone else changed the employee since
+        updated = modified_copy(employee, updates)  # Copying the employee with the new values
+        if "manager_id" in updates:  # Checking if the employee changes manager
+            self.check_managers({employee_id: updated})  # Refusing a manager who reports to the employee
+        changes = [(employee_id, employee, updated)]  # Describing the modification
+        self.notify_before(changes)  # Letting observers check the new values
+        self.employees[employee_id] = updated  # Storing the modified employee in place of the old one
+        self.update_org_chart(changes)  # Moving the employee in the hierarchy
+        self.persist_changes(self.employees, changes, undo=self.update_org_chart)  # Persisting the employee change, then telling observers about the modification
+
+    def bulk_add_employees(self, employees):  # Method for adding many employees with a single save
+        """
+        Add a batch of employees, saving once at the end. Nothing is added if any
+        employee ID already exists or appears twice in the batch.
+        Returns:
+            int: The number of employees added.
+        """
+        batch = {}  # New employees by ID
+        for employee in employees:  # Iterating over the new employees
+            if employee.employee_id in batch or employee.employee_id in self.employees:  # Checking if employee ID already exists
+                raise ValueError(f"Employee ID already exists: {employee.employee_id}")  # Raising an error naming the duplicate ID
+            batch[employee.employee_id] = employee  # Adding the employee to the batch
+        self.check_managers(batch)  # Refusing managers that would loop the hierarchy
+        changes = [(employee_id, None, employee) for employee_id, employee in batch.items()]  # Describing the additions
+        self.notify_before(changes)  # Letting observers check the new employees
+        self.employees.update(batch)  # Adding the whole batch to the employees dictionary
+        self.update_org_chart(changes)  # Placing the batch in the hierarchy
+        self.persist_changes(self.employees, changes, undo=self.update_org_chart)  # Persisting the batch once, then telling observers about the new employees
+        return len(batch)  # Returning the number of employees added
+
+    def bulk_upsert_employees(self, employees):  # Method for adding or replacing many employees with a single save
+        """
+        Add a batch of employees, replacing any existing employee with the same ID, and save once.
+        Returns:
+            int: The number of employees written.
+        """
+        batch = {employee.employee_id: employee for employee in employees}  # New employees by ID, later entries winning
+        self.check_managers(batch)  # Refusing managers that would loop the hierarchy
+        changes = [(employee_id, self.employees.get(employee_id), employee) for employee_id, employee in batch.items()]  # Describing the additions and replacements
+        self.notify_before(changes)  # Letting observers check the batch
+        self.employees.update(batch)  # Storing the whole batch in the employees dictionary
+        self.update_org_chart(changes)  # Placing the batch in the hierarchy
+        self.persist_changes(self.employees, changes, undo=self.update_org_chart)  # Persisting the batch once, then telling observers about the batch
+        return len(batch)  # Returning the number of employees written
 
     def get_employee(self, employee_id):  # Method for retrieving an employee
         if employee_id not in self.employees:  # Checking if employee ID exists
             raise ValueError("Employee not found.")  # Raising an error if employee ID doesn't exist
         return self.employees[employee_id]  # Returning the employee object
 
+    def reports_under(self, manager_id):  # Method for listing everyone reporting to a manager, directly or not
+        """
+        Returns:
+            list: The Employee objects below the manager in the org chart, depth first.
+        """
+        employees = self.employees  # Making sure the employees are loaded
+        return [employees[employee_id] for employee_id in self.org_chart.descendants(manager_id)]  # Walking the manager's subtree
+
+    def direct_reports(self, manager_id):  # Method for listing the employees a manager manages directly
+        employees = self.employees  # Making sure the employees are loaded
+        return [employees[employee_id] for employee_id in sorted(self.org_chart.children.get(manager_id, ()), key=str)]  # Reading the manager's children
+
+    def reporting_chain(self, employee_id):  # Method for listing an employee's managers up to the top
+        """
+        Returns:
+            list: The Employee objects from the employee's manager up to the top of the org chart.
+        """
+        self.get_employee(employee_id)  # Checking the employee exists
+        employees = self.employees  # The loaded employees
+        return [employees[manager_id] for manager_id in self.org_chart.ancestors(employee_id)]  # Walking up the hierarchy
+
+    def headcount_under(self, manager_id):  # Method for counting everyone reporting to a manager, directly or not
+        self.get_employee(manager_id)  # Checking the manager exists
+        return self.org_chart.sizes[manager_id] - 1  # Reading the subtree size kept by the index, less the manager
+
+    def salary_under(self, manager_id, include_manager=False):  # Method for totalling the basic salaries below a manager
+        """
+        Returns:
+            float: The summed readable basic salaries of everyone reporting to the manager,
+            read from the running subtree totals.
+        """
+        self.get_employee(manager_id)  # Checking the manager exists
+        chart = self.org_chart  # Hierarchy with the subtree totals
+        cents = chart.totals[manager_id] - (0 if include_manager else chart.weights[manager_id])  # Leaving out the manager's own salary unless asked
+        return cents / 100  # Returning it in whole units
+
     def display_employee(self, employee_id):  # Method for displaying details of a specific employee
         employee = self.get_employee(employee_id)  # Getting the employee object
         print(f"Name: {employee.name}")  # Displaying employee name
@@ -113,22 +261,35 @@ class EmployeeManagement:  # Definition of the EmployeeManagement class
         if employee.manager_id:  # Checking if manager ID exists
             print(f"Manager ID: {employee.manager_id}")  # Displaying employee manager ID
 
+    def iter_employees(self):  # Method for streaming the details of all employees one employee at a time
+        """
+        Yield the details of each employee as a block of text, in the layout used by display_all_employees.
+        """
+        for employee_id, employee in self.employees.items():  # Iterating over employees dictionary
+            manager_line = f"Manager ID: {employee.manager_id}\n\n" if employee.manager_id else "\n"  # Adding the manager ID if it exists, otherwise a blank line
+            yield (  # Yielding the formatted employee details
+                f"Employee ID: {employee_id}\n"  # Adding employee ID to the text
+                f"Name: {employee.name}\n"  # Adding employee name to the text
+                f"Department: {employee.department}\n"  # Adding employee department to the text
+                f"Job Title: {employee.job_title}\n"  # Adding employee job title to the text
+                f"Basic Salary: {employee.basic_salary}\n"  # Adding employee basic salary to the text
+                f"Age: {employee.age}\n"  # Adding employee age to the text
+                f"Date of Birth: {employee.date_of_birth}\n"  # Adding employee date of birth to the text
+                f"Passport Details: {employee.passport_details}\n"  # Adding employee passport details to the text
+                + manager_line  # Ending with the manager ID or a blank line
+            )
+
+    def iter_employee_rows(self, fields=EMPLOYEE_FIELDS, snapshot=False):  # Method for streaming employees as tuples of attribute values
+        """
+        Yield one tuple per employee holding the requested attributes (None where an older record lacks one).
+        Args:
+            fields: Attribute names to include, in order.
+            snapshot: Copy the employee references first so the employees may change while the rows are consumed.
+        """
+        return record_rows(self.employees, fields, snapshot)  # Streaming the rows, straight from the columns of a columnar store
+
     def display_all_employees(self):  # Method for displaying details of all employees
         if not self.employees:  # Checking if employees dictionary is empty
             return "No employees to display."  # Returning message if no employees exist
         else:
-            all_employees_info = ""  # Initializing string to store all employees' information
-            for employee_id, employee in self.employees.items():  # Iterating over employees dictionary
-                all_employees_info += f"Employee ID: {employee_id}\n"  # Adding employee ID to the string
-                all_employees_info += f"Name: {employee.name}\n"  # Adding employee name to the string
-                all_employees_info += f"Department: {employee.department}\n"  # Adding employee department to the string
-                all_employees_info += f"Job Title: {employee.job_title}\n"  # Adding employee job title to the string
-                all_employees_info += f"Basic Salary: {employee.basic_salary}\n"  # Adding employee basic salary to the string
-                all_employees_info += f"Age: {employee.age}\n"  # Adding employee age to the string
-                all_employees_info += f"Date of Birth: {employee.date_of_birth}\n"  # Adding employee date of birth to the string
-                all_employees_info += f"Passport Details: {employee.passport_details}\n"  # Adding employee passport details to the string
-                if employee.manager_id:  # Checking if manager ID exists
-                    all_employees_info += f"Manager ID: {employee.manager_id}\n\n"  # Adding employee manager ID to the string if it exists
-                else:
-                    all_employees_info += "\n"  # Adding a blank line if there's no manager ID
-            return all_employees_info  # Returning the string containing all employees' information
+            return "".join(self.iter_employees())  # Joining the streamed details once instead of growing one string
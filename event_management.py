@@ -1,9 +1,57 @@
-import os  # Importing the os module for operating system related functionalities
-import pickle  # Importing the pickle module for object serialization
+import re  # Importing the re module for splitting typed guest lists
+import sys  # Importing the sys module for reporting on standard error
+
+from changes import Observable, apply_external, check_version, modified_copy  # Importing the change notification mixin and version checks
+from indexes import CalendarIndex, FieldIndex, IntervalIndex, MembershipIndex, normalize  # Importing the indexes used for event lookups, the calendar, venue bookings and guests
+from records import Record, record_rows  # Importing the slot-based record base class and row streaming
+from schedule import MINUTES_PER_DAY, day_number, event_schedule, event_window  # Importing the parsers turning date, time and duration into numbers
+from sqlite_storage import CALENDAR_MINUTE, SQLiteRecords, TableCalendarIndex, TableFieldIndex, TableIntervalIndex, TableMembershipIndex  # Importing the SQLite table and the indexes answered by its own
+from storage import open_storage  # Importing the storage factory used to persist records
 
 EVENT_FILE_PATH = "events.bin"  # File path constant for storing event data
+EVENT_FIELDS = ("event_id", "event_type", "theme", "date", "time", "duration", "venue_address", "client_id", "guest_list", "catering_company", "cleaning_company", "decorations_company", "entertainment_company", "furniture_supply_company", "invoice")  # Event attributes in constructor order, used for row output
+SUPPLIER_COMPANY_FIELDS = ("catering_company", "cleaning_company", "decorations_company", "entertainment_company", "furniture_supply_company")  # Event fields naming a supplier company
+EVENT_INDEXED_FIELDS = ("client_id", "venue_address", "date") + SUPPLIER_COMPANY_FIELDS  # Event fields with a secondary index
+SCHEDULE_FIELDS = frozenset(["date", "time", "duration", "venue_address"])  # Event fields deciding when and where a venue is booked
+PARSED_SCHEDULE_FIELDS = ("day", "starts_at", "ends_at")  # Date as days and time span as minutes since 1970-01-01, parsed from the entries on write
+GUEST_LIST_SEPARATORS = re.compile(r"[,;\s]+")  # Commas, semicolons or spaces between typed guest IDs
+
+
+def parse_guest_list(value):  # Function for turning a guest list entry into guest IDs
+    """
+    Turn a guest list into a tuple of guest IDs, keeping the first of any repeats.
+    Accepts typed text such as "G1, G2; G3" or any collection of IDs.
+    Returns:
+        tuple: The guest IDs in order.
+    """
+    if isinstance(value, tuple):  # Checking if the list is already parsed
+        return value  # Returning it unchanged
+    if value is None:  # Checking for a missing list
+        return ()  # Returning an empty list
+    if isinstance(value, str):  # Checking for typed text
+        value = GUEST_LIST_SEPARATORS.split(value)  # Splitting it into IDs
+    return tuple(dict.fromkeys(str(guest_id).strip() for guest_id in value if str(guest_id).strip()))  # Dropping blanks and repeats
+
+
+def stored_guests(event):  # Function for reading the guest IDs a stored event lists
+    """
+    Events saved before guest lists held IDs still carry the text typed in the GUI, such
+    as "mansour and khalid". Its words are not guest IDs, so those events list no guests
+    until migrations.py guest-lists resolves them.
+    Returns:
+        tuple: The guest IDs in order, empty for a legacy text list.
+    """
+    if isinstance(event.guest_list, str):  # Checking for a legacy text list
+        return ()  # Listing no guests rather than its words
+    return parse_guest_list(event.guest_list)  # Returning the stored IDs
 
-class Event:  # Definition of the Event class
+
+def format_guest_list(value):  # Function for showing a guest list as text
+    return ", ".join(parse_guest_list(value))  # Joining the guest IDs with commas
+
+
+class Event(Record):  # Definition of the Event class
+    __slots__ = EVENT_FIELDS + PARSED_SCHEDULE_FIELDS  # Fixed attributes, so instances carry no __dict__
     def __init__(self, event_id, event_type, theme, date, time, duration, venue_address, client_id, guest_list, catering_company, cleaning_company, decorations_company, entertainment_company, furniture_supply_company, invoice):  # Constructor method for initializing event attributes
         self.event_id = event_id  # Assigning event ID
         self.event_type = event_type  # Assigning event type
@@ -13,17 +61,63 @@ class Event:  # Definition of the Event class
         self.duration = duration  # Assigning event duration
         self.venue_address = venue_address  # Assigning event venue address
         self.client_id = client_id  # Assigning client ID for the event
-        self.guest_list = guest_list  # Assigning event guest list
+        self.guest_list = parse_guest_list(guest_list)  # Assigning event guest list as a tuple of guest IDs
         self.catering_company = catering_company  # Assigning catering company for the event
         self.cleaning_company = cleaning_company  # Assigning cleaning company for the event
         self.decorations_company = decorations_company  # Assigning decorations company for the event
         self.entertainment_company = entertainment_company  # Assigning entertainment company for the event
         self.furniture_supply_company = furniture_supply_company  # Assigning furniture supply company for the event
         self.invoice = invoice  # Assigning invoice details for the event
+        self.parse_schedule()  # Parsing the date, time and duration once
+
+    def parse_schedule(self):  # Method for storing the date, time and duration as numbers
+        self.day, self.starts_at, self.ends_at = event_schedule(self.date, self.time, self.duration)  # Parsing the entries
 
-class EventManagement:  # Definition of the EventManagement class
-    def __init__(self):  # Constructor method for initializing event management instance
-        self.events = self.load_events()  # Loading events data when an instance is created
+
+def schedule_values(event):  # Function for reading an event's parsed date and time span
+    """
+    Returns:
+        tuple: (day, starts_at, ends_at) as stored, or parsed from the entries for events
+        saved before they were stored; unreadable entries give None.
+    """
+    day, starts_at, ends_at = (getattr(event, field, None) for field in PARSED_SCHEDULE_FIELDS)  # Reading the stored numbers
+    if day is None and starts_at is None:  # Checking for an event saved before they were stored, or one without a readable date
+        return event_schedule(event.date, event.time, event.duration)  # Parsing the entries, which the parsers cache
+    return day, starts_at, ends_at  # Returning the stored numbers
+
+
+def calendar_minute(event):  # Function for placing an event on the calendar
+    day, starts_at, _ = schedule_values(event)  # Reading the parsed schedule
+    if starts_at is not None:  # Checking if the start time is known
+        return starts_at
+    return day * MINUTES_PER_DAY if day is not None else None  # Placing events without a readable time at midnight
+
+
+class EventManagement(Observable):  # Definition of the EventManagement class
+    label = "events"  # Name passed to observers
+
+    def __init__(self, backend=None, conflict_policy="reject"):  # Constructor method for initializing event management instance
+        self.storage = open_storage(backend, EVENT_FILE_PATH, "events", Event, "event_id")  # Choosing how events data is persisted
+        self._events = None  # Events data, loaded on first access
+        self.event_index = FieldIndex(EVENT_INDEXED_FIELDS)  # Secondary indexes over the events
+        self.venue_bookings = IntervalIndex()  # Per-venue index of the time spans booked by events
+        self.guest_events = MembershipIndex()  # Reverse index of the events each guest attends
+        self.calendar = CalendarIndex()  # Events sorted by start, for date range queries
+        self.legacy_guest_lists = set()  # IDs of the events still holding a typed guest list, found on load
+        self.conflict_policy = conflict_policy  # "reject" refuses double bookings, "report" only returns them
+        self.observers = []  # Objects notified before and after each change
+
+    @property
+    def events(self):  # Property loading events data the first time it is used
+        if self._events is None:  # Checking if the events are not loaded yet
+            self._events = self.load_events()  # Loading events data from the storage
+            self.rebuild_indexes()  # Indexing the loaded events
+        return self._events  # Returning the loaded events
+
+    @events.setter
+    def events(self, value):  # Setter replacing the loaded events data
+        self._events = value  # Storing the new events dictionary
+        self.rebuild_indexes()  # Re-indexing the new events
 
     def load_events(self):  # Method for loading events data from file
         """
@@ -31,47 +125,298 @@ class EventManagement:  # Definition of the EventManagement class
         Returns:
             dict: A dictionary containing loaded event data.
         """
-        if os.path.exists(EVENT_FILE_PATH):  # Checking if the file exists
-            with open(EVENT_FILE_PATH, "rb") as file:  # Opening the file in binary read mode
-                try:
-                    return pickle.load(file)  # Loading data from the file using pickle
-                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
-                    print(f"Error loading events data: {e}")  # Printing error message
-                    return {}  # Returning an empty dictionary if error occurs
-        return {}  # Returning an empty dictionary if file doesn't exist
+        return self.storage.load()  # Loading data through the configured storage
 
     def save_events(self):  # Method for saving events data to file
-        with open(EVENT_FILE_PATH, "wb") as file:  # Opening the file in binary write mode
-            pickle.dump(self.events, file)  # Saving data to the file using pickle
+        self.storage.save(self.events)  # Saving all events data through the configured storage
+
+    def refresh_events(self, external=None):  # Method for picking up events saved by other processes sharing the files
+        """
+        Apply the events other processes added, changed or deleted since the storage
+        last read or wrote them, re-index them and tell observers about each.
+        Args:
+            external: Changed events, or None once deleted, by key, if already read from the
+                storage; they are read now if omitted.
+        Returns:
+            list: The applied changes as (key, old, new) tuples.
+        """
+        if self._events is None:  # Checking if the events are not loaded yet
+            return []  # They are read and indexed in full on first access
+        if external is None:  # Checking if the changes still have to be read
+            external = self.storage.read_changes(self._events)  # Reading the saved changes
+        changes = apply_external(self._events, external)  # Applying the saved changes
+        self.reindex_events(changes)  # Moving them in the indexes
+        if changes:  # Checking if anything changed
+            self.notify_after(changes)  # Telling observers about the changes
+        return changes  # Returning the applied changes
+
+    def rebuild_indexes(self):  # Method for indexing every loaded event from scratch
+        """
+        Index the loaded events in memory, or, for an SQLite table, answer lookups through
+        the table's own indexes without reading its rows. Those read the stored schedule, so
+        events saved before it was stored need 'python migrations.py schedules' first.
+        """
+        if isinstance(self._events, SQLiteRecords):  # Checking for an SQLite table
+            self.event_index = TableFieldIndex(self._events, EVENT_INDEXED_FIELDS)  # Looking fields up through the table's indexes
+            self.venue_bookings = TableIntervalIndex(self._events, "venue_address", "starts_at", "ends_at")  # Looking bookings up through the venue and start index
+            self.guest_events = TableMembershipIndex(self._events, "guest_list")  # Looking guests up through the member table
+            self.calendar = TableCalendarIndex(self._events, CALENDAR_MINUTE)  # Looking dates up through the calendar index
+            self.legacy_guest_lists = set(self._events.keys_where("typeof(guest_list) = 'text'"))  # Finding the typed guest lists, stored as text rather than pickled tuples
+        else:
+            self.event_index = FieldIndex(EVENT_INDEXED_FIELDS)  # Starting the secondary indexes afresh
+            self.venue_bookings = IntervalIndex()  # Starting the venue bookings afresh
+            self.guest_events = MembershipIndex()  # Starting the guest index afresh
+            self.calendar = CalendarIndex()  # Starting the calendar afresh
+            self.legacy_guest_lists = set()  # Starting the events with typed guest lists afresh
+            self.index_loaded_events()  # Indexing the events
+        if self.legacy_guest_lists:  # Checking if any guest list is still typed text
+            print(f"{len(self.legacy_guest_lists)} events still hold typed guest lists; run 'python migrations.py guest-lists' to convert them.", file=sys.stderr)  # Reporting them without mixing the notice into listed or exported data
+
+    def index_loaded_events(self):  # Method for indexing every loaded event in memory
+        starts = []  # (event ID, minute) of every event on the calendar
+        for event_id, event in self._events.items():  # Iterating over the events once, as columnar stores build them while scanning
+            self.event_index.add(event_id, event)  # Indexing each event's fields
+            self.book_venue(event_id, event)  # Booking each event's venue
+            self.guest_events.add(event_id, stored_guests(event))  # Indexing each event's guests
+            if isinstance(event.guest_list, str):  # Checking for a typed guest list saved before lists held IDs
+                self.legacy_guest_lists.add(event_id)  # Remembering it for the migration
+            minute = calendar_minute(event)  # Placing each event on the calendar
+            if minute is not None:  # Checking if the event has a readable date
+                starts.append((event_id, minute))
+        self.calendar.rebuild(starts)  # Sorting the calendar once
+
+    def index_event(self, event_id, event):  # Method for adding one event to every index
+        self.event_index.add(event_id, event)  # Indexing the event's fields
+        self.book_venue(event_id, event)  # Booking the event's venue
+        self.guest_events.add(event_id, stored_guests(event))  # Indexing the event's guests
+        if isinstance(event.guest_list, str):  # Checking for a typed guest list, as events saved by older processes may hold
+            self.legacy_guest_lists.add(event_id)  # Remembering it for the migration
+        minute = calendar_minute(event)  # Placing the event on the calendar
+        if minute is not None:  # Checking if the event has a readable date
+            self.calendar.add(event_id, minute)
+
+    def unindex_event(self, event_id, event):  # Method for removing one event from every index
+        self.event_index.remove(event_id, event)  # Removing the event's fields
+        self.venue_bookings.remove(event_id)  # Releasing the event's venue booking
+        self.guest_events.remove(event_id, stored_guests(event))  # Removing the event's guests
+        self.legacy_guest_lists.discard(event_id)  # Forgetting any typed guest list
+        self.calendar.remove(event_id)  # Taking the event off the calendar
+
+    def reindex_events(self, changes):  # Method for moving changed events in every index
+        for event_id, old, new in changes:  # Iterating over the changes
+            if old is not None:  # Checking if an event was replaced or deleted
+                self.unindex_event(event_id, old)  # Removing its old values from the indexes
+            if new is not None:  # Checking if an event was added or replaced
+                self.index_event(event_id, new)  # Indexing its new values
+
+    def book_venue(self, event_id, event):  # Method for recording when an event occupies its venue
+        venue = normalize(event.venue_address)  # Normalizing the venue address
+        if not venue:  # Checking if the event has no venue, which books nothing
+            return
+        _, starts_at, ends_at = schedule_values(event)  # Reading the event's time span
+        if starts_at is not None:  # Checking if the event can be placed on the calendar
+            self.venue_bookings.add(event_id, venue, starts_at, ends_at)  # Booking the venue for that span
+
+    def venue_conflicts(self, venue_address, date, time, duration, exclude=None):  # Method for finding events booked at a venue during a time span
+        """
+        Find the events that overlap the given booking at the same venue.
+        Returns:
+            list: IDs of the conflicting events; empty if there is none or the schedule can't be read.
+        """
+        self.events  # Making sure the events and their bookings are loaded
+        if not normalize(venue_address):  # Checking if no venue is given
+            return []  # Events without a venue can't double-book one
+        window = event_window(date, time, duration)  # Parsing the requested time span
+        if window is None:  # Checking if the booking can be placed on the calendar
+            return []  # Unreadable schedules can't be checked
+        return self.venue_bookings.overlapping(normalize(venue_address), *window, exclude=exclude)  # Looking up the overlapping bookings
+
+    def check_venue(self, event, exclude=None):  # Method for applying the conflict policy to an event's booking
+        conflicts = self.venue_conflicts(event.venue_address, event.date, event.time, event.duration, exclude)  # Finding the overlapping bookings
+        if conflicts and self.conflict_policy == "reject":  # Checking if double bookings are refused
+            raise ValueError(f"Venue is already booked at that time by event(s): {', '.join(sorted(conflicts))}.")  # Raising an error naming the conflicts
+        return conflicts  # Returning the conflicts for the caller to report
+
+    def all_venue_conflicts(self):  # Method for listing every double booking
+        """
+        Find every pair of events booked at the same venue at overlapping times.
+        Returns:
+            list: (venue address, event ID, event ID) for each conflicting pair.
+        """
+        self.events  # Making sure the events and their bookings are loaded
+        return self.venue_bookings.all_overlaps()  # Sweeping each venue's bookings once
 
     def add_event(self, event):  # Method for adding a new event
         if event.event_id in self.events:  # Checking if event ID already exists
             raise ValueError("Event ID already exists.")  # Raising an error if event ID is not unique
+        conflicts = self.check_venue(event)  # Checking the venue is free at that time
+        changes = [(event.event_id, None, event)]  # Describing the addition
+        self.notify_before(changes)  # Letting observers check the new event
         self.events[event.event_id] = event  # Adding the new event to the events dictionary
-        self.save_events()  # Saving the updated events data to file
+        self.index_event(event.event_id, event)  # Indexing the new event
+        self.persist_changes(self.events, changes, undo=self.reindex_events)  # Persisting only the new event, then telling observers about the new event
+        return conflicts  # Returning the double bookings allowed by the "report" policy
 
-    def delete_event(self, event_id):  # Method for deleting an event
+    def delete_event(self, event_id, expected_version=None):  # Method for deleting an event, optionally only if it is still at the version the caller read
         if event_id not in self.events:  # Checking if event ID exists
             raise ValueError("Event not found.")  # Raising an error if event ID doesn't exist
-        del self.events[event_id]  # Deleting the event from the events dictionary
-        self.save_events()  # Saving the updated events data to file
+        event = self.events[event_id]  # Getting the event being deleted
+        check_version(self.label, event_id, event, expected_version)  # Refusing the deletion if someone else changed the event since
+        changes = [(event_id, event, None)]  # Describing the deletion
+        self.notify_before(changes)  # Letting observers check the deletion
+        del self.events[event_id]  # Deleting the event from the events dictionary, which row-based storages may refuse
+        self.unindex_event(event_id, event)  # Removing the event from the indexes
+        self.persist_changes(self.events, changes, undo=self.reindex_events)  # Persisting the event change, then telling observers about the deletion
 
-    def modify_event(self, event_id, **kwargs):  # Method for modifying event attributes
+    def modify_event(self, event_id, expected_version=None, **kwargs):  # Method for modifying event attributes, optionally only if the event is still at the version the caller read
         if event_id not in self.events:  # Checking if event ID exists
             raise ValueError("Event not found.")  # Raising an error if event ID doesn't exist
         event = self.events[event_id]  # Getting the event object
+        check_version(self.label, event_id, event, expected_version)  # Refusing the change if someone else changed the event since
         allowed_attributes = set(['event_type', 'theme', 'date', 'time', 'duration', 'venue_address', 'client_id', 'guest_list', 'catering_company', 'cleaning_company', 'decorations_company', 'entertainment_company', 'furniture_supply_company', 'invoice'])  # Allowed attributes for modification
-        for key, value in kwargs.items():  # Iterating over keyword arguments
+        for key in kwargs:  # Iterating over keyword arguments
             if key not in allowed_attributes:  # Checking if attribute is allowed for modification
                 raise ValueError(f"{key} is not a valid attribute of Event.")  # Raising an error for invalid attribute
-            setattr(event, key, value)  # Setting the new value for the attribute
-        self.save_events()  # Saving the updated events data to file
+        if "guest_list" in kwargs:  # Checking if the guest list changes
+            kwargs["guest_list"] = parse_guest_list(kwargs["guest_list"])  # Storing it as guest IDs
+        updated = modified_copy(event, kwargs)  # Copying the event with the new values, so a refused change leaves it untouched
+        if not SCHEDULE_FIELDS.isdisjoint(kwargs):  # Checking if the date, time or duration may have changed
+            updated.parse_schedule()  # Parsing them again
+        conflicts = self.check_venue(updated, exclude=event_id) if not SCHEDULE_FIELDS.isdisjoint(kwargs) else []  # Checking the new booking if it moved
+        changes = [(event_id, event, updated)]  # Describing the modification
+        self.notify_before(changes)  # Letting observers check the new values
+        self.events[event_id] = updated  # Storing the modified event in place of the old one, which row-based storages may refuse
+        self.unindex_event(event_id, event)  # Removing the old values from the indexes
+        self.index_event(event_id, updated)  # Indexing the new values
+        self.persist_changes(self.events, changes, undo=self.reindex_events)  # Persisting the event change, then telling observers about the modification
+        return conflicts  # Returning the double bookings allowed by the "report" policy
+
+    def bulk_add_events(self, events):  # Method for adding many events with a single save
+        """
+        Add a batch of events, saving once at the end. Nothing is added if any event ID
+        already exists or appears twice in the batch, or if the conflict policy refuses
+        a double booking (including one between two events of the batch).
+        Returns:
+            int: The number of events added.
+        """
+        batch = {}  # New events by ID
+        for event in events:  # Iterating over the new events
+            if event.event_id in batch or event.event_id in self.events:  # Checking if event ID already exists
+                raise ValueError(f"Event ID already exists: {event.event_id}")  # Raising an error naming the duplicate ID
+            batch[event.event_id] = event  # Adding the event to the batch
+        return self.store_event_batch(batch)  # Storing and persisting the batch
+
+    def bulk_upsert_events(self, events):  # Method for adding or replacing many events with a single save
+        """
+        Add a batch of events, replacing any existing event with the same ID, and save once.
+        Returns:
+            int: The number of events written.
+        """
+        return self.store_event_batch({event.event_id: event for event in events})  # Storing the batch, later entries winning
+
+    def store_event_batch(self, batch):  # Method for storing a batch of events all or nothing
+        changes = [(event_id, self.events.get(event_id), event) for event_id, event in batch.items()]  # Describing the additions and replacements
+        self.notify_before(changes)  # Letting observers check the batch
+        replaced = {}  # Existing events overwritten by the batch
+        stored = []  # IDs of the batch events stored so far
+        try:
+            for event_id, event in batch.items():  # Iterating over the batch
+                old = self.events.get(event_id)  # Getting the event being replaced, if any
+                if old is not None:  # Checking if an event is replaced
+                    replaced[event_id] = old  # Remembering it for undo
+                    self.unindex_event(event_id, old)  # Releasing its indexes and venue booking
+                if old is None or any(getattr(old, field) != getattr(event, field) for field in SCHEDULE_FIELDS):  # Checking if the booking is new or moved, as modify_event does
+                    self.check_venue(event, exclude=event_id)  # Checking the venue is free at that time
+                self.events[event_id] = event  # Storing the event
+                self.index_event(event_id, event)  # Indexing it so later batch events see its booking
+                stored.append(event_id)  # Recording it for undo
+        except ValueError:  # Handling a refused event
+            for event_id in stored:  # Iterating over the stored batch events
+                self.unindex_event(event_id, batch[event_id])  # Removing them from the indexes
+                if event_id not in replaced:  # Checking if the event was new
+                    del self.events[event_id]  # Removing it
+            for event_id, old in replaced.items():  # Iterating over the replaced events
+                self.events[event_id] = old  # Restoring the old event
+                self.index_event(event_id, old)  # Re-indexing it
+            raise
+        self.persist_changes(self.events, changes, undo=self.reindex_events)  # Persisting the batch once, then telling observers about the batch
+        return len(stored)  # Returning the number of events written
 
     def get_event(self, event_id):  # Method for retrieving an event
         if event_id not in self.events:  # Checking if event ID exists
             raise ValueError("Event not found.")  # Raising an error if event ID doesn't exist
         return self.events[event_id]  # Returning the event object
 
+    def find_events(self, **criteria):  # Method for finding events through the secondary indexes
+        """
+        Find the events whose fields equal all of the given values, e.g.
+        find_events(venue_address="yas island", date="3/5/2024").
+        Text is compared ignoring case and surrounding spaces.
+        Returns:
+            list: The matching Event objects.
+        """
+        events = self.events  # Making sure the events and their indexes are loaded
+        for key in criteria:  # Iterating over the requested attributes
+            if key not in EVENT_INDEXED_FIELDS:  # Checking if the attribute is indexed
+                raise ValueError(f"{key} is not an indexed attribute of Event.")  # Raising an error for an unindexed attribute
+        if not criteria:  # Checking if no criteria were given
+            return list(events.values())  # Returning every event
+        candidates = sorted((self.event_index.lookup(key, value) for key, value in criteria.items()), key=len)  # Matching keys per criterion, most selective first
+        matches = set(candidates[0])  # Starting from the smallest set of keys
+        for keys in candidates[1:]:  # Iterating over the other criteria
+            matches &= keys  # Keeping only keys matching this criterion too
+        return [events[event_id] for event_id in matches]  # Returning the matching events
+
+    def events_between(self, first_day, last_day):  # Method for listing the events held from one day to another
+        """
+        List the events starting on any day from first_day to last_day, both included,
+        through the calendar index, e.g. events_between("2026-12-28", "2027-01-03") for a week.
+        Days may be dates, day numbers or text in any accepted date layout.
+        Returns:
+            list: The events in start order; events without a readable time count from midnight.
+        """
+        events = self.events  # Making sure the events and their indexes are loaded
+        start = day_number(first_day) * MINUTES_PER_DAY  # First minute of the first day
+        end = (day_number(last_day) + 1) * MINUTES_PER_DAY  # Minute after the last day
+        return [events[event_id] for event_id in self.calendar.between(start, end)]  # Returning the events in the range
+
+    def events_on(self, day):  # Method for listing the events held on one day
+        return self.events_between(day, day)  # Looking the single day up in the calendar
+
+    def events_for_client(self, client_id):  # Method for listing the events of a client
+        return self.find_events(client_id=client_id)  # Looking the client up in its index
+
+    def events_at_venue(self, venue_address, date=None):  # Method for listing the events booked at a venue
+        if date is None:  # Checking if the date is left open
+            return self.find_events(venue_address=venue_address)  # Looking the venue up in its index
+        return self.find_events(venue_address=venue_address, date=date)  # Intersecting the venue and date indexes
+
+    def events_using_company(self, company):  # Method for listing the events that use a supplier company in any role
+        events = self.events  # Making sure the events and their indexes are loaded
+        event_ids = set()  # Keys of the matching events
+        for field in SUPPLIER_COMPANY_FIELDS:  # Iterating over the supplier company fields
+            event_ids |= self.event_index.lookup(field, company)  # Adding the events using the company in this role
+        return [events[event_id] for event_id in event_ids]  # Returning the matching events
+
+    def events_for_guest(self, guest_id):  # Method for listing the events a guest attends
+        events = self.events  # Making sure the events and their indexes are loaded
+        return [events[event_id] for event_id in self.guest_events.lookup(guest_id)]  # Looking the guest up in the reverse index
+
+    def headcount(self, event_id):  # Method for counting the guests of an event
+        return len(parse_guest_list(self.get_event(event_id).guest_list))  # Returning the number of guest IDs
+
+    def invite_guest(self, event_id, guest_id):  # Method for adding a guest to an event
+        guest_list = parse_guest_list(self.get_event(event_id).guest_list)  # Getting the current guest IDs
+        if guest_id in guest_list:  # Checking if the guest is already invited
+            raise ValueError("Guest is already on the event's guest list.")  # Raising an error for a repeated guest
+        self.modify_event(event_id, guest_list=guest_list + (guest_id,))  # Storing the longer list
+
+    def uninvite_guest(self, event_id, guest_id):  # Method for removing a guest from an event
+        guest_list = parse_guest_list(self.get_event(event_id).guest_list)  # Getting the current guest IDs
+        if guest_id not in guest_list:  # Checking if the guest is invited
+            raise ValueError("Guest is not on the event's guest list.")  # Raising an error for an unknown guest
+        self.modify_event(event_id, guest_list=tuple(other for other in guest_list if other != guest_id))  # Storing the shorter list
+
     def display_event(self, event_id):  # Method for displaying details of a specific event
         event = self.get_event(event_id)  # Getting the event object
         print(f"Event ID: {event.event_id}")  # Displaying event ID
@@ -83,7 +428,7 @@ class EventManagement:  # Definition of the EventManagement class
         print(f"Venue Address: {event.venue_address}")  # Displaying event venue address
         print(f"Client ID: {event.client_id}")  # Displaying client ID for the event
         print("Guest List:")  # Displaying event guest list
-        for guest in event.guest_list:  # Iterating over event guest list
+        for guest in parse_guest_list(event.guest_list):  # Iterating over event guest IDs
             print(f" - {guest}")  # Displaying each guest
         print(f"Catering Company: {event.catering_company}")  # Displaying catering company for the event
         print(f"Cleaning Company: {event.cleaning_company}")  # Displaying cleaning company for the event
@@ -92,25 +437,40 @@ class EventManagement:  # Definition of the EventManagement class
         print(f"Furniture Supply Company: {event.furniture_supply_company}")  # Displaying furniture supply company for the event
         print(f"Invoice: {event.invoice}")  # Displaying invoice details for the event
 
+    def iter_events(self):  # Method for streaming the details of all events one event at a time
+        """
+        Yield the details of each event as a block of text, in the layout used by display_all_events.
+        """
+        for event_id, event in self.events.items():  # Iterating over events dictionary
+            yield (  # Yielding the formatted event details
+                f"Event ID: {event_id}\n"  # Adding event ID to the string
+                f"Type: {event.event_type}\n"  # Adding event type to the string
+                f"Theme: {event.theme}\n"  # Adding event theme to the string
+                f"Date: {event.date}\n"  # Adding event date to the string
+                f"Time: {event.time}\n"  # Adding event time to the string
+                f"Duration: {event.duration}\n"  # Adding event duration to the string
+                f"Venue Address: {event.venue_address}\n"  # Adding event venue address to the string
+                f"Client ID: {event.client_id}\n"  # Adding client ID for the event to the string
+                f"Guest List: {format_guest_list(event.guest_list)}\n"  # Adding event guest IDs to the string
+                f"Catering Company: {event.catering_company}\n"  # Adding catering company for the event to the string
+                f"Cleaning Company: {event.cleaning_company}\n"  # Adding cleaning company for the event to the string
+                f"Decorations Company: {event.decorations_company}\n"  # Adding decorations company for the event to the string
+                f"Entertainment Company: {event.entertainment_company}\n"  # Adding entertainment company for the event to the string
+                f"Furniture Supply Company: {event.furniture_supply_company}\n"  # Adding furniture supply company for the event to the string
+                f"Invoice: {event.invoice}\n\n"  # Adding invoice details for the event to the string
+            )
+
+    def iter_event_rows(self, fields=EVENT_FIELDS, snapshot=False):  # Method for streaming events as tuples of attribute values
+        """
+        Yield one tuple per event holding the requested attributes (None where an older record lacks one).
+        Args:
+            fields: Attribute names to include, in order.
+            snapshot: Copy the event references first so the events may change while the rows are consumed.
+        """
+        return record_rows(self.events, fields, snapshot)  # Streaming the rows, straight from the columns of a columnar store
+
     def display_all_events(self):  # Method for displaying details of all events
         if not self.events:  # Checking if events dictionary is empty
             return "No events to display."  # Returning message if no events exist
         else:
-            all_events_info = ""  # Initializing string to store all events' information
-            for event_id, event in self.events.items():  # Iterating over events dictionary
-                all_events_info += f"Event ID: {event_id}\n"  # Adding event ID to the string
-                all_events_info += f"Type: {event.event_type}\n"  # Adding event type to the string
-                all_events_info += f"Theme: {event.theme}\n"  # Adding event theme to the string
-                all_events_info += f"Date: {event.date}\n"  # Adding event date to the string
-                all_events_info += f"Time: {event.time}\n"  # Adding event time to the string
-                all_events_info += f"Duration: {event.duration}\n"  # Adding event duration to the string
-                all_events_info += f"Venue Address: {event.venue_address}\n"  # Adding event venue address to the string
-                all_events_info += f"Client ID: {event.client_id}\n"  # Adding client ID for the event to the string
-                all_events_info += f"Guest List: {event.guest_list}\n"  # Adding event guest list to the string
-                all_events_info += f"Catering Company: {event.catering_company}\n"  # Adding catering company for the event to the string
-                all_events_info += f"Cleaning Company: {event.cleaning_company}\n"  # Adding cleaning company for the event to the string
-                all_events_info += f"Decorations Company: {event.decorations_company}\n"  # Adding decorations company for the event to the string
-                all_events_info += f"Entertainment Company: {event.entertainment_company}\n"  # Adding entertainment company for the event to the string
-                all_events_info += f"Furniture Supply Company: {event.furniture_supply_company}\n"  # Adding furniture supply company for the event to the string
-                all_events_info += f"Invoice: {event.invoice}\n\n"  # Adding invoice details for the event to the string
-            return all_events_info  # Returning the string containing all events' information
+            return "".join(self.iter_events())  # Joining the streamed details once instead of growing one string
@@ -0,0 +1,325 @@
+import argparse  # Importing the argparse module for command-line options
+import csv  # Importing the csv module for writing CSV files
+import importlib  # Importing the importlib module for loading only the manager an export reads
+import itertools  # Importing the itertools module for splitting rows into chunks
+import json  # Importing the json module for writing JSON Lines files
+import operator  # Importing the operator module for the comparisons of numeric filters
+import os  # Importing the os module for file extensions and renames
+import re  # Importing the re module for reading filter conditions
+import struct  # Importing the struct module for packing the column file index
+
+from indexes import normalize  # Importing the text normalization used by the indexes
+from records import Record, parse_amount  # Importing the record base class and the reader of amounts typed as text
+from storage import BACKEND_HELP, TEMP_SUFFIX, SnapshotError, parse_backend, store_backend, sync_directory  # Importing the storage helpers
+
+CHUNK_SIZE = 5000  # Number of rows read and written together
+GROUP_ROWS = 65536  # Rows per row group of a column file, bounding the memory an export holds
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".cols": "columns"}  # Export formats by file extension
+EXPORT_MAGIC = b"EVEXPRT1"  # First and last bytes of an exported column file
+GROUP_ENTRY = struct.Struct("<QQQ")  # Index entry of one row group: offset, length and number of rows
+TRAILER = struct.Struct("<QQ")  # End of a column file before the magic: offset of the index and number of groups
+CONDITION = re.compile(r"^\s*(\w+)\s*(!=|>=|<=|=|>|<|~)\s*(.*?)\s*$")  # One filter condition such as "budget>=5000"
+STORES = {  # Per store: manager module, manager class and attributes in constructor order
+    "events": ("event_management", "EventManagement", "EVENT_FIELDS"),
+    "guests": ("guest_management", "GuestManagement", "GUEST_FIELDS"),
+    "suppliers": ("supplier_management", "SupplierManagement", "SUPPLIER_FIELDS"),
+    "venues": ("venue_management", "VenueManagement", "VENUE_FIELDS"),
+    "clients": ("client_management", "ClientManagement", "CLIENT_FIELDS"),
+    "employees": ("employee_management", "EmployeeManagement", "EMPLOYEE_FIELDS"),
+}
+
+
+def cell_text(value):  # Function for showing a value, such as a guest list, as text
+    if value is None:  # Checking for a missing value
+        return ""
+    if isinstance(value, (tuple, list)):  # Checking for a list of IDs
+        return ", ".join(map(str, value))  # Joining them with commas, as the guest list entry takes them
+    return str(value)  # Returning other values as text
+
+
+def store_fields(label):  # Function for listing a store's attributes
+    module_name, _, fields_name = STORES[label]  # Looking up where they are defined
+    return getattr(importlib.import_module(module_name), fields_name)  # Returning them
+
+
+def check_fields(label, fields):  # Function for checking attribute names given for a store
+    module = importlib.import_module(STORES[label][0])  # Module defining the store's records
+    known = set(getattr(module, label[:-1].capitalize()).__slots__ + Record.__slots__)  # Attributes the records store, such as an event's parsed day
+    unknown = [field for field in fields if field not in known]  # Names matching no attribute
+    if unknown:  # Checking every name is known
+        raise ValueError(f"Unknown {label[:-1]} attributes: {', '.join(unknown)}")
+
+
+def open_management(label, backend=None):  # Function for creating the manager of one store, importing only its module
+    module_name, class_name, _ = STORES[label]  # Looking up the manager
+    return getattr(importlib.import_module(module_name), class_name)(backend=store_backend(backend, label))  # Creating it with the store's backend
+
+
+def equals(value, wanted):  # Function for testing a value against the text of a "field=value" condition
+    if isinstance(value, (int, float)) and not isinstance(value, bool):  # Checking for a stored number, such as a budget
+        return value == parse_amount(wanted)  # Comparing amounts, so "5000" matches 5000.0
+    return normalize(cell_text(value)) == wanted  # Comparing text ignoring case and surrounding spaces
+
+
+def number_test(compare):  # Function for building a test of an amount
+    def test(value, wanted):  # Function testing one stored value
+        amount = parse_amount(value)  # Reading the value as an amount
+        return amount is not None and compare(amount, wanted)  # Leaving out values that aren't numbers
+    return test
+
+
+OPERATORS = {  # Test of each filter operator, taking the stored value and the condition's value
+    "=": equals,
+    "!=": lambda value, wanted: not equals(value, wanted),
+    "~": lambda value, wanted: wanted in normalize(cell_text(value)),
+    ">": number_test(operator.gt),
+    ">=": number_test(operator.ge),
+    "<": number_test(operator.lt),
+    "<=": number_test(operator.le),
+}
+
+
+def parse_filters(conditions):  # Function for reading filter conditions
+    """
+    Read conditions such as "department=Ops", "name~smith" or "budget>=5000". Text is
+    compared ignoring case and surrounding spaces; <, <=, > and >= compare amounts and
+    leave out records whose value isn't a number.
+    Returns:
+        list: (field, operator, value) per condition.
+    """
+    filters = []  # Parsed conditions
+    for condition in conditions:  # Iterating over the conditions
+        match = CONDITION.match(condition)  # Splitting the field, operator and value
+        if match is None:  # Checking the condition can be read
+            raise ValueError(f"Filter can't be read: {condition}")
+        field, test, value = match.groups()  # Naming the parts
+        if test in ("=", "!=", "~"):  # Checking for a text comparison
+            filters.append((field, test, normalize(value)))  # Comparing normalized text
+        elif parse_amount(value) is None:  # Checking a numeric comparison has a number
+            raise ValueError(f"Filter {condition} needs a number.")
+        else:
+            filters.append((field, test, parse_amount(value)))  # Comparing amounts
+    return filters  # Returning the conditions
+
+
+def export_rows(management, label, fields, filters=()):  # Function for streaming the rows an export writes
+    """
+    Check the attribute names, then read only the exported and filtered attributes from the store, a row at a time, and drop
+    the rows failing a filter before anything is serialized. Columnar stores decode just
+    those columns, and no store builds records for the rows.
+    Args:
+        fields: Attributes to export, in order.
+        filters: Conditions as returned by parse_filters, all of which a row must meet.
+    """
+    scanned = list(fields) + [field for field, _, _ in filters if field not in fields]  # Exported attributes, then the ones only filtered on
+    check_fields(label, scanned)  # Refusing misspelt attributes, which would export blanks or nothing
+    tests = [(scanned.index(field), OPERATORS[test], value) for field, test, value in filters]  # Position of each filtered attribute with its test
+    rows = getattr(management, f"iter_{label[:-1]}_rows")(tuple(scanned), snapshot=True)  # Streaming the rows, straight from the columns of a columnar store
+    return matching_rows(rows, tests, len(fields))  # Filtering them as they are read
+
+
+def matching_rows(rows, tests, width):  # Function for dropping the rows failing a filter
+    for row in rows:  # Iterating over the rows
+        if all(test(row[position], value) for position, test, value in tests):  # Checking every condition
+            yield row[:width] if len(row) > width else row  # Yielding the exported attributes
+
+
+class CsvWriter:  # Definition of the CsvWriter class
+    # Writes rows to a CSV file with a header row, joining guest lists with commas.
+    def __init__(self, file, fields):  # Constructor method for starting the file
+        self.writer = csv.writer(file)  # Creating the CSV writer
+        self.writer.writerow(fields)  # Writing the header
+
+    def write(self, rows):  # Method for writing a chunk of rows
+        self.writer.writerows([cell_text(value) for value in row] for row in rows)  # Writing each row as text
+
+    def finish(self):  # Method for ending the file
+        pass  # CSV files need no ending
+
+
+class JsonLinesWriter:  # Definition of the JsonLinesWriter class
+    # Writes one JSON object per line, keeping numbers as numbers and guest lists as arrays.
+    def __init__(self, file, fields):  # Constructor method for starting the file
+        self.file = file  # Open text file
+        self.fields = fields  # Attribute names, the keys of every object
+
+    def write(self, rows):  # Method for writing a chunk of rows
+        self.file.writelines(json.dumps(dict(zip(self.fields, row)), default=str) + "\n" for row in rows)  # Writing one object per line
+
+    def finish(self):  # Method for ending the file
+        pass  # JSON Lines files need no ending
+
+
+class ColumnFileWriter:  # Definition of the ColumnFileWriter class
+    # Writes a column file split into row groups, in the manner of Parquet: each group is a
+    # column table as the columnar backend stores it, and an index of the groups at the end
+    # of the file lets a reader map any group without reading the others. At most one
+    # group's rows are held in memory.
+    def __init__(self, file, fields, group_rows=GROUP_ROWS):  # Constructor method for starting the file
+        self.file = file  # Open binary file
+        self.fields = fields  # Column names
+        self.group_rows = group_rows  # Rows per group
+        self.pending = []  # Rows of the group being gathered
+        self.groups = []  # (offset, length, rows) of every written group
+        self.offset = len(EXPORT_MAGIC)  # Where the next group starts
+        file.write(EXPORT_MAGIC)  # Marking the file as an exported column file
+
+    def write(self, rows):  # Method for writing a chunk of rows
+        for row in rows:  # Iterating over the rows
+            self.pending.append(row)  # Gathering the row
+            if len(self.pending) >= self.group_rows:  # Checking if the group is full
+                self.flush_group()  # Writing it
+
+    def flush_group(self):  # Method for writing the gathered rows as one group
+        if not self.pending:  # Checking there are rows to write
+            return
+        from columnar_storage import encode_columns, padding  # Importing the column layout of the columnar backend only for column files
+        gap = padding(self.offset)  # Bytes aligning the group, so its columns can be read in place
+        self.file.write(bytes(gap))  # Writing them
+        self.offset += gap  # Moving past them
+        length = 0  # Size of the group
+        for part in encode_columns(self.fields, self.pending):  # Iterating over the group's header and sections
+            self.file.write(part)  # Writing each
+            length += len(part)
+        self.groups.append((self.offset, length, len(self.pending)))  # Indexing the group
+        self.offset += length  # Moving past it
+        self.pending = []  # Starting the next group
+
+    def finish(self):  # Method for writing the last group and the index
+        self.flush_group()  # Writing the rows gathered last
+        index_offset = self.offset  # Where the index starts
+        for entry in self.groups:  # Iterating over the groups
+            self.file.write(GROUP_ENTRY.pack(*entry))  # Writing its entry
+        self.file.write(TRAILER.pack(index_offset, len(self.groups)) + EXPORT_MAGIC)  # Writing where the index is, then the marker
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonLinesWriter, "columns": ColumnFileWriter}  # Writer class of each export format
+
+
+def export_format(path, output_format=None):  # Function for choosing an export format
+    output_format = output_format or FORMATS.get(os.path.splitext(path)[1].lower())  # Choosing it from the extension unless given
+    if output_format not in WRITERS:  # Checking the format is known
+        raise ValueError(f"Unsupported export file type: {output_format or path}")
+    return output_format  # Returning the format
+
+
+class Export:  # Definition of the Export class
+    # An export in progress: rows are written to a temporary file, chunk by chunk, which
+    # replaces the target file only once every row is written.
+    def __init__(self, path, fields, output_format=None):  # Constructor method for opening the temporary file
+        self.path = path  # File to write
+        self.temp_path = path + TEMP_SUFFIX  # File written until the export is complete
+        self.format = export_format(path, output_format)  # Format of the file
+        binary = self.format == "columns"  # Whether the format is binary
+        self.file = open(self.temp_path, "wb") if binary else open(self.temp_path, "w", newline="", encoding="utf-8")  # Opening the temporary file
+        self.writer = WRITERS[self.format](self.file, tuple(fields))  # Starting the file
+        self.count = 0  # Number of rows written
+
+    def write(self, rows):  # Method for writing a chunk of rows
+        rows = list(rows)  # Holding the chunk, to count it
+        self.writer.write(rows)  # Writing it
+        self.count += len(rows)  # Counting it
+
+    def finish(self):  # Method for completing the file
+        self.writer.finish()  # Ending the file
+        self.file.flush()  # Handing the bytes to the operating system
+        os.fsync(self.file.fileno())  # Waiting until they are on disk
+        self.file.close()  # Closing the temporary file
+        os.replace(self.temp_path, self.path)  # Putting the finished file in place in one step
+        sync_directory(self.path)  # Making the rename survive a crash
+        return self.count  # Returning the number of rows written
+
+    def abort(self):  # Method for dropping an unfinished export
+        self.file.close()  # Closing the temporary file
+        if os.path.exists(self.temp_path):  # Checking if it is still there
+            os.remove(self.temp_path)  # Removing it, leaving any earlier export in place
+
+
+def iter_chunks(rows, chunk_size=CHUNK_SIZE):  # Function for splitting streamed rows into chunks
+    rows = iter(rows)  # Making sure the rows are consumed once
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))  # Taking the next chunk
+        if not chunk:  # Checking if the rows are finished
+            return
+        yield chunk
+
+
+def export_file(label, path, management, fields=None, filters=(), output_format=None, chunk_size=CHUNK_SIZE, progress=None):  # Function for exporting a whole store
+    """
+    Write a store's records to a CSV, JSON Lines or column file without loading them all:
+    rows are streamed from the manager, filtered, and written a chunk at a time.
+    Args:
+        label: Name of the records, such as "guests".
+        path: File to write; the format follows the extension (.csv, .jsonl, .cols) unless given.
+        management: Manager holding the records.
+        fields: Attributes to export, in order; every attribute if omitted.
+        filters: Conditions as returned by parse_filters, or their text.
+        progress: Callable receiving the running number of exported records.
+    Returns:
+        int: The number of records exported.
+    """
+    fields = tuple(fields or store_fields(label))  # Exported attributes, every one in constructor order if omitted
+    filters = [parse_filters([condition])[0] if isinstance(condition, str) else condition for condition in filters]  # Reading conditions given as text
+    export = Export(path, fields, output_format)  # Opening the temporary file
+    try:
+        for chunk in iter_chunks(export_rows(management, label, fields, filters), chunk_size):  # Iterating over the chunks of rows
+            export.write(chunk)  # Writing each
+            if progress is not None:  # Checking if progress is reported
+                progress(export.count)  # Reporting the progress
+    except BaseException:  # Handling any failure, interruptions included
+        export.abort()  # Dropping the unfinished file
+        raise
+    return export.finish()  # Completing the file and returning the number of records
+
+
+def read_column_file(path, fields=None):  # Function for streaming the records of an exported column file
+    """
+    Map each row group in turn and yield one dictionary per row, decoding only the
+    requested columns a chunk at a time.
+    Args:
+        fields: Columns to read; every column if omitted.
+    """
+    from columnar_storage import ColumnTable  # Importing the column file reader only for column files
+    with open(path, "rb") as file:  # Opening the file to read its index
+        file.seek(0, os.SEEK_END)  # Finding its end
+        size = file.tell()  # Size of the file
+        if size < len(EXPORT_MAGIC) * 2 + TRAILER.size:  # Checking the file can hold an index
+            raise SnapshotError(f"{path} is not an exported column file.")
+        file.seek(size - len(EXPORT_MAGIC) - TRAILER.size)  # Moving to the trailer
+        index_offset, group_count = TRAILER.unpack(file.read(TRAILER.size))  # Reading where the index is
+        if file.read(len(EXPORT_MAGIC)) != EXPORT_MAGIC:  # Checking the file ends with the marker
+            raise SnapshotError(f"{path} is not an exported column file.")
+        file.seek(index_offset)  # Moving to the index
+        groups = [GROUP_ENTRY.unpack(file.read(GROUP_ENTRY.size)) for _ in range(group_count)]  # Reading the group entries
+    for offset, length, _ in groups:  # Iterating over the groups
+        table = ColumnTable(path, offset, length)  # Mapping the group
+        try:
+            names = list(fields or table.columns)  # Columns to read
+            for start in range(0, table.count, CHUNK_SIZE):  # Iterating over chunks of rows
+                columns = [table.column(name, start, start + CHUNK_SIZE) if name in table.columns else [None] * (min(start + CHUNK_SIZE, table.count) - start) for name in names]  # Decoding the chunk of each column
+                for values in zip(*columns):  # Iterating over the rows
+                    yield dict(zip(names, values))
+        finally:
+            table.close()  # Unmapping the group
+
+
+def main():  # Function for running the exporter from the command line
+    parser = argparse.ArgumentParser(description="Export records to a CSV, JSON Lines or column file.")  # Creating the argument parser
+    parser.add_argument("entity", choices=sorted(STORES), help="kind of records to export")  # Kind of records
+    parser.add_argument("path", help="CSV (.csv), JSON Lines (.jsonl) or column (.cols) file to write")  # File to write
+    parser.add_argument("--fields", help="comma-separated attributes to export, all if omitted")  # Exported attributes
+    parser.add_argument("--where", action="append", default=[], help="condition a record must meet, such as department=Ops, name~smith or budget>=5000; repeatable")  # Filters
+    parser.add_argument("--format", choices=sorted(WRITERS), default=None, help="file format, chosen from the extension if omitted")  # File format
+    parser.add_argument("--backend", type=parse_backend, default=None, help=BACKEND_HELP)  # Storage backend, optionally per store
+    args = parser.parse_args()  # Parsing the arguments
+
+    management = open_management(args.entity, args.backend)  # Opening only the exported store
+    fields = args.fields.split(",") if args.fields else None  # Exported attributes
+    total = export_file(args.entity, args.path, management, fields, parse_filters(args.where), args.format,
+                        progress=lambda count: print(f"\rExported {count} {args.entity}", end="", flush=True))  # Exporting with progress output
+    management.storage.close()  # Releasing the storage
+    print(f"\rExported {total} {args.entity}.")  # Reporting the result
+
+
+if __name__ == "__main__":
+    main()  # Running the exporter
@@ -1,9 +1,12 @@
-import os  # Importing the os module for operating system related functionalities
-import pickle  # Importing the pickle module for object serialization
+from changes import Observable, apply_external, check_version, modified_copy  # Importing the change notification mixin and version checks
+from records import Record, record_rows  # Importing the slot-based record base class and row streaming
+from storage import open_storage  # Importing the storage factory used to persist records
 
 GUEST_FILE_PATH = "guests.bin"  # File path constant for storing guest data
+GUEST_FIELDS = ("guest_id", "name", "address", "contact_details")  # Guest attributes in constructor order, used for row output
 
-class Guest:  # Definition of the Guest class
+class Guest(Record):  # Definition of the Guest class
+    __slots__ = GUEST_FIELDS  # Fixed attributes, so instances carry no __dict__
     # Initializes a Guest object with personal contact details.
     def __init__(self, guest_id, name, address, contact_details):  # Constructor method for initializing guest attributes
         self.guest_id = guest_id  # Unique identifier for the guest
@@ -11,9 +14,23 @@ class Guest:  # Definition of the Guest class
         self.address = address  # Address of the guest
         self.contact_details = contact_details  # Contact details for the guest
 
-class GuestManagement:  # Definition of the GuestManagement class
-    def __init__(self):  # Constructor method for initializing guest management instance
-        self.guests = self.load_guests()  # Loading guests data when an instance is created
+class GuestManagement(Observable):  # Definition of the GuestManagement class
+    label = "guests"  # Name passed to observers
+
+    def __init__(self, backend=None):  # Constructor method for initializing guest management instance
+        self.storage = open_storage(backend, GUEST_FILE_PATH, "guests", Guest, "guest_id")  # Choosing how guests data is persisted
+        self._guests = None  # Guests data, loaded on first access
+        self.observers = []  # Objects notified before and after each change
+
+    @property
+    def guests(self):  # Property loading guests data the first time it is used
+        if self._guests is None:  # Checking if the guests are not loaded yet
+            self._guests = self.load_guests()  # Loading guests data from the storage
+        return self._guests  # Returning the loaded guests
+
+    @guests.setter
+    def guests(self, value):  # Setter replacing the loaded guests data
+        self._guests = value  # Storing the new guests dictionary
 
     def load_guests(self):  # Method for loading guests data from file
         """
@@ -21,41 +38,92 @@ class GuestManagement:  # Definition of the GuestManagement class
         Returns:
             dict: A dictionary containing loaded guest data.
         """
-        if os.path.exists(GUEST_FILE_PATH):  # Checking if the file exists
-            with open(GUEST_FILE_PATH, "rb") as file:  # Opening the file in binary read mode
-                try:
-                    return pickle.load(file)  # Loading data from the file using pickle
-                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
-                    print(f"Error loading guests data: {e}")  # Printing error message
-                    return {}  # Returning an empty dictionary if error occurs
-        return {}  # Returning an empty dictionary if file doesn't exist
+        return self.storage.load()  # Loading data through the configured storage
 
     def save_guests(self):  # Method for saving guests data to file
-        with open(GUEST_FILE_PATH, "wb") as file:  # Opening the file in binary write mode
-            pickle.dump(self.guests, file)  # Saving data to the file using pickle
+        self.storage.save(self.guests)  # Saving all guests data through the configured storage
+
+    def refresh_guests(self, external=None):  # Method for picking up guests saved by other processes sharing the files
+        """
+        Apply the guests other processes added, changed or deleted since the storage
+        last read or wrote them, and tell observers about each.
+        Args:
+            external: Changed guests, or None once deleted, by key, if already read from the
+                storage; they are read now if omitted.
+        Returns:
+            list: The applied changes as (key, old, new) tuples.
+        """
+        if self._guests is None:  # Checking if the guests are not loaded yet
+            return []  # They are read in full on first access
+        if external is None:  # Checking if the changes still have to be read
+            external = self.storage.read_changes(self._guests)  # Reading the saved changes
+        changes = apply_external(self._guests, external)  # Applying the saved changes
+        if changes:  # Checking if anything changed
+            self.notify_after(changes)  # Telling observers about the changes
+        return changes  # Returning the applied changes
 
     def add_guest(self, guest):  # Method for adding a new guest
         if guest.guest_id in self.guests:  # Checking if guest ID already exists
             raise ValueError("Guest ID already exists.")  # Raising an error if guest ID is not unique
+        changes = [(guest.guest_id, None, guest)]  # Describing the addition
+        self.notify_before(changes)  # Letting observers check the new guest
         self.guests[guest.guest_id] = guest  # Adding the new guest to the guests dictionary
-        self.save_guests()  # Saving the updated guests data to file
+        self.persist_changes(self.guests, changes)  # Persisting only the new guest, then telling observers about the new guest
 
-    def delete_guest(self, guest_id):  # Method for deleting a guest
+    def delete_guest(self, guest_id, expected_version=None):  # Method for deleting a guest, optionally only if it is still at the version the caller read
         if guest_id not in self.guests:  # Checking if guest ID exists
             raise ValueError("Guest not found.")  # Raising an error if guest ID doesn't exist
+        check_version(self.label, guest_id, self.guests[guest_id], expected_version)  # Refusing the deletion if someone else changed the guest since
+        changes = [(guest_id, self.guests[guest_id], None)]  # Describing the deletion
+        self.notify_before(changes)  # Letting observers check the deletion
         del self.guests[guest_id]  # Deleting the guest from the guests dictionary
-        self.save_guests()  # Saving the updated guests data to file
+        self.persist_changes(self.guests, changes)  # Persisting the guest change, then telling observers about the deletion
 
-    def modify_guest(self, guest_id, **kwargs):  # Method for modifying guest attributes
+    def modify_guest(self, guest_id, expected_version=None, **kwargs):  # Method for modifying guest attributes, optionally only if the guest is still at the version the caller read
         if guest_id not in self.guests:  # Checking if guest ID exists
             raise ValueError("Guest not found.")  # Raising an error if guest ID doesn't exist
         guest = self.guests[guest_id]  # Getting the guest object
+        check_version(self.label, guest_id, guest, expected_version)  # Refusing the change if someone else changed the guest since
         allowed_attributes = set(['name', 'address', 'contact_details'])  # Allowed attributes for modification
-        for key, value in kwargs.items():  # Iterating over keyword arguments
+        for key in kwargs:  # Iterating over keyword arguments
             if key not in allowed_attributes:  # Checking if attribute is allowed for modification
                 raise ValueError(f"{key} is not a valid attribute of Guest.")  # Raising an error for invalid attribute
-            setattr(guest, key, value)  # Setting the new value for the attribute
-        self.save_guests()  # Saving the updated guests data to file
+        updated = modified_copy(guest, kwargs)  # Copying the guest with the new values
+        changes = [(guest_id, guest, updated)]  # Describing the modification
+        self.notify_before(changes)  # Letting observers check the new values
+        self.guests[guest_id] = updated  # Storing the modified guest in place of the old one
+        self.persist_changes(self.guests, changes)  # Persisting the guest change, then telling observers about the modification
+
+    def bulk_add_guests(self, guests):  # Method for adding many guests with a single save
+        """
+        Add a batch of guests, saving once at the end. Nothing is added if any
+        guest ID already exists or appears twice in the batch.
+        Returns:
+            int: The number of guests added.
+        """
+        batch = {}  # New guests by ID
+        for guest in guests:  # Iterating over the new guests
+            if guest.guest_id in batch or guest.guest_id in self.guests:  # Checking if guest ID already exists
+                raise ValueError(f"Guest ID already exists: {guest.guest_id}")  # Raising an error naming the duplicate ID
+            batch[guest.guest_id] = guest  # Adding the guest to the batch
+        changes = [(guest_id, None, guest) for guest_id, guest in batch.items()]  # Describing the additions
+        self.notify_before(changes)  # Letting observers check the new guests
+        self.guests.update(batch)  # Adding the whole batch to the guests dictionary
+        self.persist_changes(self.guests, changes)  # Persisting the batch once, then telling observers about the new guests
+        return len(batch)  # Returning the number of guests added
+
+    def bulk_upsert_guests(self, guests):  # Method for adding or replacing many guests with a single save
+        """
+        Add a batch of guests, replacing any existing guest with the same ID, and save once.
+        Returns:
+            int: The number of guests written.
+        """
+        batch = {guest.guest_id: guest for guest in guests}  # New guests by ID, later entries winning
+        changes = [(guest_id, self.guests.get(guest_id), guest) for guest_id, guest in batch.items()]  # Describing the additions and replacements
+        self.notify_before(changes)  # Letting observers check the batch
+        self.guests.update(batch)  # Storing the whole batch in the guests dictionary
+        self.persist_changes(self.guests, changes)  # Persisting the batch once, then telling observers about the batch
+        return len(batch)  # Returning the number of guests written
 
     def get_guest(self, guest_id):  # Method for retrieving a guest
         if guest_id not in self.guests:  # Checking if guest ID exists
@@ -69,14 +137,29 @@ class GuestManagement:  # Definition of the GuestManagement class
         print(f"Address: {guest.address}")  # Displaying guest address
         print(f"Contact Details: {guest.contact_details}")  # Displaying guest contact details
 
+    def iter_guests(self):  # Method for streaming the details of all guests one guest at a time
+        """
+        Yield the details of each guest as a block of text, in the layout used by display_all_guests.
+        """
+        for guest_id, guest in self.guests.items():  # Iterating over guests dictionary
+            yield (  # Yielding the formatted guest details
+                f"Guest ID: {guest_id}\n"  # Adding guest ID to the string
+                f"Name: {guest.name}\n"  # Adding guest name to the string
+                f"Address: {guest.address}\n"  # Adding guest address to the string
+                f"Contact Details: {guest.contact_details}\n\n"  # Adding guest contact details to the string
+            )
+
+    def iter_guest_rows(self, fields=GUEST_FIELDS, snapshot=False):  # Method for streaming guests as tuples of attribute values
+        """
+        Yield one tuple per guest holding the requested attributes (None where an older record lacks one).
+        Args:
+            fields: Attribute names to include, in order.
+            snapshot: Copy the guest references first so the guests may change while the rows are consumed.
+        """
+        return record_rows(self.guests, fields, snapshot)  # Streaming the rows, straight from the columns of a columnar store
+
     def display_all_guests(self):  # Method for displaying details of all guests
         if not self.guests:  # Checking if guests dictionary is empty
             return "No guests to display."  # Returning message if no guests exist
         else:
-            all_guests_info = ""  # Initializing string to store all guests' information
-            for guest_id, guest in self.guests.items():  # Iterating over guests dictionary
-                all_guests_info += f"Guest ID: {guest_id}\n"  # Adding guest ID to the string
-                all_guests_info += f"Name: {guest.name}\n"  # Adding guest name to the string
-                all_guests_info += f"Address: {guest.address}\n"  # Adding guest address to the string
-                all_guests_info += f"Contact Details: {guest.contact_details}\n\n"  # Adding guest contact details to the string
-            return all_guests_info  # Returning the string containing all guests' information
+            return "".join(self.iter_guests())  # Joining the streamed details once instead of growing one string
@@ -0,0 +1,150 @@
+import argparse  # Importing the argparse module for command-line options
+import csv  # Importing the csv module for reading CSV files
+import itertools  # Importing the itertools module for splitting rows into chunks
+import json  # Importing the json module for reading JSON files
+import os  # Importing the os module for file extensions
+
+from event_management import Event, EventManagement, EVENT_FIELDS  # Importing the event record, manager and fields
+from guest_management import Guest, GuestManagement, GUEST_FIELDS  # Importing the guest record, manager and fields
+from supplier_management import Supplier, SupplierManagement, SUPPLIER_FIELDS  # Importing the supplier record, manager and fields
+from venue_management import Venue, VenueManagement, VENUE_FIELDS  # Importing the venue record, manager and fields
+from client_management import Client, ClientManagement, CLIENT_FIELDS  # Importing the client record, manager and fields
+from employee_management import Employee, EmployeeManagement, EMPLOYEE_FIELDS  # Importing the employee record, manager and fields
+from context import BACKEND_HELP, DataContext, parse_backend  # Importing the shared data context owning one manager per store
+from exporter import read_column_file  # Importing the reader of exported column files
+
+CHUNK_SIZE = 5000  # Number of records validated and saved together
+
+
+def optional_number(parse):  # Function for building the converter of a numeric field
+    """
+    Args:
+        parse: int or float, applied to text cells.
+    Returns:
+        Callable turning a blank cell into None, as the GUI stores a field left empty, and
+        text that isn't a number into itself, as typed in the GUI; readers such as
+        matching.capacity_bounds treat both as no limit. Numbers read from JSON are kept.
+    """
+    def convert(value):  # Function converting one cell
+        if not isinstance(value, str):  # Checking for a number or null read from JSON
+            return value
+        if not value:  # Checking for a blank cell
+            return None
+        try:
+            return parse(value)  # Reading the number
+        except ValueError:  # Handling text that isn't a number
+            return value  # Keeping it as typed
+    return convert
+
+
+ENTITIES = {  # Per entity: record class, manager class, fields, key field, and converters for typed fields
+    "events": (Event, EventManagement, EVENT_FIELDS, "event_id", {}),
+    "guests": (Guest, GuestManagement, GUEST_FIELDS, "guest_id", {}),
+    "suppliers": (Supplier, SupplierManagement, SUPPLIER_FIELDS, "supplier_id", {}),
+    "venues": (Venue, VenueManagement, VENUE_FIELDS, "venue_id", {"min_guests": optional_number(int), "max_guests": optional_number(int)}),  # Venue capacities are stored as numbers where they can be read
+    "clients": (Client, ClientManagement, CLIENT_FIELDS, "client_id", {"budget": optional_number(float)}),  # Client budgets are stored as numbers where they can be read
+    "employees": (Employee, EmployeeManagement, EMPLOYEE_FIELDS, "employee_id", {"manager_id": lambda value: value or None}),  # A blank manager ID means no manager
+}
+
+
+def read_rows(path):  # Function for streaming dictionaries from a CSV or JSON file
+    """
+    Yield one dictionary per record of the file. CSV files need a header row of attribute
+    names; .jsonl/.ndjson files hold one JSON object per line; .json files hold a list of objects;
+    .cols files are column files written by the exporter.
+    """
+    extension = os.path.splitext(path)[1].lower()  # Reading the file extension
+    if extension == ".csv":  # Checking for a CSV file
+        with open(path, newline="", encoding="utf-8-sig") as file:  # Opening the file, ignoring a spreadsheet byte-order mark
+            yield from csv.DictReader(file)  # Yielding each row as a dictionary
+    elif extension in (".jsonl", ".ndjson"):  # Checking for a JSON Lines file
+        with open(path, encoding="utf-8") as file:  # Opening the file
+            for line in file:  # Reading one line at a time
+                if line.strip():  # Skipping blank lines
+                    yield json.loads(line)  # Yielding the decoded object
+    elif extension == ".json":  # Checking for a JSON file
+        with open(path, encoding="utf-8") as file:  # Opening the file
+            yield from json.load(file)  # Yielding each object of the list
+    elif extension == ".cols":  # Checking for an exported column file
+        yield from read_column_file(path)  # Yielding each row, one row group mapped at a time
+    else:
+        raise ValueError(f"Unsupported import file type: {extension or path}")  # Raising an error for an unknown format
+
+
+def build_record(entity, row):  # Function for turning one imported row into a record
+    record_class, _, fields, key_field, converters = ENTITIES[entity]  # Looking up how to build the record
+    values = {}  # Constructor arguments
+    for field in fields:  # Iterating over the record's attributes
+        value = row.get(field, "")  # Reading the value, blank if the column is missing
+        if isinstance(value, str):  # Checking for text
+            value = value.strip()  # Ignoring surrounding spaces
+        converter = converters.get(field)  # Looking up a converter for typed fields
+        values[field] = converter(value) if converter else value  # Converting the value if needed
+    if not values[key_field]:  # Checking the record has an ID
+        raise ValueError(f"Missing ID in imported {entity} row: {row}")  # Raising an error for a row without ID
+    return record_class(**values)  # Building the record
+
+
+def iter_records(entity, path):  # Function for streaming records from a file
+    for number, row in enumerate(read_rows(path), 1):  # Iterating over the rows, counted from 1 after any header
+        try:
+            yield build_record(entity, row)  # Building the record
+        except ValueError as e:  # Handling a row that can't be imported
+            raise ValueError(f"Row {number} of {path}: {e}") from e  # Naming the row
+
+
+def iter_chunks(entity, path, chunk_size=CHUNK_SIZE):  # Function for streaming records from a file in chunks
+    records = iter_records(entity, path)  # Building records as rows are read
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))  # Taking the next chunk
+        if not chunk:  # Checking for the end of the file
+            return
+        yield chunk  # Yielding the chunk
+
+
+def import_chunk(entity, management, chunk, upsert=False):  # Function for storing one chunk through a manager
+    method = f"bulk_upsert_{entity}" if upsert else f"bulk_add_{entity}"  # Choosing the bulk method
+    return getattr(management, method)(chunk)  # Storing the chunk with one save
+
+
+def import_file(entity, path, management=None, upsert=False, chunk_size=CHUNK_SIZE, progress=None):  # Function for importing a whole file
+    """
+    Import a CSV or JSON file into a manager, saving once per chunk.
+    Each chunk is all or nothing; chunks before a failing one stay imported.
+    Args:
+        entity: One of the ENTITIES names, such as "guests".
+        path: File to import.
+        management: Manager to import into; a new one is created if omitted.
+        upsert: Replace records whose ID already exists instead of failing.
+        chunk_size: Number of records per chunk.
+        progress: Callable receiving the running number of imported records.
+    Returns:
+        int: The number of records imported.
+    """
+    if management is None:  # Checking if a manager was given
+        management = ENTITIES[entity][1]()  # Creating one with the default storage
+    total = 0  # Running number of imported records
+    for chunk in iter_chunks(entity, path, chunk_size):  # Iterating over the chunks
+        total += import_chunk(entity, management, chunk, upsert)  # Storing the chunk
+        if progress is not None:  # Checking if progress is reported
+            progress(total)  # Reporting the progress
+    return total  # Returning the number of imported records
+
+
+def main():  # Function for running the importer from the command line
+    parser = argparse.ArgumentParser(description="Import records from a CSV, JSON or exported column file.")  # Creating the argument parser
+    parser.add_argument("entity", choices=sorted(ENTITIES), help="kind of records in the file")  # Kind of records
+    parser.add_argument("path", help="CSV (.csv), JSON Lines (.jsonl), JSON (.json) or column (.cols) file")  # File to import
+    parser.add_argument("--upsert", action="store_true", help="replace records whose ID already exists")  # Replace instead of failing
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records saved together")  # Chunk size
+    parser.add_argument("--backend", type=parse_backend, default=None, help=BACKEND_HELP)  # Storage backend, optionally per store
+    args = parser.parse_args()  # Parsing the arguments
+
+    with DataContext(backend=args.backend) as context:  # Opening the stores, closing them when done
+        total = import_file(args.entity, args.path, context.management(args.entity), args.upsert, args.chunk_size,
+                            progress=lambda count: print(f"\rImported {count} {args.entity}", end="", flush=True))  # Importing with progress output
+    print(f"\rImported {total} {args.entity}.")  # Reporting the result
+
+
+if __name__ == "__main__":
+    main()  # Running the importer
@@ -0,0 +1,312 @@
+import bisect  # Importing the bisect module for keeping intervals sorted
+import heapq  # Importing the heapq module for the overlap sweep
+
+
+def normalize(value):  # Function for turning a field value into an index key
+    if isinstance(value, str):  # Checking if the value is text
+        return value.strip().casefold()  # Ignoring surrounding spaces and letter case, as typed in the GUI
+    return value  # Returning other values unchanged
+
+
+class FieldIndex:  # Definition of the FieldIndex class
+    # Maps each value of the indexed fields to the set of record keys holding it,
+    # so equality lookups are a dictionary access instead of a scan.
+    def __init__(self, fields):  # Constructor method for initializing the index
+        self.fields = tuple(fields)  # Names of the indexed fields
+        self.entries = {field: {} for field in self.fields}  # Per-field mapping of value to record keys
+
+    def add(self, key, record):  # Method for indexing one record
+        for field in self.fields:  # Iterating over the indexed fields
+            value = normalize(getattr(record, field, None))  # Reading the normalized field value
+            self.entries[field].setdefault(value, set()).add(key)  # Adding the key under that value
+
+    def remove(self, key, record):  # Method for removing one record from the index
+        for field in self.fields:  # Iterating over the indexed fields
+            value = normalize(getattr(record, field, None))  # Reading the normalized field value
+            keys = self.entries[field].get(value)  # Getting the keys stored under that value
+            if keys is not None:  # Checking if the value is indexed
+                keys.discard(key)  # Removing the key
+                if not keys:  # Checking if no record holds the value anymore
+                    del self.entries[field][value]  # Dropping the empty entry
+
+    def clear(self):  # Method for removing every record
+        self.entries = {field: {} for field in self.fields}  # Clearing every field
+
+    def rebuild(self, records):  # Method for indexing a whole dictionary of records
+        self.clear()  # Clearing every field
+        for key, record in records.items():  # Iterating over the records
+            self.add(key, record)  # Indexing each record
+
+    def lookup(self, field, value):  # Method for getting the keys whose field equals a value
+        return self.entries[field].get(normalize(value), set())  # Returning the matching keys
+
+
+class IntervalIndex:  # Definition of the IntervalIndex class
+    # Keeps, per group (such as a venue), the intervals sorted by start together with the
+    # longest interval length. Any interval overlapping [start, end) must start inside
+    # [start - longest, end), so an overlap query is two bisections plus a short slice.
+    def __init__(self):  # Constructor method for initializing the index
+        self.groups = {}  # Mapping of group to its sorted list of (start, end, key)
+        self.longest = {}  # Mapping of group to the longest interval length it has held
+        self.locations = {}  # Mapping of key to its (group, start, end)
+
+    def add(self, key, group, start, end):  # Method for indexing one interval
+        entries = self.groups.setdefault(group, [])  # Getting the group's sorted intervals
+        bisect.insort(entries, (start, end, key))  # Inserting the interval in start order
+        self.longest[group] = max(self.longest.get(group, 0), end - start)  # Widening the search window if needed
+        self.locations[key] = (group, start, end)  # Remembering where the key is stored
+
+    def remove(self, key):  # Method for removing a key's interval
+        location = self.locations.pop(key, None)  # Looking up where the key is stored
+        if location is None:  # Checking if the key is indexed
+            return
+        group, start, end = location  # Unpacking the stored location
+        entries = self.groups[group]  # Getting the group's sorted intervals
+        position = bisect.bisect_left(entries, (start, end, key))  # Finding the interval
+        del entries[position]  # Removing it
+        if not entries:  # Checking if the group is now empty
+            del self.groups[group]  # Dropping the empty group
+            del self.longest[group]  # Dropping its window width
+
+    def clear(self):  # Method for removing every interval
+        self.groups = {}  # Clearing the groups
+        self.longest = {}  # Clearing the window widths
+        self.locations = {}  # Clearing the key locations
+
+    def overlapping(self, group, start, end, exclude=None):  # Method for listing the keys whose interval overlaps [start, end)
+        entries = self.groups.get(group)  # Getting the group's sorted intervals
+        if not entries:  # Checking if the group has any interval
+            return []
+        low = bisect.bisect_left(entries, (start - self.longest[group],))  # First interval that could still be running at start
+        high = bisect.bisect_left(entries, (end,))  # First interval starting at or after end
+        return [key for other_start, other_end, key in entries[low:high] if other_end > start and key != exclude]  # Keeping real overlaps
+
+    def all_overlaps(self):  # Method for listing every overlapping pair in one sweep
+        """
+        Returns:
+            list: (group, key, other_key) for every pair of overlapping intervals.
+        """
+        pairs = []  # List collecting the overlapping pairs
+        for group, entries in self.groups.items():  # Iterating over the groups
+            pairs.extend(overlapping_pairs(group, entries))  # Sweeping each group
+        return pairs  # Returning the overlapping pairs
+
+
+def overlapping_pairs(group, entries):  # Function for listing the overlapping pairs among one group's intervals
+    """
+    Sweep the intervals in start order, keeping the running intervals in a heap.
+    Args:
+        entries: (start, end, key) tuples sorted by start, read once.
+    Returns:
+        list: (group, key, other_key) for every pair of overlapping intervals.
+    """
+    pairs = []  # List collecting the overlapping pairs
+    running = []  # Heap of (end, key) for intervals that have started
+    for start, end, key in entries:  # Iterating over the intervals in start order
+        while running and running[0][0] <= start:  # Checking for intervals that ended before this one starts
+            heapq.heappop(running)  # Dropping them
+        pairs.extend((group, other_key, key) for _, other_key in running)  # Every running interval overlaps this one
+        heapq.heappush(running, (end, key))  # Marking this interval as running
+    return pairs  # Returning the overlapping pairs
+
+
+class CalendarIndex:  # Definition of the CalendarIndex class
+    # Keeps (minute, key) pairs sorted by minute, so "everything between two moments" is
+    # two bisections and a slice instead of a scan.
+    def __init__(self):  # Constructor method for initializing the index
+        self.entries = []  # Sorted list of (minute, key)
+        self.minutes = {}  # Mapping of key to its minute
+
+    def add(self, key, minute):  # Method for indexing one key at a minute
+        entry = (minute, key)  # Entry kept in the sorted list
+        if not self.entries or self.entries[-1] <= entry:  # Checking if it goes last, as when keys arrive in order
+            self.entries.append(entry)  # Appending it
+        else:
+            bisect.insort(self.entries, entry)  # Inserting it in minute order
+        self.minutes[key] = minute  # Remembering where the key is stored
+
+    def remove(self, key):  # Method for removing a key
+        minute = self.minutes.pop(key, None)  # Looking up the key's minute
+        if minute is None:  # Checking if the key is indexed
+            return
+        del self.entries[bisect.bisect_left(self.entries, (minute, key))]  # Removing its entry
+
+    def rebuild(self, pairs):  # Method for indexing many (key, minute) pairs at once
+        self.minutes = dict(pairs)  # Recording every key's minute
+        self.entries = sorted((minute, key) for key, minute in self.minutes.items())  # Sorting once instead of inserting one by one
+
+    def clear(self):  # Method for removing every key
+        self.entries = []  # Clearing the sorted list
+        self.minutes = {}  # Clearing the key minutes
+
+    def between(self, start, end):  # Method for listing the keys at minutes in [start, end)
+        low = bisect.bisect_left(self.entries, (start,))  # First entry at or after start
+        high = bisect.bisect_left(self.entries, (end,))  # First entry at or after end
+        return [key for _, key in self.entries[low:high]]  # Returning the keys in minute order
+
+
+class HierarchyIndex:  # Definition of the HierarchyIndex class
+    # Tree of keys linked to their parent key (such as employees to their manager), keeping
+    # each node's children plus the size and summed weight of the subtree under it. Those
+    # counters are adjusted along the chain of ancestors on every change, so reading them is
+    # a dictionary access and a change costs the depth of the tree.
+    # A parent that isn't indexed (yet) keeps its children listed, so they join its subtree
+    # once it is added.
+    def __init__(self):  # Constructor method for initializing the index
+        self.parents = {}  # Mapping of key to its parent key, or None
+        self.children = {}  # Mapping of parent key to the set of its children's keys
+        self.weights = {}  # Mapping of key to its own weight
+        self.sizes = {}  # Mapping of key to the number of keys in its subtree, itself included
+        self.totals = {}  # Mapping of key to the summed weight of its subtree, itself included
+
+    def ancestors(self, key):  # Method for walking from a key's parent up to the root
+        seen = {key}  # Keys visited, guarding against cycles saved before they were refused
+        parent = self.parents.get(key)  # Starting from the parent
+        while parent in self.parents and parent not in seen:  # Checking the parent is indexed and new
+            yield parent
+            seen.add(parent)  # Remembering it
+            parent = self.parents[parent]  # Moving up
+
+    def add(self, key, parent, weight=0):  # Method for indexing one key under its parent
+        self.parents[key] = parent  # Linking the key to its parent
+        self.weights[key] = weight or 0  # Storing its weight
+        if parent is not None:  # Checking if the key has a parent
+            self.children.setdefault(parent, set()).add(key)  # Listing it under the parent
+        below = self.children.get(key, ())  # Keys already waiting for this one as parent
+        self.sizes[key] = 1 + sum(self.sizes[child] for child in below)  # Counting its subtree
+        self.totals[key] = self.weights[key] + sum(self.totals[child] for child in below)  # Summing its subtree
+        for ancestor in self.ancestors(key):  # Iterating over the chain above it
+            self.sizes[ancestor] += self.sizes[key]  # Growing each ancestor's subtree
+            self.totals[ancestor] += self.totals[key]
+
+    def remove(self, key):  # Method for removing one key, leaving its children listed under it
+        if key not in self.parents:  # Checking if the key is indexed
+            return
+        for ancestor in self.ancestors(key):  # Iterating over the chain above it
+            self.sizes[ancestor] -= self.sizes[key]  # Shrinking each ancestor's subtree
+            self.totals[ancestor] -= self.totals[key]
+        parent = self.parents.pop(key)  # Unlinking it from its parent
+        if parent is not None:  # Checking if it had a parent
+            siblings = self.children[parent]  # Getting the parent's children
+            siblings.discard(key)  # Removing the key
+            if not siblings:  # Checking if the parent has no child left
+                del self.children[parent]  # Dropping the empty set
+        del self.weights[key], self.sizes[key], self.totals[key]  # Forgetting its counters
+
+    def update(self, key, parent, weight=0):  # Method for moving a key or changing its weight
+        self.remove(key)  # Taking it out with its subtree
+        self.add(key, parent, weight)  # Putting it back, which re-attaches its subtree
+
+    def rebuild(self, entries):  # Method for indexing many (key, parent, weight) entries
+        self.clear()  # Removing every key
+        for key, parent, weight in entries:  # Iterating over the entries
+            self.add(key, parent, weight)  # Indexing each
+
+    def clear(self):  # Method for removing every key
+        self.parents = {}  # Clearing the parents
+        self.children = {}  # Clearing the children
+        self.weights = {}  # Clearing the weights
+        self.sizes = {}  # Clearing the subtree sizes
+        self.totals = {}  # Clearing the subtree totals
+
+    def descendants(self, key):  # Method for listing every key under a key
+        """
+        Returns:
+            list: The keys of the subtree below the key, each followed by its own subtree,
+            with siblings in key order; in time proportional to their number.
+        """
+        found = []  # Keys below the key
+        seen = {key}  # Keys visited, guarding against cycles
+        stack = sorted(self.children.get(key, ()), key=str, reverse=True)  # Keys still to be listed, the next one last
+        while stack:  # Walking the subtree
+            child = stack.pop()  # Taking the next key
+            if child in seen:  # Checking if the key was listed already
+                continue
+            seen.add(child)  # Remembering it
+            found.append(child)  # Listing it
+            stack.extend(sorted(self.children.get(child, ()), key=str, reverse=True))  # Listing its children before its later siblings
+        return found  # Returning the keys
+
+    def creates_cycle(self, key, parent, parent_of=None):  # Method for checking if giving a key a parent would loop the tree
+        """
+        Args:
+            parent_of: Optional callable returning the parent of a key, for checking a batch
+                of changes; the indexed parents are used if omitted.
+        Returns:
+            bool: True if the key is the parent itself or one of its ancestors.
+        """
+        parent_of = parent_of or self.parents.get  # Choosing how parents are read
+        seen = set()  # Keys visited, guarding against cycles not involving the key
+        while parent is not None and parent not in seen:  # Walking up from the new parent
+            if parent == key:  # Checking if the walk came back to the key
+                return True
+            seen.add(parent)  # Remembering the step
+            parent = parent_of(parent)  # Moving up
+        return False  # The walk reached a root
+
+
+class MembershipIndex:  # Definition of the MembershipIndex class
+    # Maps each member (such as a guest ID) to the set of record keys whose collection
+    # holds it, the reverse of a record's list of members.
+    def __init__(self):  # Constructor method for initializing the index
+        self.entries = {}  # Mapping of normalized member to record keys
+
+    def add(self, key, members):  # Method for indexing the members of one record
+        for member in members:  # Iterating over the record's members
+            self.entries.setdefault(normalize(member), set()).add(key)  # Adding the key under the member
+
+    def remove(self, key, members):  # Method for removing the members of one record
+        for member in members:  # Iterating over the record's members
+            keys = self.entries.get(normalize(member))  # Getting the keys stored under the member
+            if keys is not None:  # Checking if the member is indexed
+                keys.discard(key)  # Removing the key
+                if not keys:  # Checking if no record holds the member anymore
+                    del self.entries[normalize(member)]  # Dropping the empty entry
+
+    def clear(self):  # Method for removing every member
+        self.entries = {}  # Clearing the entries
+
+    def lookup(self, member):  # Method for getting the keys of the records holding a member
+        return self.entries.get(normalize(member), set())  # Returning the matching keys
+
+
+class CapacityIndex:  # Definition of the CapacityIndex class
+    # Keeps records sorted by their lowest and by their highest capacity. The records able
+    # to take a count are a prefix of the first list and a suffix of the second, so a query
+    # bisects both and only checks the shorter side against the other bound.
+    def __init__(self):  # Constructor method for initializing the index
+        self.lows = []  # Sorted lowest capacities
+        self.low_keys = []  # Record keys in the order of self.lows
+        self.highs = []  # Sorted highest capacities
+        self.high_keys = []  # Record keys in the order of self.highs
+        self.bounds = {}  # Mapping of record key to its (lowest, highest) capacity
+
+    def __len__(self):  # Method for counting the indexed records
+        return len(self.bounds)  # Returning the number of records
+
+    def add(self, key, low, high):  # Method for indexing one record's capacity range
+        position = bisect.bisect_right(self.lows, low)  # Finding where the lowest capacity goes
+        self.lows.insert(position, low)  # Inserting it in order
+        self.low_keys.insert(position, key)  # Keeping the key beside it
+        position = bisect.bisect_right(self.highs, high)  # Finding where the highest capacity goes
+        self.highs.insert(position, high)  # Inserting it in order
+        self.high_keys.insert(position, key)  # Keeping the key beside it
+        self.bounds[key] = (low, high)  # Remembering the range
+
+    def remove(self, key):  # Method for removing a record's capacity range
+        bounds = self.bounds.pop(key, None)  # Looking up the record's range
+        if bounds is None:  # Checking if the record is indexed
+            return
+        for values, keys, value in ((self.lows, self.low_keys, bounds[0]), (self.highs, self.high_keys, bounds[1])):  # Iterating over both sorted lists
+            position = bisect.bisect_left(values, value)  # First entry with that capacity
+            while keys[position] != key:  # Stepping over other records with the same capacity
+                position += 1
+            del values[position]  # Removing the capacity
+            del keys[position]  # Removing the key
+
+    def fitting(self, count):  # Method for listing the keys whose range includes a count
+        low_end = bisect.bisect_right(self.lows, count)  # Records before this one have a lowest capacity of at most count
+        high_start = bisect.bisect_left(self.highs, count)  # Records from this one on have a highest capacity of at least count
+        if low_end <= len(self.highs) - high_start:  # Checking which side is shorter
+            return [key for key in self.low_keys[:low_end] if self.bounds[key][1] >= count]  # Checking the highest capacity of the short side
+        return [key for key in self.high_keys[high_start:] if self.bounds[key][0] <= count]  # Checking the lowest capacity of the short side
@@ -0,0 +1,259 @@
+from changes import Observer, modified_copy  # Importing the observer base class and record copying
+from event_management import SUPPLIER_COMPANY_FIELDS, stored_guests  # Importing the supplier fields of an event and the reader of its guest IDs
+from indexes import FieldIndex, MembershipIndex, normalize  # Importing the indexes used to resolve references
+
+DELETE_POLICIES = ("restrict", "cascade", "nullify")  # What happens to records referring to a deleted record
+
+
+def present(value):  # Function for checking if a reference field holds a value
+    return value is not None and str(value).strip() != ""  # Blank fields refer to nothing
+
+
+def venue_keys(venue):  # Function for listing the texts an event may use to refer to a venue
+    # Events name a venue by its address, or by its name followed by its address as typed
+    # in the GUI ("yas hotel yas island").
+    keys = {normalize(venue.address), normalize(f"{venue.name} {venue.address}")}  # Normalized address forms
+    keys.discard("")  # Ignoring a blank address
+    return keys  # Returning the keys
+
+
+def supplier_keys(supplier):  # Function for listing the texts an event may use to refer to a supplier
+    key = normalize(supplier.name)  # Events name a supplier company by its name
+    return {key} if key else set()  # Returning the key, ignoring a blank name
+
+
+def renamed_reference(field, lost_key, old, new):  # Function for rewriting a reference to a renamed venue or supplier
+    if field == "venue_address":  # Checking for a venue reference
+        if lost_key == normalize(old.address):  # Checking if the event used the bare address
+            return new.address  # Using the new address
+        return f"{new.name} {new.address}"  # Using the new name and address
+    return new.name  # Supplier references use the company name
+
+
+class ReferentialIntegrity(Observer):  # Definition of the ReferentialIntegrity class
+    # Watches the six managers and keeps references between them valid:
+    #   events.client_id -> clients, events.venue_address -> venues,
+    #   events.<company fields> -> suppliers, events.guest_list -> guests,
+    #   employees.manager_id -> employees.
+    # New references are checked with hash lookups when a record is written. Deleting
+    # or renaming a referenced record applies the on_delete policy to its referrers, except
+    # that a deleted guest is taken off guest lists under every policy.
+    def __init__(self, event_management, guest_management, supplier_management, venue_management,
+                 client_management, employee_management, on_delete="restrict"):  # Constructor method for attaching the integrity checks
+        if on_delete not in DELETE_POLICIES:  # Checking the policy name
+            raise ValueError(f"Unknown delete policy: {on_delete}")  # Raising an error for an unknown policy
+        self.event_management = event_management  # Manager of the referring events
+        self.guest_management = guest_management  # Manager of the referenced guests
+        self.supplier_management = supplier_management  # Manager of the referenced suppliers
+        self.venue_management = venue_management  # Manager of the referenced venues
+        self.client_management = client_management  # Manager of the referenced clients
+        self.employee_management = employee_management  # Manager of the employees and their managers
+        self.on_delete = on_delete  # "restrict", "cascade" or "nullify"
+        self._venue_index = None  # Venue IDs by address form, built on first use
+        self._supplier_index = None  # Supplier IDs by name, built on first use
+        self._subordinate_index = None  # Employee IDs by manager ID, built on first use
+        for management in self.managers():  # Iterating over the managers
+            management.add_observer(self)  # Watching its changes
+
+    def managers(self):  # Method for listing the watched managers
+        return [self.event_management, self.guest_management, self.supplier_management,
+                self.venue_management, self.client_management, self.employee_management]
+
+    def detach(self):  # Method for no longer watching the managers
+        for management in self.managers():  # Iterating over the managers
+            management.remove_observer(self)  # Stopping watching its changes
+
+    @property
+    def venue_index(self):  # Property building the venue address index on first use
+        if self._venue_index is None:  # Checking if the index is not built yet
+            self._venue_index = MembershipIndex()  # Creating the index
+            for venue_id, venue in self.venue_management.venues.items():  # Iterating over the venues
+                self._venue_index.add(venue_id, venue_keys(venue))  # Indexing each venue's address forms
+        return self._venue_index  # Returning the index
+
+    @property
+    def supplier_index(self):  # Property building the supplier name index on first use
+        if self._supplier_index is None:  # Checking if the index is not built yet
+            self._supplier_index = MembershipIndex()  # Creating the index
+            for supplier_id, supplier in self.supplier_management.suppliers.items():  # Iterating over the suppliers
+                self._supplier_index.add(supplier_id, supplier_keys(supplier))  # Indexing each supplier's name
+        return self._supplier_index  # Returning the index
+
+    @property
+    def subordinate_index(self):  # Property building the manager index on first use
+        if self._subordinate_index is None:  # Checking if the index is not built yet
+            self._subordinate_index = FieldIndex(["manager_id"])  # Creating the index
+            self._subordinate_index.rebuild(self.employee_management.employees)  # Indexing every employee's manager
+        return self._subordinate_index  # Returning the index
+
+    def missing_event_references(self, old, new):  # Method for listing the new references of an event that resolve to nothing
+        missing = []  # Descriptions of the dangling references
+        if present(new.client_id) and (old is None or old.client_id != new.client_id):  # Checking a new client reference
+            if new.client_id not in self.client_management.clients:  # Looking the client up by ID
+                missing.append(f"client '{new.client_id}'")  # Recording the missing client
+        if present(new.venue_address) and (old is None or normalize(old.venue_address) != normalize(new.venue_address)):  # Checking a new venue reference
+            if not self.venue_index.lookup(new.venue_address):  # Looking the venue up by address
+                missing.append(f"venue '{new.venue_address}'")  # Recording the missing venue
+        for field in SUPPLIER_COMPANY_FIELDS:  # Iterating over the supplier company fields
+            value = getattr(new, field, None)  # Reading the company name
+            if present(value) and (old is None or normalize(getattr(old, field, None)) != normalize(value)):  # Checking a new company reference
+                if not self.supplier_index.lookup(value):  # Looking the supplier up by name
+                    missing.append(f"supplier '{value}'")  # Recording the missing supplier
+        old_guests = set(stored_guests(old)) if old is not None else set()  # Guests already on the list
+        guests = self.guest_management.guests  # Guests by ID
+        for guest_id in stored_guests(new):  # Iterating over the guest IDs
+            if guest_id not in old_guests and guest_id not in guests:  # Checking a newly listed guest
+                missing.append(f"guest '{guest_id}'")  # Recording the missing guest
+        return missing  # Returning the dangling references
+
+    def check_references(self, label, changes):  # Method for refusing writes that add dangling references
+        if label == "events":  # Checking for event changes
+            for event_id, old, new in changes:  # Iterating over the changes
+                missing = self.missing_event_references(old, new) if new is not None else []  # Listing the dangling references
+                if missing:  # Checking if any reference is dangling
+                    raise ValueError(f"Event {event_id} refers to unknown {', '.join(missing)}.")  # Raising an error naming them
+        elif label == "employees":  # Checking for employee changes
+            batch = {employee_id for employee_id, _, new in changes if new is not None}  # Employees written together may manage each other
+            employees = self.employee_management.employees  # Employees by ID
+            for employee_id, old, new in changes:  # Iterating over the changes
+                if new is None or not present(new.manager_id) or (old is not None and old.manager_id == new.manager_id):  # Checking for a new manager reference
+                    continue
+                if new.manager_id == employee_id:  # Checking for an employee managing themselves
+                    raise ValueError(f"Employee {employee_id} can't be their own manager.")  # Raising an error for the loop
+                if new.manager_id not in employees and new.manager_id not in batch:  # Looking the manager up by ID
+                    raise ValueError(f"Employee {employee_id} refers to unknown manager '{new.manager_id}'.")  # Raising an error naming the manager
+
+    def lost_keys(self, label, key, old, new):  # Method for listing the reference keys a change takes away
+        if label in ("clients", "guests", "employees"):  # Checking for a change to a record referenced by its ID
+            return {key} if new is None else set()  # IDs can't be modified, so only deletions lose one
+        if label == "venues":  # Checking for a venue change
+            lost = venue_keys(old) - (venue_keys(new) if new is not None else set())  # Address forms the venue no longer has
+            return {name for name in lost if not self.venue_index.lookup(name) - {key}}  # Keeping those no other venue still provides
+        if label == "suppliers":  # Checking for a supplier change
+            lost = supplier_keys(old) - (supplier_keys(new) if new is not None else set())  # Names the supplier no longer has
+            return {name for name in lost if not self.supplier_index.lookup(name) - {key}}  # Keeping those no other supplier still provides
+        return set()  # Events aren't referenced by other records
+
+    def referrers(self, label, lost):  # Method for finding the records referring to lost keys
+        """
+        Look up, through the indexes, which records refer to the given keys.
+        Returns:
+            list: (manager label, record key, field, lost key) for each reference.
+        """
+        events = self.event_management  # Manager of the referring events
+        events.events  # Making sure the events and their indexes are loaded
+        found = []  # References found
+        for lost_key in lost:  # Iterating over the lost keys
+            if label == "clients":  # Checking for a client
+                found.extend(("events", event_id, "client_id", lost_key) for event_id in set(events.event_index.lookup("client_id", lost_key)))
+            elif label == "venues":  # Checking for a venue
+                found.extend(("events", event_id, "venue_address", lost_key) for event_id in set(events.event_index.lookup("venue_address", lost_key)))
+            elif label == "suppliers":  # Checking for a supplier
+                for field in SUPPLIER_COMPANY_FIELDS:  # Iterating over the supplier company fields
+                    found.extend(("events", event_id, field, lost_key) for event_id in set(events.event_index.lookup(field, lost_key)))
+            elif label == "guests":  # Checking for a guest
+                found.extend(("events", event_id, "guest_list", lost_key) for event_id in set(events.guest_events.lookup(lost_key)))
+            elif label == "employees":  # Checking for an employee
+                self.employee_management.employees  # Making sure the employees are loaded
+                found.extend(("employees", employee_id, "manager_id", lost_key) for employee_id in set(self.subordinate_index.lookup("manager_id", lost_key)))
+        return found  # Returning the references
+
+    def before_change(self, label, changes):  # Method for checking changes before they are stored
+        self.check_references(label, changes)  # Refusing new dangling references
+        if self.on_delete != "restrict":  # Checking if referrers are handled after the change instead
+            return
+        for key, old, new in changes:  # Iterating over the changes
+            if old is None:  # Checking for an addition, which takes nothing away
+                continue
+            found = [reference for reference in self.referrers(label, self.lost_keys(label, key, old, new)) if reference[2] != "guest_list"]  # Finding the records that would be left dangling, guest lists being pruned after the change
+            if found:  # Checking if anything refers to the record
+                users = ", ".join(sorted({record_key for _, record_key, _, _ in found}))  # Naming the referring records
+                raise ValueError(f"{label[:-1].capitalize()} {key} is still used by {found[0][0]}: {users}.")  # Raising an error naming them
+
+    def after_change(self, label, changes):  # Method for updating the indexes and the referrers once changes are stored
+        actions = []  # Referrer updates to apply
+        for key, old, new in changes:  # Iterating over the changes
+            if old is not None and (self.on_delete != "restrict" or label == "guests"):  # Checking for a change that may leave referrers behind, as a deleted guest does under every policy
+                actions.extend((reference, old, new) for reference in self.referrers(label, self.lost_keys(label, key, old, new)))  # Finding them before the indexes change
+            self.update_index(label, key, old, new)  # Keeping the reference indexes current
+        if actions:  # Checking if any referrer needs updating
+            self.repair(actions)  # Applying the policy to the referrers
+
+    def update_index(self, label, key, old, new):  # Method for keeping a reference index in line with a change
+        if label == "venues" and self._venue_index is not None:  # Checking for a venue change with a built index
+            if old is not None:  # Checking for a replaced venue
+                self._venue_index.remove(key, venue_keys(old))  # Removing its old address forms
+            if new is not None:  # Checking for a stored venue
+                self._venue_index.add(key, venue_keys(new))  # Adding its address forms
+        elif label == "suppliers" and self._supplier_index is not None:  # Checking for a supplier change with a built index
+            if old is not None:  # Checking for a replaced supplier
+                self._supplier_index.remove(key, supplier_keys(old))  # Removing its old name
+            if new is not None:  # Checking for a stored supplier
+                self._supplier_index.add(key, supplier_keys(new))  # Adding its name
+        elif label == "employees" and self._subordinate_index is not None:  # Checking for an employee change with a built index
+            if old is not None:  # Checking for a replaced employee
+                self._subordinate_index.remove(key, old)  # Removing its old manager
+            if new is not None:  # Checking for a stored employee
+                self._subordinate_index.add(key, new)  # Adding its manager
+
+    def repair(self, actions):  # Method for applying the delete policy to the referring records
+        events = self.event_management  # Manager of the referring events
+        updates = {}  # New field values by event ID, stored together with one save
+        deletions = []  # IDs of the events to delete
+        for (manager_label, record_key, field, lost_key), old, new in actions:  # Iterating over the references
+            if manager_label == "employees":  # Checking for an employee whose manager is gone
+                if record_key not in self.employee_management.employees:  # Checking if an earlier cascade already removed it
+                    continue
+                if self.on_delete == "cascade":  # Checking if subordinates are deleted too
+                    self.employee_management.delete_employee(record_key)  # Deleting the subordinate, which cascades further
+                else:
+                    self.employee_management.clear_manager(record_key)  # Leaving the subordinate without a manager
+            elif field == "guest_list":  # Checking for a deleted guest, who only leaves the guest list whatever the policy
+                fields = updates.setdefault(record_key, {})  # New values of the event
+                guest_list = fields.get("guest_list", events.events[record_key].guest_list)  # Current guest IDs, including earlier removals
+                fields["guest_list"] = tuple(guest_id for guest_id in guest_list if normalize(guest_id) != normalize(lost_key))  # Dropping the guest
+            elif new is not None and self.on_delete == "cascade":  # Checking for a renamed venue or supplier
+                updates.setdefault(record_key, {})[field] = renamed_reference(field, lost_key, old, new)  # Following the new name
+            elif self.on_delete == "cascade":  # Checking if referring events are deleted
+                deletions.append(record_key)  # Deleting the event
+            else:
+                updates.setdefault(record_key, {})[field] = None  # Clearing the reference
+        for event_id in deletions:  # Iterating over the events to delete
+            updates.pop(event_id, None)  # Skipping updates to a deleted event
+            if event_id in events.events:  # Checking if the event is still stored
+                events.delete_event(event_id)  # Deleting it
+        if updates:  # Checking if any event changes
+            events.bulk_upsert_events([modified_copy(events.events[event_id], fields) for event_id, fields in updates.items()])  # Storing the new values with one save
+
+    def audit(self):  # Method for listing every dangling reference
+        """
+        Check every reference in one pass over each store, using sets of the referenced keys.
+        Returns:
+            list: (manager label, record key, field, value) for each dangling reference.
+        """
+        clients = self.client_management.clients  # Client IDs, looked up in the dictionary itself
+        guests = self.guest_management.guests  # Guest IDs, looked up in the dictionary itself
+        employees = self.employee_management.employees  # Employee IDs, looked up in the dictionary itself
+        venues = set()  # Address forms of every venue
+        for venue in self.venue_management.venues.values():  # Iterating over the venues once
+            venues |= venue_keys(venue)  # Adding its address forms
+        suppliers = set()  # Names of every supplier
+        for supplier in self.supplier_management.suppliers.values():  # Iterating over the suppliers once
+            suppliers |= supplier_keys(supplier)  # Adding its name
+        dangling = []  # Dangling references found
+        for event_id, event in self.event_management.events.items():  # Iterating over the events once
+            if present(event.client_id) and event.client_id not in clients:  # Checking the client
+                dangling.append(("events", event_id, "client_id", event.client_id))
+            if present(event.venue_address) and normalize(event.venue_address) not in venues:  # Checking the venue
+                dangling.append(("events", event_id, "venue_address", event.venue_address))
+            for field in SUPPLIER_COMPANY_FIELDS:  # Iterating over the supplier company fields
+                value = getattr(event, field, None)  # Reading the company name
+                if present(value) and normalize(value) not in suppliers:  # Checking the supplier
+                    dangling.append(("events", event_id, field, value))
+            for guest_id in stored_guests(event):  # Iterating over the guest IDs
+                if guest_id not in guests:  # Checking the guest
+                    dangling.append(("events", event_id, "guest_list", guest_id))
+        for employee_id, employee in employees.items():  # Iterating over the employees once
+            if present(employee.manager_id) and employee.manager_id not in employees:  # Checking the manager
+                dangling.append(("employees", employee_id, "manager_id", employee.manager_id))
+        return dangling  # Returning the dangling references
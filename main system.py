@@ -1,20 +1,334 @@
 import tkinter as tk  # Importing the tkinter module and aliasing it as tk
 import pickle  # Importing the pickle module
+import itertools  # Importing the itertools module for reading rows in chunks
+import queue  # Importing the queue module for collecting background save errors
 from tkinter import ttk  # Importing the ttk submodule from tkinter
 from tkinter import messagebox  # Importing the messagebox submodule from tkinter
-from event_management import Event, EventManagement  # Importing Event and EventManagement classes from
+from tkinter import filedialog  # Importing the filedialog submodule from tkinter for choosing import and export files
+from tkinter import simpledialog  # Importing the simpledialog submodule from tkinter for asking guest counts
+from event_management import Event, EventManagement, format_guest_list  # Importing Event and EventManagement classes from
 # event_management module
 from guest_management import Guest, GuestManagement  # Importing Guest and GuestManagement classes from guest_management module
 from supplier_management import Supplier, SupplierManagement  # Importing Supplier and SupplierManagement classes from supplier_management module
 from venue_management import Venue, VenueManagement  # Importing Venue and VenueManagement classes from venue_management module
 from client_management import Client, ClientManagement  # Importing Client and ClientManagement classes from client_management module
 from employee_management import Employee, EmployeeManagement  # Importing Employee and EmployeeManagement classes from employee_management module
+import importer  # Importing the CSV/JSON importer
+import exporter  # Importing the streaming CSV, JSON Lines and column file exporter
+from changes import Observer  # Importing the observer base class for tables following their store
+from context import DataContext  # Importing the shared data context owning one manager per store
+from search import describe  # Importing the one-line summary of search hits
+
+EVENT_COLUMNS = [  # Attributes and headings shown in the all-events table
+    ("event_id", "Event ID"), ("event_type", "Type"), ("theme", "Theme"), ("date", "Date"), ("time", "Time"),
+    ("duration", "Duration"), ("venue_address", "Venue Address"), ("client_id", "Client ID"), ("guest_list", "Guest List"),
+    ("catering_company", "Catering Company"), ("cleaning_company", "Cleaning Company"), ("decorations_company", "Decorations Company"),
+    ("entertainment_company", "Entertainment Company"), ("furniture_supply_company", "Furniture Company"), ("invoice", "Invoice"),
+]
+REFRESH_INTERVAL = 2000  # Milliseconds between checks for records saved by other copies of the program
+MATCH_COLUMNS = [  # Columns of the matching venues and suppliers table
+    ("kind", "Kind"), ("id", "ID"), ("name", "Name"), ("address", "Address"), ("service", "Service"),
+    ("min_guests", "Min Guests"), ("max_guests", "Max Guests"),
+]
+REFERENCE_COLUMNS = [("label", "Records"), ("key", "ID"), ("field", "Field"), ("value", "Unknown Reference")]  # Columns of the dangling references table
+DASHBOARD_VIEWS = {  # Dashboard breakdowns: heading of the group column and the totals listed by group
+    "Revenue by month": ("Month", lambda analytics: analytics.revenue_by("month")),
+    "Revenue by client": ("Client", lambda analytics: analytics.revenue_by("client")),
+    "Revenue by venue": ("Venue", lambda analytics: analytics.revenue_by("venue")),
+    "Revenue by supplier": ("Supplier", lambda analytics: analytics.revenue_by("supplier")),
+    "Payroll by department": ("Department", lambda analytics: analytics.payroll_by_department()),
+}
+DASHBOARD_LABELS = {"events", "clients", "employees"}  # Stores whose changes move the dashboard totals
+EVENT_ENTRY_FIELDS = {heading: field for field, heading in EVENT_COLUMNS}  # Event attribute behind each entry label
+GUEST_COLUMNS = [("guest_id", "Guest ID"), ("name", "Name"), ("address", "Address"), ("contact_details", "Contact Details")]  # Columns of the all-guests table
+SUPPLIER_COLUMNS = [  # Attributes and headings shown in the all-suppliers table
+    ("supplier_id", "Supplier ID"), ("name", "Name"), ("address", "Address"), ("contact_details", "Contact Details"),
+    ("service_provided", "Service Provided"), ("min_guests_supplier", "Min Guests"), ("max_guests_supplier", "Max Guests"), ("menu", "Menu"),
+]
+VENUE_COLUMNS = [  # Attributes and headings shown in the all-venues table
+    ("venue_id", "Venue ID"), ("name", "Name"), ("address", "Address"), ("contact", "Contact"),
+    ("min_guests", "Minimum Guests"), ("max_guests", "Maximum Guests"),
+]
+CLIENT_COLUMNS = [("client_id", "Client ID"), ("name", "Name"), ("address", "Address"), ("contact_details", "Contact Details"), ("budget", "Budget")]  # Columns of the all-clients table
+EMPLOYEE_COLUMNS = [  # Attributes and headings shown in the all-employees table
+    ("employee_id", "Employee ID"), ("name", "Name"), ("department", "Department"), ("job_title", "Job Title"),
+    ("basic_salary", "Basic Salary"), ("age", "Age"), ("date_of_birth", "Date of Birth"),
+    ("passport_details", "Passport Details"), ("manager_id", "Manager ID"),
+]
+
+
+def column_fields(columns):  # Function for listing the attributes shown by a table's columns
+    return [field for field, _ in columns]  # Returning the attribute of each column
+
+
+def cell_text(value):  # Function for showing a cell value, such as a guest list, as text
+    if isinstance(value, (tuple, list)):  # Checking for a collection of IDs
+        return ", ".join(str(item) for item in value)  # Joining the items with commas
+    return value  # Returning other values unchanged
+
+
+def sort_key(value):  # Function for ordering table cells, numbers before text
+    try:
+        return (0, float(value), "")  # Ordering numeric cells by value
+    except (TypeError, ValueError):  # Handling text cells
+        return (1, 0.0, str(cell_text(value)).casefold())  # Ordering text cells alphabetically
+
+
+class RecordTable(tk.Toplevel, Observer):
+    # Window listing records in a Treeview that only ever holds the visible page of rows.
+    # Rows are read from the manager in chunks between Tk events, so the window opens at once
+    # and the main loop stays responsive while a large store streams in.
+    # A live table follows one store of a DataContext: changed records replace their row,
+    # deleted ones drop out and new ones are added at the end, without reading the store again.
+    PAGE_ROWS = 25  # Number of rows shown at a time
+    CHUNK_ROWS = 2000  # Number of rows read per main loop turn
+
+    def __init__(self, master, title, columns, rows, live=None):  # Constructor method for RecordTable class
+        """
+        Args:
+            live: (context, label) of the store the rows come from, to keep them up to date.
+                The first column must hold the record key.
+        """
+        super().__init__(master)  # Creating the window
+        self.title(title)  # Setting the window title
+        self.fields = column_fields(columns)  # Attributes shown in the table
+        self.rows = []  # Every row read so far
+        self.offset = 0  # Index of the first visible row
+        self.sort_index = None  # Column the rows are sorted by
+        self.sort_reverse = False  # Whether the sort is descending
+        self.row_source = iter(rows)  # Iterator yielding the remaining rows
+        self.loading = True  # Whether rows are still being read
+        self.live = live  # Store the rows follow, if any
+        self.positions = {}  # Index in self.rows of each record key, kept for live tables
+        self.unread_changes = {}  # Newest row (None once deleted) of records changed before their row was read
+
+        self.tree = ttk.Treeview(self, columns=self.fields, show="headings", height=self.PAGE_ROWS)  # Creating the table
+        for index, (field, heading) in enumerate(columns):  # Iterating over the columns
+            self.tree.heading(field, text=heading, command=lambda index=index: self.sort_by(index))  # Sorting when the heading is clicked
+            self.tree.column(field, width=120, stretch=True)  # Setting the column width
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.scroll)  # Scrollbar moving over all rows, not just the page
+        self.xscrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)  # Scrollbar for wide tables
+        self.tree.configure(xscrollcommand=self.xscrollbar.set)  # Linking the horizontal scrollbar
+        self.status = tk.Label(self, anchor="w")  # Label showing the loading progress and row count
+        self.tree.grid(row=0, column=0, sticky="nsew")  # Placing the table
+        self.scrollbar.grid(row=0, column=1, sticky="ns")  # Placing the vertical scrollbar
+        self.xscrollbar.grid(row=1, column=0, sticky="we")  # Placing the horizontal scrollbar
+        self.status.grid(row=2, column=0, columnspan=2, sticky="we")  # Placing the status label
+        self.grid_rowconfigure(0, weight=1)  # Letting the table grow vertically
+        self.grid_columnconfigure(0, weight=1)  # Letting the table grow horizontally
+
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll("scroll", -1 if event.delta > 0 else 1, "units"))  # Scrolling with the mouse wheel
+        self.tree.bind("<Button-4>", lambda event: self.scroll("scroll", -1, "units"))  # Scrolling up with the mouse wheel on X11
+        self.tree.bind("<Button-5>", lambda event: self.scroll("scroll", 1, "units"))  # Scrolling down with the mouse wheel on X11
+        self.bind("<Prior>", lambda event: self.scroll("scroll", -1, "pages"))  # Scrolling a page up with Page Up
+        self.bind("<Next>", lambda event: self.scroll("scroll", 1, "pages"))  # Scrolling a page down with Page Down
+        self.after_idle(self.load_chunk)  # Starting to read rows once the window is shown
+        if live is not None:  # Checking if the rows should follow their store
+            live[0].add_observer(self)  # Listening for changes
+            self.bind("<Destroy>", self.stop_following)  # Stopping when the window closes
+
+    def stop_following(self, event):  # Method to stop listening for changes once the window is closed
+        if event.widget is self:  # Checking if the window itself, not one of its widgets, is closing
+            self.live[0].remove_observer(self)  # Removing the table from the context's observers
+
+    def load_chunk(self):  # Method to read the next chunk of rows
+        chunk = list(itertools.islice(self.row_source, self.CHUNK_ROWS))  # Reading up to one chunk of rows
+        if self.live is None:  # Checking if the rows are a fixed list
+            self.rows.extend(chunk)  # Adding the rows
+        else:
+            for row in chunk:  # Iterating over the rows
+                row = self.unread_changes.pop(row[0], row)  # Preferring a newer version changed while loading
+                if row is not None:  # Checking if the record was not deleted while loading
+                    self.add_row(row)  # Adding the row
+        if chunk:  # Checking if there may be more rows
+            self.status.config(text=f"Loading... {len(self.rows)} rows")  # Showing the progress
+            if len(self.rows) - len(chunk) < self.offset + self.PAGE_ROWS:  # Checking if the new rows reach the visible page
+                self.render()  # Showing them
+            else:
+                self.update_scrollbar()  # Only the scrollbar changes
+            self.after(1, self.load_chunk)  # Reading the next chunk after handling pending events
+        else:
+            self.loading = False  # Every row is read
+            for row in self.unread_changes.values():  # Iterating over the records added while loading
+                if row is not None:  # Checking if the record still exists
+                    self.add_row(row)  # Adding its row
+            self.unread_changes.clear()  # Forgetting the handled changes
+            if self.sort_index is not None:  # Checking if a sort was requested while loading
+                self.apply_sort()  # Sorting the complete rows
+            self.show_count()  # Showing the final count
+            self.render()  # Showing the final page
+
+    def show_count(self):  # Method to show the number of rows in the status label
+        self.status.config(text=f"{len(self.rows)} rows" if self.rows else "No records to display.")  # Showing the count
+
+    def add_row(self, row):  # Method to append one row of a live table
+        self.positions[row[0]] = len(self.rows)  # Remembering where the record's row is
+        self.rows.append(row)  # Adding the row
+
+    def after_change(self, label, changes):  # Method to update the rows of changed records in a live table
+        if label != self.live[1]:  # Checking if the change is to the table's store
+            return
+        deleted = set()  # Keys of the deleted records with a row
+        for key, old, new in changes:  # Iterating over the changes
+            row = None if new is None else tuple(getattr(new, field, None) for field in self.fields)  # Building the new row
+            position = self.positions.get(key)  # Finding the record's row
+            if position is None:  # Checking if the record has no row yet
+                if self.loading:  # Checking if its row may still be read
+                    self.unread_changes[key] = row  # Applying the change when it is
+                elif row is not None:  # Checking for an added record
+                    self.add_row(row)  # Adding its row at the end
+            elif row is None:  # Checking for a deleted record
+                deleted.add(key)  # Removing its row below
+            else:
+                self.rows[position] = row  # Replacing the record's row in place
+        if deleted:  # Checking if any row has to go
+            self.rows = [row for row in self.rows if row[0] not in deleted]  # Dropping the rows in one pass
+            self.index_rows()  # Finding the remaining rows again
+            self.offset = max(0, min(self.offset, len(self.rows) - self.PAGE_ROWS))  # Keeping the page inside the rows
+        if not self.loading:  # Checking if the final count is shown
+            self.show_count()  # Updating it
+        self.render()  # Showing the visible page with the changes
+
+    def index_rows(self):  # Method to record where each record's row is after rows moved
+        if self.live is not None:  # Checking if the table follows its store
+            self.positions = {row[0]: position for position, row in enumerate(self.rows)}  # Mapping each key to its row
+
+    def render(self):  # Method to show the rows of the visible page
+        self.tree.delete(*self.tree.get_children())  # Removing the previous page
+        for row in self.rows[self.offset:self.offset + self.PAGE_ROWS]:  # Iterating over the visible rows
+            self.tree.insert("", "end", values=[cell_text(value) for value in row])  # Adding each visible row
+        self.update_scrollbar()  # Updating the scrollbar position
+
+    def update_scrollbar(self):  # Method to size the scrollbar to the visible share of all rows
+        total = len(self.rows)  # Number of rows read so far
+        if total <= self.PAGE_ROWS:  # Checking if every row fits on the page
+            self.scrollbar.set(0, 1)  # Filling the scrollbar
+        else:
+            self.scrollbar.set(self.offset / total, min(1, (self.offset + self.PAGE_ROWS) / total))  # Showing the visible share
+
+    def scroll(self, action, amount, unit=None):  # Method to move the visible page, called by the scrollbar and the bindings
+        if action == "moveto":  # Handling a drag of the scrollbar
+            offset = int(float(amount) * len(self.rows))  # Converting the fraction to a row index
+        else:  # Handling arrow, page and wheel scrolling
+            step = self.PAGE_ROWS if unit == "pages" else 1  # Rows moved per step
+            offset = self.offset + int(amount) * step  # Moving the page
+        self.offset = max(0, min(offset, len(self.rows) - self.PAGE_ROWS))  # Keeping the page inside the rows
+        self.render()  # Showing the new page
+
+    def sort_by(self, index):  # Method to sort the rows when a heading is clicked
+        self.sort_reverse = self.sort_index == index and not self.sort_reverse  # Reversing on a second click
+        self.sort_index = index  # Remembering the sort column
+        self.apply_sort()  # Sorting the rows read so far
+        self.offset = 0  # Going back to the first page
+        self.render()  # Showing the sorted page
+
+    def apply_sort(self):  # Method to sort the rows by the selected column
+        self.rows.sort(key=lambda row: sort_key(row[self.sort_index]), reverse=self.sort_reverse)  # Sorting the rows
+        self.index_rows()  # Finding the moved rows again
+
+
+class ImportProgress(tk.Toplevel):
+    # Window importing a CSV or JSON file one chunk per main loop turn, so the GUI stays
+    # responsive and shows the running count while a large file is read.
+    def __init__(self, master, entity, path, management, upsert=True):  # Constructor method for ImportProgress class
+        super().__init__(master)  # Creating the window
+        self.title(f"Importing {entity.capitalize()}")  # Setting the window title
+        self.entity = entity  # Kind of records imported
+        self.management = management  # Manager receiving the records
+        self.upsert = upsert  # Whether existing IDs are replaced
+        self.total = 0  # Number of records imported so far
+        self.chunks = importer.iter_chunks(entity, path)  # Iterator yielding the file's records in chunks
+        self.status = tk.Label(self, text=f"Importing {entity} from {path}...", anchor="w", width=60)  # Label showing the progress
+        self.status.pack(fill="x", padx=10, pady=10)  # Placing the label
+        self.after_idle(self.import_chunk)  # Starting the import once the window is shown
+
+    def import_chunk(self):  # Method to import the next chunk of records
+        try:  # Starting a try block
+            chunk = next(self.chunks, None)  # Reading the next chunk
+            if chunk is not None:  # Checking if there are records left
+                self.total += importer.import_chunk(self.entity, self.management, chunk, self.upsert)  # Storing the chunk with one save
+        except Exception as e:  # Catching any exceptions
+            self.destroy()  # Closing the progress window
+            messagebox.showerror("Error", f"Import stopped after {self.total} {self.entity}: {e}")  # Displaying error message
+            return
+        if chunk is None:  # Checking if the file is finished
+            self.destroy()  # Closing the progress window
+            messagebox.showinfo("Success", f"Imported {self.total} {self.entity}.")  # Displaying success message
+        else:
+            self.status.config(text=f"Imported {self.total} {self.entity}...")  # Showing the progress
+            self.after(1, self.import_chunk)  # Importing the next chunk after handling pending events
+
+
+def import_records(master, entity, management):  # Function to let the user pick a file and import it into a manager
+    path = filedialog.askopenfilename(  # Asking for the file to import
+        parent=master, title=f"Import {entity.capitalize()}",
+        filetypes=[("CSV, JSON or column file", "*.csv *.jsonl *.ndjson *.json *.cols"), ("All files", "*.*")],
+    )
+    if path:  # Checking if a file was chosen
+        ImportProgress(master, entity, path, management)  # Importing it in the background of the main loop
+
+
+class ExportProgress(tk.Toplevel):
+    # Window exporting a store one chunk of rows per main loop turn, so the GUI stays
+    # responsive and shows the running count while a large store is written.
+    def __init__(self, master, entity, path, management, fields, filters):  # Constructor method for ExportProgress class
+        super().__init__(master)  # Creating the window
+        self.title(f"Exporting {entity.capitalize()}")  # Setting the window title
+        self.entity = entity  # Kind of records exported
+        self.export = exporter.Export(path, fields)  # Temporary file replacing the chosen one once complete
+        self.chunks = exporter.iter_chunks(exporter.export_rows(management, entity, fields, filters))  # Iterator yielding the matching rows in chunks
+        self.status = tk.Label(self, text=f"Exporting {entity} to {path}...", anchor="w", width=60)  # Label showing the progress
+        self.status.pack(fill="x", padx=10, pady=10)  # Placing the label
+        self.after_idle(self.export_chunk)  # Starting the export once the window is shown
+
+    def export_chunk(self):  # Method to write the next chunk of rows
+        try:  # Starting a try block
+            chunk = next(self.chunks, None)  # Reading the next chunk
+            if chunk is None:  # Checking if the store is finished
+                total = self.export.finish()  # Completing the file
+            else:
+                self.export.write(chunk)  # Writing the chunk
+        except Exception as e:  # Catching any exceptions
+            self.export.abort()  # Dropping the unfinished file
+            self.destroy()  # Closing the progress window
+            messagebox.showerror("Error", f"Export stopped after {self.export.count} {self.entity}: {e}")  # Displaying error message
+            return
+        if chunk is None:  # Checking if the export is complete
+            self.destroy()  # Closing the progress window
+            messagebox.showinfo("Success", f"Exported {total} {self.entity}.")  # Displaying success message
+        else:
+            self.status.config(text=f"Exported {self.export.count} {self.entity}...")  # Showing the progress
+            self.after(1, self.export_chunk)  # Writing the next chunk after handling pending events
+
+
+def export_records(master, entity, management):  # Function to let the user pick a file, attributes and filters and export a store
+    path = filedialog.asksaveasfilename(  # Asking for the file to write
+        parent=master, title=f"Export {entity.capitalize()}", defaultextension=".csv",
+        filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Column file", "*.cols")],
+    )
+    if not path:  # Checking if the user cancelled
+        return
+    fields = simpledialog.askstring("Attributes", "Attributes to export, separated by commas (leave blank for all):", parent=master)  # Asking for the projection
+    if fields is None:  # Checking if the user cancelled
+        return
+    conditions = simpledialog.askstring("Filter", "Conditions such as department=Ops; budget>=5000, separated by semicolons (leave blank for all):", parent=master)  # Asking for the filters
+    if conditions is None:  # Checking if the user cancelled
+        return
+    try:  # Starting a try block
+        fields = tuple(field.strip() for field in fields.split(",") if field.strip()) or exporter.store_fields(entity)  # Attributes to export
+        filters = exporter.parse_filters(condition for condition in conditions.split(";") if condition.strip())  # Conditions the records meet
+        exporter.check_fields(entity, list(fields) + [field for field, _, _ in filters])  # Checking the names before opening the file
+        ExportProgress(master, entity, path, management, fields, filters)  # Exporting in the background of the main loop
+    except Exception as e:  # Catching any exceptions
+        messagebox.showerror("Error", f"Could not export {entity}: {e}")  # Displaying error message
 
 
 class EventGUI:
-    def __init__(self, master):  # Constructor method for EventGUI class, taking master as an argument
+    def __init__(self, master, context=None):  # Constructor method for EventGUI class, taking master as an argument
         self.master = master  # Assigning the master argument to the master attribute
-        self.event_management = EventManagement()  # Creating an instance of EventManagement and assigning it to event_management attribute
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.event_management = self.context.event_management  # Using the context's EventManagement
+        self.matcher = self.context.matcher  # Venue and supplier matcher shared through the context
         self.create_widgets()  # Calling the create_widgets method to create GUI elements
 
     def create_widgets(self):  # Method to create GUI elements
@@ -48,7 +362,10 @@ class EventGUI:
             ("Delete Event", self.delete_event),  # Delete Event operation
             ("Modify Event", self.modify_event),  # Modify Event operation
             ("Display Event", self.display_event),  # Display Event operation
-            ("Display All Events", self.display_all_events)  # Display All Events operation
+            ("Display All Events", self.display_all_events),  # Display All Events operation
+            ("Import Events", self.import_events),  # Import Events operation
+            ("Export Events", self.export_events),  # Export Events operation
+            ("Find Venues and Suppliers", self.find_venues_and_suppliers)  # Find Venues and Suppliers operation
         ]
         for i, (text, command) in enumerate(operations, start=len(labels)):  # Iterating over operations
             button = tk.Button(self.master, text=text, command=command)  # Creating button widgets
@@ -76,8 +393,11 @@ class EventGUI:
             event_data["invoice"] = event_data.pop("Invoice")  # Changing "Invoice" key to "invoice"
 
             new_event = Event(**event_data)  # Creating a new Event instance with event data
-            self.event_management.add_event(new_event)  # Adding the new event to event management
-            messagebox.showinfo("Success", "Event added successfully.")  # Displaying success message
+            conflicts = self.event_management.add_event(new_event)  # Adding the new event to event management
+            if conflicts:  # Checking if the venue was already booked at that time
+                messagebox.showwarning("Venue Conflict", f"Event added, but the venue is also booked by: {', '.join(conflicts)}")  # Reporting the double booking
+            else:
+                messagebox.showinfo("Success", "Event added successfully.")  # Displaying success message
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", f"Could not add event: {e}")  # Displaying error message
 
@@ -92,11 +412,15 @@ class EventGUI:
     def modify_event(self):  # Method to modify an event
         event_id = self.entries["Event ID"].get()  # Getting the event ID from entry widget
         updates = {  # Creating a dictionary of updates
-            key: entry.get() for key, entry in self.entries.items() if entry.get()  # Getting updates from entry widgets
+            EVENT_ENTRY_FIELDS[key]: entry.get() for key, entry in self.entries.items()  # Getting updates from entry widgets under their attribute names
+            if key != "Event ID" and entry.get()  # Skipping the ID and empty entries
         }
         try:  # Starting a try block
-            self.event_management.modify_event(event_id, **updates)  # Modifying the event
-            messagebox.showinfo("Success", "Event modified successfully.")  # Displaying success message
+            conflicts = self.event_management.modify_event(event_id, **updates)  # Modifying the event
+            if conflicts:  # Checking if the venue was already booked at that time
+                messagebox.showwarning("Venue Conflict", f"Event modified, but the venue is also booked by: {', '.join(conflicts)}")  # Reporting the double booking
+            else:
+                messagebox.showinfo("Success", "Event modified successfully.")  # Displaying success message
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", f"Could not modify event: {e}")  # Displaying error message
 
@@ -105,9 +429,9 @@ class EventGUI:
         try:  # Starting a try block
             event = self.event_management.get_event(event_id)  # Getting the event
             event_info = "\n".join(  # Joining event information into a string
-                f"{key}: {getattr(event, key.lower().replace(' ', '_'), '')}"  # Formatting each line of event information
-                if key != "Type"  # Ensure event type is excluded from here
-                else f"{key}: {event.event_type}"  # Displaying event type separately
+                f"{key}: {format_guest_list(event.guest_list)}"  # Displaying the guest IDs separated by commas
+                if key == "Guest List"  # Ensure the guest list is formatted separately
+                else f"{key}: {getattr(event, EVENT_ENTRY_FIELDS[key], '')}"  # Formatting each line of event information
                 for key in self.entries
             )
             messagebox.showinfo("Event Details", event_info)  # Displaying event information
@@ -116,17 +440,40 @@ class EventGUI:
 
     def display_all_events(self):  # Method to display all events
         try:  # Starting a try block
-            all_events_info = self.event_management.display_all_events()  # Getting information of all events
-            if all_events_info:  # Checking if there are events to display
-                messagebox.showinfo("All Events Details", all_events_info)  # Displaying all events information
-            else:  # If there are no events to display
-                messagebox.showinfo("All Events Details", "No events to display.")  # Displaying message
+            rows = self.event_management.iter_event_rows(column_fields(EVENT_COLUMNS), snapshot=True)  # Streaming the rows from the manager
+            RecordTable(self.master, "All Events Details", EVENT_COLUMNS, rows, live=(self.context, "events"))  # Showing them in a paged, sortable table kept up to date
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", str(e))  # Displaying error message
+
+    def import_events(self):  # Method to import events from a CSV or JSON file
+        import_records(self.master, "events", self.event_management)  # Importing the chosen file in chunks
+
+    def export_events(self):  # Method to export events to a CSV, JSON Lines or column file
+        export_records(self.master, "events", self.event_management)  # Exporting the chosen attributes and records in chunks
+
+    def find_venues_and_suppliers(self):  # Method to list the venues and suppliers free for the entered date, time and duration
+        guest_count = simpledialog.askinteger("Guests", "Number of guests:", parent=self.master, minvalue=1)  # Asking for the guest count
+        if guest_count is None:  # Checking if the user cancelled
+            return
+        service = simpledialog.askstring("Service", "Supplier service (leave blank for all):", parent=self.master)  # Asking for the service
+        if service is None:  # Checking if the user cancelled
+            return
+        try:  # Starting a try block
+            venues, suppliers = self.matcher.match(  # Finding the free venues and suppliers, best fit first
+                guest_count, self.entries["Date"].get(), self.entries["Time"].get(), self.entries["Duration"].get(),
+                service, exclude_event=self.entries["Event ID"].get() or None,
+            )
+            rows = [("Venue", venue.venue_id, venue.name, venue.address, "", venue.min_guests, venue.max_guests) for venue in venues]  # Rows for the venues
+            rows += [("Supplier", supplier.supplier_id, supplier.name, supplier.address, supplier.service_provided,
+                      supplier.min_guests_supplier, supplier.max_guests_supplier) for supplier in suppliers]  # Rows for the suppliers
+            RecordTable(self.master, f"Free for {guest_count} Guests", MATCH_COLUMNS, rows)  # Showing them in a sortable table
+        except Exception as e:  # Catching any exceptions
+            messagebox.showerror("Error", f"Could not find venues and suppliers: {e}")  # Displaying error message
 class GuestGUI:
-    def __init__(self, master):  # Constructor method for GuestGUI class, taking master as an argument
+    def __init__(self, master, context=None):  # Constructor method for GuestGUI class, taking master as an argument
         self.master = master  # Assigning the master argument to the master attribute
-        self.guest_management = GuestManagement()  # Creating an instance of GuestManagement and assigning it to guest_management attribute
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.guest_management = self.context.guest_management  # Using the context's GuestManagement
         self.create_widgets()  # Calling the create_widgets method to create GUI elements
 
     def create_widgets(self):  # Method to create GUI elements
@@ -176,6 +523,16 @@ class GuestGUI:
         )
         self.display_all_button.grid(row=6, column=0, columnspan=2, sticky="we")  # Placing button widget in the grid
 
+        self.import_button = tk.Button(  # Creating button widget for importing guests from a file
+            self.master, text="Import Guests", command=self.import_guests  # Assigning text and command to the button
+        )
+        self.import_button.grid(row=7, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
+        self.export_button = tk.Button(  # Creating button widget for exporting guests to a file
+            self.master, text="Export Guests", command=self.export_guests  # Assigning text and command to the button
+        )
+        self.export_button.grid(row=8, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
     def add_guest(self):  # Method to add a guest
         guest_id = self.guest_id_entry.get()  # Getting guest ID from entry widget
         name = self.name_entry.get()  # Getting guest name from entry widget
@@ -220,19 +577,23 @@ class GuestGUI:
 
     def display_all_guests(self):  # Method to display all guests
         try:  # Starting a try block
-            all_guests_info = self.guest_management.display_all_guests()  # Getting information of all guests
-            if all_guests_info:  # Checking if there are guests to display
-                messagebox.showinfo("All Guests Details", all_guests_info)  # Displaying all guests information
-            else:  # If there are no guests to display
-                messagebox.showinfo("All Guests Details", "No guests to display.")  # Displaying message
+            rows = self.guest_management.iter_guest_rows(column_fields(GUEST_COLUMNS), snapshot=True)  # Streaming the rows from the manager
+            RecordTable(self.master, "All Guests Details", GUEST_COLUMNS, rows, live=(self.context, "guests"))  # Showing them in a paged, sortable table kept up to date
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", str(e))  # Displaying error message
 
+    def import_guests(self):  # Method to import guests from a CSV or JSON file
+        import_records(self.master, "guests", self.guest_management)  # Importing the chosen file in chunks
+
+    def export_guests(self):  # Method to export guests to a CSV, JSON Lines or column file
+        export_records(self.master, "guests", self.guest_management)  # Exporting the chosen attributes and records in chunks
+
 
 class SupplierGUI:
-    def __init__(self, master):  # Constructor method for SupplierGUI class, taking master as an argument
+    def __init__(self, master, context=None):  # Constructor method for SupplierGUI class, taking master as an argument
         self.master = master  # Assigning the master argument to the master attribute
-        self.supplier_management = SupplierManagement()  # Creating an instance of SupplierManagement and assigning it to supplier_management attribute
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.supplier_management = self.context.supplier_management  # Using the context's SupplierManagement
         self.create_widgets()  # Calling the create_widgets method to create GUI elements
 
     def create_widgets(self):  # Method to create GUI elements
@@ -302,6 +663,16 @@ class SupplierGUI:
         )
         self.display_all_button.grid(row=10, columnspan=2, column=0, sticky="we")  # Placing button widget in the grid
 
+        self.import_button = tk.Button(  # Creating button widget for importing suppliers from a file
+            self.master, text="Import Suppliers", command=self.import_suppliers  # Assigning text and command to the button
+        )
+        self.import_button.grid(row=11, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
+        self.export_button = tk.Button(  # Creating button widget for exporting suppliers to a file
+            self.master, text="Export Suppliers", command=self.export_suppliers  # Assigning text and command to the button
+        )
+        self.export_button.grid(row=12, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
     def add_supplier(self):  # Method to add a supplier
         supplier_id = self.supplier_id_entry.get()  # Getting supplier ID from entry widget
         name = self.name_entry.get()  # Getting supplier name from entry widget
@@ -362,19 +733,23 @@ class SupplierGUI:
 
     def display_all_suppliers(self):  # Method to display all suppliers
         try:  # Starting a try block
-            all_suppliers_info = self.supplier_management.display_all_suppliers()  # Getting information of all suppliers
-            if all_suppliers_info:  # Checking if there are suppliers to display
-                messagebox.showinfo("All Suppliers Details", all_suppliers_info)  # Displaying all suppliers information
-            else:  # If there are no suppliers to display
-                messagebox.showinfo("All Suppliers Details", "No suppliers to display.")  # Displaying message
+            rows = self.supplier_management.iter_supplier_rows(column_fields(SUPPLIER_COLUMNS), snapshot=True)  # Streaming the rows from the manager
+            RecordTable(self.master, "All Suppliers Details", SUPPLIER_COLUMNS, rows, live=(self.context, "suppliers"))  # Showing them in a paged, sortable table kept up to date
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", str(e))  # Displaying error message
 
+    def import_suppliers(self):  # Method to import suppliers from a CSV or JSON file
+        import_records(self.master, "suppliers", self.supplier_management)  # Importing the chosen file in chunks
+
+    def export_suppliers(self):  # Method to export suppliers to a CSV, JSON Lines or column file
+        export_records(self.master, "suppliers", self.supplier_management)  # Exporting the chosen attributes and records in chunks
+
 
 class VenueGUI:
-    def __init__(self, master):
+    def __init__(self, master, context=None):
         self.master = master  # Initializing the master widget
-        self.venue_management = VenueManagement()  # Creating an instance of VenueManagement
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.venue_management = self.context.venue_management  # Using the context's VenueManagement
         self.create_widgets()  # Calling the method to create GUI widgets
 
     def create_widgets(self):
@@ -434,6 +809,16 @@ class VenueGUI:
         )
         self.display_all_button.grid(row=8, columnspan=2, column=0, sticky="we")  # Placing the button widget
 
+        self.import_button = tk.Button(  # Creating button widget for importing venues from a file
+            self.master, text="Import Venues", command=self.import_venues  # Assigning text and command to the button
+        )
+        self.import_button.grid(row=9, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
+        self.export_button = tk.Button(  # Creating button widget for exporting venues to a file
+            self.master, text="Export Venues", command=self.export_venues  # Assigning text and command to the button
+        )
+        self.export_button.grid(row=10, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
     def add_venue(self):
         venue_id = self.venue_id_entry.get()  # Getting the venue ID from the entry widget
         name = self.name_entry.get()  # Getting the name from the entry widget
@@ -480,14 +865,17 @@ class VenueGUI:
 
     def display_all_venues(self):  # Method to display all venues
         try:  # Starting a try block
-            all_venues_info = self.venue_management.display_all_venues()  # Retrieving all venue information
-            if all_venues_info:  # Checking if there are venues to display
-                messagebox.showinfo("All Venues Details", all_venues_info)  # Displaying all venue details
-            else:  # If there are no venues
-                messagebox.showinfo("All Venues Details", "No venues to display.")  # Displaying message indicating no venues
+            rows = self.venue_management.iter_venue_rows(column_fields(VENUE_COLUMNS), snapshot=True)  # Streaming the rows from the manager
+            RecordTable(self.master, "All Venues Details", VENUE_COLUMNS, rows, live=(self.context, "venues"))  # Showing them in a paged, sortable table kept up to date
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", str(e))  # Displaying error message
 
+    def import_venues(self):  # Method to import venues from a CSV or JSON file
+        import_records(self.master, "venues", self.venue_management)  # Importing the chosen file in chunks
+
+    def export_venues(self):  # Method to export venues to a CSV, JSON Lines or column file
+        export_records(self.master, "venues", self.venue_management)  # Exporting the chosen attributes and records in chunks
+
     def display_venue(self):  # Method to display a venue
         venue_id = self.venue_id_entry.get()  # Getting venue ID from entry widget
         try:  # Starting a try block
@@ -499,9 +887,10 @@ class VenueGUI:
 
 
 class ClientGUI:
-    def __init__(self, master):
+    def __init__(self, master, context=None):
         self.master = master  # Initializing the master widget
-        self.client_management = ClientManagement()  # Creating an instance of ClientManagement
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.client_management = self.context.client_management  # Using the context's ClientManagement
         self.create_widgets()  # Calling the method to create GUI widgets
 
     def create_widgets(self):
@@ -556,6 +945,16 @@ class ClientGUI:
         )
         self.display_all_button.grid(row=7, columnspan=2, column=0, sticky="we")  # Placing the button widget
 
+        self.import_button = tk.Button(  # Creating button widget for importing clients from a file
+            self.master, text="Import Clients", command=self.import_clients  # Assigning text and command to the button
+        )
+        self.import_button.grid(row=8, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
+        self.export_button = tk.Button(  # Creating button widget for exporting clients to a file
+            self.master, text="Export Clients", command=self.export_clients  # Assigning text and command to the button
+        )
+        self.export_button.grid(row=9, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
     def add_client(self):
         client_id = self.client_id_entry.get()  # Getting the client ID from the entry widget
         name = self.name_entry.get()  # Getting the name from the entry widget
@@ -612,18 +1011,22 @@ class ClientGUI:
 
     def display_all_clients(self):
         try:  # Starting a try block
-            all_clients_info = self.client_management.display_all_clients()  # Retrieving all clients' information
-            if all_clients_info:  # Checking if there are clients to display
-                messagebox.showinfo("All Clients Details", all_clients_info)  # Displaying all client details
-            else:  # If there are no clients
-                messagebox.showinfo("All Clients Details", "No clients to display.")  # Displaying message indicating no clients
+            rows = self.client_management.iter_client_rows(column_fields(CLIENT_COLUMNS), snapshot=True)  # Streaming the rows from the manager
+            RecordTable(self.master, "All Clients Details", CLIENT_COLUMNS, rows, live=(self.context, "clients"))  # Showing them in a paged, sortable table kept up to date
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", str(e))  # Displaying error message
 
+    def import_clients(self):  # Method to import clients from a CSV or JSON file
+        import_records(self.master, "clients", self.client_management)  # Importing the chosen file in chunks
+
+    def export_clients(self):  # Method to export clients to a CSV, JSON Lines or column file
+        export_records(self.master, "clients", self.client_management)  # Exporting the chosen attributes and records in chunks
+
 class EmployeeGUI:
-    def __init__(self, master):
+    def __init__(self, master, context=None):
         self.master = master  # Initializing the master widget
-        self.employee_management = EmployeeManagement()  # Creating an instance of EmployeeManagement
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.employee_management = self.context.employee_management  # Using the context's EmployeeManagement
         self.create_widgets()  # Calling the method to create GUI widgets
 
     def create_widgets(self):
@@ -695,6 +1098,16 @@ class EmployeeGUI:
         self.display_all_button = tk.Button(self.master, text="Display All Employee", command=self.display_all_employees)
         self.display_all_button.grid(row=11, columnspan=2, column=0, sticky="we")  # Placing the button widget
 
+        self.import_button = tk.Button(  # Creating button widget for importing employees from a file
+            self.master, text="Import Employees", command=self.import_employees  # Assigning text and command to the button
+        )
+        self.import_button.grid(row=12, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
+        self.export_button = tk.Button(  # Creating button widget for exporting employees to a file
+            self.master, text="Export Employees", command=self.export_employees  # Assigning text and command to the button
+        )
+        self.export_button.grid(row=13, columnspan=2, column=0, sticky="we")  # Placing the button widget
+
     def add_employee(self):
         try:  # Starting a try block
             new_employee = Employee(  # Creating a new Employee object
@@ -759,13 +1172,133 @@ class EmployeeGUI:
 
     def display_all_employees(self):
         try:  # Starting a try block
-            all_employees_info = self.employee_management.display_all_employees()  # Retrieving all employees' information
-            if all_employees_info:  # Checking if there are employees to display
-                messagebox.showinfo("All Employees Details", all_employees_info)  # Displaying all employees' details
-            else:  # If there are no employees
-                messagebox.showinfo("All Employees Details", "No employees to display.")  # Displaying message indicating no employees
+            rows = self.employee_management.iter_employee_rows(column_fields(EMPLOYEE_COLUMNS), snapshot=True)  # Streaming the rows from the manager
+            RecordTable(self.master, "All Employees Details", EMPLOYEE_COLUMNS, rows, live=(self.context, "employees"))  # Showing them in a paged, sortable table kept up to date
+        except Exception as e:  # Catching any exceptions
+            messagebox.showerror("Error", str(e))  # Displaying error message
+
+    def import_employees(self):  # Method to import employees from a CSV or JSON file
+        import_records(self.master, "employees", self.employee_management)  # Importing the chosen file in chunks
+
+    def export_employees(self):  # Method to export employees to a CSV, JSON Lines or column file
+        export_records(self.master, "employees", self.employee_management)  # Exporting the chosen attributes and records in chunks
+
+class DashboardGUI(Observer):
+    # Tab showing revenue, budget and payroll totals. The totals are kept up to date by the
+    # context's Analytics on every change, so redrawing only reads them.
+    def __init__(self, master, context=None):  # Constructor method for DashboardGUI class
+        self.master = master  # Initializing the master widget
+        self.context = context or DataContext()  # Using the shared data context or creating one
+        self.analytics = self.context.analytics  # Running totals of the context
+        self.pending = False  # Whether a redraw is already scheduled
+        self.create_widgets()  # Calling the method to create GUI widgets
+        self.context.add_observer(self)  # Redrawing after changes to the stores
+        self.refresh()  # Showing the current totals
+
+    def create_widgets(self):
+        self.summary = tk.Label(self.master, justify="left", anchor="w")  # Label listing the overall totals
+        self.summary.grid(row=0, column=0, columnspan=2, sticky="we")  # Placing the label
+
+        tk.Label(self.master, text="Breakdown:").grid(row=1, column=0, sticky="w")  # Creating a label for the breakdown choice
+        self.view = ttk.Combobox(self.master, values=list(DASHBOARD_VIEWS), state="readonly")  # Creating the breakdown choice
+        self.view.current(0)  # Starting with the first breakdown
+        self.view.grid(row=1, column=1, sticky="we")  # Placing the breakdown choice
+        self.view.bind("<<ComboboxSelected>>", lambda event: self.refresh())  # Redrawing when another breakdown is chosen
+
+        self.tree = ttk.Treeview(self.master, columns=("group", "count", "total", "mean"), show="headings", height=10)  # Creating the breakdown table
+        for column, heading in (("group", ""), ("count", "Count"), ("total", "Total"), ("mean", "Average")):  # Iterating over the columns
+            self.tree.heading(column, text=heading)  # Setting the heading
+            self.tree.column(column, width=110, stretch=True)  # Setting the column width
+        self.tree.grid(row=2, column=0, columnspan=2, sticky="nsew")  # Placing the table
+        self.master.grid_rowconfigure(2, weight=1)  # Letting the table grow vertically
+        self.master.grid_columnconfigure(1, weight=1)  # Letting the table grow horizontally
+
+    def after_change(self, label, changes):  # Method to redraw once after a batch of changes
+        if label in DASHBOARD_LABELS and not self.pending:  # Checking if the totals moved and no redraw is waiting
+            self.pending = True  # Marking the redraw as scheduled
+            self.master.after_idle(self.refresh)  # Redrawing once the change is fully applied
+
+    def refresh(self):  # Method to show the current totals
+        self.pending = False  # No redraw is waiting anymore
+        try:  # Starting a try block
+            revenue, budgets, payroll = self.analytics.revenue(), self.analytics.budgets(), self.analytics.payroll()  # Reading the overall totals
+            utilization = f"{revenue.total / budgets.total:.0%}" if budgets.total else "n/a"  # Share of the client budgets invoiced
+            self.summary.config(text=(
+                f"Revenue: {revenue.total:,.2f} from {revenue.count} events\n"
+                f"Client budgets: {budgets.total:,.2f} over {budgets.count} clients ({utilization} invoiced)\n"
+                f"Payroll: {payroll.total:,.2f} for {payroll.count} employees"
+            ))
+            heading, read_groups = DASHBOARD_VIEWS[self.view.get()]  # Looking up the chosen breakdown
+            self.tree.heading("group", text=heading)  # Naming the group column
+            self.tree.delete(*self.tree.get_children())  # Clearing the previous rows
+            for group, totals in sorted(read_groups(self.analytics).items(), key=lambda item: str(item[0])):  # Iterating over the groups in order
+                mean = totals.mean  # Average amount of the group
+                self.tree.insert("", "end", values=(group, totals.count, f"{totals.total:,.2f}", f"{mean:,.2f}" if mean is not None else ""))  # Listing the group
+        except Exception as e:  # Catching any exceptions
+            messagebox.showerror("Error", str(e))  # Displaying error message
+
+
+class SearchBar(tk.Frame):
+    # Search box listing the best matching records of every store while the user types.
+    # Searching waits for a short pause in typing so each key press stays responsive.
+    DELAY_MS = 150  # Pause in typing before searching
+    RESULT_ROWS = 6  # Number of hits shown at a time
+
+    def __init__(self, master, search_index):  # Constructor method for SearchBar class
+        super().__init__(master)  # Creating the frame
+        self.search_index = search_index  # Index answering the searches
+        self.pending = None  # Scheduled search waiting for a pause in typing
+        self.hits = []  # (label, key) of each listed hit
+
+        tk.Label(self, text="Search:").grid(row=0, column=0, sticky="w")  # Label for the search box
+        self.query_entry = tk.Entry(self)  # Creating the search box
+        self.query_entry.grid(row=0, column=1, sticky="we")  # Placing the search box
+        self.results = tk.Listbox(self, height=self.RESULT_ROWS)  # Creating the list of hits
+        self.results.grid(row=1, column=0, columnspan=2, sticky="we")  # Placing the list of hits
+        self.results.grid_remove()  # Hiding the list until there is something to show
+        self.grid_columnconfigure(1, weight=1)  # Letting the search box grow horizontally
+
+        self.query_entry.bind("<KeyRelease>", self.schedule_search)  # Searching as the user types
+        self.results.bind("<Double-Button-1>", self.show_hit)  # Showing a hit when it is double-clicked
+        self.results.bind("<Return>", self.show_hit)  # Showing the selected hit with Enter
+
+    def schedule_search(self, event=None):  # Method to search once typing pauses
+        if self.pending is not None:  # Checking if a search is already waiting
+            self.after_cancel(self.pending)  # Dropping it in favour of the newer text
+        self.pending = self.after(self.DELAY_MS, self.run_search)  # Searching after the pause
+
+    def run_search(self):  # Method to list the hits for the current text
+        self.pending = None  # No search is waiting anymore
+        self.results.delete(0, tk.END)  # Clearing the previous hits
+        self.hits = []  # Forgetting the previous hits
+        query = self.query_entry.get()  # Reading the search text
+        if not query.strip():  # Checking for an empty search
+            self.results.grid_remove()  # Hiding the list
+            return
+        if not self.search_index.built:  # Checking if the first search still has to index the records
+            self.results.insert(tk.END, "Indexing records...")  # Saying why the first search takes longer
+            self.results.grid()  # Showing the message
+            self.update_idletasks()  # Drawing it before indexing
+            self.results.delete(0, tk.END)  # Clearing the message
+        try:  # Starting a try block
+            for label, key, score in self.search_index.search(query):  # Iterating over the ranked hits
+                self.results.insert(tk.END, describe(label, self.search_index.record(label, key)))  # Listing each hit
+                self.hits.append((label, key))  # Remembering which record it is
         except Exception as e:  # Catching any exceptions
             messagebox.showerror("Error", str(e))  # Displaying error message
+        if not self.hits:  # Checking if nothing matched
+            self.results.insert(tk.END, "No matches found.")  # Saying so
+        self.results.grid()  # Showing the list
+
+    def show_hit(self, event=None):  # Method to show every attribute of the selected hit
+        selection = self.results.curselection()  # Getting the selected line
+        if not selection or selection[0] >= len(self.hits):  # Checking if a hit is selected
+            return
+        label, key = self.hits[selection[0]]  # Getting the selected record
+        record = self.search_index.record(label, key)  # Reading the record
+        details = "\n".join(f"{field}: {value}" for field, value in record.__getstate__().items())  # Listing its attributes
+        messagebox.showinfo(describe(label, record), details)  # Displaying them
+
 
 class ManagementApp(tk.Tk):
     def __init__(self):
@@ -773,46 +1306,127 @@ class ManagementApp(tk.Tk):
         self.title("Events Company Management System")  # Setting the title of the application window
         self.geometry("500x400")  # Setting the size of the application window
 
+        self.persistence_errors = queue.Queue()  # Errors raised by the background writers, shown on the Tk thread
+        self.context = DataContext(  # One manager per store, shared by every tab
+            write_behind=True, report_error=self.persistence_errors.put,  # Saving in the background and reporting errors on the Tk thread
+            on_delete="restrict",  # Refusing to delete records that are still referred to
+        )
+        self.closing = False  # Whether the window is being closed
+        self.protocol("WM_DELETE_WINDOW", self.on_close)  # Flushing unsaved changes when the window is closed
+        self.after(200, self.show_persistence_errors)  # Starting to poll for background save errors
+        self.after(REFRESH_INTERVAL, self.refresh_records)  # Starting to poll for records saved by other copies of the program
+        self.after(200, self.apply_refreshed_records)  # Starting to poll for the records the background writers read
+
+        menu_bar = tk.Menu(self)  # Creating the menu bar
+        tools_menu = tk.Menu(menu_bar, tearoff=0)  # Creating the tools menu
+        tools_menu.add_command(label="Check References", command=self.check_references)  # Listing dangling references
+        menu_bar.add_cascade(label="Tools", menu=tools_menu)  # Adding the tools menu
+        self.config(menu=menu_bar)  # Showing the menu bar
+
+        self.search_bar = SearchBar(self, self.context.search_index)  # Creating the search box above the tabs
+        self.search_bar.pack(fill="x")  # Packing the search box
+
         self.tab_control = ttk.Notebook(self)  # Creating a tab control
         self.init_tabs()  # Initializing tabs
         self.tab_control.pack(expand=1, fill="both")  # Packing the tab control
 
     def init_tabs(self):
+        self.tab_builders = {}  # Mapping of tab frames to the GUI attribute and class that fill them on first selection
+
         # Client Tab
         self.client_tab = ttk.Frame(self.tab_control)  # Creating a frame for the client tab
-        self.client_gui = ClientGUI(self.client_tab)  # Creating an instance of ClientGUI
+        self.client_gui = None  # The ClientGUI is created when the tab is first selected
         self.client_tab.pack(fill="both", expand=True)  # Packing the client tab frame
         self.tab_control.add(self.client_tab, text="Clients")  # Adding the client tab to the tab control
+        self.tab_builders[str(self.client_tab)] = ("client_gui", ClientGUI)  # Registering how to build the client tab
 
         # Employee Tab
         self.employee_tab = ttk.Frame(self.tab_control)  # Creating a frame for the employee tab
-        self.employee_gui = EmployeeGUI(self.employee_tab)  # Creating an instance of EmployeeGUI
+        self.employee_gui = None  # The EmployeeGUI is created when the tab is first selected
         self.employee_tab.pack(fill="both", expand=True)  # Packing the employee tab frame
         self.tab_control.add(self.employee_tab, text="Employees")  # Adding the employee tab to the tab control
+        self.tab_builders[str(self.employee_tab)] = ("employee_gui", EmployeeGUI)  # Registering how to build the employee tab
 
         # Event Tab
         self.event_tab = ttk.Frame(self.tab_control)  # Creating a frame for the event tab
-        self.event_gui = EventGUI(self.event_tab)  # Creating an instance of EventGUI
+        self.event_gui = None  # The EventGUI is created when the tab is first selected
         self.event_tab.pack(fill="both", expand=True)  # Packing the event tab frame
         self.tab_control.add(self.event_tab, text="Events")  # Adding the event tab to the tab control
+        self.tab_builders[str(self.event_tab)] = ("event_gui", EventGUI)  # Registering how to build the event tab
 
         # Guest Tab
         self.guest_tab = ttk.Frame(self.tab_control)  # Creating a frame for the guest tab
-        self.guest_gui = GuestGUI(self.guest_tab)  # Creating an instance of GuestGUI
+        self.guest_gui = None  # The GuestGUI is created when the tab is first selected
         self.guest_tab.pack(fill="both", expand=True)  # Packing the guest tab frame
         self.tab_control.add(self.guest_tab, text="Guests")  # Adding the guest tab to the tab control
+        self.tab_builders[str(self.guest_tab)] = ("guest_gui", GuestGUI)  # Registering how to build the guest tab
 
         # Supplier Tab
         self.supplier_tab = ttk.Frame(self.tab_control)  # Creating a frame for the supplier tab
-        self.supplier_gui = SupplierGUI(self.supplier_tab)  # Creating an instance of SupplierGUI
+        self.supplier_gui = None  # The SupplierGUI is created when the tab is first selected
         self.supplier_tab.pack(fill="both", expand=True)  # Packing the supplier tab frame
         self.tab_control.add(self.supplier_tab, text="Suppliers")  # Adding the supplier tab to the tab control
+        self.tab_builders[str(self.supplier_tab)] = ("supplier_gui", SupplierGUI)  # Registering how to build the supplier tab
 
         # Venue Tab
         self.venue_tab = ttk.Frame(self.tab_control)  # Creating a frame for the venue tab
-        self.venue_gui = VenueGUI(self.venue_tab)  # Creating an instance of VenueGUI
+        self.venue_gui = None  # The VenueGUI is created when the tab is first selected
         self.venue_tab.pack(fill="both", expand=True)  # Packing the venue tab frame
         self.tab_control.add(self.venue_tab, text="Venues")  # Adding the venue tab to the tab control
+        self.tab_builders[str(self.venue_tab)] = ("venue_gui", VenueGUI)  # Registering how to build the venue tab
+
+        # Dashboard Tab
+        self.dashboard_tab = ttk.Frame(self.tab_control)  # Creating a frame for the dashboard tab
+        self.dashboard_gui = None  # The DashboardGUI is created when the tab is first selected
+        self.dashboard_tab.pack(fill="both", expand=True)  # Packing the dashboard tab frame
+        self.tab_control.add(self.dashboard_tab, text="Dashboard")  # Adding the dashboard tab to the tab control
+        self.tab_builders[str(self.dashboard_tab)] = ("dashboard_gui", DashboardGUI)  # Registering how to build the dashboard tab
+
+        self.tab_control.bind("<<NotebookTabChanged>>", self.build_selected_tab)  # Building each tab the first time it is shown
+
+    def build_selected_tab(self, event=None):  # Method to fill the selected tab on first selection
+        tab = self.tab_control.select()  # Getting the name of the selected tab frame
+        if tab in self.tab_builders:  # Checking if the tab has not been built yet
+            attribute, gui_class = self.tab_builders.pop(tab)  # Taking the GUI attribute and class for the tab
+            setattr(self, attribute, gui_class(self.nametowidget(tab), self.context))  # Creating the GUI inside the tab frame with the shared context
+
+    def check_references(self):  # Method to list every reference to a missing record
+        try:  # Starting a try block
+            dangling = self.context.integrity.audit()  # Checking every store in one pass
+            RecordTable(self, "Dangling References", REFERENCE_COLUMNS, dangling)  # Showing them in a sortable table
+        except Exception as e:  # Catching any exceptions
+            messagebox.showerror("Error", str(e))  # Displaying error message
+
+    def show_persistence_errors(self):  # Method to report background save errors on the Tk thread
+        while not self.persistence_errors.empty():  # Checking for unreported errors
+            error = self.persistence_errors.get()  # Taking the next reported error
+            messagebox.showerror("Save Error", f"Changes could not be saved: {error}")  # Displaying it
+        if not self.closing:  # Checking if the window is still open
+            self.after(200, self.show_persistence_errors)  # Polling again later
+
+    def refresh_records(self):  # Method to pick up the records other copies of the program saved to the shared files
+        if self.closing:  # Checking if the window is being closed
+            return
+        try:
+            self.context.request_refresh()  # Having the background writers read them, so the window never waits on the disk
+        except Exception as e:  # Handling unreadable files
+            self.persistence_errors.put(e)  # Reporting the error with the save errors
+        self.after(REFRESH_INTERVAL, self.refresh_records)  # Polling again later
+
+    def apply_refreshed_records(self):  # Method to apply the records the background writers read on the Tk thread
+        if self.closing:  # Checking if the window is being closed
+            return
+        try:
+            self.context.apply_refreshed()  # Applying their changes, which open tables and the search index follow
+        except Exception as e:  # Handling changes the observers could not follow
+            self.persistence_errors.put(e)  # Reporting the error with the save errors
+        self.after(200, self.apply_refreshed_records)  # Polling again later
+
+    def on_close(self):  # Method to flush unsaved changes before the window closes
+        self.closing = True  # Stopping the error polling
+        self.context.close()  # Writing the queued changes and stopping the writers
+        self.show_persistence_errors()  # Reporting any error raised by the last writes
+        self.destroy()  # Closing the window
 
 
 if __name__ == "__main__":
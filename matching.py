@@ -0,0 +1,183 @@
+from changes import Observer  # Importing the observer base class
+from event_management import SUPPLIER_COMPANY_FIELDS, schedule_values  # Importing the event fields naming a supplier company and the parsed event schedule
+from indexes import CapacityIndex, IntervalIndex, normalize  # Importing the capacity and booking indexes
+from integrity import supplier_keys, venue_keys  # Importing the texts events use to name venues and suppliers
+from schedule import event_window  # Importing the parser turning date, time and duration into a time span
+
+UNLIMITED = float("inf")  # Capacity of a blank upper bound
+
+
+def capacity_bounds(low, high):  # Function for reading a capacity range entered as numbers or text
+    """
+    Read a minimum and maximum guest count. A blank or unreadable minimum means no
+    minimum and a blank or unreadable maximum means no maximum.
+    Returns:
+        tuple: (lowest, highest) as numbers.
+    """
+    return read_count(low, -UNLIMITED), read_count(high, UNLIMITED)  # Returning the readable bounds
+
+
+def read_count(value, default):  # Function for reading one guest count
+    try:
+        return float(str(value).strip())  # Returning the count as a number
+    except ValueError:  # Handling blank or unreadable counts
+        return default  # Returning the open bound
+
+
+def fit(record_bounds, guest_count):  # Function for ranking how snugly a capacity range fits a count
+    low, high = record_bounds  # Unpacking the range
+    return (high - guest_count, guest_count - low)  # Fewer empty places first, then the closest minimum
+
+
+class Matcher(Observer):  # Definition of the Matcher class
+    # Answers "which venues and suppliers can take N guests at this time?" from indexes kept
+    # up to date through the managers' change notifications:
+    #   venue capacities, supplier capacities per service, and supplier bookings per company.
+    # Venue bookings come from the event manager's own interval index.
+    def __init__(self, event_management, venue_management, supplier_management):  # Constructor method for attaching the matcher
+        self.event_management = event_management  # Manager of the events booking venues and suppliers
+        self.venue_management = venue_management  # Manager of the venues to match
+        self.supplier_management = supplier_management  # Manager of the suppliers to match
+        self._venue_capacity = None  # Capacity index over the venues, built on first use
+        self._supplier_capacity = None  # Capacity index per normalized service, built on first use
+        self._supplier_services = {}  # Normalized service of each indexed supplier
+        self._supplier_bookings = None  # Time spans each supplier company is booked for, built on first use
+        for management in (event_management, venue_management, supplier_management):  # Iterating over the managers
+            management.add_observer(self)  # Watching its changes
+
+    @property
+    def venue_capacity(self):  # Property building the venue capacity index on first use
+        if self._venue_capacity is None:  # Checking if the index is not built yet
+            self._venue_capacity = CapacityIndex()  # Creating the index
+            for venue_id, low, high in self.venue_management.iter_venue_rows(("venue_id", "min_guests", "max_guests")):  # Iterating over the venues' capacities, read from the columns of a columnar store
+                self._venue_capacity.add(venue_id, *capacity_bounds(low, high))  # Indexing each venue's capacity
+        return self._venue_capacity  # Returning the index
+
+    @property
+    def supplier_capacity(self):  # Property building the supplier capacity indexes on first use
+        if self._supplier_capacity is None:  # Checking if the indexes are not built yet
+            self._supplier_capacity = {}  # Creating the indexes
+            fields = ("supplier_id", "service_provided", "min_guests_supplier", "max_guests_supplier")  # Attributes the index needs
+            for supplier_id, service, low, high in self.supplier_management.iter_supplier_rows(fields):  # Iterating over the suppliers' capacities, read from the columns of a columnar store
+                self.index_capacity(supplier_id, service, low, high)  # Indexing each supplier's capacity
+        return self._supplier_capacity  # Returning the indexes
+
+    @property
+    def supplier_bookings(self):  # Property building the supplier booking index on first use
+        if self._supplier_bookings is None:  # Checking if the index is not built yet
+            self._supplier_bookings = IntervalIndex()  # Creating the index
+            for event_id, event in self.event_management.events.items():  # Iterating over the events
+                self.book_suppliers(event_id, event)  # Booking each event's suppliers
+        return self._supplier_bookings  # Returning the index
+
+    def index_supplier(self, supplier_id, supplier):  # Method for indexing one supplier under its service
+        self.index_capacity(supplier_id, supplier.service_provided, supplier.min_guests_supplier, supplier.max_guests_supplier)  # Indexing its capacity
+
+    def index_capacity(self, supplier_id, service, low, high):  # Method for indexing a supplier's capacity under its service
+        service = normalize(service) or ""  # Normalizing the service
+        self._supplier_capacity.setdefault(service, CapacityIndex()).add(supplier_id, *capacity_bounds(low, high))  # Adding the supplier to its service's index
+        self._supplier_services[supplier_id] = service  # Remembering where the supplier is indexed
+
+    def unindex_supplier(self, supplier_id):  # Method for removing one supplier from its service's index
+        service = self._supplier_services.pop(supplier_id, None)  # Looking up the supplier's service
+        if service is not None:  # Checking if the supplier is indexed
+            self._supplier_capacity[service].remove(supplier_id)  # Removing it
+            if not self._supplier_capacity[service]:  # Checking if the service has no supplier left
+                del self._supplier_capacity[service]  # Dropping the empty index
+
+    def book_suppliers(self, event_id, event):  # Method for recording when an event uses its suppliers
+        _, starts_at, ends_at = schedule_values(event)  # Reading the event's time span
+        if starts_at is None:  # Checking if the event can be placed on the calendar
+            return
+        for field in SUPPLIER_COMPANY_FIELDS:  # Iterating over the supplier company fields
+            company = normalize(getattr(event, field, None))  # Normalizing the company name
+            if company:  # Checking if a company is named
+                self._supplier_bookings.add((event_id, field), company, starts_at, ends_at)  # Booking the company for that span
+
+    def release_suppliers(self, event_id):  # Method for removing an event's supplier bookings
+        for field in SUPPLIER_COMPANY_FIELDS:  # Iterating over the supplier company fields
+            self._supplier_bookings.remove((event_id, field))  # Releasing the booking, if any
+
+    def after_change(self, label, changes):  # Method for keeping the indexes in line with stored changes
+        for key, old, new in changes:  # Iterating over the changes
+            if label == "venues" and self._venue_capacity is not None:  # Checking for a venue change with a built index
+                self._venue_capacity.remove(key)  # Removing the old capacity
+                if new is not None:  # Checking for a stored venue
+                    self._venue_capacity.add(key, *capacity_bounds(new.min_guests, new.max_guests))  # Adding the new capacity
+            elif label == "suppliers" and self._supplier_capacity is not None:  # Checking for a supplier change with a built index
+                self.unindex_supplier(key)  # Removing the old capacity
+                if new is not None:  # Checking for a stored supplier
+                    self.index_supplier(key, new)  # Adding the new capacity
+            elif label == "events" and self._supplier_bookings is not None:  # Checking for an event change with a built index
+                self.release_suppliers(key)  # Releasing the old bookings
+                if new is not None:  # Checking for a stored event
+                    self.book_suppliers(key, new)  # Booking the new suppliers
+
+    def window(self, date, time, duration):  # Method for reading the requested time span
+        window = event_window(date, time, duration)  # Parsing the date, time and duration
+        if window is None:  # Checking if any entry could not be read
+            raise ValueError("Date, time or duration can't be read.")  # Raising an error for an unreadable schedule
+        return window  # Returning the span
+
+    def match_venues(self, guest_count, date, time, duration, exclude_event=None, limit=None):  # Method for finding the venues free for an event
+        """
+        Find the venues whose capacity includes the guest count and that no event books
+        during the given time, best fit first (fewest empty places).
+        Args:
+            exclude_event: ID of an event being re-planned, whose own booking is ignored.
+            limit: Largest number of venues to return; bookings are only checked until it is reached.
+        Returns:
+            list: The matching Venue objects.
+        """
+        window = self.window(date, time, duration)  # Reading the requested time span
+        venues = self.venue_management.venues  # Venues by ID
+        self.event_management.events  # Making sure the venue bookings are loaded
+        bookings = self.event_management.venue_bookings  # Venue bookings by normalized address
+        capacity = self.venue_capacity  # Venue capacity index
+        candidates = sorted((fit(capacity.bounds[venue_id], guest_count), venue_id) for venue_id in capacity.fitting(guest_count))  # Venues able to take the guests, best fit first
+        matches = []  # Free venues found
+        for _, venue_id in candidates:  # Iterating over the candidates in fit order
+            venue = venues[venue_id]  # Getting the venue
+            if not any(bookings.overlapping(key, *window, exclude=exclude_event) for key in venue_keys(venue)):  # Checking if no event books the venue then
+                matches.append(venue)  # Keeping the free venue
+                if len(matches) == limit:  # Checking if enough venues were found
+                    break
+        return matches  # Returning the venues
+
+    def match_suppliers(self, guest_count, date, time, duration, service=None, exclude_event=None, limit=None):  # Method for finding the suppliers free for an event
+        """
+        Find the suppliers offering the service (matched as part of their service text,
+        ignoring case), whose capacity includes the guest count and that no event uses
+        during the given time, best fit first.
+        Returns:
+            list: The matching Supplier objects.
+        """
+        window = self.window(date, time, duration)  # Reading the requested time span
+        wanted = normalize(service or "")  # Normalizing the requested service
+        suppliers = self.supplier_management.suppliers  # Suppliers by ID
+        bookings = self.supplier_bookings  # Supplier bookings by normalized company name
+        candidates = []  # Suppliers able to take the guests, with their fit
+        for offered, capacity in self.supplier_capacity.items():  # Iterating over the services, far fewer than the suppliers
+            if wanted in offered:  # Checking if the service matches
+                candidates.extend((fit(capacity.bounds[supplier_id], guest_count), supplier_id) for supplier_id in capacity.fitting(guest_count))
+        candidates.sort()  # Ranking by fit
+        matches = []  # Free suppliers found
+        for _, supplier_id in candidates:  # Iterating over the candidates in fit order
+            supplier = suppliers[supplier_id]  # Getting the supplier
+            booked = any(  # Checking if an event uses the supplier during the span
+                key[0] != exclude_event for name in supplier_keys(supplier)
+                for key in bookings.overlapping(name, *window)
+            )
+            if not booked:  # Checking if the supplier is free
+                matches.append(supplier)  # Keeping the free supplier
+                if len(matches) == limit:  # Checking if enough suppliers were found
+                    break
+        return matches  # Returning the suppliers
+
+    def match(self, guest_count, date, time, duration, service=None, exclude_event=None, limit=None):  # Method for finding venues and suppliers together
+        """
+        Returns:
+            tuple: (venues, suppliers) as returned by match_venues and match_suppliers.
+        """
+        return (self.match_venues(guest_count, date, time, duration, exclude_event, limit),
+                self.match_suppliers(guest_count, date, time, duration, service, exclude_event, limit))
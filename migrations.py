@@ -0,0 +1,87 @@
+import argparse  # Importing the argparse module for command-line options
+import re  # Importing the re module for splitting free-text guest lists
+
+from context import BACKEND_HELP, DataContext, parse_backend  # Importing the shared data context owning one manager per store
+from changes import modified_copy  # Importing the copy-on-write helper used for changed records
+from event_management import PARSED_SCHEDULE_FIELDS, EventManagement, parse_guest_list  # Importing the event manager, its parsed schedule fields and guest list parser
+from guest_management import GuestManagement  # Importing the guest manager for resolving guest names
+from indexes import normalize  # Importing the text normalization used by the indexes
+
+LEGACY_GUEST_SEPARATORS = re.compile(r"\s*(?:[,;\n]|\band\b|&)\s*", re.IGNORECASE)  # Separators people typed between guests before lists held IDs
+
+
+def resolve_guests(text, guests):  # Function for turning a free-text guest list into guest IDs
+    """
+    Split a free-text guest list such as "mansour and khalid" and resolve each part to a
+    guest ID, matching IDs first and then names. Parts matching no guest are kept as typed.
+    Returns:
+        tuple: The guest IDs in order.
+    """
+    by_id = {normalize(guest_id): guest_id for guest_id in guests}  # Guest IDs by normalized ID
+    by_name = {}  # Guest IDs by normalized name
+    for guest_id, guest in guests.items():  # Iterating over the guests
+        by_name.setdefault(normalize(guest.name), guest_id)  # Keeping the first guest with each name
+    parts = LEGACY_GUEST_SEPARATORS.split(text)  # Splitting the text into guests
+    return parse_guest_list([by_id.get(normalize(part)) or by_name.get(normalize(part)) or part for part in parts])  # Resolving each part
+
+
+def migrate_guest_lists(management=None, guest_management=None):  # Function for converting typed guest lists into guest IDs
+    """
+    Rewrite every event whose guest list is still the text typed in the GUI as a tuple
+    of guest IDs. Events already migrated are left alone, so running it twice is safe.
+    The events are saved through the manager, so its indexes and observers follow.
+    Returns:
+        int: The number of events converted.
+    """
+    if management is None:  # Checking if a manager was given
+        management = EventManagement()  # Creating one with the default storage
+    if guest_management is None:  # Checking if a guest manager was given
+        guest_management = GuestManagement()  # Creating one with the default storage
+    events = management.events  # Loading the events, which finds the typed guest lists
+    converted = [  # Copies of the events with their guest lists resolved
+        modified_copy(events[event_id], {"guest_list": resolve_guests(events[event_id].guest_list, guest_management.guests)})
+        for event_id in sorted(management.legacy_guest_lists)
+    ]
+    return management.bulk_upsert_events(converted) if converted else 0  # Saving them together, stamped and indexed by the manager
+
+
+def migrate_schedules(management=None):  # Function for storing the parsed date, time and duration of older events
+    """
+    Parse the date, time and duration of every event saved before they were stored as
+    numbers, and save those events through the manager, so its indexes and observers
+    follow. Events already holding the parsed values are left alone, so running it
+    twice is safe.
+    Returns:
+        int: The number of events converted.
+    """
+    if management is None:  # Checking if a manager was given
+        management = EventManagement()  # Creating one with the default storage
+    converted = []  # Copies of the events with their parsed values stored
+    for event in management.events.values():  # Iterating over the events
+        stored = tuple(getattr(event, field, None) for field in PARSED_SCHEDULE_FIELDS)  # Parsed values saved with the event
+        updated = modified_copy(event, {})  # Copying the event, so the loaded one stays as saved until the manager replaces it
+        updated.parse_schedule()  # Parsing the entries
+        if tuple(getattr(updated, field) for field in PARSED_SCHEDULE_FIELDS) != stored:  # Checking if the saved values were missing or stale
+            converted.append(updated)  # Recording the change
+    return management.bulk_upsert_events(converted) if converted else 0  # Saving them together, stamped and re-indexed by the manager
+
+
+MIGRATIONS = {  # Available migrations by name, each called with a DataContext
+    "guest-lists": lambda context: migrate_guest_lists(context.event_management, context.guest_management),
+    "schedules": lambda context: migrate_schedules(context.event_management),
+}
+
+
+def main():  # Function for running a migration from the command line
+    parser = argparse.ArgumentParser(description="Upgrade stored records to the current layout.")  # Creating the argument parser
+    parser.add_argument("migration", choices=sorted(MIGRATIONS), help="migration to run")  # Migration name
+    parser.add_argument("--backend", type=parse_backend, default=None, help=BACKEND_HELP)  # Storage backend, optionally per store
+    args = parser.parse_args()  # Parsing the arguments
+
+    with DataContext(backend=args.backend) as context:  # Opening the stores, closing them when done
+        count = MIGRATIONS[args.migration](context)  # Running the migration
+    print(f"Migrated {count} events.")  # Reporting the result
+
+
+if __name__ == "__main__":
+    main()  # Running the migration
@@ -0,0 +1,78 @@
+import re  # Importing the re module for reading amounts typed as text
+
+VERSION_FIELD = "version"  # Attribute counting the saved changes of a record
+AMOUNT = re.compile(r"-?\d+(?:\.\d+)?")  # First number in a typed amount such as "AED 12,500.50"
+
+
+def record_version(record):  # Function for reading a record's version stamp
+    return getattr(record, VERSION_FIELD, None) or 0  # Returning 0 for records saved before versions existed
+
+
+def parse_amount(value):  # Function for reading a money amount
+    """
+    Read an amount stored as a number or typed as text, ignoring currency names and
+    thousands separators.
+    Returns:
+        float: The amount, or None if it can't be read.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):  # Checking for a number
+        return float(value)
+    match = AMOUNT.search(str(value or "").replace(",", ""))  # Finding the number in the text
+    return float(match.group()) if match else None  # Returning it, or None for blank or unreadable text
+
+
+def amount_cents(value):  # Function for reading a money amount in whole cents
+    """
+    Returns:
+        int: The amount read by parse_amount in cents, 0 if it can't be read, so sums of
+        many amounts stay exact.
+    """
+    amount = parse_amount(value)  # Reading the amount
+    return round(amount * 100) if amount is not None else 0  # Converting it to cents
+
+
+def record_rows(records, fields, snapshot=False):  # Function for streaming tuples of attribute values from a store
+    """
+    Yield one tuple per record holding the requested attributes (None where an older
+    record lacks one). Stores that keep their records as columns answer without
+    building the records.
+    Args:
+        records: The store's records by key.
+        fields: Attribute names to include, in order.
+        snapshot: Copy the record references first so the store may change while the rows are consumed.
+    """
+    if hasattr(records, "rows"):  # Checking for a columnar store, whose rows never see later changes
+        yield from records.rows(fields)  # Reading the columns
+        return
+    values = list(records.values()) if snapshot else records.values()  # Choosing between a snapshot and live iteration
+    for record in values:  # Iterating over the records
+        yield tuple(getattr(record, field, None) for field in fields)  # Yielding the requested attribute values
+
+
+class Record:  # Definition of the Record base class
+    # Base for the slot-based record classes. Subclasses list their attributes in __slots__,
+    # so instances carry no per-instance __dict__. Pickles keep the plain attribute dictionary
+    # used before, so files written by either version load in the other.
+    # Every record also carries a version stamp, raised by one on each stored change, which
+    # lets two processes sharing the files tell whose copy of a record is newer.
+    __slots__ = (VERSION_FIELD,)  # Version stamp shared by every record class
+
+    def stored_fields(self):  # Method for listing the attributes saved for the record
+        return self.__slots__ + Record.__slots__  # Returning the record's own attributes and the version stamp
+
+    def __getstate__(self):  # Method for describing the record to pickle
+        return {field: getattr(self, field, None) for field in self.stored_fields()}  # Returning the attributes as a dictionary
+
+    def __setstate__(self, state):  # Method for rebuilding the record from a pickle
+        """
+        Restore the attributes from a pickled state. Accepts the attribute dictionary
+        of older pickles and the (dict, slots) pair of default slot pickling.
+        Attributes missing from older pickles are set to None.
+        """
+        if isinstance(state, tuple):  # Checking for a (dict, slots) pair
+            attributes = dict(state[0] or {})  # Starting from the dictionary part
+            attributes.update(state[1] or {})  # Adding the slot part
+        else:
+            attributes = state or {}  # Using the attribute dictionary
+        for field in self.stored_fields():  # Iterating over the record's attributes
+            setattr(self, field, attributes.get(field))  # Restoring each attribute, None if it was never stored
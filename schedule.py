@@ -0,0 +1,106 @@
+import functools  # Importing the functools module for caching parsed entries
+import re  # Importing the re module for reading free-text durations
+from datetime import date as Date, datetime  # Importing the date types used to parse GUI entries
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d")  # Accepted date layouts, day before month as entered locally
+TIME_FORMATS = ("%I:%M%p", "%I%p", "%H:%M", "%H.%M", "%H")  # Accepted time layouts, 12-hour with am/pm or 24-hour
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)\s*(hours|hour|hrs|hr|h|minutes|minute|mins|min|m)?")  # One number with an optional unit
+EPOCH_ORDINAL = Date(1970, 1, 1).toordinal()  # Day number of 1970-01-01
+MINUTES_PER_DAY = 24 * 60  # Minutes in a day
+PARSE_CACHE_SIZE = 4096  # Distinct entries remembered per parser; events share few dates, times and durations
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(text):  # Function for reading a date entry
+    """
+    Parse a date such as "3/5/2024" (day first) or "2024-05-03".
+    Returns:
+        int: Days since 1970-01-01, or None if the text is not a date.
+    """
+    text = str(text).strip()  # Ignoring surrounding spaces
+    for layout in DATE_FORMATS:  # Trying each accepted layout
+        try:
+            return datetime.strptime(text, layout).toordinal() - EPOCH_ORDINAL  # Returning the day number
+        except ValueError:  # Handling a layout that doesn't match
+            continue
+    return None  # Returning None for unreadable dates
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_time(text):  # Function for reading a time entry
+    """
+    Parse a time such as "9:30pm", "9 PM" or "21:30".
+    Returns:
+        int: Minutes after midnight, or None if the text is not a time.
+    """
+    text = str(text).strip().upper().replace(" ", "")  # Normalizing case and spaces for the am/pm layouts
+    for layout in TIME_FORMATS:  # Trying each accepted layout
+        try:
+            parsed = datetime.strptime(text, layout)  # Parsing the time
+            return parsed.hour * 60 + parsed.minute  # Returning the minutes after midnight
+        except ValueError:  # Handling a layout that doesn't match
+            continue
+    return None  # Returning None for unreadable times
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_duration(text):  # Function for reading a duration entry
+    """
+    Parse a duration such as "4 hours", "90 min", "2h 30m", "1:30" or "3" (hours).
+    Returns:
+        int: Length in minutes, or None if the text is not a duration.
+    """
+    text = str(text).strip().lower()  # Normalizing case and spaces
+    if re.fullmatch(r"\d+:\d{2}", text):  # Checking for hours:minutes
+        hours, minutes = text.split(":")  # Splitting hours and minutes
+        return int(hours) * 60 + int(minutes)  # Returning the length in minutes
+    parts = DURATION_PART.findall(text)  # Finding every number with its unit
+    if not parts:  # Checking if no number was found
+        return None  # Returning None for unreadable durations
+    total = 0.0  # Running length in minutes
+    for number, unit in parts:  # Iterating over the parts
+        total += float(number) if unit.startswith("m") else float(number) * 60  # Bare numbers count as hours
+    return int(round(total)) or None  # Returning the length, treating zero as unreadable
+
+
+def event_window(date, time, duration):  # Function for turning an event's schedule entries into a time span
+    """
+    Compute when an event occupies its venue.
+    Returns:
+        tuple: (start, end) in minutes since 1970-01-01, or None if any entry is unreadable.
+    """
+    day = parse_date(date)  # Parsing the date
+    start = parse_time(time)  # Parsing the start time
+    length = parse_duration(duration)  # Parsing the duration
+    if day is None or start is None or length is None:  # Checking if any entry could not be read
+        return None  # The event can't be placed on the calendar
+    start += day * MINUTES_PER_DAY  # Adding the day to the start time
+    return start, start + length  # Returning the occupied span
+
+
+def event_schedule(date, time, duration):  # Function for turning an event's schedule entries into the numbers stored with it
+    """
+    Returns:
+        tuple: (day, start, end) with the day in days since 1970-01-01 and the span in
+        minutes since then; the day stays known when only the time or duration is unreadable.
+    """
+    window = event_window(date, time, duration)  # Parsing the time span
+    if window is None:  # Checking if the event can't be placed on the calendar
+        return parse_date(date), None, None  # Keeping the day if it can be read
+    return window[0] // MINUTES_PER_DAY, window[0], window[1]  # Returning the day and span
+
+
+def day_number(value):  # Function for reading a day given to a calendar query
+    """
+    Accepts a date or datetime, a day number, or text in any accepted date layout.
+    Returns:
+        int: Days since 1970-01-01.
+    """
+    if isinstance(value, Date):  # Checking for a date or datetime
+        return value.toordinal() - EPOCH_ORDINAL  # Returning its day number
+    if isinstance(value, int):  # Checking for a day number
+        return value
+    day = parse_date(value)  # Parsing the text
+    if day is None:  # Checking if the text is a date
+        raise ValueError(f"Date can't be read: {value}")  # Raising an error for an unreadable date
+    return day  # Returning the day number
@@ -0,0 +1,238 @@
+import bisect  # Importing the bisect module for prefix ranges of the sorted vocabulary
+import gc  # Importing the gc module for pausing garbage collection while indexing
+import heapq  # Importing the heapq module for picking the best hits without sorting them all
+import re  # Importing the re module for splitting text into words
+
+from changes import Observer  # Importing the observer base class
+from indexes import normalize  # Importing the text normalization used by the indexes
+
+SEARCH_FIELDS = {  # Per store: searched attributes and their ranking boost
+    "events": {"event_id": 2.0, "event_type": 1.5, "theme": 1.5, "venue_address": 1.0},
+    "guests": {"guest_id": 2.0, "name": 2.0, "address": 1.0, "contact_details": 1.0},
+    "suppliers": {"supplier_id": 2.0, "name": 2.0, "address": 1.0, "contact_details": 1.0, "service_provided": 1.5, "menu": 1.0},
+    "venues": {"venue_id": 2.0, "name": 2.0, "address": 1.0, "contact": 1.0},
+    "clients": {"client_id": 2.0, "name": 2.0, "address": 1.0, "contact_details": 1.0},
+    "employees": {"employee_id": 2.0, "name": 2.0, "department": 1.0, "job_title": 1.0},
+}
+WORD = re.compile(r"\w+")  # One word of letters and digits
+MIN_PREFIX = 2  # Shortest query word expanded as a prefix; shorter words must match whole
+MAX_PREFIX_WORDS = 200  # Most vocabulary words one prefix expands to
+MIN_FUZZY = 3  # Shortest query word matched with typos
+TRIGRAMS_PER_TYPO = 4  # Most trigrams one typo (including two swapped letters) can change
+EXACT_WEIGHT = 1.0  # Weight of a query word found as typed
+PREFIX_WEIGHT = 0.8  # Weight of a query word found as the start of a longer word
+FUZZY_WEIGHT = 0.6  # Weight of a query word found with one typo, halved for two
+
+
+def words(value):  # Function for splitting a field value into normalized words
+    if value is None:  # Checking for a missing value
+        return []  # Missing values hold no words
+    if isinstance(value, (tuple, list)):  # Checking for a collection such as a guest list
+        value = " ".join(str(item) for item in value)  # Searching its items as text
+    return WORD.findall(normalize(str(value)))  # Returning the words, ignoring case
+
+
+def trigrams(word):  # Function for listing the three-letter pieces of a word
+    padded = f"${word}$"  # Marking the word's start and end so short words have pieces too
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}  # Returning the distinct pieces
+
+
+def fuzzy(word):  # Function for deciding if a word can be found with typos
+    return word.isalpha()  # Only words of letters; IDs and phone numbers are found by their start instead
+
+
+def allowed_typos(word):  # Function for deciding how many typos a query word may contain
+    return 2 if len(word) >= 7 else 1  # Longer words tolerate more typos
+
+
+def edit_distance(first, second, limit):  # Function for measuring typos between two words, up to a limit
+    """
+    Count the single-letter insertions, deletions, substitutions and swaps of two
+    neighbouring letters turning one word into the other.
+    Returns:
+        int: The distance, or limit + 1 once it is known to exceed the limit.
+    """
+    if abs(len(first) - len(second)) > limit:  # Checking if the lengths alone exceed the limit
+        return limit + 1
+    before = None  # Distances two rows back, for swapped letters
+    previous = list(range(len(second) + 1))  # Distances from the empty prefix
+    for i, letter in enumerate(first, start=1):  # Iterating over the first word's letters
+        current = [i]  # Distance from the first i letters to the empty prefix
+        for j, other in enumerate(second, start=1):  # Iterating over the second word's letters
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (letter != other))  # Cheapest edit
+            if i > 1 and j > 1 and letter == second[j - 2] and first[i - 2] == other:  # Checking for two swapped letters
+                distance = min(distance, before[j - 2] + 1)  # Counting the swap as one typo
+            current.append(distance)  # Recording the distance
+        if min(current) > limit:  # Checking if every path already exceeds the limit
+            return limit + 1
+        before, previous = previous, current  # Moving to the next row
+    return previous[-1]  # Returning the distance
+
+
+class SearchIndex(Observer):  # Definition of the SearchIndex class
+    # Inverted index over the searchable text of all six stores. Each word maps to the
+    # records holding it (with the best field boost); a sorted vocabulary answers prefixes
+    # and a trigram index finds words within a typo or two. Records are indexed once on
+    # first use, then kept current through the managers' change notifications.
+    def __init__(self, managers):  # Constructor method for attaching the index to the managers
+        self.managers = {management.label: management for management in managers}  # Managers by store label
+        self.postings = None  # Mapping of word to {(label, key): boost}, built on first search
+        self.record_words = {}  # Mapping of (label, key) to the words indexed for it
+        self.vocabulary = []  # Sorted list of every indexed word
+        self.word_trigrams = {}  # Mapping of trigram to the words containing it
+        for management in managers:  # Iterating over the managers
+            management.add_observer(self)  # Watching its changes
+
+    def build(self):  # Method for indexing every record once
+        self.postings = {}  # Clearing the postings
+        self.record_words = {}  # Clearing the per-record words
+        self.vocabulary = []  # Clearing the vocabulary
+        self.word_trigrams = {}  # Clearing the trigram index
+        collecting = gc.isenabled()  # Remembering if garbage collection was on
+        gc.disable()  # Pausing it: indexing creates many small objects and no garbage
+        try:
+            for label, management in self.managers.items():  # Iterating over the stores
+                for key, record in getattr(management, label).items():  # Iterating over the store's records
+                    self.add_record(label, key, record, sort=False)  # Indexing each record
+        finally:
+            if collecting:  # Checking if garbage collection was on
+                gc.enable()  # Resuming it
+        self.vocabulary.sort()  # Sorting the vocabulary once
+
+    def add_record(self, label, key, record, sort=True):  # Method for indexing one record
+        document = (label, key)  # Identifier of the record in the index
+        found = {}  # Best boost of each word in the record
+        for field, boost in SEARCH_FIELDS[label].items():  # Iterating over the searched fields
+            for word in words(getattr(record, field, None)):  # Iterating over the field's words
+                found[word] = max(found.get(word, 0.0), boost)  # Keeping the best boost
+        for word, boost in found.items():  # Iterating over the record's words
+            records = self.postings.get(word)  # Getting the records holding the word
+            if records is None:  # Checking if the word is new
+                records = self.postings[word] = {}  # Adding the word
+                if sort:  # Checking if the vocabulary is kept sorted as words arrive
+                    bisect.insort(self.vocabulary, word)  # Inserting the word in order
+                else:
+                    self.vocabulary.append(word)  # Appending it for a later sort
+                if fuzzy(word):  # Checking if the word can be found with typos
+                    for piece in trigrams(word):  # Iterating over the word's trigrams
+                        self.word_trigrams.setdefault(piece, set()).add(word)  # Indexing the word under each
+            records[document] = boost  # Recording the record under the word
+        self.record_words[document] = tuple(found)  # Remembering the record's words for removal
+
+    def remove_record(self, label, key):  # Method for removing one record from the index
+        document = (label, key)  # Identifier of the record in the index
+        for word in self.record_words.pop(document, ()):  # Iterating over the record's words
+            records = self.postings[word]  # Getting the records holding the word
+            records.pop(document, None)  # Removing the record
+            if not records:  # Checking if no record holds the word anymore
+                del self.postings[word]  # Dropping the word
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, word)]  # Removing it from the vocabulary
+                if fuzzy(word):  # Checking if the word is in the trigram index
+                    for piece in trigrams(word):  # Iterating over the word's trigrams
+                        holders = self.word_trigrams[piece]  # Getting the words containing the trigram
+                        holders.discard(word)  # Removing the word
+                        if not holders:  # Checking if no word contains the trigram anymore
+                            del self.word_trigrams[piece]  # Dropping the trigram
+
+    def after_change(self, label, changes):  # Method for keeping the index in line with stored changes
+        if not self.built or label not in SEARCH_FIELDS:  # Checking if the index is built and covers the store
+            return
+        for key, old, new in changes:  # Iterating over the changes
+            self.remove_record(label, key)  # Removing the old words
+            if new is not None:  # Checking for a stored record
+                self.add_record(label, key, new)  # Adding the new words
+
+    def expand(self, term):  # Method for finding the indexed words matching one query word
+        """
+        Returns:
+            dict: Matching vocabulary words with their weight: whole words first,
+            then words starting with the term, then words within a typo or two.
+        """
+        matches = {}  # Weight of each matching word
+        if term in self.postings:  # Checking for the word as typed
+            matches[term] = EXACT_WEIGHT  # Matching it fully
+        if len(term) >= MIN_PREFIX:  # Checking if the word is long enough to expand
+            start = bisect.bisect_left(self.vocabulary, term)  # First word at or after the prefix
+            for word in self.vocabulary[start:start + MAX_PREFIX_WORDS]:  # Iterating over the words in order
+                if not word.startswith(term):  # Checking if the prefix range ended
+                    break
+                matches.setdefault(word, PREFIX_WEIGHT)  # Matching the longer word
+        if term not in self.postings and len(term) >= MIN_FUZZY and fuzzy(term):  # Checking if the word may be misspelled
+            limit = allowed_typos(term)  # Typos tolerated for the word
+            pieces = trigrams(term)  # Trigrams of the query word
+            shared = {}  # Number of trigrams each vocabulary word shares with it
+            for piece in pieces:  # Iterating over the query trigrams
+                for word in self.word_trigrams.get(piece, ()):  # Iterating over the words containing it
+                    shared[word] = shared.get(word, 0) + 1  # Counting the shared trigram
+            needed = len(pieces) - TRIGRAMS_PER_TYPO * limit  # Trigrams a word within the limit must share
+            for word, count in shared.items():  # Iterating over the candidate words
+                if count >= needed and word not in matches:  # Checking if the word can be within the typo limit
+                    distance = edit_distance(term, word, limit)  # Counting the typos
+                    if distance <= limit:  # Checking if the word is close enough
+                        matches[word] = FUZZY_WEIGHT / distance  # Matching it, fewer typos ranking higher
+        return matches  # Returning the matching words
+
+    @property
+    def built(self):  # Property telling if the records are indexed yet
+        return self.postings is not None  # Returning whether the first search has run
+
+    def search(self, query, limit=20, labels=None):  # Method for finding the records matching a query
+        """
+        Find the records containing every word of the query, as a whole word, the start
+        of a word or within a typo or two, best matches first.
+        Args:
+            labels: Stores to search, such as ["guests"]; all stores if omitted.
+        Returns:
+            list: (label, key, score) of the best matches.
+        """
+        if not self.built:  # Checking if the index is built
+            self.build()  # Indexing every record once
+        expansions = [self.expand(term) for term in dict.fromkeys(words(query))]  # Matching words of each distinct query word
+        if not expansions or not all(expansions):  # Checking for an empty query or a word matching nothing
+            return []
+        expansions.sort(key=self.postings_size)  # Starting from the rarest word so later words check few records
+        scores = None  # Score of each record matching every word so far
+        for matches in expansions:  # Iterating over the query words
+            term_scores = self.score_term(matches, scores)  # Scoring the records matching this word too
+            scores = term_scores if scores is None else {document: scores[document] + score for document, score in term_scores.items()}  # Adding up the scores
+            if not scores:  # Checking if nothing matches anymore
+                return []
+        hits = ((score, document) for document, score in scores.items() if labels is None or document[0] in labels)  # Filtering the stores
+        best = heapq.nsmallest(limit, hits, key=lambda hit: (-hit[0], hit[1][0], str(hit[1][1])))  # Ranking by score, then by store and ID
+        return [(label, key, score) for score, (label, key) in best]  # Returning the best hits
+
+    def postings_size(self, matches):  # Method for counting the records listed under some words
+        return sum(len(self.postings[word]) for word in matches)  # Returning the number of postings
+
+    def score_term(self, matches, candidates=None):  # Method for scoring the records matching one query word
+        """
+        Args:
+            matches: Matching words with their weight, as returned by expand.
+            candidates: Records matching the earlier query words, or None for the first word.
+        Returns:
+            dict: The best score of each matching record, among the candidates if given.
+        """
+        scores = {}  # Best score of each record
+        if candidates is not None and len(candidates) * len(matches) < self.postings_size(matches):  # Checking if looking up the candidates is cheaper
+            for document in candidates:  # Iterating over the candidates
+                for word, weight in matches.items():  # Iterating over the matching words
+                    boost = self.postings[word].get(document)  # Looking up the record under the word
+                    if boost is not None and weight * boost > scores.get(document, 0.0):  # Checking for a better match
+                        scores[document] = weight * boost  # Keeping it
+            return scores  # Returning the scores
+        for word, weight in matches.items():  # Iterating over the matching words
+            for document, boost in self.postings[word].items():  # Iterating over the records holding the word
+                if candidates is not None and document not in candidates:  # Checking if the record missed an earlier word
+                    continue
+                if weight * boost > scores.get(document, 0.0):  # Checking for a better match
+                    scores[document] = weight * boost  # Keeping it
+        return scores  # Returning the scores
+
+    def record(self, label, key):  # Method for getting a hit's record
+        return getattr(self.managers[label], label)[key]  # Returning the record from its store
+
+
+def describe(label, record):  # Function for summarizing a record on one line of search results
+    name = getattr(record, "name", None) or getattr(record, "theme", None) or ""  # Using the name, or an event's theme
+    key = getattr(record, f"{label[:-1]}_id", "")  # Reading the record ID
+    return f"{label[:-1].capitalize()} {key}: {name}"  # Returning the summary
@@ -0,0 +1,390 @@
+import argparse  # Importing the argparse module for command-line options
+import asyncio  # Importing the asyncio module for serving many connections on one thread
+import concurrent.futures  # Importing the concurrent.futures module for the writer thread
+import itertools  # Importing the itertools module for slicing pages out of the stores
+import json  # Importing the json module for request and response bodies
+import threading  # Importing the threading module for keeping readers out of half-applied changes
+import urllib.parse  # Importing the urllib.parse module for splitting request paths and queries
+
+from changes import ConflictError  # Importing the error raised when a record changed since the caller read it
+from context import BACKEND_HELP, DataContext, parse_backend  # Importing the shared data context owning one manager per store
+from importer import ENTITIES, build_record  # Importing the record builders shared with the file importer
+from search import describe  # Importing the one-line summary of search hits
+
+DEFAULT_HOST = "127.0.0.1"  # Address the server listens on unless told otherwise
+DEFAULT_PORT = 8080  # Port the server listens on unless told otherwise
+PAGE_SIZE = 100  # Records per page when the client gives no limit
+MAX_PAGE_SIZE = 1000  # Largest page a client may ask for
+STREAM_CHUNK = 500  # Records sent per chunk when a list is streamed
+MAX_BODY_SIZE = 1 << 20  # Largest request body accepted, in bytes
+MAX_HEADERS = 100  # Largest number of request headers accepted
+WRITE_QUEUE_SIZE = 1000  # Writes waiting for the writer before new ones wait too
+REFRESH_INTERVAL = 2.0  # Seconds between checks for records saved by other processes
+STATUS_TEXT = {  # Reason phrases of the status codes the server sends
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):  # Definition of the HTTPError class
+    # Raised while handling a request to answer it with an error status.
+    def __init__(self, status, message):  # Constructor method for the status and message
+        super().__init__(message)  # Storing the message
+        self.status = status  # HTTP status code sent back
+
+
+class Request:  # Definition of the Request class
+    # One parsed HTTP request.
+    def __init__(self, method, target, headers, body):  # Constructor method for initializing request attributes
+        url = urllib.parse.urlsplit(target)  # Splitting the path from the query
+        self.method = method  # Request method, such as "GET"
+        self.parts = [urllib.parse.unquote(part) for part in url.path.split("/") if part]  # Decoded path segments
+        self.query = dict(urllib.parse.parse_qsl(url.query))  # Query parameters, the last one winning
+        self.headers = headers  # Header values by lower-case name
+        self.body = body  # Raw request body
+
+    def json(self):  # Method for decoding the request body
+        try:
+            return json.loads(self.body or b"null")  # Decoding the JSON body
+        except ValueError as e:  # Handling malformed JSON
+            raise HTTPError(400, f"Request body is not valid JSON: {e}")
+
+    def keep_alive(self):  # Method for checking if the client wants the connection kept open
+        return self.headers.get("connection", "").lower() != "close"  # HTTP/1.1 keeps connections open by default
+
+    def expected_version(self):  # Method for reading the record version named in an If-Match header
+        value = self.headers.get("if-match")  # Reading the header
+        if value is None or value.strip() == "*":  # Checking if any version will do
+            return None
+        try:
+            return int(value.strip().strip('"'))  # Reading the version from the entity tag
+        except ValueError:  # Handling a tag the server never sent
+            raise HTTPError(400, f"If-Match must be a record version, got {value}")
+
+    def integer(self, name, default, largest=None):  # Method for reading a whole-number query parameter
+        try:
+            value = int(self.query.pop(name, default))  # Reading the parameter
+        except ValueError:  # Handling text that is no number
+            raise HTTPError(400, f"{name} must be a whole number.")
+        if value < 0:  # Checking for a negative value
+            raise HTTPError(400, f"{name} must not be negative.")
+        return min(value, largest) if largest is not None else value  # Capping the value if needed
+
+
+def record_json(record):  # Function for describing a record as JSON-ready values
+    return record.__getstate__()  # Returning the attributes, version included
+
+
+def encode(payload):  # Function for turning a response payload into bytes
+    return json.dumps(payload, default=str).encode()  # Encoding the JSON, writing unusual values such as dates as text
+
+
+class Writer:  # Definition of the Writer class
+    # Single task running every change to the stores, one at a time and in arrival order, so
+    # request handlers never change the managers concurrently. The changes run on one thread
+    # of their own, so the event loop keeps serving reads while a change or a refresh waits on
+    # the disk. Reads don't go through it: single records and pages are read between the
+    # changes, and reads walking the indexes run on other threads through read(), holding the
+    # lock the changes are applied under.
+    def __init__(self, queue_size=WRITE_QUEUE_SIZE):  # Constructor method for initializing the write queue
+        self.pending = asyncio.Queue(maxsize=queue_size)  # Bounded queue of (function, arguments, future)
+        self.task = None  # Task running the writes, started by start()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-writer")  # The one thread running the changes, in order
+        self.lock = threading.Lock()  # Lock held while a change is applied
+
+    def start(self):  # Method for starting the writer task
+        self.task = asyncio.get_running_loop().create_task(self.run())  # Running the writes in the background
+
+    async def submit(self, function, *args, **kwargs):  # Method for running a change through the writer
+        """
+        Queue a call and wait for the writer to run it.
+        Returns:
+            The call's result; an exception it raised is raised here.
+        """
+        future = asyncio.get_running_loop().create_future()  # Future receiving the outcome
+        await self.pending.put((function, args, kwargs, future))  # Queuing the call, waiting if the queue is full
+        return await future  # Waiting for the outcome
+
+    async def run(self):  # Method executed by the writer task
+        while True:
+            item = await self.pending.get()  # Waiting for the next write
+            if item is None:  # Checking if the writer should finish
+                return
+            function, args, kwargs, future = item  # Unpacking the write
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self.executor, self.apply, function, args, kwargs)  # Running the change on the writer thread
+            except Exception as e:  # Handling a refused change
+                if not future.cancelled():  # Checking if the caller still waits
+                    future.set_exception(e)  # Passing the error to the caller
+            else:
+                if not future.cancelled():  # Checking if the caller still waits
+                    future.set_result(result)  # Passing the result to the caller
+
+    def apply(self, function, args, kwargs):  # Method run on the writer thread for one change, or another thread for a read
+        with self.lock:  # Keeping changes and index readers apart
+            return function(*args, **kwargs)  # Running the call
+
+    async def read(self, function, *args, **kwargs):  # Method for running a read of the indexes between changes
+        """
+        Run a call reading the indexes on a thread of the default pool, once no change is
+        being applied, so the event loop keeps serving other requests meanwhile.
+        Returns:
+            The call's result; an exception it raised is raised here.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.apply, function, args, kwargs)  # Running the read off the event loop
+
+    async def close(self):  # Method for finishing the queued writes and stopping the writer
+        if self.task is not None:  # Checking if the writer was started
+            await self.pending.put(None)  # Asking it to finish after the queued writes
+            await self.task  # Waiting for it to finish
+        self.executor.shutdown()  # Stopping the writer thread
+
+
+class APIServer:  # Definition of the APIServer class
+    # HTTP/JSON interface to the six stores. Routes:
+    #   GET    /                     record counts of every store
+    #   GET    /search?q=...         full-text search over every store
+    #   GET    /<store>              one page of records (offset, limit); stream=1 sends every
+    #                                record as JSON Lines; events accept indexed field filters
+    #   POST   /<store>              add one record, or a list of records saved together
+    #   GET    /<store>/<id>         one record, with its version as ETag
+    #   PATCH  /<store>/<id>         change some attributes; If-Match refuses stale versions
+    #   DELETE /<store>/<id>         delete a record; If-Match refuses stale versions
+    def __init__(self, context, refresh_interval=REFRESH_INTERVAL):  # Constructor method for initializing the server
+        self.context = context  # Managers serving the requests
+        self.writer = Writer()  # Task running every change
+        self.refresh_interval = refresh_interval  # Seconds between checks for other processes' records
+        self.server = None  # Listening socket, opened by start()
+        self.refresher = None  # Task picking up other processes' records
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):  # Method for loading the stores and listening for connections
+        for management in self.context.managers():  # Iterating over the managers
+            getattr(management, management.label)  # Loading the store before the first request needs it
+        self.writer.start()  # Starting the writer task
+        if self.refresh_interval:  # Checking if other processes' records should be picked up
+            self.refresher = asyncio.get_running_loop().create_task(self.refresh())  # Starting the refresh task
+        self.server = await asyncio.start_server(self.handle_connection, host, port)  # Listening for connections
+        return self.server  # Returning the listening server
+
+    async def refresh(self):  # Method executed by the refresh task
+        # The background storages read the saved changes on their own threads; the reads
+        # requested at one check are applied, in turn with our changes, at the next.
+        while True:
+            await asyncio.sleep(self.refresh_interval)  # Waiting between checks
+            try:
+                await self.writer.submit(self.context.apply_refreshed)  # Applying the changes read since the last check
+                await self.writer.submit(self.context.request_refresh)  # Reading the next ones behind the queued saves
+            except Exception as e:  # Handling unreadable files
+                print(f"Error reading changes of other processes: {e}")  # Printing error message
+
+    async def close(self):  # Method for stopping the server and writing the remaining changes
+        if self.refresher is not None:  # Checking if the refresh task runs
+            self.refresher.cancel()  # Stopping it
+        if self.server is not None:  # Checking if the server listens
+            self.server.close()  # Closing the listening socket
+            await self.server.wait_closed()  # Waiting for it to close
+        await self.writer.close()  # Finishing the queued writes
+
+    async def handle_connection(self, reader, writer):  # Method serving the requests of one connection in turn
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)  # Reading the next request
+                except HTTPError as e:  # Handling a malformed request
+                    await self.send_json(writer, e.status, {"error": str(e)}, keep_alive=False)  # Answering with the error
+                    break
+                if request is None:  # Checking if the client closed the connection
+                    break
+                await self.respond(request, writer)  # Answering the request
+                if not request.keep_alive():  # Checking if the client wants the connection closed
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):  # Handling a client going away mid-request
+            pass
+        finally:
+            writer.close()  # Closing the connection
+
+    async def read_request(self, reader):  # Method for reading one request from a connection
+        """
+        Returns:
+            Request: The parsed request, or None once the client closed the connection.
+        """
+        line = await reader.readline()  # Reading the request line
+        if not line:  # Checking for a closed connection
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()  # Splitting the method, target and version
+        except ValueError:  # Handling a malformed request line
+            raise HTTPError(400, "Malformed request line.")
+        headers = {}  # Header values by lower-case name
+        while True:
+            line = await reader.readline()  # Reading the next header
+            if line in (b"\r\n", b"\n", b""):  # Checking for the end of the headers
+                break
+            if len(headers) >= MAX_HEADERS:  # Checking for too many headers
+                raise HTTPError(400, "Too many headers.")
+            name, _, value = line.decode("latin-1").partition(":")  # Splitting the name from the value
+            headers[name.strip().lower()] = value.strip()  # Storing the header
+        if headers.get("transfer-encoding", "").lower() == "chunked":  # Checking for a chunked body, which the server doesn't read
+            raise HTTPError(411, "Send the request body with a Content-Length.")
+        length = int(headers.get("content-length", "0") or 0)  # Reading the body length
+        if length > MAX_BODY_SIZE:  # Checking for an oversized body
+            raise HTTPError(413, f"Request bodies are limited to {MAX_BODY_SIZE} bytes.")
+        body = await reader.readexactly(length) if length else b""  # Reading the body
+        return Request(method.upper(), target, headers, body)  # Returning the request
+
+    async def respond(self, request, writer):  # Method for answering one request
+        try:
+            await self.route(request, writer)  # Running the matching route
+        except HTTPError as e:  # Handling a request the server refuses
+            await self.send_json(writer, e.status, {"error": str(e)}, request.keep_alive())
+        except ConflictError as e:  # Handling a record changed by someone else
+            await self.send_json(writer, 409, {"error": str(e), "keys": e.keys}, request.keep_alive())
+        except (ConnectionError, asyncio.IncompleteReadError):  # Handling a client going away
+            raise
+        except Exception as e:  # Handling a change the managers refuse
+            await self.send_json(writer, 400, {"error": str(e)}, request.keep_alive())
+
+    async def route(self, request, writer):  # Method for dispatching a request to its handler
+        parts = request.parts  # Path segments
+        if not parts:  # Checking for the root path
+            self.allow(request, "GET")  # Only reading is supported
+            counts = {management.label: len(getattr(management, management.label)) for management in self.context.managers()}  # Counting the records of every store
+            return await self.send_json(writer, 200, {"stores": counts}, request.keep_alive())
+        if parts == ["search"]:  # Checking for the search route
+            self.allow(request, "GET")  # Only reading is supported
+            return await self.search(request, writer)
+        if parts[0] not in ENTITIES or len(parts) > 2:  # Checking for an unknown store or path
+            raise HTTPError(404, f"No such resource: /{'/'.join(parts)}")
+        management = self.context.management(parts[0])  # Finding the store's manager
+        if len(parts) == 1:  # Checking for the store's collection
+            if request.method == "GET":  # Checking for a listing
+                return await self.list_records(request, writer, management)
+            self.allow(request, "POST")  # Only adding is supported otherwise
+            return await self.add_records(request, writer, management)
+        key = parts[1]  # Requested record ID
+        records = getattr(management, management.label)  # The store's records
+        if key not in records:  # Checking if the record exists
+            raise HTTPError(404, f"{management.label[:-1].capitalize()} {key} not found.")
+        if request.method == "GET":  # Checking for a read
+            return await self.send_record(writer, 200, records[key], request.keep_alive())
+        singular = management.label[:-1]  # Record name used in the manager's method names
+        if request.method == "DELETE":  # Checking for a deletion
+            await self.writer.submit(getattr(management, f"delete_{singular}"), key, expected_version=request.expected_version())
+            return await self.send_response(writer, 204, b"", request.keep_alive())
+        self.allow(request, "PATCH", "PUT")  # Only changing is supported otherwise
+        updates = request.json()  # Reading the new values
+        if not isinstance(updates, dict) or not updates:  # Checking for an object of attributes
+            raise HTTPError(400, "Send a JSON object of the attributes to change.")
+        if ENTITIES[management.label][3] in updates or "version" in updates:  # Checking for attributes the server manages
+            raise HTTPError(400, "The ID and version of a record can't be changed.")
+        await self.writer.submit(getattr(management, f"modify_{singular}"), key, expected_version=request.expected_version(), **updates)
+        return await self.send_record(writer, 200, records[key], request.keep_alive())
+
+    @staticmethod
+    def allow(request, *methods):  # Method for refusing request methods a route doesn't support
+        if request.method not in methods:  # Checking the method
+            raise HTTPError(405, f"{request.method} is not supported here.")
+
+    async def search(self, request, writer):  # Method for answering a full-text search
+        query = request.query.pop("q", "")  # Reading the search words
+        limit = request.integer("limit", 20, MAX_PAGE_SIZE)  # Reading the number of hits wanted
+        labels = request.query.pop("stores", None)  # Reading the stores to search
+        labels = labels.split(",") if labels else None  # Splitting the store names
+        hits = await self.writer.read(self.find_hits, query, limit, labels)  # Searching between changes
+        await self.send_json(writer, 200, {"query": query, "hits": hits}, request.keep_alive())
+
+    def find_hits(self, query, limit, labels):  # Method for describing the best matches of a search
+        hits = []  # Found records
+        for label, key, score in self.context.search_index.search(query, limit, labels):  # Iterating over the best matches
+            record = self.context.search_index.record(label, key)  # Getting the matching record
+            hits.append({"store": label, "id": key, "score": round(score, 3), "summary": describe(label, record)})  # Describing the hit
+        return hits  # Returning the hits
+
+    async def list_records(self, request, writer, management):  # Method for answering a listing of a store
+        offset = request.integer("offset", 0)  # Reading the first record wanted
+        limit = request.integer("limit", PAGE_SIZE, MAX_PAGE_SIZE)  # Reading the page size
+        stream = request.query.pop("stream", "") not in ("", "0", "false")  # Reading whether every record should be streamed
+        records = getattr(management, management.label)  # The store's records
+        if request.query:  # Checking for field filters
+            if management.label != "events":  # Checking if the store has field indexes
+                raise HTTPError(400, "Only events can be filtered.")
+            matches = await self.writer.read(management.find_events, **request.query)  # Looking the filters up in the event indexes between changes
+        else:
+            matches = None  # Listing every record
+        if stream:  # Checking if every record should be sent
+            snapshot = matches if matches is not None else list(records.values())  # Taking the records as they are now, so writes meanwhile can't disturb the stream
+            return await self.stream_records(writer, snapshot[offset:], request.keep_alive())
+        if matches is not None:  # Checking for filtered records
+            total, page = len(matches), matches[offset:offset + limit]  # Cutting the page out of the matches
+        else:
+            total, page = len(records), list(itertools.islice(records.values(), offset, offset + limit))  # Cutting the page out of the store
+        payload = {"total": total, "offset": offset, "limit": limit, "items": [record_json(record) for record in page]}  # Describing the page
+        await self.send_json(writer, 200, payload, request.keep_alive())
+
+    async def add_records(self, request, writer, management):  # Method for adding one record or a batch
+        body = request.json()  # Reading the new records
+        label = management.label  # Name of the store
+        if isinstance(body, list):  # Checking for a batch
+            records = [build_record(label, row) for row in body]  # Building every record first
+            count = await self.writer.submit(getattr(management, f"bulk_add_{label}"), records)  # Adding them all or none
+            return await self.send_json(writer, 201, {"added": count}, request.keep_alive())
+        if not isinstance(body, dict):  # Checking for one record
+            raise HTTPError(400, "Send a JSON object, or a list of objects, describing the records.")
+        record = build_record(label, body)  # Building the record
+        await self.writer.submit(getattr(management, f"add_{label[:-1]}"), record)  # Adding it
+        await self.send_record(writer, 201, record, request.keep_alive())
+
+    async def send_record(self, writer, status, record, keep_alive):  # Method for answering with one record and its version
+        headers = {"ETag": f'"{record.version or 0}"'}  # Naming the version a later If-Match should give
+        await self.send_response(writer, status, encode(record_json(record)), keep_alive, headers)
+
+    async def send_json(self, writer, status, payload, keep_alive):  # Method for answering with a JSON payload
+        await self.send_response(writer, status, encode(payload), keep_alive)
+
+    async def send_response(self, writer, status, body, keep_alive, headers=None):  # Method for writing a complete response
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}", f"Content-Length: {len(body)}",  # Status line and body length
+                "Connection: " + ("keep-alive" if keep_alive else "close")]  # Telling the client if the connection stays open
+        if body:  # Checking if the body has content
+            head.append("Content-Type: application/json")  # Describing the body
+        head.extend(f"{name}: {value}" for name, value in (headers or {}).items())  # Adding the extra headers
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)  # Writing the response
+        await writer.drain()  # Waiting until the client keeps up
+
+    async def stream_records(self, writer, records, keep_alive):  # Method for sending records as chunked JSON Lines
+        head = ["HTTP/1.1 200 OK", "Content-Type: application/x-ndjson", "Transfer-Encoding: chunked",  # Headers of a streamed body
+                "Connection: " + ("keep-alive" if keep_alive else "close")]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))  # Writing the headers
+        for start in range(0, len(records), STREAM_CHUNK):  # Iterating over the chunks
+            chunk = b"".join(encode(record_json(record)) + b"\n" for record in records[start:start + STREAM_CHUNK])  # Encoding one line per record
+            writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))  # Writing the chunk
+            await writer.drain()  # Waiting until the client keeps up, letting other requests run meanwhile
+        writer.write(b"0\r\n\r\n")  # Ending the body
+        await writer.drain()  # Sending it
+
+
+async def serve(host, port, backend):  # Function for running the server until it is interrupted
+    with DataContext(backend=backend, write_behind=True, on_delete="restrict") as context:  # Opening the stores, saving in the background as the GUI does
+        server = APIServer(context)  # Creating the server
+        await server.start(host, port)  # Loading the stores and listening
+        print(f"Serving on http://{host}:{port}")  # Reporting the address
+        try:
+            await asyncio.Event().wait()  # Serving until interrupted
+        finally:
+            await server.close()  # Finishing the queued writes
+
+
+def main():  # Function for running the server from the command line
+    parser = argparse.ArgumentParser(description="Serve the records over HTTP/JSON.")  # Creating the argument parser
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")  # Listening address
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")  # Listening port
+    parser.add_argument("--backend", type=parse_backend, default=None, help=BACKEND_HELP)  # Storage backend, optionally per store
+    args = parser.parse_args()  # Parsing the arguments
+    try:
+        asyncio.run(serve(args.host, args.port, args.backend))  # Serving until interrupted
+    except KeyboardInterrupt:  # Handling Ctrl+C
+        print("Stopped.")  # Reporting the shutdown
+
+
+if __name__ == "__main__":
+    main()  # Running the server
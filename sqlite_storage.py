@@ -0,0 +1,441 @@
+import inspect  # Importing the inspect module for reading record constructor parameters
+import itertools  # Importing the itertools module for grouping sorted bookings
+import os  # Importing the os module for operating system related functionalities
+import pickle  # Importing the pickle module for storing non-scalar field values
+import re  # Importing the re module for naming indexes after their expressions
+import sqlite3  # Importing the sqlite3 module for the embedded database
+import threading  # Importing the threading module for keeping one connection per thread
+from collections.abc import MutableMapping  # Importing the dictionary interface the records table implements
+
+from changes import ConflictError, SavedChanges  # Importing the error raised when another process saved a record first and the changes found by a refresh
+from indexes import normalize, overlapping_pairs  # Importing the index key normalization and the overlap sweep
+from records import VERSION_FIELD, Record  # Importing the record base class and version stamp
+from schedule import MINUTES_PER_DAY  # Importing the number of minutes in a day
+
+SQLITE_SUFFIX = ".db"  # Extension of the database file that replaces a manager's pickle file
+SCALAR_TYPES = (str, int, float, type(None))  # Field value types stored directly in a column
+CHANGE_LOG_SUFFIX = "_changes"  # Suffix of the table logging the rows each change replaced
+CHANGE_LOG_SIZE = 10000  # Number of logged changes kept for processes that have not refreshed yet
+CALENDAR_MINUTE = f"COALESCE(starts_at, day * {MINUTES_PER_DAY})"  # Calendar position of an event, as event_management.calendar_minute reads it
+TABLE_INDEXES = {  # Secondary indexes of each table besides its primary key, as the expressions the table indexes below query
+    "events": (
+        "normalize(client_id)", "normalize(date)",  # Client and date lookups
+        "normalize(catering_company)", "normalize(cleaning_company)", "normalize(decorations_company)",
+        "normalize(entertainment_company)", "normalize(furniture_supply_company)",  # Supplier company lookups
+        "normalize(venue_address), starts_at",  # Venue lookups and bookings
+        CALENDAR_MINUTE,  # Date range queries
+    ),
+}
+MEMBER_FIELDS = {  # Collection fields of each table whose members get a table of their own, for reverse lookups
+    "events": ("guest_list",),  # Events by guest ID
+}
+
+
+def index_name(table, expression):  # Function for naming a secondary index after the expression it covers
+    words = re.sub(r"\W+", "_", expression).strip("_").lower()  # Turning the expression into an identifier
+    return f"{table}_by_{words}"  # Prefixing it with the table
+
+
+def member_rows(key, value):  # Function for listing the member table rows of one record's collection field
+    if isinstance(value, bytes):  # Checking for a value read from its pickled column
+        value = pickle.loads(value)  # Restoring it
+    if not isinstance(value, (tuple, list, set, frozenset)):  # Checking for text typed before such fields held collections
+        return []  # Listing no members, as event_management.stored_guests does
+    return [(key, member) for member in dict.fromkeys(normalize(member) for member in value)]  # Pairing the key with each distinct normalized member
+
+
+def record_fields(record_class):  # Function for listing the attributes a record class stores
+    if issubclass(record_class, Record):  # Checking for a slot-based record, which lists its attributes
+        return list(record_class.__slots__ + Record.__slots__)  # Storing every attribute, derived ones and the version stamp included
+    parameters = inspect.signature(record_class.__init__).parameters  # Reading the constructor parameters
+    return [name for name in parameters if name != "self"]  # Taking every parameter except self
+
+
+class SQLiteRecords(MutableMapping):  # Definition of the SQLiteRecords class
+    # Dictionary-like view over one table; every lookup or change touches a single row.
+    # Versioned rows are only replaced by a newer version, so a process writing a record
+    # another process changed since it was read gets a ConflictError instead of overwriting it.
+    # Every change first copies the row it replaces into a change log, so read_changes can
+    # tell which rows other processes changed since this view last read the log, and what
+    # the loaded indexes and observers still hold for them.
+    def __init__(self, connect, table, record_class, key_field, fields):  # Constructor method for initializing the table view
+        self.connect = connect  # Callable returning the calling thread's database connection
+        self.members = MEMBER_FIELDS.get(table, ())  # Collection fields whose members are kept in tables of their own
+        self.table = table  # Name of the table holding the records
+        self.record_class = record_class  # Class used to rebuild records from rows
+        self.key_field = key_field  # Primary key column
+        self.fields = fields  # All stored columns, primary key included
+        columns = ", ".join(fields)  # Column list used in the queries
+        placeholders = ", ".join("?" for _ in fields)  # Parameter placeholders for inserts
+        self.select_one = f"SELECT {columns} FROM {table} WHERE {key_field} = ?"  # Query for a single record
+        self.select_all = f"SELECT {columns} FROM {table}"  # Query streaming every record
+        self.upsert = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"  # Query storing one record
+        self.log = table + CHANGE_LOG_SUFFIX  # Name of the change log table
+        self.log_row = f"INSERT INTO {self.log} (change_key, change_found, {columns}) SELECT ?, 1, {columns} FROM {table} WHERE {key_field} = ?"  # Query logging the row a change replaces
+        self.log_missing = f"INSERT INTO {self.log} (change_key, change_found) VALUES (?, 0)"  # Query logging a change that adds a row
+        self.select_log = f"SELECT change_seq, change_key, change_found, {columns} FROM {self.log} WHERE change_seq > ? ORDER BY change_seq"  # Query reading the changes logged since
+        self.seen = self.connection.execute(f"SELECT COALESCE(MAX(change_seq), 0) FROM {self.log}").fetchone()[0]  # Last logged change this view has read, as the rows are current on load
+        self.written = set()  # Logged changes this view made and read_changes has not passed yet
+        if VERSION_FIELD in fields:  # Checking if the rows carry a version stamp
+            updates = ", ".join(f"{field} = excluded.{field}" for field in fields if field != key_field)  # Columns replaced in an existing row
+            self.upsert = (  # Query storing one record unless the stored row is as new or newer
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT ({key_field}) DO UPDATE SET {updates} "
+                f"WHERE COALESCE({table}.{VERSION_FIELD}, 0) < COALESCE(excluded.{VERSION_FIELD}, 0)"
+            )
+
+    @property
+    def connection(self):  # Property returning the calling thread's database connection
+        return self.connect()  # Taking it from the storage's pool
+
+    def encode(self, record):  # Method for turning a record into a row
+        row = []  # List collecting the column values
+        for field in self.fields:  # Iterating over the stored columns
+            value = getattr(record, field, None)  # Reading the attribute, tolerating older records without it
+            row.append(value if isinstance(value, SCALAR_TYPES) else pickle.dumps(value))  # Pickling anything SQLite can't hold
+        return row  # Returning the row values
+
+    def decode(self, row):  # Method for turning a row back into a record
+        record = self.record_class.__new__(self.record_class)  # Creating the record without running the constructor
+        for field, value in zip(self.fields, row):  # Iterating over the column values
+            setattr(record, field, pickle.loads(value) if isinstance(value, bytes) else value)  # Restoring each attribute
+        return record  # Returning the rebuilt record
+
+    def __getitem__(self, key):  # Method for retrieving one record by its key
+        row = self.connection.execute(self.select_one, (key,)).fetchone()  # Looking the row up through the primary key
+        if row is None:  # Checking if the record exists
+            raise KeyError(key)  # Raising an error like a dictionary would
+        return self.decode(row)  # Returning the rebuilt record
+
+    def log_change(self, key):  # Method for logging the row a change is about to replace
+        """
+        Raises:
+            ConflictError: If another process changed the row since this view last read the
+                log, so the caller's copy is outdated; nothing is logged.
+        """
+        connection = self.connection  # The calling thread's connection
+        cursor = connection.execute(self.log_row, (key, key))  # Copying the current row, which takes the write lock
+        if cursor.rowcount == 0:  # Checking if there is no row yet
+            cursor = connection.execute(self.log_missing, (key,))  # Logging the addition
+        seq = cursor.lastrowid  # Number of the logged change
+        query = f"SELECT change_seq FROM {self.log} WHERE change_key = ? AND change_seq > ? AND change_seq < ?"  # Query for the changes of the row not read yet
+        if any(other not in self.written for (other,) in connection.execute(query, (key, self.seen, seq))):  # Checking if another process changed the row since
+            connection.execute(f"DELETE FROM {self.log} WHERE change_seq = ?", (seq,))  # Taking the entry back
+            raise ConflictError(f"{self.table.capitalize()} {key} was changed by someone else and was not saved.", [key])  # Raising the conflict
+        self.written.add(seq)  # Remembering the change as ours
+        if seq % CHANGE_LOG_SIZE == 0:  # Checking if the log grew by another CHANGE_LOG_SIZE changes
+            connection.execute(f"DELETE FROM {self.log} WHERE change_seq <= ?", (seq - CHANGE_LOG_SIZE,))  # Dropping the oldest ones
+        return seq  # Returning the number of the logged change
+
+    def unlog_change(self, seq):  # Method for taking back the log entry of a change that was not made
+        self.connection.execute(f"DELETE FROM {self.log} WHERE change_seq = ?", (seq,))  # Deleting the entry
+        self.written.discard(seq)  # Forgetting it
+
+    def __setitem__(self, key, record):  # Method for inserting or replacing one record
+        seq = self.log_change(key)  # Logging the row being replaced
+        cursor = self.connection.execute(self.upsert, self.encode(record))  # Writing only this row
+        if cursor.rowcount == 0:  # Checking if a newer stored version kept the row from being replaced
+            self.unlog_change(seq)  # Nothing was replaced
+            raise ConflictError(f"{self.table.capitalize()} {key} was changed by someone else and was not saved.", [key])  # Raising the conflict
+        self.write_members(key, record)  # Listing the record's members
+
+    def __delitem__(self, key):  # Method for deleting one record
+        seq = self.log_change(key)  # Logging the row being deleted
+        cursor = self.connection.execute(f"DELETE FROM {self.table} WHERE {self.key_field} = ?", (key,))  # Deleting only this row
+        if cursor.rowcount == 0:  # Checking if anything was deleted
+            self.unlog_change(seq)  # Nothing was deleted
+            raise KeyError(key)  # Raising an error like a dictionary would
+        self.write_members(key, None)  # Forgetting the record's members
+
+    def write_members(self, key, record):  # Method for replacing the member table rows of one record
+        connection = self.connection  # The calling thread's connection
+        for field in self.members:  # Iterating over the collection fields
+            connection.execute(f"DELETE FROM {self.table}_{field} WHERE member_key = ?", (key,))  # Dropping the old members
+            if record is not None:  # Checking if the record is stored
+                connection.executemany(f"INSERT INTO {self.table}_{field} (member_key, member) VALUES (?, ?)", member_rows(key, getattr(record, field, None)))  # Listing the new ones
+
+    def keys_where(self, condition, parameters=(), order=None):  # Method for listing the keys of the rows meeting an SQL condition
+        """
+        Args:
+            condition: SQL condition on the table's columns, served by its secondary indexes.
+            parameters: Values of the condition's placeholders.
+            order: SQL expression to sort the keys by, if any.
+        Returns:
+            list: The matching keys.
+        """
+        query = f"SELECT {self.key_field} FROM {self.table} WHERE {condition}"  # Query for the matching keys
+        if order is not None:  # Checking if the keys are wanted in order
+            query += f" ORDER BY {order}, {self.key_field}"  # Sorting them, ties by key
+        return [key for (key,) in self.connection.execute(query, parameters)]  # Returning the keys
+
+    def read_changes(self):  # Method for finding the rows other processes changed since this view last read the log
+        """
+        Returns:
+            SavedChanges: Current record, or None once deleted, by key, with the row each
+            replaced when this view last read the log, or None for an added one, in old.
+        """
+        old = {}  # Row each changed record had when last read, by key
+        last = self.seen  # Last logged change read
+        for seq, key, found, *row in self.connection.execute(self.select_log, (self.seen,)):  # Streaming the changes logged since
+            last = seq  # Moving past the change
+            if seq in self.written:  # Checking if the change is ours
+                self.written.discard(seq)  # Observers heard about it when it was made
+            elif key not in old:  # Checking for the first change of the row made elsewhere
+                old[key] = self.decode(row) if found else None  # Taking the row as this view last had it
+        self.seen = last  # Remembering where the next read starts
+        return SavedChanges({key: self.get(key) for key in old}, old)  # Pairing the rows as they are now with the replaced ones
+
+    def __contains__(self, key):  # Method for checking if a key exists
+        query = f"SELECT 1 FROM {self.table} WHERE {self.key_field} = ?"  # Primary key existence query
+        return self.connection.execute(query, (key,)).fetchone() is not None  # Returning whether a row was found
+
+    def __iter__(self):  # Method for iterating over the keys
+        for (key,) in self.connection.execute(f"SELECT {self.key_field} FROM {self.table}"):  # Streaming the keys
+            yield key  # Yielding each key
+
+    def __len__(self):  # Method for counting the records
+        return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]  # Returning the row count
+
+    def items(self):  # Method for streaming key and record pairs with one query
+        key_position = self.fields.index(self.key_field)  # Position of the key in each row
+        for row in self.connection.execute(self.select_all):  # Streaming every row
+            yield row[key_position], self.decode(row)  # Yielding the key and the rebuilt record
+
+    def values(self):  # Method for streaming records with one query
+        for _, record in self.items():  # Reusing the streaming pair iterator
+            yield record  # Yielding each record
+
+
+class SQLiteStorage:  # Definition of the SQLiteStorage class
+    # Keeps one table per manager in an SQLite file instead of an in-memory dictionary, with
+    # the secondary indexes in TABLE_INDEXES and member tables for the fields in MEMBER_FIELDS,
+    # which the Table* indexes below query so managers need not hold their own.
+    # Each thread gets a connection of its own from a small pool, so a server can read rows
+    # on its event loop while its writer thread writes and commits through another; in WAL
+    # mode readers see the last committed rows and are never blocked by the writer.
+    def __init__(self, file_path, label, record_class=None, key_field=None):  # Constructor method for initializing SQLite storage
+        if record_class is None or key_field is None:  # Checking if the table layout can be derived
+            raise ValueError("SQLite storage needs the record class and its key field.")  # Raising an error for a missing layout
+        self.file_path = os.path.splitext(file_path)[0] + SQLITE_SUFFIX  # Path of the database file
+        self.label = label  # Table name and label used in error messages
+        self.record_class = record_class  # Class of the stored records
+        self.key_field = key_field  # Primary key column
+        self.fields = record_fields(record_class)  # Stored columns
+        self.local = threading.local()  # The calling thread's connection, opened on first use
+        self.connections = []  # Every open connection, closed together
+        self.pool_lock = threading.Lock()  # Lock guarding the list of connections
+
+    def connect(self):  # Method for opening the calling thread's connection, creating the table the first time
+        connection = getattr(self.local, "connection", None)  # The thread's open connection
+        if connection is None:  # Checking if the thread has no connection yet
+            connection = sqlite3.connect(self.file_path, check_same_thread=False)  # Opening the database file; close() may run on another thread
+            connection.create_function("normalize", 1, normalize, deterministic=True)  # Letting the secondary indexes compare text as the in-memory indexes do
+            connection.execute("PRAGMA journal_mode=WAL")  # Letting readers run while a write is in progress
+            with self.pool_lock:  # Keeping other threads out while the schema is checked
+                if not self.connections:  # Checking if this is the first connection
+                    self.create_table(connection)  # Creating or upgrading the table
+                self.connections.append(connection)  # Adding it to the pool
+            self.local.connection = connection  # Remembering it for the thread
+        return connection  # Returning the open connection
+
+    def create_table(self, connection):  # Method for creating the table and its change log
+        columns = ", ".join(f"{field} PRIMARY KEY" if field == self.key_field else field for field in self.fields)  # Column definitions
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {self.label} ({columns})")  # Creating the table
+        log = self.label + CHANGE_LOG_SUFFIX  # Name of the change log table
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {log} (change_seq INTEGER PRIMARY KEY AUTOINCREMENT, change_key, change_found, {', '.join(self.fields)})")  # Creating the log of replaced rows
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {log}_key ON {log} (change_key)")  # Indexing it by record key for the conflict check
+        for table in (self.label, log):  # Iterating over both tables
+            existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}  # Columns of a table created by an older version
+            for field in self.fields:  # Iterating over the stored columns
+                if field not in existing:  # Checking if the column is missing
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {field}")  # Adding it, empty for the old rows
+        wanted = {index_name(self.label, expression): expression for expression in TABLE_INDEXES.get(self.label, ())}  # Secondary indexes the lookups use
+        query = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL"  # Secondary indexes the table has
+        for (name,) in connection.execute(query, (self.label,)).fetchall():  # Iterating over them
+            if name not in wanted:  # Checking for an index older versions created on a plain column
+                connection.execute(f"DROP INDEX {name}")  # Dropping it, as no lookup uses it
+        for name, expression in wanted.items():  # Iterating over the wanted indexes
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {self.label} ({expression})")  # Creating each once
+        for field in MEMBER_FIELDS.get(self.label, ()):  # Iterating over the collection fields
+            members = f"{self.label}_{field}"  # Name of the member table
+            created = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (members,)).fetchone() is None  # Checking if it is new
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {members} (member_key, member)")  # Creating the table of members
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {members}_member ON {members} (member)")  # Indexing it by member for reverse lookups
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {members}_key ON {members} (member_key)")  # and by key for replacing a record's members
+            if created:  # Checking if rows saved before the table existed need listing
+                rows = connection.execute(f"SELECT {self.key_field}, {field} FROM {self.label}").fetchall()  # Reading the key and collection of every row
+                connection.executemany(f"INSERT INTO {members} (member_key, member) VALUES (?, ?)", (row for key, value in rows for row in member_rows(key, value)))  # Listing their members
+        connection.commit()  # Committing the schema
+
+    def load(self):  # Method for opening the table without reading its rows
+        """
+        Open the records table.
+        Returns:
+            SQLiteRecords: A dictionary-like view that reads rows on demand.
+        """
+        self.connect()  # Opening the database and creating the table
+        return SQLiteRecords(self.connect, self.label, self.record_class, self.key_field, self.fields)  # Returning the table view
+
+    def save(self, records):  # Method for saving all records
+        connection = self.connect()  # Making sure the database is open
+        if not isinstance(records, SQLiteRecords):  # Checking if the records come from somewhere else, such as a pickle
+            table = self.load()  # Opening the table view used for encoding
+            connection.execute(f"DELETE FROM {self.label}")  # Clearing the old rows
+            connection.executemany(table.upsert, (table.encode(record) for record in records.values()))  # Writing every record
+            for field in table.members:  # Iterating over the collection fields
+                connection.execute(f"DELETE FROM {self.label}_{field}")  # Clearing the old members
+                connection.executemany(f"INSERT INTO {self.label}_{field} (member_key, member) VALUES (?, ?)", (row for key, record in records.items() for row in member_rows(key, getattr(record, field, None))))  # Listing the new ones
+        connection.commit()  # Committing the rows
+
+    def save_changes(self, records, keys):  # Method for persisting the rows touched by a change
+        self.connect().commit()  # The rows were already written by the table view, so they only need committing
+
+    def read_changes(self, records):  # Method for finding the records other processes saved
+        """
+        Args:
+            records: The table view returned by load().
+        Returns:
+            SavedChanges: The rows other processes changed since the view last read them,
+            which lookups already return, with the rows they replaced for the managers'
+            indexes and observers.
+        """
+        return records.read_changes()  # Reading the change log
+
+    def close(self):  # Method for closing every connection of the pool
+        with self.pool_lock:  # Keeping other threads from opening one meanwhile
+            connections, self.connections = self.connections, []  # Taking the open connections
+            self.local = threading.local()  # Forgetting them for every thread
+        for connection in connections:  # Iterating over the connections
+            connection.commit()  # Committing any pending rows
+            connection.close()  # Closing the connection
+
+
+class TableIndex:  # Definition of the TableIndex class
+    # Base of the stand-ins for the in-memory indexes of indexes.py, answered by queries on
+    # a table's secondary indexes. SQLite keeps those current as rows are written, so adding
+    # and removing records does nothing.
+    def __init__(self, records):  # Constructor method for attaching the index to a table
+        self.records = records  # Table view answering the queries
+
+    def add(self, *args):  # Method kept for the in-memory index interface
+        pass
+
+    def remove(self, *args):  # Method kept for the in-memory index interface
+        pass
+
+    def clear(self):  # Method kept for the in-memory index interface
+        pass
+
+
+class TableFieldIndex(TableIndex):  # Definition of the TableFieldIndex class
+    # Equality lookups on normalized field values, like indexes.FieldIndex.
+    def __init__(self, records, fields):  # Constructor method for naming the indexed fields
+        super().__init__(records)  # Attaching the index to the table
+        self.fields = tuple(fields)  # Names of the indexed fields
+
+    def lookup(self, field, value):  # Method for getting the keys whose field equals a value
+        if field not in self.fields:  # Checking if the field is indexed
+            raise KeyError(field)  # Raising an error as the in-memory index would
+        return set(self.records.keys_where(f"normalize({field}) IS ?", (normalize(value),)))  # Returning the matching keys
+
+
+class TableIntervalIndex(TableIndex):  # Definition of the TableIntervalIndex class
+    # Time spans per normalized group value, like indexes.IntervalIndex. Only spans starting
+    # within the longest span before the queried start can overlap it, so a lookup reads a
+    # short range of the (group, start) index.
+    def __init__(self, records, group_field, start_field, end_field):  # Constructor method for naming the span columns
+        super().__init__(records)  # Attaching the index to the table
+        self.group_field = group_field  # Column holding the group, such as the venue
+        self.start_field = start_field  # Column holding the start of the span
+        self.end_field = end_field  # Column holding the end of the span
+        query = f"SELECT MAX({end_field} - {start_field}) FROM {records.table}"  # Query for the longest stored span
+        self.longest = records.connection.execute(query).fetchone()[0] or 0  # Longest span, widened as spans are added
+
+    def add(self, key, group, start, end):  # Method for widening the search window for a new span
+        self.longest = max(self.longest, end - start)  # Keeping the longest span
+
+    def overlapping(self, group, start, end, exclude=None):  # Method for listing the keys whose span overlaps [start, end)
+        condition = (  # Spans of the group starting in [start - longest, end) and ending after start
+            f"normalize({self.group_field}) = ? AND {self.start_field} >= ? AND {self.start_field} < ? "
+            f"AND {self.end_field} > ? AND {self.records.key_field} IS NOT ?"
+        )
+        return self.records.keys_where(condition, (normalize(group), start - self.longest, end, start, exclude))  # Returning the overlapping keys
+
+    def all_overlaps(self):  # Method for listing every overlapping pair in one sweep
+        """
+        Returns:
+            list: (group, key, other_key) for every pair of overlapping spans.
+        """
+        query = (  # Query streaming every span in group and start order
+            f"SELECT normalize({self.group_field}), {self.start_field}, {self.end_field}, {self.records.key_field} "
+            f"FROM {self.records.table} WHERE normalize({self.group_field}) != '' AND {self.start_field} IS NOT NULL ORDER BY 1, 2, 3, 4"
+        )
+        pairs = []  # List collecting the overlapping pairs
+        for group, rows in itertools.groupby(self.records.connection.execute(query), key=lambda row: row[0]):  # Iterating over the groups
+            pairs.extend(overlapping_pairs(group, (row[1:] for row in rows)))  # Sweeping each group
+        return pairs  # Returning the overlapping pairs
+
+
+class TableCalendarIndex(TableIndex):  # Definition of the TableCalendarIndex class
+    # Keys sorted by a minute expression, like indexes.CalendarIndex.
+    def __init__(self, records, expression):  # Constructor method for naming the minute expression
+        super().__init__(records)  # Attaching the index to the table
+        self.expression = expression  # SQL expression giving each row's minute, indexed in TABLE_INDEXES
+
+    def between(self, start, end):  # Method for listing the keys at minutes in [start, end)
+        return self.records.keys_where(f"{self.expression} >= ? AND {self.expression} < ?", (start, end), order=self.expression)  # Returning the keys in minute order
+
+
+class TableMembershipIndex(TableIndex):  # Definition of the TableMembershipIndex class
+    # Records by the members of a collection field, like indexes.MembershipIndex.
+    def __init__(self, records, field):  # Constructor method for naming the collection field
+        super().__init__(records)  # Attaching the index to the table
+        self.field = field  # Collection field listed in MEMBER_FIELDS
+
+    def lookup(self, member):  # Method for getting the keys of the records holding a member
+        query = f"SELECT member_key FROM {self.records.table}_{self.field} WHERE member = ?"  # Query served by the member index
+        return {key for (key,) in self.records.connection.execute(query, (normalize(member),))}  # Returning the matching keys
+
+
+def migrate_pickles_to_sqlite():  # Function for copying every pickle store into SQLite once
+    """
+    Copy each pickle store, with the changes its journal holds, into an empty SQLite
+    table. Tables already holding rows are left alone, since the stores were migrated
+    before and the database has newer changes than the old files.
+    """
+    from storage import JOURNAL_SUFFIX, JournalStorage, PickleStorage  # Importing the storages used to read the old files
+    from event_management import Event, EVENT_FILE_PATH  # Importing the event record and file
+    from guest_management import Guest, GUEST_FILE_PATH  # Importing the guest record and file
+    from supplier_management import Supplier, SUPPLIER_FILE_PATH  # Importing the supplier record and file
+    from venue_management import Venue, VENUE_FILE_PATH  # Importing the venue record and file
+    from client_management import Client, CLIENT_FILE_PATH  # Importing the client record and file
+    from employee_management import Employee, EMPLOYEE_FILE_PATH  # Importing the employee record and file
+
+    stores = [  # Stores to migrate: file path, label, record class and key field
+        (EVENT_FILE_PATH, "events", Event, "event_id"),
+        (GUEST_FILE_PATH, "guests", Guest, "guest_id"),
+        (SUPPLIER_FILE_PATH, "suppliers", Supplier, "supplier_id"),
+        (VENUE_FILE_PATH, "venues", Venue, "venue_id"),
+        (CLIENT_FILE_PATH, "clients", Client, "client_id"),
+        (EMPLOYEE_FILE_PATH, "employees", Employee, "employee_id"),
+    ]
+    for file_path, label, record_class, key_field in stores:  # Iterating over the stores
+        target = SQLiteStorage(file_path, label, record_class, key_field)  # Opening the new database
+        existing = len(target.load())  # Counting the rows already migrated
+        if existing:  # Checking if the table was filled before
+            target.close()  # Closing the database untouched
+            print(f"Skipped {label}: {target.file_path} already holds {existing} rows.")  # Reporting the refusal
+            continue
+        if os.path.exists(file_path + JOURNAL_SUFFIX):  # Checking if the store was written through a journal
+            source = JournalStorage(file_path, label, record_class, key_field)  # Replaying the journal over the snapshot
+        else:
+            source = PickleStorage(file_path, label, record_class, key_field)  # Reading the snapshot alone
+        records = source.load()  # Reading the old records
+        source.close()  # Releasing the old files
+        target.save(records)  # Writing every record as a row
+        target.close()  # Closing the database
+        print(f"Migrated {len(records)} {label} to {target.file_path}")  # Reporting the migration
+
+
+if __name__ == "__main__":
+    migrate_pickles_to_sqlite()  # Running the one-shot migration
@@ -0,0 +1,674 @@
+import importlib  # Importing the importlib module for loading optional backends on demand
+import os  # Importing the os module for operating system related functionalities
+import pickle  # Importing the pickle module for object serialization
+import queue  # Importing the queue module for handing changes to the writer thread
+import struct  # Importing the struct module for packing journal frame headers
+import threading  # Importing the threading module for the write-behind worker
+import zlib  # Importing the zlib module for journal frame checksums
+
+from changes import ConflictError  # Importing the error raised when another process saved a record first
+from records import Record, record_version  # Importing the record base class and version stamp
+
+try:
+    import fcntl  # Importing the fcntl module for advisory file locks on POSIX systems
+except ImportError:  # Handling Windows, which has no fcntl
+    fcntl = None
+try:
+    import msvcrt  # Importing the msvcrt module for file locks on Windows
+except ImportError:  # Handling POSIX systems, which have no msvcrt
+    msvcrt = None
+
+DEFAULT_BACKEND = os.environ.get("EVENT_SYSTEM_BACKEND", "pickle")  # Storage backend used when a manager doesn't pick one
+JOURNAL_SUFFIX = ".journal"  # Suffix appended to a snapshot path to name its journal file
+PREVIOUS_SUFFIX = ".prev"  # Suffix naming the previous snapshot, kept as a fallback
+TEMP_SUFFIX = ".tmp"  # Suffix naming a snapshot while it is being written
+CORRUPT_SUFFIX = ".corrupt"  # Suffix naming an unreadable snapshot moved aside so saves don't overwrite the fallback
+LOCK_SUFFIX = ".lock"  # Suffix naming the lock file held while a data file is read or written
+SNAPSHOT_MAGIC = b"EVSNAP1\n"  # First bytes of a checksummed snapshot; older files are bare pickles
+SNAPSHOT_HEADER = struct.Struct("<QI")  # Snapshot header after the magic: payload length and CRC32 of the payload
+COMPACTION_THRESHOLD = 1000  # Smallest number of journal records after which the journal is folded into a new snapshot
+FRAME_HEADER = struct.Struct("<II")  # Journal frame header: payload length and CRC32 of the payload
+WRITE_QUEUE_SIZE = 256  # Number of unwritten changes a write-behind storage holds before callers wait
+
+
+class SnapshotError(Exception):  # Definition of the SnapshotError class
+    # Raised when a snapshot file is cut short or fails its checksum.
+    pass
+
+
+class ChecksumWriter:  # Definition of the ChecksumWriter class
+    # File wrapper counting the bytes and CRC32 of everything pickled through it, so a
+    # snapshot is checksummed while it streams to disk instead of being built in memory first.
+    def __init__(self, file):  # Constructor method for wrapping a file
+        self.file = file  # File receiving the bytes
+        self.length = 0  # Number of bytes written
+        self.checksum = 0  # CRC32 of the bytes written
+
+    def write(self, data):  # Method for writing bytes and adding them to the checksum
+        self.length += len(data)  # Counting the bytes
+        self.checksum = zlib.crc32(data, self.checksum)  # Extending the checksum
+        return self.file.write(data)  # Writing the bytes
+
+
+def write_snapshot(file_path, records):  # Function for replacing a snapshot file without ever leaving it half written
+    """
+    Write the records to a temporary file with a checksum header, flush it to disk and
+    rename it over the snapshot. The snapshot being replaced is kept as the .prev file.
+    """
+    temp_path = file_path + TEMP_SUFFIX  # Path of the snapshot being written
+    with open(temp_path, "wb") as file:  # Opening the temporary file in binary write mode
+        file.write(SNAPSHOT_MAGIC + SNAPSHOT_HEADER.pack(0, 0))  # Reserving the header
+        writer = ChecksumWriter(file)  # Checksumming the payload as it is written
+        pickle.dump(records, writer, protocol=pickle.HIGHEST_PROTOCOL)  # Streaming the records to the file
+        file.seek(len(SNAPSHOT_MAGIC))  # Going back to the header
+        file.write(SNAPSHOT_HEADER.pack(writer.length, writer.checksum))  # Filling in the length and checksum
+        file.flush()  # Handing the bytes to the operating system
+        os.fsync(file.fileno())  # Waiting until they are on disk
+    if os.path.exists(file_path):  # Checking if there is a snapshot to keep as the fallback
+        os.replace(file_path, file_path + PREVIOUS_SUFFIX)  # Keeping it as the previous generation
+    os.replace(temp_path, file_path)  # Putting the new snapshot in place in one step
+    sync_directory(file_path)  # Making the renames survive a crash
+
+
+def sync_directory(file_path):  # Function for flushing a directory's entries to disk after a rename
+    if os.name != "posix":  # Checking if directories can be opened for syncing
+        return  # Windows makes renames durable without it
+    descriptor = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)  # Opening the directory
+    try:
+        os.fsync(descriptor)  # Flushing its entries
+    finally:
+        os.close(descriptor)  # Closing the directory
+
+
+def read_snapshot(file_path):  # Function for reading a snapshot file and checking it is whole
+    """
+    Read the records from a snapshot, verifying its length and checksum. Files written
+    before snapshots had a header are read as bare pickles.
+    Returns:
+        dict: The stored records.
+    """
+    with open(file_path, "rb") as file:  # Opening the file in binary read mode
+        if file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:  # Checking for an older bare pickle
+            file.seek(0)  # Going back to the start
+            return pickle.load(file)  # Loading data from the file using pickle
+        header = file.read(SNAPSHOT_HEADER.size)  # Reading the header
+        if len(header) < SNAPSHOT_HEADER.size:  # Checking for a cut-off header
+            raise SnapshotError("snapshot header is incomplete")  # Raising an error for a torn file
+        length, checksum = SNAPSHOT_HEADER.unpack(header)  # Unpacking the payload length and checksum
+        payload = file.read(length)  # Reading the payload
+    if len(payload) < length:  # Checking for a cut-off payload
+        raise SnapshotError(f"snapshot is truncated ({len(payload)} of {length} bytes)")  # Raising an error for a torn file
+    if zlib.crc32(payload) != checksum:  # Checking the payload against its checksum
+        raise SnapshotError("snapshot checksum does not match")  # Raising an error for a corrupt file
+    return pickle.loads(payload)  # Decoding the records
+
+
+class FileLock:  # Definition of the FileLock class
+    # Advisory lock on a .lock file next to a data file, held while a process reads or writes
+    # the data, so processes sharing a folder never interleave their saves. It also shuts out
+    # other threads of the same process and may be taken again by the thread holding it.
+    def __init__(self, lock_path):  # Constructor method for naming the lock file
+        self.lock_path = lock_path  # Path of the lock file
+        self.thread_lock = threading.RLock()  # Lock between the threads of this process
+        self.depth = 0  # Number of nested acquisitions by the holding thread
+        self.file = None  # Open lock file while the lock is held
+
+    def __enter__(self):  # Method for taking the lock
+        self.thread_lock.acquire()  # Waiting for the other threads first
+        if self.depth == 0:  # Checking if this process does not hold the file lock yet
+            try:
+                self.file = open(self.lock_path, "a+b")  # Opening the lock file, creating it if needed
+                lock_file(self.file)  # Waiting for the other processes
+            except BaseException:  # Handling a failure to lock
+                if self.file is not None:  # Checking if the file was opened
+                    self.file.close()  # Closing it
+                    self.file = None  # Forgetting it
+                self.thread_lock.release()  # Letting the other threads in
+                raise
+        self.depth += 1  # Counting the acquisition
+        return self  # Returning the lock
+
+    def __exit__(self, exc_type, exc_value, traceback):  # Method for releasing the lock
+        self.depth -= 1  # Counting the release
+        if self.depth == 0:  # Checking if the outermost holder is done
+            unlock_file(self.file)  # Letting the other processes in
+            self.file.close()  # Closing the lock file
+            self.file = None  # Forgetting it
+        self.thread_lock.release()  # Letting the other threads in
+
+
+def lock_file(file):  # Function for waiting for an exclusive lock on an open file
+    if fcntl is not None:  # Checking for POSIX file locks
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)  # Waiting for the lock
+    elif msvcrt is not None:  # Checking for Windows file locks
+        file.seek(0)  # Locking the first byte
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)  # Waiting for the lock, which gives up after about ten seconds
+                return
+            except OSError:  # Handling the timeout
+                continue  # Waiting again
+
+
+def unlock_file(file):  # Function for releasing the lock on an open file
+    if fcntl is not None:  # Checking for POSIX file locks
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)  # Releasing the lock
+    elif msvcrt is not None:  # Checking for Windows file locks
+        file.seek(0)  # Going back to the locked byte
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)  # Releasing the lock
+
+
+def file_signature(file_path):  # Function for identifying the current contents of a file
+    """
+    Returns:
+        tuple: (inode, size, modification time), which changes whenever the file is
+        replaced or appended to, or None if the file does not exist.
+    """
+    try:
+        status = os.stat(file_path)  # Reading the file's status
+    except FileNotFoundError:  # Handling a missing file
+        return None
+    return (status.st_ino, status.st_size, status.st_mtime_ns)  # Returning the signature
+
+
+def same_record(first, second):  # Function for checking if two copies of a record hold the same values
+    if isinstance(first, Record) and isinstance(second, Record):  # Checking for slot-based records
+        return first.__getstate__() == second.__getstate__()  # Comparing every attribute
+    return first == second  # Comparing other values directly
+
+
+def conflicting(theirs, ours):  # Function for checking if saving our record would overwrite a newer one
+    """
+    Another process's record conflicts with ours if it is at least as new and differs:
+    both were changed from the same version, or theirs has moved on since.
+    """
+    return record_version(theirs) >= record_version(ours) and not same_record(theirs, ours)  # Returning whether ours is outdated
+
+
+def merge_changes(disk, records, keys):  # Function for applying our changed records over another process's saved records
+    """
+    Write our records under the changed keys into the records read from the file, leaving
+    the keys whose saved record conflicts with ours as they are.
+    Returns:
+        list: The conflicting keys.
+    """
+    conflicts = []  # Keys changed by both processes
+    for key in keys:  # Iterating over our changed keys
+        ours = records.get(key)  # Getting our record, None once deleted
+        theirs = disk.get(key)  # Getting the saved record
+        if ours is None:  # Checking for our deletion
+            disk.pop(key, None)  # Deleting the saved record
+        elif theirs is not None and conflicting(theirs, ours):  # Checking if the saved record is newer
+            conflicts.append(key)  # Keeping theirs
+        else:
+            disk[key] = ours  # Saving ours
+    return conflicts  # Returning the conflicting keys
+
+
+def compare_records(disk, records, refused=()):  # Function for listing how saved records differ from loaded ones
+    """
+    Returns:
+        dict: Saved record, or None once deleted, by key, for every record saved at a newer
+        version than the loaded one, missing from the loaded ones, deleted from the file,
+        or refused as a conflict.
+    """
+    changes = {}  # Differences by key
+    for key, record in disk.items():  # Iterating over the saved records
+        loaded = records.get(key)  # Getting the loaded copy
+        if loaded is None or key in refused or record_version(record) > record_version(loaded):  # Checking if the saved copy is newer
+            changes[key] = record  # Taking the saved copy
+    for key in records:  # Iterating over the loaded keys
+        if key not in disk:  # Checking if the record was deleted from the file
+            changes[key] = None  # Deleting it
+    return changes  # Returning the differences
+
+
+class PickleStorage:  # Definition of the PickleStorage class
+    # Stores the whole dictionary as one checksummed pickle snapshot, rewritten atomically on
+    # every change. The previous snapshot is kept and loaded when the current one is damaged.
+    # Reads and writes hold a lock shared with other processes using the same folder. When
+    # another process saved the file since this one read or wrote it, a save writes only the
+    # changed records over the file's records instead of overwriting them, refusing records
+    # the other process changed too; read_changes hands the other process's records over.
+    def __init__(self, file_path, label, record_class=None, key_field=None):  # Constructor method for initializing pickle storage
+        self.file_path = file_path  # Path of the pickle file
+        self.label = label  # Name of the stored records used in error messages
+        self.record_class = record_class  # Class of the stored records
+        self.key_field = key_field  # Attribute holding each record's key
+        self.lock = FileLock(file_path + LOCK_SUFFIX)  # Lock shared with other processes using the file
+        self.signature = None  # Signature of the file when this process last read or wrote it
+        self.refused = set()  # Keys whose change was refused as a conflict, to be replaced by the saved record
+
+    def read(self):  # Method for reading the newest readable snapshot
+        """
+        Load records from the snapshot, or from the previous snapshot if the current one
+        is damaged. A damaged snapshot is renamed with a .corrupt suffix, so the next save
+        keeps the good previous one instead of rotating the damaged file over it.
+        Returns:
+            dict: A dictionary containing the loaded records.
+        """
+        previous_path = self.file_path + PREVIOUS_SUFFIX  # Path of the previous snapshot
+        for path in (self.file_path, previous_path):  # Trying the newest snapshot first
+            if not os.path.exists(path):  # Checking if the file exists
+                continue
+            try:
+                records = read_snapshot(path)  # Reading and verifying the snapshot
+            except (SnapshotError, pickle.UnpicklingError, EOFError) as e:  # Handling torn or corrupt snapshots
+                print(f"Error loading {self.label} data from {path}: {e}")  # Printing error message
+                os.replace(path, path + CORRUPT_SUFFIX)  # Setting the file aside for inspection
+                continue
+            if path == previous_path:  # Checking if the fallback was needed
+                print(f"Loaded {self.label} data from the previous snapshot.")  # Telling the user older data is shown
+            return records  # Returning the records
+        return {}  # Returning an empty dictionary if no snapshot can be read
+
+    def load(self):  # Method for loading records from file
+        """
+        Returns:
+            dict: A dictionary containing the loaded records.
+        """
+        with self.lock:  # Keeping other processes from saving while the file is read
+            records = self.read()  # Reading the snapshot
+            self.signature = file_signature(self.file_path)  # Remembering which version of the file was read
+        self.refused.clear()  # Every record now matches the file
+        return records  # Returning the records
+
+    def save(self, records):  # Method for saving all records to file
+        with self.lock:  # Keeping other processes out while the file is replaced
+            write_snapshot(self.file_path, records)  # Replacing the snapshot atomically
+            self.signature = file_signature(self.file_path)  # Remembering the file as written
+
+    def save_changes(self, records, keys):  # Method for persisting the records stored under the given keys
+        """
+        Persist the changed records. If another process saved the file since this one last
+        read or wrote it, the file's records are kept and only the changed keys are written
+        over them; keys the other process changed too keep its records.
+        Raises:
+            ConflictError: Naming the keys that were not saved.
+        """
+        with self.lock:  # Keeping other processes out between reading and replacing the file
+            current = file_signature(self.file_path)  # Identifying the file as it is now
+            if current is None or current == self.signature:  # Checking if nobody else saved since
+                self.save(records)  # A plain pickle file can only be rewritten as a whole
+                return
+            disk = self.read()  # Reading the other process's records
+            conflicts = merge_changes(disk, records, keys)  # Writing ours over them
+            write_snapshot(self.file_path, disk)  # Saving the merged records
+            self.signature = None  # Making the next refresh pick up the other process's records
+        self.raise_conflicts(conflicts)  # Reporting the refused records
+
+    def raise_conflicts(self, conflicts):  # Method for reporting records that were not saved because another process changed them
+        if conflicts:  # Checking if any record was refused
+            self.refused.update(conflicts)  # Replacing them with the saved records on the next refresh
+            names = ", ".join(str(key) for key in conflicts[:10])  # Naming the first few
+            raise ConflictError(f"{len(conflicts)} {self.label} changed by someone else were not saved: {names}", conflicts)  # Raising the conflict
+
+    def read_changes(self, records):  # Method for finding the records other processes saved since this one last read or wrote the file
+        """
+        Args:
+            records: The loaded records, compared with the saved ones.
+        Returns:
+            dict: Saved record, or None once deleted, by key; empty if the file is unchanged.
+        """
+        with self.lock:  # Keeping other processes from saving while the file is read
+            current = file_signature(self.file_path)  # Identifying the file as it is now
+            if current is None or current == self.signature:  # Checking if nobody else saved since
+                return {}
+            disk = self.read()  # Reading the saved records
+            self.signature = file_signature(self.file_path)  # Remembering which version of the file was read
+        changes = compare_records(disk, records, self.refused)  # Keeping only what differs
+        self.refused.clear()  # The refused records are replaced now
+        return changes  # Returning the differences
+
+    def close(self):  # Method for releasing any resources held by the storage
+        pass  # Nothing is kept open between saves
+
+
+class JournalStorage(PickleStorage):  # Definition of the JournalStorage class
+    # Appends one small record per change to a journal next to the pickle snapshot.
+    # Loading replays the journal over the snapshot; once the journal grows past the
+    # compaction threshold it is folded into a fresh snapshot and emptied.
+    # Processes sharing the files append under the lock and each remembers how far it has
+    # read the journal, so picking up another process's changes reads only its new frames.
+    def __init__(self, file_path, label, record_class=None, key_field=None, compaction_threshold=COMPACTION_THRESHOLD):  # Constructor method for initializing journal storage
+        super().__init__(file_path, label, record_class, key_field)  # Initializing the snapshot part of the storage
+        self.journal_path = file_path + JOURNAL_SUFFIX  # Path of the journal file
+        self.compaction_threshold = compaction_threshold  # Journal size that triggers compaction
+        self.journal_records = 0  # Number of records currently in the journal
+        self.journal_offset = 0  # Journal bytes already read or written by this process
+        self.external = {}  # Changes other processes appended, not yet handed over by read_changes
+        self.stale = False  # Whether another process compacted, so the loaded records need a full comparison
+
+    def read_all(self):  # Method for reading the snapshot and replaying the whole journal over it
+        records = self.read()  # Reading the last snapshot
+        operations = self.read_journal(0)  # Reading every journal record
+        for operation in operations:  # Iterating over the journal records
+            self.apply(records, operation)  # Applying each to the snapshot
+        self.signature = file_signature(self.file_path)  # Remembering which snapshot was read
+        self.journal_records = len(operations)  # Counting the journal records
+        return records  # Returning the snapshot with the journal applied
+
+    def load(self):  # Method for loading the snapshot and replaying the journal over it
+        with self.lock:  # Keeping other processes from saving while the files are read
+            records = self.read_all()  # Reading the snapshot and journal
+        self.refused.clear()  # Every record now matches the files
+        self.external = {}  # Nothing is left to hand over
+        self.stale = False  # The records are current
+        return records  # Returning the snapshot with the journal applied
+
+    def read_journal(self, start):  # Method for reading the journal records written after an offset
+        """
+        Read the complete frames from the offset on, moving self.journal_offset past them.
+        A partially written tail is cut off so later appends stay readable.
+        Returns:
+            list: The decoded journal records.
+        """
+        operations = []  # Journal records read
+        self.journal_offset = start  # Offset just after the last complete frame
+        if not os.path.exists(self.journal_path):  # Checking if there is a journal to read
+            self.journal_offset = 0  # Nothing has been written yet
+            return operations
+        with open(self.journal_path, "rb") as file:  # Opening the journal in binary read mode
+            file.seek(start)  # Skipping the frames already read
+            while True:
+                header = file.read(FRAME_HEADER.size)  # Reading the frame header
+                if len(header) < FRAME_HEADER.size:  # Checking for the end of the journal
+                    break
+                length, checksum = FRAME_HEADER.unpack(header)  # Unpacking payload length and checksum
+                payload = file.read(length)  # Reading the frame payload
+                if len(payload) < length or zlib.crc32(payload) != checksum:  # Checking for a torn or corrupt frame
+                    break
+                try:
+                    operations.append(pickle.loads(payload))  # Decoding the journal record
+                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
+                    print(f"Error replaying {self.label} journal: {e}")  # Printing error message
+                    break
+                self.journal_offset = file.tell()  # Remembering where the next frame starts
+        if self.journal_offset < os.path.getsize(self.journal_path):  # Checking for a partially written tail
+            with open(self.journal_path, "r+b") as file:  # Opening the journal for truncation
+                file.truncate(self.journal_offset)  # Dropping the incomplete tail so later appends stay readable
+        return operations  # Returning the journal records
+
+    @staticmethod
+    def apply(records, operation):  # Method for applying one journal record to a dictionary
+        if operation[0] == "put":  # Checking for an insert or update record
+            records[operation[1]] = operation[2]  # Storing the record under its key
+        else:  # Handling a delete record
+            records.pop(operation[1], None)  # Removing the record if present
+
+    def save(self, records):  # Method for writing a new snapshot and emptying the journal
+        with self.lock:  # Keeping other processes out until the journal is emptied too
+            super().save(records)  # Writing the full snapshot, which is on disk before the journal is emptied
+            with open(self.journal_path, "wb"):  # Truncating the journal now that the snapshot contains it
+                pass
+            self.journal_records = 0  # Resetting the journal record count
+            self.journal_offset = 0  # Nothing is left to read
+
+    def catch_up(self, records, keys):  # Method for reading what other processes saved before appending our changes
+        """
+        Returns:
+            list: Our changed keys whose record another process changed too.
+        """
+        if file_signature(self.file_path) != self.signature:  # Checking if another process compacted
+            disk = self.read_all()  # Reading its snapshot and journal
+            self.stale = True  # Comparing everything on the next refresh
+            return [key for key in keys if records.get(key) is not None and disk.get(key) is not None and conflicting(disk[key], records[key])]  # Finding the keys it changed too
+        if not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) <= self.journal_offset:  # Checking if nobody appended since
+            return []
+        operations = self.read_journal(self.journal_offset)  # Reading the other processes' frames
+        self.journal_records += len(operations)  # Counting them
+        theirs = {}  # Their newest record, or None once deleted, by key
+        for operation in operations:  # Iterating over their journal records
+            theirs[operation[1]] = operation[2] if operation[0] == "put" else None  # Keeping the last change of each key
+        self.external.update(theirs)  # Handing them over on the next refresh
+        conflicts = []  # Keys changed by both processes
+        for key in keys:  # Iterating over our changed keys
+            ours = records.get(key)  # Getting our record, None once deleted
+            if key in theirs and ours is not None and (theirs[key] is None or conflicting(theirs[key], ours)):  # Checking if they deleted or changed it too
+                conflicts.append(key)  # Keeping theirs
+        return conflicts  # Returning the conflicting keys
+
+    def save_changes(self, records, keys):  # Method for appending the changed records to the journal
+        """
+        Raises:
+            ConflictError: Naming the keys another process changed first, which are not saved.
+        """
+        with self.lock:  # Keeping other processes out while reading their frames and appending ours
+            conflicts = self.catch_up(records, keys)  # Reading their changes first
+            frames = []  # List collecting the encoded frames
+            for key in keys:  # Iterating over the changed keys
+                if key in conflicts:  # Checking if the other process's record wins
+                    continue
+                if key in records:  # Checking if the record still exists
+                    operation = ("put", key, records[key])  # Encoding an insert or update
+                else:
+                    operation = ("delete", key)  # Encoding a removal
+                payload = pickle.dumps(operation, protocol=pickle.HIGHEST_PROTOCOL)  # Serializing the journal record
+                frames.append(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)  # Framing it with length and checksum
+            with open(self.journal_path, "ab") as file:  # Opening the journal in binary append mode
+                file.write(b"".join(frames))  # Appending every frame in one write
+                self.journal_offset = file.tell()  # Our frames need no reading back
+            self.journal_records += len(frames)  # Counting the appended records
+            if self.journal_records >= max(self.compaction_threshold, len(records) // 2):  # Checking if the journal outgrew the threshold and half the snapshot, so compaction cost stays proportional to the appends
+                self.compact(records)  # Folding the journal into a new snapshot
+        self.raise_conflicts(conflicts)  # Reporting the refused records
+
+    def compact(self, records):  # Method for folding the journal into a new snapshot
+        with self.lock:  # Keeping other processes out while the files are replaced
+            if self.stale or self.external:  # Checking if the loaded records miss other processes' changes
+                records = self.read_all()  # Folding the files' own records instead
+            self.save(records)  # Writing the snapshot also empties the journal
+
+    def read_changes(self, records):  # Method for finding the records other processes saved since this one last read or wrote the files
+        """
+        Returns:
+            dict: Saved record, or None once deleted, by key. Only the journal frames other
+            processes appended are read, unless one of them compacted the journal.
+        """
+        with self.lock:  # Keeping other processes from saving while the files are read
+            if self.stale or file_signature(self.file_path) != self.signature:  # Checking if another process compacted
+                refused = set(self.refused)  # Keeping the refused keys across the reload
+                disk = self.load()  # Reading the snapshot and journal again
+                return compare_records(disk, records, refused)  # Keeping only what differs
+            self.catch_up(records, [])  # Reading the frames appended since
+            changes, self.external = self.external, {}  # Handing the collected changes over
+        self.refused.clear()  # The refused records are replaced now
+        return changes  # Returning the changes
+
+
+class BackgroundStorage:  # Definition of the BackgroundStorage class
+    # Write-behind wrapper: changes are queued for a worker thread that persists them through
+    # the wrapped storage, so callers such as Tk button handlers never wait on the disk.
+    # Callers queue only the changed keys with their record, or None once deleted; the worker
+    # applies them to its own copy of the records, which it hands to the wrapped storage, so
+    # queuing a one-record change costs O(1) however large the store is. Changes queued while
+    # the worker is busy are merged into one write. Reads of the records other processes saved
+    # are queued the same way, so they happen after the changes queued before them and never
+    # hold up the caller.
+    STOP = object()  # Queue item telling the worker to finish
+
+    def __init__(self, inner, report_error=None, queue_size=WRITE_QUEUE_SIZE):  # Constructor method for initializing write-behind storage
+        self.inner = inner  # Storage that does the actual writing
+        self.label = inner.label  # Name of the stored records used in error messages
+        self.report_error = report_error  # Callable receiving exceptions raised by the worker
+        self.pending = queue.Queue(maxsize=queue_size)  # Bounded queue of ("changes", records by key), ("save", all records) and ("read", callable) items
+        self.records = None  # The worker's copy of the stored records, once loaded
+        self.reading = False  # Whether a read requested with request_changes is still queued
+        self.worker = threading.Thread(target=self.run, name=f"{self.label}-writer", daemon=True)  # Thread writing the changes
+        self.worker.start()  # Starting the worker
+
+    def load(self):  # Method for loading records once every queued change is written
+        self.flush()  # Writing the queued changes first
+        records = self.inner.load()  # Loading through the wrapped storage
+        self.records = dict(records) if isinstance(records, dict) else None  # Giving the worker its own copy, which only it changes from now on
+        return records  # Returning the records
+
+    def save(self, records):  # Method for queuing a full save
+        if not isinstance(records, dict):  # Checking for row-based records, which write through on their own thread
+            self.write_through(records, None)  # Persisting right away
+            return
+        self.pending.put(("save", dict(records)))  # Queuing a copy of every record, waiting if the queue is full
+
+    def save_changes(self, records, keys):  # Method for queuing the changed keys
+        if not isinstance(records, dict):  # Checking for row-based records, which write through on their own thread
+            self.write_through(records, list(keys))  # Persisting right away
+            return
+        self.pending.put(("changes", {key: records.get(key) for key in keys}))  # Queuing each changed record, None once deleted
+
+    def run(self):  # Method executed by the worker thread
+        while True:
+            batch = [self.pending.get()]  # Waiting for the next change
+            while True:  # Collecting everything else already queued
+                try:
+                    batch.append(self.pending.get_nowait())  # Taking another change
+                except queue.Empty:  # Handling an empty queue
+                    break
+            stop = any(item is self.STOP for item in batch)  # Checking if the worker should finish
+            items = [item for item in batch if item is not self.STOP]  # Queued changes and reads
+            self.write_batch([item for item in items if item[0] != "read"])  # Writing the merged changes
+            for kind, deliver in items:  # Iterating over the queued items in order
+                if kind == "read":  # Checking for a read, which sees every change written above
+                    self.read_batch(deliver)  # Reading the records other processes saved
+            for _ in batch:  # Iterating over the handled items
+                self.pending.task_done()  # Marking each as done for flush()
+            if stop:  # Checking if the worker should finish
+                return
+
+    def write_batch(self, batch):  # Method for merging and writing a batch of changes
+        keys, full = set(), False  # Changed keys, and whether every record must be written
+        for kind, payload in batch:  # Iterating over the queued changes in order
+            if kind == "save":  # Checking for a full save
+                self.records = payload  # Taking the saved records as they were when queued
+                keys, full = set(), True  # A full save covers every key
+                continue
+            if self.records is None:  # Checking if nothing was loaded before the change
+                self.records = self.guarded(self.inner.load) or {}  # Starting from the saved records, so the change doesn't replace them
+            for key, record in payload.items():  # Iterating over the changed records
+                if record is None:  # Checking for a deletion
+                    self.records.pop(key, None)  # Removing the record
+                else:
+                    self.records[key] = record  # Storing the record
+            keys.update(payload)  # Merging the changed keys
+        if full:  # Checking if a full save was requested
+            self.guarded(self.inner.save, self.records)  # Writing every record
+        elif keys:  # Checking if any key changed
+            self.guarded(self.inner.save_changes, self.records, keys)  # Writing the changed records
+
+    def read_batch(self, deliver):  # Method for reading the records other processes saved on the worker thread
+        external, compared = {}, {}  # Saved changes, and the worker's records they replace
+        if self.records is not None:  # Checking if the records were loaded, so there is something to compare
+            external = self.guarded(self.inner.read_changes, self.records) or {}  # Comparing with the worker's copy, which holds every written change
+            for key, record in external.items():  # Iterating over the changes
+                compared[key] = self.records.get(key)  # Remembering the record the change replaces
+                if record is None:  # Checking for a deletion
+                    self.records.pop(key, None)  # Removing the record
+                else:
+                    self.records[key] = record  # Storing the record
+        self.reading = False  # Allowing the next requested read
+        deliver(external, compared)  # Handing the changes over
+
+    def write_through(self, records, keys):  # Method for persisting row-based records on the caller's thread
+        if keys is None:  # Checking if a full save was requested
+            self.guarded(self.inner.save, records)  # Writing every record
+        elif keys:  # Checking if any key changed
+            self.guarded(self.inner.save_changes, records, keys)  # Writing the changed records
+
+    def guarded(self, action, *args):  # Method for running a storage call, reporting instead of raising its errors
+        try:
+            return action(*args)  # Running the call
+        except Exception as e:  # Handling any error raised while writing
+            if self.report_error is not None:  # Checking if someone wants to hear about errors
+                self.report_error(e)  # Passing the error on
+            else:
+                print(f"Error saving {self.label} data: {e}")  # Printing error message
+            return None
+
+    def read_changes(self, records):  # Method for finding the records other processes saved, once every queued change is written
+        if self.records is None:  # Checking for row-based records, which the worker holds no copy of
+            self.flush()  # Writing the queued changes first, so they are not mistaken for someone else's
+            return self.inner.read_changes(records)  # Reading through the wrapped storage
+        done, result = threading.Event(), {}  # Signal and result of the worker's read
+        self.pending.put(("read", lambda external, compared: (result.update(external), done.set())))  # Reading after the queued changes
+        done.wait()  # Waiting for the worker
+        return result  # Returning the changes
+
+    def request_changes(self, deliver):  # Method for reading the records other processes saved without waiting
+        """
+        Queue a read of the records other processes saved, done by the worker once the
+        changes queued before it are written. Does nothing while an earlier read is queued.
+        Args:
+            deliver: Callable run on the worker thread with the saved records, or None once
+                deleted, by key, and the records they replace by key. It should hand them
+                to the caller's thread rather than apply them itself.
+        Returns:
+            bool: Whether a read was queued.
+        """
+        if self.reading or self.records is None:  # Checking for a queued read, or no records to compare
+            return False
+        self.reading = True  # Holding back further reads until this one is done
+        self.pending.put(("read", deliver))  # Queuing the read behind the queued changes
+        return True
+
+    def flush(self):  # Method for waiting until every queued change is written
+        self.pending.join()  # Waiting for the worker to catch up
+
+    def close(self):  # Method for writing the remaining changes and stopping the worker
+        if self.worker.is_alive():  # Checking if the worker is still running
+            self.pending.put(self.STOP)  # Asking the worker to finish after the queued changes
+            self.worker.join()  # Waiting for it to finish
+        self.inner.close()  # Closing the wrapped storage
+
+
+BACKENDS = {  # Mapping of backend names to the storage classes implementing them
+    "pickle": "storage.PickleStorage",  # Whole-file pickle rewrite on every change
+    "journal": "storage.JournalStorage",  # Append-only journal with threshold compaction
+    "sqlite": "sqlite_storage.SQLiteStorage",  # One SQLite table per manager, read row by row
+    "columnar": "columnar_storage.ColumnarStorage",  # Memory-mapped column file with a journal, for read-mostly stores
+}
+
+BACKEND_HELP = "storage backend (pickle, journal, sqlite, columnar), optionally per store, e.g. journal,venues=columnar"  # Help text of the --backend option
+
+
+def parse_backend(text):  # Function for reading a --backend option
+    """
+    Read a backend name, or a default and per-store names such as
+    "journal,venues=columnar,suppliers=columnar".
+    Returns:
+        The backend name, or a dictionary of names by store label with the default under None.
+    """
+    if not text or "=" not in text:  # Checking for a single backend
+        return text or None  # Returning it, None meaning the configured default
+    backends = {}  # Backend names by store label
+    for part in text.split(","):  # Iterating over the entries
+        label, _, name = part.rpartition("=")  # Splitting an optional store label from the name
+        backends[label.strip() or None] = name.strip()  # Storing the name
+    return backends  # Returning the names
+
+
+def store_backend(backend, label):  # Function for picking the backend of one store
+    if isinstance(backend, dict):  # Checking for per-store backends
+        return backend.get(label, backend.get(None))  # Returning the store's backend, or the default
+    return backend  # Returning the backend shared by every store
+
+
+def open_storage(backend, file_path, label, record_class=None, key_field=None):  # Function for building the storage a manager persists through
+    """
+    Build a storage for a manager.
+    Args:
+        backend: A backend name from BACKENDS, or an already constructed storage object.
+        file_path: Path of the manager's data file.
+        label: Name of the stored records used in error messages.
+        record_class: Class of the stored records.
+        key_field: Attribute holding each record's key.
+    Returns:
+        The storage object.
+    """
+    if backend is None:  # Checking if the caller left the choice to the default
+        backend = DEFAULT_BACKEND  # Using the configured default backend
+    if not isinstance(backend, str):  # Checking if a storage object was passed in directly
+        return backend  # Using it as is
+    if backend not in BACKENDS:  # Checking if the backend name is known
+        raise ValueError(f"Unknown storage backend: {backend}")  # Raising an error for an unknown backend
+    module_name, class_name = BACKENDS[backend].rsplit(".", 1)  # Splitting the module and class names
+    storage_class = getattr(importlib.import_module(module_name), class_name)  # Importing the backend only when it is used
+    return storage_class(file_path, label, record_class, key_field)  # Constructing the storage
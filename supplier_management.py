@@ -1,9 +1,12 @@
-import os  # Importing the os module for operating system related functionalities
-import pickle  # Importing the pickle module for object serialization
+from changes import Observable, apply_external, check_version, modified_copy  # Importing the change notification mixin and version checks
+from records import VERSION_FIELD, Record, record_rows  # Importing the slot-based record base class, version stamp and row streaming
+from storage import open_storage  # Importing the storage factory used to persist records
 
 SUPPLIER_FILE_PATH = "suppliers.bin"  # File path constant for storing supplier data
+SUPPLIER_FIELDS = ("supplier_id", "name", "address", "contact_details", "service_provided", "min_guests_supplier", "max_guests_supplier", "menu")  # Supplier attributes in constructor order, used for row output
 
-class Supplier:  # Definition of the Supplier class
+class Supplier(Record):  # Definition of the Supplier class
+    __slots__ = SUPPLIER_FIELDS  # Fixed attributes, so instances carry no __dict__
     # Initializes a Supplier object who provides services for events.
     def __init__(self, supplier_id, name, address, contact_details, service_provided,min_guests_supplier, max_guests_supplier, menu):
         self.supplier_id = supplier_id  # Unique identifier for the supplier
@@ -14,46 +17,110 @@ class Supplier:  # Definition of the Supplier class
         self.min_guests_supplier = min_guests_supplier # Minimum number of guests the supplier or  can accommodate
         self.max_guests_supplier = max_guests_supplier  # Maximum number of guests the venue can accommodate
         self.menu = menu  # Menu offered by the supplier
-class SupplierManagement:  # Definition of the SupplierManagement class
-    def __init__(self):  # Constructor method for initializing supplier management instance
-        self.suppliers = self.load_suppliers()  # Loading suppliers data when an instance is created
+class SupplierManagement(Observable):  # Definition of the SupplierManagement class
+    label = "suppliers"  # Name passed to observers
+
+    def __init__(self, backend=None):  # Constructor method for initializing supplier management instance
+        self.storage = open_storage(backend, SUPPLIER_FILE_PATH, "suppliers", Supplier, "supplier_id")  # Choosing how suppliers data is persisted
+        self._suppliers = None  # Suppliers data, loaded on first access
+        self.observers = []  # Objects notified before and after each change
+
+    @property
+    def suppliers(self):  # Property loading suppliers data the first time it is used
+        if self._suppliers is None:  # Checking if the suppliers are not loaded yet
+            self._suppliers = self.load_suppliers()  # Loading suppliers data from the storage
+        return self._suppliers  # Returning the loaded suppliers
+
+    @suppliers.setter
+    def suppliers(self, value):  # Setter replacing the loaded suppliers data
+        self._suppliers = value  # Storing the new suppliers dictionary
 
     def load_suppliers(self):  # Method for loading suppliers data from file
-        if os.path.exists(SUPPLIER_FILE_PATH):  # Checking if the file exists
-            with open(SUPPLIER_FILE_PATH, "rb") as file:  # Opening the file in binary read mode
-                try:
-                    return pickle.load(file)  # Loading data from the file using pickle
-                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
-                    print(f"Error loading suppliers data: {e}")  # Printing error message
-                    return {}  # Returning an empty dictionary if error occurs
-        return {}  # Returning an empty dictionary if file doesn't exist
+        return self.storage.load()  # Loading data through the configured storage
 
     def save_suppliers(self):  # Method for saving suppliers data to file
-        with open(SUPPLIER_FILE_PATH, "wb") as file:  # Opening the file in binary write mode
-            pickle.dump(self.suppliers, file)  # Saving data to the file using pickle
+        self.storage.save(self.suppliers)  # Saving all suppliers data through the configured storage
+
+    def refresh_suppliers(self, external=None):  # Method for picking up suppliers saved by other processes sharing the files
+        """
+        Apply the suppliers other processes added, changed or deleted since the storage
+        last read or wrote them, and tell observers about each.
+        Args:
+            external: Changed suppliers, or None once deleted, by key, if already read from the
+                storage; they are read now if omitted.
+        Returns:
+            list: The applied changes as (key, old, new) tuples.
+        """
+        if self._suppliers is None:  # Checking if the suppliers are not loaded yet
+            return []  # They are read in full on first access
+        if external is None:  # Checking if the changes still have to be read
+            external = self.storage.read_changes(self._suppliers)  # Reading the saved changes
+        changes = apply_external(self._suppliers, external)  # Applying the saved changes
+        if changes:  # Checking if anything changed
+            self.notify_after(changes)  # Telling observers about the changes
+        return changes  # Returning the applied changes
 
     def add_supplier(self, supplier):  # Method for adding a new supplier
         if supplier.supplier_id in self.suppliers:  # Checking if supplier ID already exists
             raise Exception("Supplier ID already exists.")  # Raising an error if supplier ID is not unique
+        changes = [(supplier.supplier_id, None, supplier)]  # Describing the addition
+        self.notify_before(changes)  # Letting observers check the new supplier
         self.suppliers[supplier.supplier_id] = supplier  # Adding the new supplier to the suppliers dictionary
-        self.save_suppliers()  # Saving the updated suppliers data to file
+        self.persist_changes(self.suppliers, changes)  # Persisting only the new supplier, then telling observers about the new supplier
 
-    def delete_supplier(self, supplier_id):  # Method for deleting a supplier
+    def delete_supplier(self, supplier_id, expected_version=None):  # Method for deleting a supplier, optionally only if it is still at the version the caller read
         if supplier_id not in self.suppliers:  # Checking if supplier ID exists
             raise Exception("Supplier not found.")  # Raising an error if supplier ID doesn't exist
+        check_version(self.label, supplier_id, self.suppliers[supplier_id], expected_version)  # Refusing the deletion if someone else changed the supplier since
+        changes = [(supplier_id, self.suppliers[supplier_id], None)]  # Describing the deletion
+        self.notify_before(changes)  # Letting observers check the deletion
         del self.suppliers[supplier_id]  # Deleting the supplier from the suppliers dictionary
-        self.save_suppliers()  # Saving the updated suppliers data to file
+        self.persist_changes(self.suppliers, changes)  # Persisting the supplier change, then telling observers about the deletion
 
-    def modify_supplier(self, supplier_id, **kwargs):  # Method for modifying supplier attributes
+    def modify_supplier(self, supplier_id, expected_version=None, **kwargs):  # Method for modifying supplier attributes, optionally only if the supplier is still at the version the caller read
         if supplier_id not in self.suppliers:  # Checking if supplier ID exists
             raise Exception("Supplier not found.")  # Raising an error if supplier ID doesn't exist
         supplier = self.suppliers[supplier_id]  # Getting the supplier object
-        for key, value in kwargs.items():  # Iterating over keyword arguments
-            if hasattr(supplier, key):  # Checking if the supplier has the attribute
-                setattr(supplier, key, value)  # Setting the new value for the attribute
-            else:
+        check_version(self.label, supplier_id, supplier, expected_version)  # Refusing the change if someone else changed the supplier since
+        for key in kwargs:  # Iterating over keyword arguments
+            if not hasattr(supplier, key) or key == VERSION_FIELD:  # Checking if the supplier has the attribute, which the version stamp doesn't count as
                 raise Exception(f"{key} is not a valid attribute of Supplier.")  # Raising an error for invalid attribute
-        self.save_suppliers()  # Saving the updated suppliers data to file
+        updated = modified_copy(supplier, kwargs)  # Copying the supplier with the new values
+        changes = [(supplier_id, supplier, updated)]  # Describing the modification
+        self.notify_before(changes)  # Letting observers check the new values
+        self.suppliers[supplier_id] = updated  # Storing the modified supplier in place of the old one
+        self.persist_changes(self.suppliers, changes)  # Persisting the supplier change, then telling observers about the modification
+
+    def bulk_add_suppliers(self, suppliers):  # Method for adding many suppliers with a single save
+        """
+        Add a batch of suppliers, saving once at the end. Nothing is added if any
+        supplier ID already exists or appears twice in the batch.
+        Returns:
+            int: The number of suppliers added.
+        """
+        batch = {}  # New suppliers by ID
+        for supplier in suppliers:  # Iterating over the new suppliers
+            if supplier.supplier_id in batch or supplier.supplier_id in self.suppliers:  # Checking if supplier ID already exists
+                raise Exception(f"Supplier ID already exists: {supplier.supplier_id}")  # Raising an error naming the duplicate ID
+            batch[supplier.supplier_id] = supplier  # Adding the supplier to the batch
+        changes = [(supplier_id, None, supplier) for supplier_id, supplier in batch.items()]  # Describing the additions
+        self.notify_before(changes)  # Letting observers check the new suppliers
+        self.suppliers.update(batch)  # Adding the whole batch to the suppliers dictionary
+        self.persist_changes(self.suppliers, changes)  # Persisting the batch once, then telling observers about the new suppliers
+        return len(batch)  # Returning the number of suppliers added
+
+    def bulk_upsert_suppliers(self, suppliers):  # Method for adding or replacing many suppliers with a single save
+        """
+        Add a batch of suppliers, replacing any existing supplier with the same ID, and save once.
+        Returns:
+            int: The number of suppliers written.
+        """
+        batch = {supplier.supplier_id: supplier for supplier in suppliers}  # New suppliers by ID, later entries winning
+        changes = [(supplier_id, self.suppliers.get(supplier_id), supplier) for supplier_id, supplier in batch.items()]  # Describing the additions and replacements
+        self.notify_before(changes)  # Letting observers check the batch
+        self.suppliers.update(batch)  # Storing the whole batch in the suppliers dictionary
+        self.persist_changes(self.suppliers, changes)  # Persisting the batch once, then telling observers about the batch
+        return len(batch)  # Returning the number of suppliers written
 
     def get_supplier(self, supplier_id):  # Method for retrieving a supplier
         if supplier_id not in self.suppliers:  # Checking if supplier ID exists
@@ -71,18 +138,33 @@ class SupplierManagement:  # Definition of the SupplierManagement class
         print(f"Maximum Guests: {supplier.max_guests_supplier}")  # Displaying maximum guests
         print(f"Menu: {supplier.menu}")  # Displaying menu
 
+    def iter_suppliers(self):  # Method for streaming the details of all suppliers one supplier at a time
+        """
+        Yield the details of each supplier as a block of text, in the layout used by display_all_suppliers.
+        """
+        for supplier_id, supplier in self.suppliers.items():  # Iterating over suppliers dictionary
+            yield (  # Yielding the formatted supplier details
+                f"Supplier ID: {supplier_id}\n"  # Adding supplier ID to the string
+                f"Name: {supplier.name}\n"  # Adding supplier name to the string
+                f"Address: {supplier.address}\n"  # Adding supplier address to the string
+                f"Contact Details: {supplier.contact_details}\n"  # Adding supplier contact details to the string
+                f"Service Provided: {supplier.service_provided}\n\n"  # Adding supplier services provided to the string
+                f"Minimum Guests: {supplier.min_guests_supplier}\n"  # Adding minimum guests to the string
+                f"Maximum Guests: {supplier.max_guests_supplier}\n\n"  # Adding maximum guests to the string
+                f"Menu: {supplier.menu}\n\n"  # Adding menu to the string
+            )
+
+    def iter_supplier_rows(self, fields=SUPPLIER_FIELDS, snapshot=False):  # Method for streaming suppliers as tuples of attribute values
+        """
+        Yield one tuple per supplier holding the requested attributes (None where an older record lacks one).
+        Args:
+            fields: Attribute names to include, in order.
+            snapshot: Copy the supplier references first so the suppliers may change while the rows are consumed.
+        """
+        return record_rows(self.suppliers, fields, snapshot)  # Streaming the rows, straight from the columns of a columnar store
+
     def display_all_suppliers(self):  # Method for displaying details of all suppliers
         if not self.suppliers:  # Checking if suppliers dictionary is empty
             return "No suppliers to display."  # Returning message if no suppliers exist
         else:
-            all_suppliers_info = ""  # Initializing string to store all suppliers' information
-            for supplier_id, supplier in self.suppliers.items():  # Iterating over suppliers dictionary
-                all_suppliers_info += f"Supplier ID: {supplier_id}\n"  # Adding supplier ID to the string
-                all_suppliers_info += f"Name: {supplier.name}\n"  # Adding supplier name to the string
-                all_suppliers_info += f"Address: {supplier.address}\n"  # Adding supplier address to the string
-                all_suppliers_info += f"Contact Details: {supplier.contact_details}\n"  # Adding supplier contact details to the string
-                all_suppliers_info += f"Service Provided: {supplier.service_provided}\n\n"  # Adding supplier services provided to the string
-                all_suppliers_info += f"Minimum Guests: {supplier.min_guests_supplier}\n"  # Adding minimum guests to the string
-                all_suppliers_info += f"Maximum Guests: {supplier.max_guests_supplier}\n\n"  # Adding maximum guests to the string
-                all_suppliers_info += f"Menu: {supplier.menu}\n\n"  # Adding menu to the string
-            return all_suppliers_info  # Returning the string containing all suppliers' information
+            return "".join(self.iter_suppliers())  # Joining the streamed details once instead of growing one string
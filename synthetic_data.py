@@ -0,0 +1,87 @@
+from event_management import Event, EVENT_FILE_PATH  # Importing the event record and file path
+from guest_management import Guest, GUEST_FILE_PATH  # Importing the guest record and file path
+from supplier_management import Supplier, SUPPLIER_FILE_PATH  # Importing the supplier record and file path
+from venue_management import Venue, VENUE_FILE_PATH  # Importing the venue record and file path
+from client_management import Client, CLIENT_FILE_PATH  # Importing the client record and file path
+from employee_management import Employee, EMPLOYEE_FILE_PATH  # Importing the employee record and file path
+from storage import PickleStorage  # Importing the pickle storage used to write the synthetic files
+
+SERVICES = ["Catering", "Cleaning", "Decorations", "Entertainment", "Furniture"]  # Services offered by synthetic suppliers
+DEPARTMENTS = ["sales", "marketing", "operations", "finance", "logistics"]  # Departments of synthetic employees
+
+
+def supplier_name(service_index, i):  # Function for naming one of the first 200 synthetic suppliers of a service
+    supplier = (i % 40) * len(SERVICES) + service_index  # Picking a supplier offering that service, as make_supplier assigns them
+    return f"{SERVICES[service_index].lower()} company {supplier}"  # Returning the supplier's name
+
+
+def make_event(i):  # Function for building the i-th synthetic event
+    return Event(
+        f"E{i}",  # Event ID
+        "WEDDING" if i % 3 else "BIRTHDAY",  # Event type
+        f"theme {i % 50}",  # Theme
+        f"{i % 28 + 1}/{i % 12 + 1}/{2024 + i % 3}",  # Date in day/month/year form
+        f"{i % 12 + 1}:00pm",  # Time
+        f"{i % 6 + 1} hours",  # Duration
+        f"venue street {i % 500}",  # Venue address
+        f"C{i % 2000}",  # Client ID
+        (f"G{i}", f"G{i + 1}"),  # Guest IDs
+        supplier_name(0, i),  # Catering company
+        supplier_name(1, i),  # Cleaning company
+        supplier_name(2, i),  # Decorations company
+        supplier_name(3, i),  # Entertainment company
+        supplier_name(4, i),  # Furniture supply company
+        str(1000 + i % 9000),  # Invoice
+    )
+
+
+def make_guest(i):  # Function for building the i-th synthetic guest
+    return Guest(f"G{i}", f"guest {i}", f"street {i % 1000}, abu dhabi", f"050{i:07d}")
+
+
+def make_supplier(i):  # Function for building the i-th synthetic supplier
+    service = SERVICES[i % len(SERVICES)]  # Picking the service provided
+    return Supplier(f"S{i}", f"{service.lower()} company {i}", f"street {i % 1000}", f"supplier{i}@example.com", service, 10 + i % 50, 100 + i % 900, f"menu {i % 20}")
+
+
+def make_venue(i):  # Function for building the i-th synthetic venue
+    return Venue(f"V{i}", f"venue {i}", f"venue street {i}", f"venue{i}@example.com", 10 + i % 90, 100 + i % 1900)
+
+
+def make_client(i):  # Function for building the i-th synthetic client
+    return Client(f"C{i}", f"client {i}", f"street {i % 1000}", f"055{i:07d}", float(5000 + i % 95000))
+
+
+def make_employee(i):  # Function for building the i-th synthetic employee
+    manager_id = f"M{(i - 1) // 10}" if i else None  # Ten reports per manager, rooted at M0
+    return Employee(f"employee {i}", f"M{i}", DEPARTMENTS[i % len(DEPARTMENTS)], "staff", str(3000 + i % 7000), str(20 + i % 40), "2000/1/1", f"P{i}", manager_id)
+
+
+GENERATORS = {  # Mapping of store labels to their file path, key field and record generator
+    "events": (EVENT_FILE_PATH, "event_id", make_event),
+    "guests": (GUEST_FILE_PATH, "guest_id", make_guest),
+    "suppliers": (SUPPLIER_FILE_PATH, "supplier_id", make_supplier),
+    "venues": (VENUE_FILE_PATH, "venue_id", make_venue),
+    "clients": (CLIENT_FILE_PATH, "client_id", make_client),
+    "employees": (EMPLOYEE_FILE_PATH, "employee_id", make_employee),
+}
+
+
+def make_records(label, count):  # Function for building a dictionary of synthetic records
+    _, key_field, generator = GENERATORS[label]  # Looking up the key field and generator
+    records = {}  # Dictionary collecting the records
+    for i in range(count):  # Iterating over the requested number of records
+        record = generator(i)  # Building the record
+        records[getattr(record, key_field)] = record  # Storing it under its key
+    return records  # Returning the records
+
+
+def write_stores(counts):  # Function for writing synthetic pickle stores in the current directory
+    """
+    Write synthetic stores next to the working directory's data files.
+    Args:
+        counts: Mapping of store label to the number of records to generate.
+    """
+    for label, count in counts.items():  # Iterating over the stores to generate
+        file_path = GENERATORS[label][0]  # Looking up the store's file path
+        PickleStorage(file_path, label).save(make_records(label, count))  # Writing the store as a pickle
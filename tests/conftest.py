@@ -0,0 +1,12 @@
+import os  # Importing the os module for the repository path
+import sys  # Importing the sys module for the import path
+
+import pytest  # Importing pytest for the fixtures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Letting the tests import the modules at the top of the repository
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):  # Fixture running a test in an empty directory, as the stores are files in the working directory
+    monkeypatch.chdir(tmp_path)  # Moving into the directory for the test
+    return tmp_path  # Returning its path
@@ -0,0 +1,33 @@
+from cli import main  # Importing the command-line entry point under test
+from employee_management import Employee, EmployeeManagement  # Importing the employee record and manager
+
+
+def test_add_and_list(data_dir, capsys):  # Records added on the command line are listed back
+    assert main(["add", "guests", "guest_id=G1", "name=Mansour", "address=Street 1", "contact_details=050"]) == 0
+    capsys.readouterr()  # Dropping the confirmation
+    assert main(["list", "guests", "--fields", "guest_id,name", "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["guest_id,name", "G1,Mansour"]
+
+
+def test_report_options(data_dir, capsys):  # Report options are refused by the reports they don't apply to
+    assert main(["report", "revenue", "--group", "client"]) == 0
+    assert main(["report", "payroll", "--by-department"]) == 0
+    assert main(["report", "payroll", "--group", "month"]) == 1
+    assert main(["report", "revenue", "--manager", "E1"]) == 1
+    assert main(["report", "org"]) == 1
+    assert "--manager" in capsys.readouterr().err
+
+
+def test_org_report(data_dir, capsys):  # Reports are listed depth first in key order, with exact salary totals
+    management = EmployeeManagement()
+    management.bulk_add_employees([
+        Employee("Manager", "M1", "Sales", "Head", "1000", 40, "", "", None),
+        Employee("Khalid", "S1235", "Sales", "Clerk", "0.2", 30, "", "", "M1"),
+        Employee("Mansour", "S1234", "Sales", "Lead", "0.1", 30, "", "", "M1"),
+        Employee("Salem", "S2000", "Sales", "Clerk", "0", 30, "", "", "S1234"),
+    ])
+    assert management.salary_under("M1") == 0.3
+    assert main(["report", "org", "--manager", "M1", "--format", "csv"]) == 0
+    captured = capsys.readouterr()
+    assert [line.split(",")[0] for line in captured.out.splitlines()[1:]] == ["S1234", "S2000", "S1235"]
+    assert "3 employees, basic salaries 0.30" in captured.err
@@ -0,0 +1,69 @@
+import pytest  # Importing pytest for parametrized tests
+
+from client_management import Client, ClientManagement  # Importing the client record and manager
+from event_management import Event, EventManagement  # Importing the event record and manager
+from exporter import export_file, store_fields  # Importing the exporter under test
+from importer import import_file  # Importing the importer under test
+from venue_management import VenueManagement  # Importing the venue manager
+
+FORMATS = ("csv", "jsonl", "cols")  # Every export file format
+
+
+def values(record, label):  # Function for reading a record's exported attributes
+    return tuple(getattr(record, field) for field in store_fields(label))
+
+
+@pytest.mark.parametrize("extension", FORMATS)
+def test_clients(data_dir, monkeypatch, extension):  # Exported clients import back unchanged, budgets as numbers
+    source = ClientManagement()
+    source.bulk_add_clients([Client(f"C{number}", f"Client {number}", "Street 1", "050", 1000.5 * number) for number in range(20)])
+    path = str(data_dir / f"clients.{extension}")
+    assert export_file("clients", path, source) == 20
+
+    target_dir = data_dir / "target"
+    target_dir.mkdir()
+    monkeypatch.chdir(target_dir)  # Importing into empty stores
+    target = ClientManagement()
+    assert import_file("clients", path, target) == 20
+    assert {key: values(client, "clients") for key, client in target.clients.items()} == {key: values(client, "clients") for key, client in source.clients.items()}
+
+
+@pytest.mark.parametrize("extension", FORMATS)
+def test_events(data_dir, monkeypatch, extension):  # Exported events import back with their guest lists and schedules
+    source = EventManagement()
+    source.bulk_add_events([
+        Event("E1", "Wedding", "Gold", "3/5/2026", "18:00", "4 hours", "", "", ("G1", "G2"), "", "", "", "", "", "5000 AED"),
+        Event("E2", "Party", "Blue, white", "4/5/2026", "", "", "", "", (), "", "", "", "", "", ""),
+    ])
+    path = str(data_dir / f"events.{extension}")
+    assert export_file("events", path, source) == 2
+
+    target_dir = data_dir / "target"
+    target_dir.mkdir()
+    monkeypatch.chdir(target_dir)  # Importing into empty stores
+    target = EventManagement()
+    assert import_file("events", path, target) == 2
+    for key, event in source.events.items():  # Comparing each event
+        imported = target.events[key]
+        assert values(imported, "events") == values(event, "events")
+        assert (imported.day, imported.starts_at, imported.ends_at) == (event.day, event.starts_at, event.ends_at)
+
+
+def test_filtered_export(data_dir):  # Only the records meeting the conditions are exported
+    source = ClientManagement()
+    source.bulk_add_clients([Client(f"C{number}", f"Client {number}", "", "", 1000 * number) for number in range(10)])
+    path = str(data_dir / "clients.jsonl")
+    assert export_file("clients", path, source, fields=("client_id", "budget"), filters=["budget>=5000"]) == 5
+
+
+def test_blank_and_text_numbers(data_dir):  # Blank numbers import as None and text as typed, while bad rows are named
+    path = data_dir / "venues.csv"
+    path.write_text("venue_id,name,address,min_guests,max_guests\nV1,Hall,Street 1,,about 200\nV2,Garden,Street 2,20,150\n")
+    target = VenueManagement()
+    assert import_file("venues", str(path), target) == 2
+    assert (target.venues["V1"].min_guests, target.venues["V1"].max_guests) == (None, "about 200")
+    assert (target.venues["V2"].min_guests, target.venues["V2"].max_guests) == (20, 150)
+
+    path.write_text("venue_id,name,address,min_guests,max_guests\nV3,Hall,Street 3,,\n,Yard,Street 4,,\n")
+    with pytest.raises(ValueError, match="Row 2 of .*: Missing ID"):
+        import_file("venues", str(path), VenueManagement())
@@ -0,0 +1,20 @@
+import pytest  # Importing pytest for the expected errors
+
+from client_management import Client  # Importing the client record
+from context import DataContext  # Importing the shared data context
+from event_management import Event  # Importing the event record
+from guest_management import Guest  # Importing the guest record
+
+
+def test_restrict(data_dir):  # Restrict refuses deleting referenced records, but deleted guests leave guest lists
+    with DataContext(on_delete="restrict") as context:
+        context.client_management.add_client(Client("C1", "Client 1", "", "", 1000))
+        context.guest_management.bulk_add_guests([Guest("G1", "Mansour", "", ""), Guest("G2", "Khalid", "", "")])
+        events = context.event_management
+        events.add_event(Event("E1", "Wedding", "Gold", "3/5/2026", "18:00", "4 hours", "", "C1", ("G1", "G2"), "", "", "", "", "", "5000"))
+
+        with pytest.raises(ValueError, match="still used by events: E1"):  # The event still names the client
+            context.client_management.delete_client("C1")
+        context.guest_management.delete_guest("G1")
+        assert events.events["E1"].guest_list == ("G2",)
+        assert not events.guest_events.lookup("G1")
@@ -0,0 +1,94 @@
+import json  # Importing the json module for reading listed records
+
+from changes import Observer  # Importing the observer base class
+from cli import main  # Importing the command-line entry point
+from context import DataContext  # Importing the shared data context
+from event_management import Event, PARSED_SCHEDULE_FIELDS  # Importing the event record and its parsed schedule fields
+from guest_management import Guest  # Importing the guest record
+from migrations import migrate_guest_lists, migrate_schedules  # Importing the migrations under test
+from sqlite_storage import migrate_pickles_to_sqlite  # Importing the SQLite migrator under test
+from storage import PickleStorage  # Importing the pickle storage used to write legacy records
+
+
+class Recorder(Observer):  # Observer remembering the changed keys
+    def __init__(self):
+        self.keys = []  # Keys of the stored changes
+
+    def after_change(self, label, changes):
+        self.keys.extend(key for key, _, _ in changes)  # Recording each key
+
+
+def save_legacy_event(guest_list):  # Function for saving an event as older versions of the program did
+    with DataContext() as context:  # Saving a current event first
+        context.event_management.add_event(Event("E1", "Wedding", "Gold", "3/5/2026", "18:00", "4 hours", "", "", (), "", "", "", "", "", "5000"))
+    storage = PickleStorage("events.bin", "events")  # Rewriting the file directly
+    events = storage.load()
+    event = events["E1"]
+    event.guest_list = guest_list  # Typed text instead of guest IDs
+    for field in PARSED_SCHEDULE_FIELDS:  # Dropping the parsed schedule, stored only by newer versions
+        delattr(event, field)
+    storage.save(events)
+
+
+def test_guest_lists(data_dir):  # Typed guest lists become guest IDs through the manager
+    with DataContext() as context:  # Saving the guests the text names
+        context.guest_management.bulk_add_guests([Guest("G1", "Mansour", "", ""), Guest("G2", "Khalid", "", "")])
+    save_legacy_event("mansour and khalid")
+
+    with DataContext(on_delete="restrict") as context:  # Opening the stores as the GUI does
+        events = context.event_management
+        recorder = Recorder()
+        context.observers.append(recorder)  # Watching the changes
+        events.events  # Loading the events
+        assert events.legacy_guest_lists == {"E1"}  # The typed list is found on load
+        assert not events.guest_events.lookup("and")  # and its words are not indexed as guests
+
+        assert migrate_guest_lists(events, context.guest_management) == 1
+        assert events.events["E1"].guest_list == ("G1", "G2")
+        assert events.events["E1"].version == 2  # Stamped by the manager
+        assert set(events.guest_events.lookup("G1")) == {"E1"}  # Indexed by the manager
+        assert recorder.keys == ["E1"]  # Observers heard about it
+        assert migrate_guest_lists(events, context.guest_management) == 0  # Running it again changes nothing
+
+    with DataContext() as context:  # Reading the store again
+        assert context.event_management.events["E1"].guest_list == ("G1", "G2")
+
+
+def test_guest_list_notice(data_dir, capsys):  # The notice about typed guest lists stays out of listed records
+    save_legacy_event("mansour and khalid")
+    assert main(["list", "events", "--format", "jsonl"]) == 0
+    captured = capsys.readouterr()
+    assert [json.loads(line)["event_id"] for line in captured.out.splitlines()] == ["E1"]
+    assert "typed guest lists" in captured.err
+
+
+def test_schedules(data_dir):  # Parsed schedules are stored through the manager
+    save_legacy_event(())
+
+    with DataContext() as context:
+        events = context.event_management
+        recorder = Recorder()
+        context.observers.append(recorder)  # Watching the changes
+        assert migrate_schedules(events) == 1
+        assert events.events["E1"].starts_at is not None
+        assert events.events["E1"].version == 2  # Stamped by the manager
+        assert recorder.keys == ["E1"]  # Observers heard about it
+        assert migrate_schedules(events) == 0  # Running it again changes nothing
+
+    with DataContext() as context:  # Reading the store again
+        event = context.event_management.events["E1"]
+        assert None not in (event.day, event.starts_at, event.ends_at)
+
+
+def test_pickles_to_sqlite(data_dir):  # Journal-backed stores are copied with their journal, and only once
+    with DataContext(backend="journal") as context:  # Saving guests through the journal only
+        context.guest_management.bulk_add_guests([Guest(f"G{number}", "Mansour", "", "") for number in range(3)])
+    migrate_pickles_to_sqlite()
+
+    with DataContext(backend="sqlite") as context:
+        assert sorted(context.guest_management.guests) == ["G0", "G1", "G2"]
+        context.guest_management.add_guest(Guest("G3", "Khalid", "", ""))  # A change saved only in SQLite
+    migrate_pickles_to_sqlite()  # Running the migration again
+
+    with DataContext(backend="sqlite") as context:
+        assert sorted(context.guest_management.guests) == ["G0", "G1", "G2", "G3"]  # The table was left alone
@@ -0,0 +1,156 @@
+import pytest  # Importing pytest for parametrized tests
+
+from changes import ConflictError  # Importing the error raised for records changed by another process
+from context import DataContext  # Importing the shared data context
+from event_management import Event, EventManagement  # Importing the event record and manager
+from guest_management import Guest, GuestManagement  # Importing the guest record and manager
+from sqlite_storage import SQLiteRecords  # Importing the SQLite table view
+
+BACKENDS = ("pickle", "journal", "sqlite", "columnar")  # Every storage backend
+
+
+def make_guest(guest_id, name="Mansour"):  # Function for building a guest
+    return Guest(guest_id, name, "Street 1", "050 123 4567")
+
+
+def make_event(event_id, guest_list=("G1", "G2"), venue=""):  # Function for building an event
+    return Event(event_id, "Wedding", "Gold", "3/5/2026", "18:00", "4 hours", venue, "", guest_list, "", "", "", "", "", "5000 AED")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_guests_round_trip(data_dir, backend):  # Added, changed and deleted records are read back after reopening
+    management = GuestManagement(backend=backend)  # Opening an empty store
+    for number in range(5):  # Adding a few guests
+        management.add_guest(make_guest(f"G{number}"))
+    management.modify_guest("G1", name="Khalid")  # Changing one
+    management.delete_guest("G2")  # Deleting another
+    management.storage.close()  # Releasing the files
+
+    reopened = GuestManagement(backend=backend)  # Reading the store again
+    guests = reopened.guests  # The saved guests
+    assert sorted(guests) == ["G0", "G1", "G3", "G4"]
+    assert guests["G1"].name == "Khalid"
+    assert guests["G1"].version == 2  # Added at version 1, changed once
+    reopened.storage.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_events_round_trip(data_dir, backend):  # Guest lists and parsed schedules survive every backend
+    management = EventManagement(backend=backend)  # Opening an empty store
+    management.bulk_add_events([make_event("E1"), make_event("E2", ())])  # Adding events with and without guests
+    management.storage.close()  # Releasing the files
+
+    reopened = EventManagement(backend=backend)  # Reading the store again
+    event = reopened.events["E1"]  # The saved event
+    assert event.guest_list == ("G1", "G2")
+    assert (event.day, event.starts_at, event.ends_at) == (make_event("E1").day, make_event("E1").starts_at, make_event("E1").ends_at)
+    assert reopened.events["E2"].guest_list == ()
+    assert sorted(found.event_id for found in reopened.find_events(date="3/5/2026")) == ["E1", "E2"]  # The indexes are rebuilt on load
+    reopened.storage.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_event_lookups(data_dir, monkeypatch, backend):  # Every backend answers the event lookups alike, SQLite without reading every row
+    management = EventManagement(backend=backend, conflict_policy="report")  # Opening an empty store that allows double bookings
+    second = make_event("E2", ("G2",), venue=" yas hall")  # An event overlapping the first
+    second.time, second.duration = "20:00", "1 hour"
+    second.parse_schedule()
+    management.bulk_add_events([make_event("E1", venue="Yas Hall"), second, make_event("E3", (), venue="Louvre")])
+    management.storage.close()  # Releasing the files
+
+    def read_every_row(self):  # Function failing a full read of the table
+        raise AssertionError("every row was read")
+    monkeypatch.setattr(SQLiteRecords, "items", read_every_row)
+    reopened = EventManagement(backend=backend, conflict_policy="report")  # Reading the store again
+    assert sorted(event.event_id for event in reopened.find_events(venue_address="YAS HALL")) == ["E1", "E2"]
+    assert [event.event_id for event in reopened.events_on("3/5/2026")][-1] == "E2"  # In start order
+    assert reopened.venue_conflicts("Yas Hall", "3/5/2026", "21:30", "1 hour") == ["E1"]
+    assert reopened.all_venue_conflicts() == [("yas hall", "E1", "E2")]
+    assert sorted(event.event_id for event in reopened.events_for_guest("g2")) == ["E1", "E2"]
+    reopened.modify_event("E2", guest_list=("G1",))  # Changing a guest list
+    assert [event.event_id for event in reopened.events_for_guest("G2")] == ["E1"]
+    reopened.storage.close()
+
+
+@pytest.mark.parametrize("backend", ("pickle", "journal"))
+def test_write_behind_round_trip(data_dir, backend):  # Changes queued on the background writer are all saved by close()
+    with DataContext(backend=backend, write_behind=True) as context:  # Saving in the background, as the GUI does
+        management = context.guest_management
+        for number in range(50):  # Queuing many single-record saves
+            management.add_guest(make_guest(f"G{number}"))
+        management.modify_guest("G7", name="Khalid")
+        management.delete_guest("G8")
+
+    with DataContext(backend=backend) as context:  # Reading the store again
+        guests = context.guest_management.guests
+        assert len(guests) == 49
+        assert guests["G7"].name == "Khalid"
+        assert "G8" not in guests
+
+
+@pytest.mark.parametrize("backend", ("pickle", "journal"))
+def test_refresh_on_writer_thread(data_dir, backend):  # Records saved by another process are read by the writer and applied by the caller
+    with DataContext(backend=backend, write_behind=True) as ours, DataContext(backend=backend, write_behind=True) as theirs:
+        ours.guest_management.bulk_add_guests([make_guest("G1"), make_guest("G2")])  # Saving two guests
+        ours.guest_management.storage.flush()  # Waiting until they are on disk
+        theirs.guest_management.guests  # Loading them in the other process
+        theirs.guest_management.add_guest(make_guest("G3"))  # The other process adds one
+        theirs.guest_management.modify_guest("G1", name="Khalid")  # and changes another
+        theirs.guest_management.storage.flush()  # Waiting until its changes are on disk
+
+        ours.request_refresh()  # Queuing the read behind our saves
+        ours.guest_management.storage.flush()  # Waiting for the writer to read them
+        ours.guest_management.modify_guest("G2", name="Salem")  # Changing a record after the read
+        assert ours.apply_refreshed() == 2  # Their two changes are applied
+        guests = ours.guest_management.guests
+        assert sorted(guests) == ["G1", "G2", "G3"]
+        assert guests["G1"].name == "Khalid"
+        assert guests["G2"].name == "Salem"  # Our later change is kept
+
+
+@pytest.mark.parametrize("backend", ("pickle", "journal"))
+def test_conflict_restores_record(data_dir, backend):  # A change refused as a conflict leaves memory, indexes and totals as saved
+    with DataContext(backend=backend) as ours, DataContext(backend=backend) as theirs:
+        ours.event_management.bulk_add_events([make_event("E1"), make_event("E2")])  # Saving two events
+        theirs.event_management.events  # Loading them in the other process
+        theirs.analytics.revenue()  # Counting them there
+        ours.event_management.modify_event("E1", invoice="1000")  # Changing one first
+
+        with pytest.raises(ConflictError):  # The other process changes it too
+            theirs.event_management.modify_event("E1", invoice="3000", date="4/5/2026")
+        events = theirs.event_management
+        assert events.events["E1"].invoice == "5000 AED"  # Its value is put back
+        assert [event.event_id for event in events.find_events(date="4/5/2026")] == []  # and so are its indexes
+        assert theirs.analytics.revenue().total == 10000  # Observers never counted it
+
+        theirs.refresh()  # Reading the saved change
+        assert events.events["E1"].invoice == "1000"
+        assert theirs.analytics.revenue().total == 6000
+
+
+def test_sqlite_refresh(data_dir):  # Rows another process saves in the database reach the indexes and observers on refresh
+    with DataContext(backend="sqlite") as ours, DataContext(backend="sqlite") as theirs:
+        ours.event_management.add_event(make_event("E1"))  # Saving an event
+        ours.analytics.revenue()  # Counting it
+        events = theirs.event_management
+        events.events  # Loading and indexing it in the other process
+        assert theirs.analytics.revenue().total == 5000  # Counting it there
+        ours.event_management.add_event(make_event("E5", venue="Yas Hall"))  # Booking a venue
+        ours.event_management.modify_event("E1", invoice="1000")  # Changing the first event
+
+        assert theirs.refresh() == 2
+        assert sorted(event.event_id for event in events.find_events(date="3/5/2026")) == ["E1", "E5"]
+        assert events.venue_conflicts("Yas Hall", "3/5/2026", "19:00", "1 hour") == ["E5"]  # The booking is seen
+        assert theirs.analytics.revenue().total == 6000
+        assert theirs.refresh() == 0  # Nothing is read twice
+
+        ours.event_management.delete_event("E5")  # Deleting an event
+        ours.event_management.modify_event("E1", invoice="1500")  # and changing the other
+        with pytest.raises(ConflictError):  # Changing it before reading that change
+            events.modify_event("E1", invoice="3000")
+        assert theirs.analytics.revenue().total == 6000  # Nothing was counted
+        assert theirs.refresh() == 2
+        assert "E5" not in events.events and events.venue_conflicts("Yas Hall", "3/5/2026", "19:00", "1 hour") == []
+        assert theirs.analytics.revenue().total == 1500
+        events.modify_event("E1", invoice="2000")  # Changing it after reading it
+        assert ours.refresh() == 1 and ours.analytics.revenue().total == 2000
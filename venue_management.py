@@ -1,9 +1,12 @@
-import os  # Importing the os module for operating system related functionalities
-import pickle  # Importing the pickle module for object serialization
+from changes import Observable, apply_external, check_version, modified_copy  # Importing the change notification mixin and version checks
+from records import VERSION_FIELD, Record, record_rows  # Importing the slot-based record base class, version stamp and row streaming
+from storage import open_storage  # Importing the storage factory used to persist records
 
 VENUE_FILE_PATH = "venues.bin"  # File path constant for storing venue data
+VENUE_FIELDS = ("venue_id", "name", "address", "contact", "min_guests", "max_guests")  # Venue attributes in constructor order, used for row output
 
-class Venue:  # Definition of the Venue class
+class Venue(Record):  # Definition of the Venue class
+    __slots__ = VENUE_FIELDS  # Fixed attributes, so instances carry no __dict__
     # Initializes a Venue object with location and capacity details.
     def __init__(self, venue_id, name, address, contact, min_guests, max_guests):
         self.venue_id = venue_id  # Unique identifier for the venue
@@ -13,46 +16,110 @@ class Venue:  # Definition of the Venue class
         self.min_guests = min_guests  # Minimum number of guests the venue can accommodate
         self.max_guests = max_guests  # Maximum number of guests the venue can accommodate
 
-class VenueManagement:  # Definition of the VenueManagement class
-    def __init__(self):  # Constructor method for initializing venue management instance
-        self.venues = self.load_venues()  # Loading venues data when an instance is created
+class VenueManagement(Observable):  # Definition of the VenueManagement class
+    label = "venues"  # Name passed to observers
+
+    def __init__(self, backend=None):  # Constructor method for initializing venue management instance
+        self.storage = open_storage(backend, VENUE_FILE_PATH, "venues", Venue, "venue_id")  # Choosing how venues data is persisted
+        self._venues = None  # Venues data, loaded on first access
+        self.observers = []  # Objects notified before and after each change
+
+    @property
+    def venues(self):  # Property loading venues data the first time it is used
+        if self._venues is None:  # Checking if the venues are not loaded yet
+            self._venues = self.load_venues()  # Loading venues data from the storage
+        return self._venues  # Returning the loaded venues
+
+    @venues.setter
+    def venues(self, value):  # Setter replacing the loaded venues data
+        self._venues = value  # Storing the new venues dictionary
 
     def load_venues(self):  # Method for loading venues data from file
-        if os.path.exists(VENUE_FILE_PATH):  # Checking if the file exists
-            with open(VENUE_FILE_PATH, "rb") as file:  # Opening the file in binary read mode
-                try:
-                    return pickle.load(file)  # Loading data from the file using pickle
-                except (pickle.UnpicklingError, EOFError) as e:  # Handling errors during unpickling
-                    print(f"Error loading venues data: {e}")  # Printing error message
-                    return {}  # Returning an empty dictionary if error occurs
-        return {}  # Returning an empty dictionary if file doesn't exist
+        return self.storage.load()  # Loading data through the configured storage
 
     def save_venues(self):  # Method for saving venues data to file
-        with open(VENUE_FILE_PATH, "wb") as file:  # Opening the file in binary write mode
-            pickle.dump(self.venues, file)  # Saving data to the file using pickle
+        self.storage.save(self.venues)  # Saving all venues data through the configured storage
+
+    def refresh_venues(self, external=None):  # Method for picking up venues saved by other processes sharing the files
+        """
+        Apply the venues other processes added, changed or deleted since the storage
+        last read or wrote them, and tell observers about each.
+        Args:
+            external: Changed venues, or None once deleted, by key, if already read from the
+                storage; they are read now if omitted.
+        Returns:
+            list: The applied changes as (key, old, new) tuples.
+        """
+        if self._venues is None:  # Checking if the venues are not loaded yet
+            return []  # They are read in full on first access
+        if external is None:  # Checking if the changes still have to be read
+            external = self.storage.read_changes(self._venues)  # Reading the saved changes
+        changes = apply_external(self._venues, external)  # Applying the saved changes
+        if changes:  # Checking if anything changed
+            self.notify_after(changes)  # Telling observers about the changes
+        return changes  # Returning the applied changes
 
     def add_venue(self, venue):  # Method for adding a new venue
         if venue.venue_id in self.venues:  # Checking if venue ID already exists
             raise Exception("Venue ID already exists.")  # Raising an error if venue ID is not unique
+        changes = [(venue.venue_id, None, venue)]  # Describing the addition
+        self.notify_before(changes)  # Letting observers check the new venue
         self.venues[venue.venue_id] = venue  # Adding the new venue to the venues dictionary
-        self.save_venues()  # Saving the updated venues data to file
+        self.persist_changes(self.venues, changes)  # Persisting only the new venue, then telling observers about the new venue
 
-    def delete_venue(self, venue_id):  # Method for deleting a venue
+    def delete_venue(self, venue_id, expected_version=None):  # Method for deleting a venue, optionally only if it is still at the version the caller read
         if venue_id not in self.venues:  # Checking if venue ID exists
             raise Exception("Venue not found.")  # Raising an error if venue ID doesn't exist
+        check_version(self.label, venue_id, self.venues[venue_id], expected_version)  # Refusing the deletion if someone else changed the venue since
+        changes = [(venue_id, self.venues[venue_id], None)]  # Describing the deletion
+        self.notify_before(changes)  # Letting observers check the deletion
         del self.venues[venue_id]  # Deleting the venue from the venues dictionary
-        self.save_venues()  # Saving the updated venues data to file
+        self.persist_changes(self.venues, changes)  # Persisting the venue change, then telling observers about the deletion
 
-    def modify_venue(self, venue_id, **kwargs):  # Method for modifying venue attributes
+    def modify_venue(self, venue_id, expected_version=None, **kwargs):  # Method for modifying venue attributes, optionally only if the venue is still at the version the caller read
         if venue_id not in self.venues:  # Checking if venue ID exists
             raise Exception("Venue not found.")  # Raising an error if venue ID doesn't exist
         venue = self.venues[venue_id]  # Getting the venue object
-        for key, value in kwargs.items():  # Iterating over keyword arguments
-            if hasattr(venue, key):  # Checking if the venue has the attribute
-                setattr(venue, key, value)  # Setting the new value for the attribute
-            else:
+        check_version(self.label, venue_id, venue, expected_version)  # Refusing the change if someone else changed the venue since
+        for key in kwargs:  # Iterating over keyword arguments
+            if not hasattr(venue, key) or key == VERSION_FIELD:  # Checking if the venue has the attribute, which the version stamp doesn't count as
                 raise Exception(f"{key} is not a valid attribute of Venue.")  # Raising an error for invalid attribute
-        self.save_venues()  # Saving the updated venues data to file
+        updated = modified_copy(venue, kwargs)  # Copying the venue with the new values
+        changes = [(venue_id, venue, updated)]  # Describing the modification
+        self.notify_before(changes)  # Letting observers check the new values
+        self.venues[venue_id] = updated  # Storing the modified venue in place of the old one
+        self.persist_changes(self.venues, changes)  # Persisting the venue change, then telling observers about the modification
+
+    def bulk_add_venues(self, venues):  # Method for adding many venues with a single save
+        """
+        Add a batch of venues, saving once at the end. Nothing is added if any
+        venue ID already exists or appears twice in the batch.
+        Returns:
+            int: The number of venues added.
+        """
+        batch = {}  # New venues by ID
+        for venue in venues:  # Iterating over the new venues
+            if venue.venue_id in batch or venue.venue_id in self.venues:  # Checking if venue ID already exists
+                raise Exception(f"Venue ID already exists: {venue.venue_id}")  # Raising an error naming the duplicate ID
+            batch[venue.venue_id] = venue  # Adding the venue to the batch
+        changes = [(venue_id, None, venue) for venue_id, venue in batch.items()]  # Describing the additions
+        self.notify_before(changes)  # Letting observers check the new venues
+        self.venues.update(batch)  # Adding the whole batch to the venues dictionary
+        self.persist_changes(self.venues, changes)  # Persisting the batch once, then telling observers about the new venues
+        return len(batch)  # Returning the number of venues added
+
+    def bulk_upsert_venues(self, venues):  # Method for adding or replacing many venues with a single save
+        """
+        Add a batch of venues, replacing any existing venue with the same ID, and save once.
+        Returns:
+            int: The number of venues written.
+        """
+        batch = {venue.venue_id: venue for venue in venues}  # New venues by ID, later entries winning
+        changes = [(venue_id, self.venues.get(venue_id), venue) for venue_id, venue in batch.items()]  # Describing the additions and replacements
+        self.notify_before(changes)  # Letting observers check the batch
+        self.venues.update(batch)  # Storing the whole batch in the venues dictionary
+        self.persist_changes(self.venues, changes)  # Persisting the batch once, then telling observers about the batch
+        return len(batch)  # Returning the number of venues written
 
     def get_venue(self, venue_id):  # Method for retrieving a venue
         if venue_id not in self.venues:  # Checking if venue ID exists
@@ -68,16 +135,31 @@ class VenueManagement:  # Definition of the VenueManagement class
         print(f"Minimum Guests: {venue.min_guests}")  # Displaying minimum guests
         print(f"Maximum Guests: {venue.max_guests}")  # Displaying maximum guests
 
+    def iter_venues(self):  # Method for streaming the details of all venues one venue at a time
+        """
+        Yield the details of each venue as a block of text, in the layout used by display_all_venues.
+        """
+        for venue_id, venue in self.venues.items():  # Iterating over venues dictionary
+            yield (  # Yielding the formatted venue details
+                f"Venue ID: {venue_id}\n"  # Adding venue ID to the string
+                f"Name: {venue.name}\n"  # Adding venue name to the string
+                f"Address: {venue.address}\n"  # Adding venue address to the string
+                f"Contact: {venue.contact}\n"  # Adding venue contact to the string
+                f"Minimum Guests: {venue.min_guests}\n"  # Adding minimum guests to the string
+                f"Maximum Guests: {venue.max_guests}\n\n"  # Adding maximum guests to the string
+            )
+
+    def iter_venue_rows(self, fields=VENUE_FIELDS, snapshot=False):  # Method for streaming venues as tuples of attribute values
+        """
+        Yield one tuple per venue holding the requested attributes (None where an older record lacks one).
+        Args:
+            fields: Attribute names to include, in order.
+            snapshot: Copy the venue references first so the venues may change while the rows are consumed.
+        """
+        return record_rows(self.venues, fields, snapshot)  # Streaming the rows, straight from the columns of a columnar store
+
     def display_all_venues(self):  # Method for displaying details of all venues
         if not self.venues:  # Checking if venues dictionary is empty
             return "No venues to display."  # Returning message if no venues exist
         else:
-            all_venues_info = ""  # Initializing string to store all venues' information
-            for venue_id, venue in self.venues.items():  # Iterating over venues dictionary
-                all_venues_info += f"Venue ID: {venue_id}\n"  # Adding venue ID to the string
-                all_venues_info += f"Name: {venue.name}\n"  # Adding venue name to the string
-                all_venues_info += f"Address: {venue.address}\n"  # Adding venue address to the string
-                all_venues_info += f"Contact: {venue.contact}\n"  # Adding venue contact to the string
-                all_venues_info += f"Minimum Guests: {venue.min_guests}\n"  # Adding minimum guests to the string
-                all_venues_info += f"Maximum Guests: {venue.max_guests}\n\n"  # Adding maximum guests to the string
-            return all_venues_info  # Returning the string containing all venues' information
+            return "".join(self.iter_venues())  # Joining the streamed details once instead of growing one string